@@ -4,18 +4,19 @@ import threading
 import time
 import traceback as _tb
 from webhook_cakto import register_cakto_webhook
-try:
+
+SUPABASE_URL = os.environ.get('SUPABASE_URL', 'https://urlthgicnomfbyklesou.supabase.co')
+SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
+
+
+def _criar_supabase():
+    """Cliente Supabase criado no primeiro uso (fora do cold start)"""
     from supabase import create_client
-    SUPABASE_URL = os.environ.get('SUPABASE_URL', 'https://urlthgicnomfbyklesou.supabase.co')
-    SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
-    supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_KEY else None
-    if supabase_client:
-        print("✅ Supabase conectado!")
-    else:
-        print("⚠️ SUPABASE_KEY não definida — liberação de produtos desativada")
-except Exception as e:
-    print(f"⚠️ Supabase não disponível: {e}")
-    supabase_client = None
+    client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    print("✅ Supabase conectado!")
+    return client
+
+
 from datetime import datetime
 from flask import Flask, request, jsonify, send_from_directory, redirect
 try:
@@ -35,6 +36,13 @@ app = Flask(__name__, static_folder=None)
 DERIV_ID_BLACKLIST = {"VRTC10166481"}
 IP_BLACKLIST = {"187.20.29.230"}
 CORS(app)
+
+from backend.lazy_import import LazyObject
+if SUPABASE_KEY:
+    supabase_client = LazyObject(_criar_supabase)
+else:
+    supabase_client = None
+    print("⚠️ SUPABASE_KEY não definida — liberação de produtos desativada")
 register_cakto_webhook(app, supabase_client)
 
 # ==================== IMPORTAR BOTS REAIS ====================
@@ -57,42 +65,22 @@ try:
         else:
             raise ImportError("Nenhuma classe encontrada em backend.bot")
     from backend.config import BotConfig
-    from backend.strategies.alpha_bot_balanced import AlphaBotBalanced
-    from backend.strategies.alpha_bot_1 import AlphaBot1
-    from backend.strategies.alpha_bot_2 import AlphaBot2
-    from backend.strategies.alpha_bot_3 import AlphaBot3
-    from backend.strategies.alpha_mind import AlphaMind
-    from backend.strategies.quantum_trader import QuantumTrader
-    from backend.strategies.titan_core import TitanCore
-    from backend.strategies.alpha_pulse import AlphaPulse
-    from backend.strategies.alpha_smart import AlphaSmart
-    from backend.strategies.alpha_analytics_sniper import AlphaAnalytics, AlphaSniper
-    from backend.strategies.premium_strategies import MegaAlpha1, MegaAlpha2, MegaAlpha3, AlphaElite, AlphaNexus
+    from backend.strategies.ensemble import StrategyEnsemble
+    from backend.strategies.registry import strategy_registry
+    from backend.strategies.indicator_cache import indicator_cache
+    from backend.paper_trading import PaperDerivAPI, paper_feed
     BOTS_AVAILABLE = True
-    print("✅ Todas as 15 estratégias carregadas!")
+    print(f"✅ {len(strategy_registry)} estratégias registradas (importadas no primeiro uso)")
 except ImportError as e:
     BOTS_AVAILABLE = False
     print(f"⚠️ Erro ao importar bots: {e}")
     _tb.print_exc()
 
-STRATEGY_MAP = {
-    'alpha_bot_1':        lambda tm, rm: AlphaBot1(tm, rm),
-    'alpha_bot_2':        lambda tm, rm: AlphaBot2(tm, rm),
-    'alpha_bot_3':        lambda tm, rm: AlphaBot3(tm, rm),
-    'alpha_bot_balanced': lambda tm, rm: AlphaBotBalanced(tm, rm),
-    'alpha_mind':         lambda tm, rm: AlphaMind(tm, rm),
-    'quantum_trader':     lambda tm, rm: QuantumTrader(tm, rm),
-    'titan_core':         lambda tm, rm: TitanCore(tm, rm),
-    'alpha_pulse':        lambda tm, rm: AlphaPulse(tm, rm),
-    'alpha_smart':        lambda tm, rm: AlphaSmart(tm, rm),
-    'alpha_analytics':    lambda tm, rm: AlphaAnalytics(tm, rm),
-    'alpha_sniper':       lambda tm, rm: AlphaSniper(tm, rm),
-    'mega_alpha_1':       lambda tm, rm: MegaAlpha1(tm, rm),
-    'mega_alpha_2':       lambda tm, rm: MegaAlpha2(tm, rm),
-    'mega_alpha_3':       lambda tm, rm: MegaAlpha3(tm, rm),
-    'alpha_elite':        lambda tm, rm: AlphaElite(tm, rm),
-    'alpha_nexus':        lambda tm, rm: AlphaNexus(tm, rm),
-}
+def criar_estrategia(strategy_id, trading_mode, risk_mode):
+    """Instancia a estratégia Rise/Fall pelo id (módulo importado no primeiro uso)"""
+    if strategy_id not in strategy_registry or strategy_registry.is_digit(strategy_id):
+        strategy_id = 'alpha_bot_1'
+    return strategy_registry.create(strategy_id, trading_mode, risk_mode)
 
 SYMBOL_MAP = {
     # Volatility Indices
@@ -381,6 +369,9 @@ def start_bot():
         account_type = data.get('account_type', 'demo')
         token        = data.get('token')
         deriv_id     = data.get('deriv_id', '') or data.get('loginid', '')
+        # Paper: AlphaDolar real sobre conta virtual (sem token nem conexão autorizada);
+        # bots que não são do motor Python também rodam em paper
+        paper        = account_type == 'paper' or bot_type not in ['ia', 'ia_simples']
 
         symbol        = resolve_symbol(config.get('symbol', 'R_100'))
         stake_inicial = float(config.get('stake') or config.get('stake_inicial') or 0.35)
@@ -396,7 +387,7 @@ def start_bot():
         print(f"🔑 Token recebido: {'✅ SIM (' + account_type.upper() + ')' if token else '❌ NÃO'}")
         print(f"{'='*60}\n")
 
-        if not token:
+        if not token and not paper:
             return jsonify({
                 'success': False,
                 'error': f'Token não recebido para conta {account_type}. Faça login novamente.'
@@ -424,9 +415,9 @@ def start_bot():
         if _bots_ativos:
             return jsonify({'success': False, 'error': f'Pare o bot ativo ({_bots_ativos[0]}) antes de iniciar outro'}), 400
 
-        # ==================== BOT REAL ====================
-        if BOTS_AVAILABLE and bot_type in ['ia', 'ia_simples']:
-            print("🤖 Iniciando BOT PYTHON REAL...")
+        # ==================== BOT REAL / PAPER ====================
+        if BOTS_AVAILABLE:
+            print(f"🤖 Iniciando BOT PYTHON {'PAPER' if paper else 'REAL'}...")
 
             BotConfig.DEFAULT_SYMBOL = symbol
             if deriv_id and bot_type:
@@ -434,7 +425,8 @@ def start_bot():
             BotConfig.STAKE_INICIAL  = stake_inicial
             BotConfig.LUCRO_ALVO     = lucro_alvo
             BotConfig.LIMITE_PERDA   = limite_perda
-            BotConfig.API_TOKEN      = token
+            if token:
+                BotConfig.API_TOKEN  = token
             # Salvar config no estado do usuário para isolamento
             get_user_state(deriv_id, bot_type).update({
                 'token': token,
@@ -461,7 +453,8 @@ def start_bot():
             except:
                 bot_nome = data.get('bot_name', bot_type)
             get_user_state(deriv_id, bot_type)['bot_name'] = bot_nome
-            print(f"🔑 Token [{account_type.upper()}]: {token[:10]}...")
+            if token:
+                print(f"🔑 Token [{account_type.upper()}]: {token[:10]}...")
 
             trading_mode   = config.get('trading_mode', 'faster')
             risk_mode      = config.get('risk_mode', 'conservative')
@@ -486,30 +479,37 @@ def start_bot():
 
             try:
                 if is_multi:
-                    _multi_lista = list(multi_strategies)
-                    import random
-                    random.shuffle(_multi_lista)
-                    _multi_idx = [0]  # lista mutável para closure
-                    def _get_next_strategy():
-                        idx = _multi_idx[0] % len(_multi_lista)
-                        sid = _multi_lista[idx]
-                        _multi_idx[0] = (idx + 1) % len(_multi_lista)
-                        # Sorteia próxima aleatória diferente da atual
-                        if len(_multi_lista) > 1:
-                            opcoes = [s for s in _multi_lista if s != sid]
-                            return STRATEGY_MAP.get(random.choice(opcoes), STRATEGY_MAP['alpha_bot_1'])(trading_mode, risk_mode)
-                        return STRATEGY_MAP.get(sid, STRATEGY_MAP['alpha_bot_1'])(trading_mode, risk_mode)
-                    strategy = _get_next_strategy()
+                    # Todas as escolhidas ficam aquecidas e são avaliadas a cada tick;
+                    # após perda a troca é instantânea (sem novo aquecimento)
+                    ensemble = StrategyEnsemble({
+                        sid: criar_estrategia(sid, trading_mode, risk_mode)
+                        for sid in multi_strategies
+                    })
+                    _get_next_strategy = ensemble.next_strategy
+                    strategy = ensemble.active
                     get_user_state(deriv_id, bot_type)['strategy_name'] = type(strategy).__name__
                 else:
+                    ensemble = None
                     _get_next_strategy = None
-                    factory  = STRATEGY_MAP.get(strategy_id, STRATEGY_MAP['alpha_bot_1'])
-                    strategy = factory(trading_mode, risk_mode)
+                    strategy = criar_estrategia(strategy_id, trading_mode, risk_mode)
             except Exception as e:
                 return jsonify({'success': False, 'error': f'Erro estratégia: {str(e)}'}), 500
 
             try:
-                bot = AlphaDolar(strategy=strategy, use_martingale=getattr(strategy, "usar_martingale", True), api_token=token)
+                if paper:
+                    # Isoladas do cache de indicadores do processo (como no backtest):
+                    # ticks sintéticos usam o nome real do símbolo e não podem
+                    # entrar no estado compartilhado lido pelos bots reais
+                    for _s in (ensemble.strategies.values() if ensemble is not None else (strategy,)):
+                        _s.use_shared_cache = False
+                    # Ticks do feed compartilhado (ao vivo ou sintético) e liquidação local
+                    paper_api = PaperDerivAPI(paper_feed(symbol, config.get('paper_feed')),
+                                              balance=float(config['paper_balance']) if config.get('paper_balance') else None)
+                    bot = AlphaDolar(strategy=strategy, use_martingale=getattr(strategy, "usar_martingale", True),
+                                     ensemble=ensemble, api=paper_api, tick_feed=paper_api)
+                else:
+                    bot = AlphaDolar(strategy=strategy, use_martingale=getattr(strategy, "usar_martingale", True), api_token=token,
+                                     ensemble=ensemble)
             except Exception as e:
                 return jsonify({'success': False, 'error': f'Erro bot: {str(e)}'}), 500
 
@@ -552,7 +552,7 @@ def start_bot():
                 if not won and is_multi and _get_next_strategy and get_user_state(deriv_id, bot_type).get('running'):
                     try:
                         nova_strategy = _get_next_strategy()
-                        bot.strategy = nova_strategy
+                        bot.trocar_estrategia(nova_strategy)
                         nome_nova = type(nova_strategy).__name__
                         get_user_state(deriv_id, bot_type)['strategy_name'] = nome_nova
                         # Reseta lucro sessao ao trocar estrategia
@@ -638,6 +638,7 @@ def start_bot():
                     'exit_tick': str(exit_tick) if exit_tick else None,
                     'longcode': getattr(getattr(bot, 'api', None), '_ultimo_longcode', None),
                     'perda_acum': round(perda_acum, 2),
+                    'latency_ms': getattr(getattr(bot, 'api', None), 'last_buy_latency_ms', None),
                 }
                 _trades_list = list(get_user_state(deriv_id, bot_type).get('trades', []))
                 _trades_list.append(trade)
@@ -717,6 +718,7 @@ def start_bot():
             _user_stop = limite_perda
 
             def run_bot():
+                iniciado = False
                 try:
                     if hasattr(bot, 'api') and hasattr(bot.api, 'api_token'):
                         bot.api.api_token = _user_token
@@ -730,17 +732,30 @@ def start_bot():
                     get_user_state(deriv_id, bot_type)['_limite_perda']  = _user_stop
                     get_user_state(deriv_id, bot_type)['lucro_alvo']     = _user_target
                     get_user_state(deriv_id, bot_type)['_symbol']        = _user_symbol
-                    bot.start()
+                    # Sem thread por bot: segue nos callbacks do feed e do timer_service
+                    iniciado = bot.start(block=False)
+                    if not iniciado:
+                        get_user_state(deriv_id, bot_type)['stop_reason'] = 'start_failed'
+                        get_user_state(deriv_id, bot_type)['stop_message'] = 'Falha ao iniciar bot (conexão, autorização ou saldo)'
                 except Exception as e:
                     import traceback
-                    print(f"❌ Erro thread bot: {e}")
+                    print(f"❌ Erro ao iniciar bot: {e}")
                     traceback.print_exc()
                     get_user_state(deriv_id, bot_type)['stop_reason'] = 'crash'
                     get_user_state(deriv_id, bot_type)['stop_message'] = str(e)
                 finally:
-                    get_user_state(deriv_id, bot_type)['running'] = False
-
-            # Marcar running=True no Redis ANTES de iniciar thread
+                    if not iniciado:
+                        get_user_state(deriv_id, bot_type)['running'] = False
+                return iniciado
+
+            # Sem thread de run_bot: o stop() do bot é quem encerra a sessão
+            _orig_stop = bot.stop
+            def _stop_sessao(_orig=_orig_stop):
+                _orig()
+                get_user_state(deriv_id, bot_type)['running'] = False
+            bot.stop = _stop_sessao
+
+            # Marcar running=True no Redis ANTES do start
             # Evita que o frontend detecte 'parado' durante inicialização
             if STATE_MANAGER:
                 _sm_update(deriv_id, bot_type, {
@@ -752,10 +767,12 @@ def start_bot():
                     'bot_name': bot_nome if 'bot_nome' in dir() else bot_type,
                 })
 
-            thread = threading.Thread(target=run_bot, daemon=True)
-            thread.start()
             set_bot_instance(deriv_id, bot_type, bot)
 
+            # Real: connect/authorize/warm-start fora da thread do request; a
+            # thread termina após o start e falhas chegam via stop_reason
+            thread = None if paper else threading.Thread(target=run_bot, daemon=True)
+
             get_user_state(deriv_id, bot_type).update({
                 'running': True, 'instance': bot, 'thread': thread,
                 'trades': [], 'stop_reason': None, 'stop_message': None,
@@ -764,6 +781,20 @@ def start_bot():
                 '_lucro_desde_ultimo_reset': 0.0,
                 'mart_step': 0, 'mart_max': 3,
             })
+            # Só depois do update acima: uma falha rápida não é sobrescrita por running=True
+            if thread is not None:
+                thread.start()
+
+            if paper:
+                # Feed local: o start é imediato e a falha volta no próprio request
+                if not run_bot():
+                    erro = get_user_state(deriv_id, bot_type).get('stop_message') or 'Falha ao iniciar bot paper'
+                    return jsonify({'success': False, 'error': erro}), 500
+                return jsonify({
+                    'success': True, 'message': 'Bot paper iniciado!',
+                    'bot_type': bot_type, 'account_type': account_type,
+                    'symbol': symbol, 'mode': f"PAPER - {bot.api.get_info()['feed'].upper()}"
+                })
 
             return jsonify({
                 'success': True, 'message': 'Bot iniciado!',
@@ -771,40 +802,9 @@ def start_bot():
                 'symbol': symbol, 'mode': f'REAL BOT - {account_type.upper()}'
             })
 
-        # ==================== SIMULADO ====================
+        # ==================== SEM MOTOR ====================
         else:
-            class SimulatedBot:
-                def __init__(self):
-                    self.running = True
-                    self.stats = {'total_trades': 0, 'vitorias': 0, 'derrotas': 0,
-                                  'lucro_liquido': 0.0, 'saldo_atual': 10000.0, 'win_rate': 0.0}
-                def run(self):
-                    import random
-                    while self.running:
-                        time.sleep(5)
-                        if random.random() < 0.3:
-                            won    = random.random() < 0.65
-                            profit = stake_inicial * 0.95 if won else -stake_inicial
-                            self.stats['total_trades'] += 1
-                            if won: self.stats['vitorias'] += 1
-                            else:   self.stats['derrotas'] += 1
-                            self.stats['lucro_liquido'] += profit
-                            self.stats['saldo_atual']   += profit
-                            self.stats['win_rate'] = (self.stats['vitorias'] / self.stats['total_trades']) * 100
-                def stop(self): self.running = False
-
-            bot    = SimulatedBot()
-            thread = threading.Thread(target=bot.run, daemon=True)
-            thread.start()
-            get_user_state(deriv_id, bot_type).update({
-                'running': True, 'instance': bot, 'thread': thread,
-                'trades': [], 'stop_reason': None, 'stop_message': None,
-                'bot_name_real': data.get('bot_name', bot_type),
-                '_perda_desde_ultimo_ganho': 0.0,
-                '_lucro_desde_ultimo_reset': 0.0,
-                'mart_step': 0, 'mart_max': 3,
-            })
-            return jsonify({'success': True, 'message': 'Bot simulado iniciado', 'mode': 'SIMULATED'})
+            return jsonify({'success': False, 'error': 'Motor de bots indisponível no servidor'}), 503
 
     except Exception as e:
         print(f"❌ ERRO start_bot: {e}")
@@ -989,48 +989,15 @@ def _enviar_imagem_telegram(url_imagem, caption=''):
         return False
 
 def _verificar_resultado_sinal(mercado, tipo, ticks_espera=5):
-    import websocket, json, threading
+    """Liquida o sinal PAR/ÍMPAR localmente no próximo tick do feed público (tick_hub)"""
+    from backend.settlement import settle_live
     resultado = {'ok': False, 'won': False, 'digito': None}
-    ev = threading.Event()
-    
-    def on_msg(ws, msg):
-        data = json.loads(msg)
-        if data.get('msg_type') == 'authorize':
-            ws.send(json.dumps({'ticks': mercado, 'subscribe': 1}))
-        elif data.get('msg_type') == 'tick':
-            q = float(data['tick']['quote'])
-            ds = f"{q:.5f}".replace('.','')
-            dg = int(ds[-1])
-            resultado['digito'] = dg
-            if tipo == 'PAR':
-                resultado['won'] = (dg % 2 == 0)
-            else:
-                resultado['won'] = (dg % 2 != 0)
-            resultado['ok'] = True
-            ws.close()
-            ev.set()
-    
-    def on_error(ws, err): ev.set()
-    def on_close(ws, *a): ev.set()
-    
     try:
-        token = os.environ.get('DERIV_SIGNAL_TOKEN', '')
-        ws = websocket.WebSocketApp(
-            'wss://ws.derivws.com/websockets/v3?app_id=1089',
-            on_message=on_msg, on_error=on_error, on_close=on_close
-        )
-        def on_open(ws):
-            if token:
-                ws.send(json.dumps({'authorize': token}))
-            else:
-                ws.send(json.dumps({'ticks': mercado, 'subscribe': 1}))
-        ws.on_open = on_open
-        t = threading.Thread(target=ws.run_forever, daemon=True)
-        t.start()
-        ev.wait(timeout=15)
+        contrato = settle_live(mercado, 'DIGITEVEN' if tipo == 'PAR' else 'DIGITODD', timeout=15)
+        if contrato:
+            resultado.update(ok=True, won=contrato['status'] == 'won', digito=contrato['digito'])
     except Exception as e:
         print(f"Erro verificar resultado: {e}")
-    
     return resultado
 
 def robo_master_loop():
@@ -1464,6 +1431,30 @@ def mult_ia():
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
+def _candles_simbolo(symbol):
+    """CandleAggregator do símbolo (alimentado pelo feed do tick_hub), ou None"""
+    if not BOTS_AVAILABLE or not symbol:
+        return None
+    return indicator_cache.candles(resolve_symbol(symbol))
+
+
+@app.route('/api/candles', methods=['GET'])
+def api_candles():
+    """Candles OHLC fechados + parcial de um símbolo (?symbol=R_100&tf=60&n=50)"""
+    try:
+        tf = int(request.args.get('tf', 60))
+        n  = max(1, min(int(request.args.get('n', 50)), 200))
+    except ValueError:
+        return jsonify({'ok': False, 'erro': 'tf e n devem ser inteiros'}), 400
+    symbol = request.args.get('symbol', '')
+    agg = _candles_simbolo(symbol)
+    if agg is None:
+        return jsonify({'ok': False, 'erro': 'Sem ticks recebidos para o símbolo', 'candles': [], 'partial': None})
+    if tf not in agg.timeframes:
+        return jsonify({'ok': False, 'erro': f'Timeframe inválido. Disponíveis: {list(agg.timeframes)}'}), 400
+    return jsonify({'ok': True, **agg.snapshot(tf, n)})
+
+
 @app.route('/api/ctx-ia', methods=['POST'])
 def ctx_ia():
     import urllib.request, json as j
@@ -1483,6 +1474,26 @@ def ctx_ia():
     historico   = dados.get('historico', [])  # ultimos trades da sessao
     modo        = dados.get('modo', 'balanceado')
 
+    # Com ticks do símbolo no servidor, velas e Bollinger vêm dos candles
+    # incrementais (sem depender do que o navegador montou)
+    agg = _candles_simbolo(dados.get('symbol'))
+    try:
+        tf = int(dados.get('tf', 60))
+    except (TypeError, ValueError):
+        tf = 60
+    if agg is not None and tf in agg.timeframes:
+        fechados = agg.candles(tf, 20)
+        if len(fechados) >= 3:
+            last3 = ['🟢' if c.close > c.open else '🔴' for c in fechados[-3:]]
+        if len(fechados) >= 20:
+            closes  = [c.close for c in fechados]
+            media   = sum(closes) / len(closes)
+            desvio  = (sum((c - media) ** 2 for c in closes) / len(closes)) ** 0.5
+            atual   = agg.partial(tf).close if agg.partial(tf) is not None else closes[-1]
+            banda_sup, banda_inf = round(media + 2 * desvio, 4), round(media - 2 * desvio, 4)
+            preco_atual = atual
+            bb_pct  = round((atual - banda_inf) / ((banda_sup - banda_inf) or 0.001) * 100, 1)
+
     # Montar historico resumido
     hist_txt = ''
     if historico:
@@ -2359,4 +2370,16 @@ def get_admin_status():
         from backend.state_manager import cleanup_old_states
         cleanup_old_states()
     except: pass
-    return jsonify({'status':'ok','memoria_mb':mem_mb,'bots_rodando':bots_rodando,'users_em_memoria':users})
+    # Assinaturas vivas por conexão (bots deste worker + feeds públicos do TickHub)
+    assinaturas = {'conexoes': [], 'feeds': {}}
+    try:
+        from backend.state_manager import list_bot_instances
+        from backend.tick_hub import tick_hub
+        for _inst in list_bot_instances():
+            _api = getattr(_inst, 'api', None)
+            if _api and hasattr(_api, 'get_subscription_info'):
+                assinaturas['conexoes'].append(_api.get_subscription_info())
+        assinaturas['feeds'] = tick_hub.get_info()
+    except: pass
+    return jsonify({'status':'ok','memoria_mb':mem_mb,'bots_rodando':bots_rodando,'users_em_memoria':users,
+                    'assinaturas':assinaturas})
@@ -57,7 +57,7 @@ class MLStrategy:
             from ml import prepare_features
 
             # Prepara features
-            features = prepare_features(ticks, window_size=10)
+            features = prepare_features(ticks, window_size=10, symbol=config.get('symbol'))
 
             if features is None:
                 return {
@@ -10,6 +10,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
 
+try:
+    from ..digits import tick_digit
+except ImportError:
+    from digits import tick_digit
+
 
 class DataCollector:
     """Coleta e armazena dados históricos de ticks"""
@@ -41,9 +46,8 @@ class DataCollector:
             'bid': float(tick_data.get('bid', 0)),
         }
 
-        # Adiciona dígito
-        quote_str = str(processed_tick['quote'])
-        last_digit = int(quote_str.replace('.', '')[-1]) if quote_str else 0
+        # Adiciona dígito (pip_size do tick ou tabela do símbolo)
+        last_digit = tick_digit(tick_data)
         processed_tick['last_digit'] = last_digit
         processed_tick['is_even'] = last_digit % 2 == 0
 
@@ -6,9 +6,19 @@ Facilita uso de API real ou simulação
 
 import asyncio
 import random
-from datetime import datetime
+import time
 from typing import Callable, Dict, Optional
 
+try:
+    from ..settlement import SettlementEngine, CONTRACT_TYPES
+    from ..paper_trading import SyntheticTickGenerator, calibracao
+except ImportError:
+    from settlement import SettlementEngine, CONTRACT_TYPES
+    from paper_trading import SyntheticTickGenerator, calibracao
+
+# Espera máxima pela liquidação local de um trade virtual (segundos)
+VIRTUAL_TIMEOUT = 60
+
 
 class DerivBridge:
     """
@@ -16,11 +26,12 @@ class DerivBridge:
     Permite usar API real ou simulação transparentemente
     """
 
-    def __init__(self, mode='simulado', api_token=None):
+    def __init__(self, mode='simulado', api_token=None, payouts=None):
         """
         Args:
             mode: 'simulado', 'demo', ou 'real'
             api_token: Token da Deriv (necessário para demo/real)
+            payouts: Tabela de payout da liquidação local (ver settlement.PayoutTable)
         """
         self.mode = mode
         self.api_token = api_token
@@ -33,6 +44,12 @@ class DerivBridge:
         # Simulação (se modo simulado)
         self.sim_price = 10000.0
         self.sim_balance = 10000.0
+        self.sim_epoch = int(time.time())
+        self.sim_generator = None
+
+        # Trades simulados e virtuais liquidados localmente pelos ticks
+        self.settlement = SettlementEngine(payouts)
+        self.symbol = None
 
         # Callbacks
         self.on_tick_callback = None
@@ -90,6 +107,7 @@ class DerivBridge:
 
     async def subscribe_ticks(self, symbol: str, callback: Callable = None):
         """Subscreve para receber ticks"""
+        self.symbol = symbol
         if self.is_real_api and self.deriv_client:
             # Subscreve na API real
             self.on_tick_callback = callback
@@ -100,6 +118,9 @@ class DerivBridge:
                 if self.data_collector:
                     self.data_collector.add_tick(tick_data)
 
+                # Liquida trades virtuais abertos
+                self.settlement.on_tick(tick_data, symbol)
+
                 # Chama callback do usuário
                 if callback:
                     callback(tick_data['quote'])
@@ -111,11 +132,18 @@ class DerivBridge:
             return True
 
     def generate_sim_tick(self):
-        """Gera tick simulado"""
+        """Gera tick simulado (gerador calibrado pela volatilidade do índice)"""
         if not self.is_real_api:
-            # Movimento aleatório
-            change = random.uniform(-2, 2)
-            self.sim_price += change
+            # Símbolo que não é índice de volatilidade usa a calibração do R_100
+            indice = self.symbol if calibracao(self.symbol) is not None else 'R_100'
+            if self.sim_generator is None or self.sim_generator.symbol != indice:
+                self.sim_generator = SyntheticTickGenerator(indice, start_price=self.sim_price,
+                                                            epoch=self.sim_epoch)
+            tick = self.sim_generator.next_tick()
+            self.sim_price = tick.quote
+            self.sim_epoch = tick.epoch
+            # Cotação já no pip_size do índice: o dígito liquidado é o que aparece
+            self.settlement.on_tick(tick, self.symbol)
 
             if self.on_tick_callback:
                 self.on_tick_callback(self.sim_price)
@@ -125,6 +153,9 @@ class DerivBridge:
 
     async def execute_trade(self, params: Dict) -> Optional[Dict]:
         """Executa trade (real ou simulado)"""
+        if params.get('is_virtual') or not self.is_real_api:
+            return await self._liquidar_local(params)
+
         if self.is_real_api and self.trade_executor:
             # Trade REAL via API
             print("\n🎯 EXECUTANDO TRADE REAL VIA API DERIV")
@@ -150,26 +181,39 @@ class DerivBridge:
                         'profit': profit
                     }
 
+        return None
+
+    async def _liquidar_local(self, params: Dict) -> Optional[Dict]:
+        """
+        Trade simulado ou virtual: liquidado pelos próximos ticks do símbolo,
+        sem passar pela API (no simulado os ticks são gerados aqui mesmo)
+        """
+        if params['contract_type'] not in CONTRACT_TYPES:
+            print(f"⚠️ {params['contract_type']} não tem liquidação local — trade ignorado")
             return None
+
+        contrato = self.settlement.open(
+            params['contract_type'], params['amount'], self.symbol,
+            duration=params.get('duration', 1),
+            duration_unit=params.get('duration_unit', 't'),
+            barrier=params.get('barrier'),
+        )
+
+        if not self.is_real_api:
+            while not contrato.settled:
+                self.generate_sim_tick()
         else:
-            # Trade SIMULADO
-            amount = params['amount']
-
-            # Simula win/loss (65% win rate)
-            won = random.random() < 0.65
-
-            if won:
-                profit = amount * 0.95
-                self.sim_balance += profit
-            else:
-                profit = -amount
-                self.sim_balance += profit
-
-            return {
-                'status': 'won' if won else 'lost',
-                'profit': profit,
-                'contract_id': f'SIM_{int(datetime.now().timestamp())}'
-            }
+            limite = time.time() + VIRTUAL_TIMEOUT
+            while not contrato.settled and time.time() < limite:
+                await asyncio.sleep(0.05)
+            if not contrato.settled:
+                return None
+
+        resultado = dict(contrato.result)
+        if not self.is_real_api and not params.get('is_virtual'):
+            self.sim_balance = round(self.sim_balance + resultado['profit'], 2)
+        resultado['contract_id'] = f"{'VIRTUAL' if params.get('is_virtual') else 'SIM'}_{contrato.contract_id}"
+        return resultado
 
     def get_balance(self) -> float:
         """Retorna saldo atual"""
@@ -0,0 +1,433 @@
+"""
+Backtest — replay de arquivos de ticks pelo pipeline real do AlphaDolar
+Alpha Dolar 2.0
+
+Até aqui a única forma de medir uma estratégia era rodá-la ao vivo. O
+backtest alimenta o próprio AlphaDolar (on_tick → analyze_strategy →
+executar_trade → martingale/recuperação → StopLoss → on_contract_update)
+com ticks gravados, trocando só a conexão: SimulatedDerivAPI tem a mesma
+interface do DerivAPI, mas compra e liquida os contratos localmente com
+os ticks seguintes do próprio arquivo.
+
+Arquivos aceitos (CSV com cabeçalho):
+    - DataCollector:         timestamp, epoch, symbol, quote, ...
+    - HistoricalDataFetcher: timestamp (epoch), datetime, symbol, price, ...
+
+Liquidação: settlement.SettlementEngine (mesmas regras dos trades
+virtuais e simulados). A compra feita no tick i tem o tick i+1 como spot de
+entrada; payout da tabela passada em payouts={contract_type: lucro_por_stake}
+ou, no resto, (1 - settlement.HOUSE_EDGE) / probabilidade - 1.
+
+Uso:
+    python -m backend.backtest backend/data/R_100_20250301.csv --strategy alpha_pulse --mode faster
+"""
+import contextlib
+import csv
+import io
+import os
+import time
+from array import array
+
+try:
+    from .config import BotConfig
+    from .bot import AlphaDolar
+    from .tick_record import TickRecord
+    from .settlement import SettlementEngine
+    from .strategies.registry import strategy_registry
+except ImportError:
+    from config import BotConfig
+    from bot import AlphaDolar
+    from tick_record import TickRecord
+    from settlement import SettlementEngine
+    from strategies.registry import strategy_registry
+
+# Saldo inicial da conta simulada
+SALDO_INICIAL = 1000.0
+# MAX_TRADES_PER_DAY do backtest: o limite ao vivo (1000) encerraria a sessão
+# nos primeiros milhares de ticks de um arquivo de vários dias (o contador
+# não zera com o tempo simulado); config={"MAX_TRADES_PER_DAY": n} reativa
+SEM_LIMITE_TRADES = float("inf")
+
+# ─── DADOS ──────────────────────────────────────────────────────────────────
+class TickSeries:
+    """Ticks de um símbolo em arrays compactos (epoch int64, quote float64)"""
+
+    def __init__(self, symbol, epochs, quotes, pip_size=None):
+        self.symbol   = symbol
+        self.epochs   = epochs
+        self.quotes   = quotes
+        self.pip_size = pip_size
+
+    def __len__(self):
+        return len(self.quotes)
+
+    def ticks(self, start=0, stop=None):
+        """TickRecords (mesmo formato do feed ao vivo) de start até stop"""
+        symbol, pip_size = self.symbol, self.pip_size
+        # tolist() converte o trecho de uma vez (array, memoryview ou numpy)
+        epochs = self.epochs[start:stop].tolist()
+        quotes = self.quotes[start:stop].tolist()
+        for epoch, quote in zip(epochs, quotes):
+            yield TickRecord(epoch, quote, symbol, pip_size)
+
+    def slice(self, start=0, stop=None):
+        """Sub-série [start:stop] (sem cópia quando os arrays são memoryview)"""
+        return TickSeries(self.symbol, self.epochs[start:stop], self.quotes[start:stop], self.pip_size)
+
+
+def _symbol_from_filename(path):
+    """R_100_20250301.csv / 1HZ100V_20250301_120000.csv → R_100 / 1HZ100V"""
+    nome = os.path.splitext(os.path.basename(path))[0]
+    partes = nome.split("_")
+    while partes and partes[-1].isdigit() and len(partes[-1]) >= 6:
+        partes.pop()
+    return "_".join(partes) or None
+
+
+def load_ticks_csv(path, symbol=None):
+    """
+    Carrega um CSV do DataCollector ou do HistoricalDataFetcher
+
+    Args:
+        path (str): Arquivo CSV
+        symbol (str): Símbolo (padrão: coluna symbol ou nome do arquivo)
+
+    Returns:
+        TickSeries: ticks em ordem cronológica (epochs repetidos/fora de ordem descartados)
+    """
+    epochs, quotes = array("q"), array("d")
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        campos = reader.fieldnames or []
+        col_epoch = "epoch" if "epoch" in campos else "timestamp"
+        col_quote = "quote" if "quote" in campos else "price"
+        if col_epoch not in campos or col_quote not in campos:
+            raise ValueError(f"{path}: colunas epoch/quote (ou timestamp/price) não encontradas em {campos}")
+        ultimo = None
+        for row in reader:
+            try:
+                epoch = int(float(row[col_epoch]))
+                quote = float(row[col_quote])
+            except (TypeError, ValueError):
+                continue
+            if ultimo is not None and epoch <= ultimo:
+                continue
+            if symbol is None and row.get("symbol"):
+                symbol = row["symbol"]
+            epochs.append(epoch)
+            quotes.append(quote)
+            ultimo = epoch
+    return TickSeries(symbol or _symbol_from_filename(path), epochs, quotes)
+
+
+# ─── CONTA SIMULADA ─────────────────────────────────────────────────────────
+class SimulatedDerivAPI:
+    """
+    Mesma interface usada pelo AlphaDolar no DerivAPI, sem rede: ticks
+    entram por push_tick() e os contratos são liquidados com eles
+    """
+
+    def __init__(self, balance=SALDO_INICIAL, currency="USD", payouts=None):
+        self.balance       = float(balance)
+        self.currency      = currency
+        self.is_connected  = True
+        self.is_authorized = True
+        self.settlement    = SettlementEngine(payouts)
+
+        self.on_tick_callback     = None
+        self.on_contract_callback = None
+        self.on_balance_callback  = None
+
+        self.tick_index   = -1
+        self.last_tick    = None
+        self.history      = []      # ticks para get_ticks_history (warm-start)
+        self.abertos      = 0       # contratos aguardando liquidação
+        self.trades       = []      # (epoch, contract_type, barrier, stake, profit, saldo)
+
+    # ─── INTERFACE DO DerivAPI ──────────────────────────────────────────────
+    def connect(self):
+        return True
+
+    def authorize(self):
+        return True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def set_tick_callback(self, callback):
+        self.on_tick_callback = callback
+
+    def set_contract_callback(self, callback):
+        self.on_contract_callback = callback
+
+    def set_balance_callback(self, callback):
+        self.on_balance_callback = callback
+
+    def subscribe_ticks(self, symbol, since_epoch=None):
+        pass
+
+    def resubscribe_ticks(self, symbol):
+        pass
+
+    def get_ticks_history(self, symbol, count, timeout=15):
+        return list(self.history[-int(count):]) if count else []
+
+    def prime_proposals(self, shapes):
+        pass
+
+    def forget_proposals(self):
+        pass
+
+    def get_subscription_info(self):
+        return {"total": 0}
+
+    def get_latency_stats(self):
+        return {}
+
+    def open_contract(self, contract_type, symbol, amount, duration, duration_unit="t",
+                      barrier=None, signal_time=None):
+        """Compra imediata: debita o stake e agenda a liquidação a partir do próximo tick"""
+        tick = self.last_tick
+        contrato = self.settlement.open(contract_type, amount, symbol, duration, duration_unit, barrier,
+                                        callback=self._liquidado,
+                                        after_epoch=tick.get("epoch") if tick is not None else None)
+        self.balance -= contrato.stake
+        self.abertos += 1
+
+    # ─── STREAM DE TICKS ────────────────────────────────────────────────────
+    def push_tick(self, tick):
+        """Entrega o tick ao bot e liquida os contratos que vencem nele"""
+        self.tick_index += 1
+        self.last_tick = tick
+        if self.on_tick_callback:
+            self.on_tick_callback(tick)
+        if self.abertos:
+            self.settlement.on_tick(tick)
+
+    def _liquidado(self, resultado):
+        self.abertos -= 1
+        self.balance += resultado["sell_price"]
+        self.trades.append((resultado["exit_epoch"], resultado["contract_type"],
+                            resultado["barrier"],
+                            resultado["buy_price"], resultado["profit"], round(self.balance, 2)))
+        if self.on_contract_callback:
+            self.on_contract_callback(resultado)
+
+
+# ─── BACKTEST ───────────────────────────────────────────────────────────────
+class _NullWriter(io.TextIOBase):
+    def write(self, s):
+        return len(s)
+
+
+def _silencio(*args, **kwargs):
+    pass
+
+
+@contextlib.contextmanager
+def config_override(**valores):
+    """Altera atributos do BotConfig durante o bloco (restaura no fim)"""
+    antigos = {k: getattr(BotConfig, k) for k in valores}
+    try:
+        for k, v in valores.items():
+            setattr(BotConfig, k, v)
+        yield
+    finally:
+        for k, v in antigos.items():
+            setattr(BotConfig, k, v)
+
+
+def strategy_with_params(cls, trading_mode, risk_mode, params):
+    """
+    Subclasse da estratégia com valores trocados no TRADING_MODE_CONFIG /
+    RISK_MODE_CONFIG do modo escolhido (a classe original não é alterada)
+
+    Args:
+        params (dict): chave → valor (ex.: {'min_confidence': 0.7, 'max_steps': 3})
+
+    Raises:
+        ValueError: chave que não existe em nenhum dos dois modos
+    """
+    atributos = {}
+    restantes = dict(params)
+    for nome, modo, padrao in (("TRADING_MODE_CONFIG", trading_mode, "faster"),
+                               ("RISK_MODE_CONFIG", risk_mode, "conservative")):
+        tabela = getattr(cls, nome, None)
+        if not tabela:
+            continue
+        # Mesmo fallback dos construtores: modo desconhecido usa o padrão
+        chave = modo if modo in tabela else padrao
+        valores = {k: v for k, v in restantes.items() if k in tabela[chave]}
+        if valores:
+            atributos[nome] = {**tabela, chave: {**tabela[chave], **valores}}
+            for k in valores:
+                del restantes[k]
+    if restantes:
+        raise ValueError(f"{cls.__name__}: parâmetros sem correspondência em "
+                         f"{trading_mode}/{risk_mode}: {sorted(restantes)}")
+    return type(cls.__name__, (cls,), atributos) if atributos else cls
+
+
+class Backtester:
+    """Roda uma estratégia sobre um TickSeries pelo AlphaDolar real"""
+
+    def __init__(self, strategy="alpha_bot_1", trading_mode="faster", risk_mode="conservative",
+                 balance=SALDO_INICIAL, payouts=None, config=None, quiet=True, params=None):
+        """
+        Args:
+            strategy: Id do registro de estratégias ou instância já criada
+            trading_mode / risk_mode: Repassados ao construtor da estratégia
+            balance (float): Saldo inicial da conta simulada
+            payouts (dict): contract_type → lucro por stake (padrão: default_payout)
+            config (dict): Atributos do BotConfig durante o backtest
+                (STAKE_INICIAL, LUCRO_ALVO, LIMITE_PERDA, MAX_TRADES_PER_DAY, ...;
+                sem MAX_TRADES_PER_DAY, não há limite diário de trades)
+            quiet (bool): Suprime os logs do bot e das estratégias
+            params (dict): Valores trocados no TRADING_MODE_CONFIG/RISK_MODE_CONFIG
+                do modo (ver strategy_with_params; só estratégias rise/fall por id)
+        """
+        self.strategy     = strategy
+        self.trading_mode = trading_mode
+        self.risk_mode    = risk_mode
+        self.balance      = balance
+        self.payouts      = payouts
+        self.config       = {"MAX_TRADES_PER_DAY": SEM_LIMITE_TRADES, **(config or {})}
+        self.quiet        = quiet
+        self.params       = dict(params or {})
+
+    def _criar_estrategia(self):
+        if not isinstance(self.strategy, str):
+            return self.strategy
+        if self.params and not strategy_registry.is_digit(self.strategy):
+            cls = strategy_with_params(strategy_registry.load(self.strategy),
+                                       self.trading_mode, self.risk_mode, self.params)
+            return cls(self.trading_mode, self.risk_mode)
+        return strategy_registry.create(self.strategy, self.trading_mode, self.risk_mode, default=None)
+
+    def run(self, series):
+        """
+        Executa o backtest
+
+        Args:
+            series (TickSeries): Ticks do símbolo
+
+        Returns:
+            dict: Estatísticas (trades, win rate, lucro líquido, drawdown, ...)
+        """
+        saida = _NullWriter() if self.quiet else None
+        with config_override(DEFAULT_SYMBOL=series.symbol, **self.config), \
+                (contextlib.redirect_stdout(saida) if saida else contextlib.nullcontext()):
+            inicio = time.perf_counter()
+            strategy = self._criar_estrategia()
+            # Isolada do cache de indicadores do processo: epochs históricos não
+            # disputam com o feed ao vivo e o tick não paga candles/regime compartilhados
+            strategy.use_shared_cache = False
+            api = SimulatedDerivAPI(self.balance, payouts=self.payouts)
+            bot = AlphaDolar(strategy=strategy, use_martingale=getattr(strategy, "usar_martingale", True), api=api)
+            if self.quiet:
+                bot.log = _silencio
+                bot.exibir_relatorio_final = _silencio
+            api.set_contract_callback(bot.on_contract_update)
+            api.set_tick_callback(bot.on_tick)
+
+            # Warm-start como no start(): os primeiros ticks só aquecem
+            aquecimento = min(bot._ticks_aquecimento(), len(series))
+            if aquecimento:
+                bot._aquecer(list(series.ticks(0, aquecimento)))
+            api.tick_index = aquecimento - 1
+
+            parado = bot._parado
+            processados = aquecimento
+            inicio_replay = time.perf_counter()
+            for tick in series.ticks(aquecimento):
+                api.push_tick(tick)
+                processados += 1
+                if parado.is_set():
+                    break
+            fim = time.perf_counter()
+            motivo = self._motivo_parada(bot)
+
+        return self._resultado(series, bot, api, processados, fim - inicio,
+                               processados - aquecimento, fim - inicio_replay, motivo)
+
+    @staticmethod
+    def _motivo_parada(bot):
+        """Por que o bot parou antes do fim dos ticks (None = consumiu tudo); lê o BotConfig do backtest"""
+        if not bot._parado.is_set():
+            return None
+        if bot.trades_hoje >= BotConfig.MAX_TRADES_PER_DAY:
+            return "limite_trades_dia"
+        if bot.stop_loss.get_estatisticas()["saldo_liquido"] >= BotConfig.LUCRO_ALVO:
+            return "lucro_alvo"
+        return "stop_loss"
+
+    def _resultado(self, series, bot, api, processados, segundos, replay, segundos_replay, motivo):
+        pico, drawdown, minimo = self.balance, 0.0, self.balance
+        for *_, saldo in api.trades:
+            if saldo > pico:
+                pico = saldo
+            elif pico - saldo > drawdown:
+                drawdown = pico - saldo
+            if saldo < minimo:
+                minimo = saldo
+        stats = bot.stop_loss.get_estatisticas()
+        total = stats["total_trades"]
+        return {
+            "strategy":          self.strategy if isinstance(self.strategy, str) else type(self.strategy).__name__,
+            "trading_mode":      self.trading_mode,
+            "risk_mode":         self.risk_mode,
+            "symbol":            series.symbol,
+            "ticks":             processados,
+            "trades":            total,
+            "vitorias":          stats["vitorias"],
+            "derrotas":          stats["derrotas"],
+            "win_rate":          round(stats["win_rate"], 2),
+            "lucro_liquido":     round(stats["saldo_liquido"], 2),
+            "max_drawdown":      round(drawdown, 2),
+            "max_perdas_seguidas": stats.get("max_perdas_consecutivas", 0),
+            "saldo_final":       round(api.balance, 2),
+            "saldo_minimo":      round(minimo, 2),
+            "parou":             bot._parado.is_set(),
+            "motivo_parada":     motivo,
+            "limite_trades_dia": None if self.config["MAX_TRADES_PER_DAY"] == SEM_LIMITE_TRADES
+                                 else self.config["MAX_TRADES_PER_DAY"],
+            "segundos":          round(segundos, 3),
+            # Só o replay: criação da estratégia e aquecimento ficam fora
+            "ticks_por_segundo": int(replay / segundos_replay) if segundos_replay > 0 else 0,
+        }
+
+
+def run_backtest(path_or_series, strategy="alpha_bot_1", **kwargs):
+    """Atalho: carrega o CSV (se for caminho) e roda o Backtester"""
+    series = load_ticks_csv(path_or_series) if isinstance(path_or_series, str) else path_or_series
+    return Backtester(strategy, **kwargs).run(series)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest de estratégia sobre CSV de ticks")
+    parser.add_argument("csv", help="CSV do DataCollector ou HistoricalDataFetcher")
+    parser.add_argument("--strategy", default="alpha_bot_1", choices=strategy_registry.ids())
+    parser.add_argument("--mode", default="faster", help="trading_mode (lowRisk, accurate, balanced, faster)")
+    parser.add_argument("--risk", default="conservative", help="risk_mode da estratégia")
+    parser.add_argument("--saldo", type=float, default=SALDO_INICIAL)
+    parser.add_argument("--stake", type=float, default=None, help="BotConfig.STAKE_INICIAL")
+    parser.add_argument("--lucro-alvo", type=float, default=None, help="BotConfig.LUCRO_ALVO")
+    parser.add_argument("--limite-perda", type=float, default=None, help="BotConfig.LIMITE_PERDA")
+    parser.add_argument("--max-trades-dia", type=int, default=None,
+                        help="BotConfig.MAX_TRADES_PER_DAY (padrão: sem limite no backtest)")
+    parser.add_argument("--verbose", action="store_true", help="Mostra os logs do bot")
+    args = parser.parse_args()
+
+    config = {k: v for k, v in (("STAKE_INICIAL", args.stake), ("LUCRO_ALVO", args.lucro_alvo),
+                                 ("LIMITE_PERDA", args.limite_perda),
+                                 ("MAX_TRADES_PER_DAY", args.max_trades_dia)) if v is not None}
+    series = load_ticks_csv(args.csv)
+    print(f"📂 {len(series)} ticks de {series.symbol} carregados de {args.csv}")
+    resultado = Backtester(args.strategy, args.mode, args.risk, balance=args.saldo,
+                           config=config, quiet=not args.verbose).run(series)
+    print("\n📊 RESULTADO DO BACKTEST")
+    print("-" * 50)
+    for chave, valor in resultado.items():
+        print(f"  {chave:22s} {valor}")
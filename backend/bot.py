@@ -11,16 +11,21 @@ FIX 03/03: barrier passado corretamente para estratégias digit (DIGITOVER/DIGIT
 """
 import time
 import sys
+import threading
 from datetime import datetime
 
 try:
     from .config import BotConfig, validate_config
-    from .deriv_api import DerivAPI
+    from .deriv_api_async import criar_api
+    from .tick_hub import tick_hub
+    from .timer_service import timer_service
     from .risk_management.martingale import Martingale
     from .risk_management.stop_loss import StopLoss
 except ImportError:
     from config import BotConfig, validate_config
-    from deriv_api import DerivAPI
+    from deriv_api_async import criar_api
+    from tick_hub import tick_hub
+    from timer_service import timer_service
     from risk_management.martingale import Martingale
     from risk_management.stop_loss import StopLoss
 
@@ -28,12 +33,25 @@ except ImportError:
 class AlphaDolar:
     """Motor principal do bot Alpha Dolar 2.0"""
 
-    def __init__(self, strategy=None, use_martingale=True, bot_number=None, api_token=None):
+    # Watchdog (segundos)
+    WATCHDOG_CONTRATO = 45
+    TICK_TIMEOUT      = 30
+    TRADE_TIMEOUT     = 60
+
+    def __init__(self, strategy=None, use_martingale=True, bot_number=None, api_token=None, ensemble=None, api=None,
+                 tick_feed=None):
         self.bot_name = "ALPHA DOLAR 2.0"
         self.version = "2.0.0"
         self._api_token = api_token or BotConfig.API_TOKEN
-        self.api = DerivAPI(api_token=self._api_token)
-
+        # api: conexão já criada (ex.: SimulatedDerivAPI do backtest); padrão: DerivAPI real
+        self.api = api if api is not None else criar_api(api_token=self._api_token)
+        # tick_feed: feed com subscribe/unsubscribe/ensure no lugar do tick_hub (ex.: PaperDerivAPI)
+        self.tick_feed = tick_feed
+
+        # Multi-estratégia: todas as estratégias avaliadas a cada tick, só a ativa opera
+        self.ensemble = ensemble
+        if strategy is None and ensemble is not None:
+            strategy = ensemble.active
         if strategy is None:
             raise ValueError("Estratégia não pode ser None!")
         self.strategy = strategy
@@ -56,6 +74,8 @@ class AlphaDolar:
 
         self.tick_history = []
         self.max_tick_history = 200
+        self._tick_symbol = None
+        self._usando_hub  = False
 
         self.trades_hoje = 0
         self.inicio_sessao = datetime.now()
@@ -66,6 +86,9 @@ class AlphaDolar:
         self._aguardando_sinal    = False
         self._sem_sinal_streak    = 0
         self._ultimo_stake_usado  = BotConfig.STAKE_INICIAL
+        self._watchdog_timer      = None
+        self._parado              = threading.Event()
+        self._watchdog_lock       = threading.Lock()
 
     def print_header(self):
         print("\n" + "="*70)
@@ -95,6 +118,11 @@ class AlphaDolar:
     def on_tick(self, tick_data):
         self._ultimo_tick_time = time.time()
 
+        if tick_data.get('_replay'):
+            # Backfill de reconexão: só aquece os históricos, nunca opera
+            self._aquecer([tick_data])
+            return
+
         if self.waiting_contract:
             return
 
@@ -117,6 +145,7 @@ class AlphaDolar:
         signal_data = self.analyze_strategy(tick_data)
 
         if signal_data and signal_data.get('signal'):
+            signal_data['t_sinal'] = time.perf_counter()
             direction = signal_data['signal']
             confidence = signal_data.get('confidence', 0)
             self._sem_sinal_streak = 0
@@ -127,8 +156,56 @@ class AlphaDolar:
         else:
             self._sem_sinal_streak += 1
 
+    def _aquecer(self, ticks):
+        """Alimenta tick_history e o histórico da estratégia sem avaliar sinais"""
+        for tick in ticks:
+            if 'quote' in tick:
+                self.tick_history.append(float(tick['quote']))
+        if len(self.tick_history) > self.max_tick_history:
+            del self.tick_history[:-self.max_tick_history]
+        alvo = self.ensemble if self.ensemble is not None else self.strategy
+        if hasattr(alvo, 'preload'):
+            alvo.preload(ticks)
+
+    def _ticks_aquecimento(self):
+        """Ticks necessários antes do primeiro sinal da estratégia atual"""
+        if self.ensemble is not None:
+            n = self.ensemble.warmup_ticks()
+        elif hasattr(self.strategy, 'warmup_ticks'):
+            n = self.strategy.warmup_ticks()
+        else:
+            n = max(getattr(self.strategy, 'min_ticks', 0), getattr(self.strategy, 'MIN_TICKS', 0),
+                    getattr(self.strategy, 'min_history', 0))
+        if hasattr(self.strategy, 'analyze'):
+            n = max(n, 30)
+        return min(n, self.max_tick_history)
+
+    def _warm_start(self, symbol):
+        """Pré-carrega os históricos com os últimos N ticks (um único ticks_history)"""
+        n = self._ticks_aquecimento()
+        if n <= 0:
+            return
+        ticks = self.api.get_ticks_history(symbol, n)
+        if ticks:
+            self._aquecer(ticks)
+            self.log(f"🔥 Warm-start: {len(ticks)} ticks de {symbol} pré-carregados", "INFO")
+
+    def trocar_estrategia(self, nova_strategy):
+        """Troca a estratégia (multi-estratégia) já aquecida com os ticks recentes do bot"""
+        n = getattr(nova_strategy, 'warmup_ticks', lambda: 0)()
+        if self.ensemble is not None and nova_strategy in self.ensemble:
+            n = 0  # já recebe todos os ticks pelo ensemble
+        symbol = self._tick_symbol or BotConfig.DEFAULT_SYMBOL
+        if n and hasattr(nova_strategy, 'preload'):
+            nova_strategy.preload([{'symbol': symbol, 'quote': q} for q in self.tick_history[-n:]])
+        self.strategy = nova_strategy
+        self._preparar_propostas()
+
     def analyze_strategy(self, tick_data):
         if hasattr(self.strategy, 'analyze'):
+            if getattr(self.strategy, 'digit_decimals', 0) is None:
+                # analyze() só recebe cotações: pip_size vem do tick ao vivo
+                self.strategy.update_pip_size(tick_data)
             if len(self.tick_history) > 0 and len(self.tick_history) < 30:
                 ultimo = self.tick_history[-1]
                 while len(self.tick_history) < 30:
@@ -137,7 +214,10 @@ class AlphaDolar:
                 return None
             return self.strategy.analyze(self.tick_history)
         elif hasattr(self.strategy, 'should_enter'):
-            should_enter, direction, confidence = self.strategy.should_enter(tick_data)
+            if self.ensemble is not None and self.ensemble.active is self.strategy:
+                should_enter, direction, confidence = self.ensemble.evaluate(tick_data)
+            else:
+                should_enter, direction, confidence = self.strategy.should_enter(tick_data)
             if should_enter and direction:
                 # ✅ FIX 03/03: tenta pegar barrier para estratégias digit
                 params = None
@@ -177,15 +257,35 @@ class AlphaDolar:
         self.log(f"🛑 Bot encerrado automaticamente por proteção de capital", "STOP_LOSS")
         self.stop()
 
-    def executar_trade(self, direction, signal_data=None):
+    def _proximo_stake(self):
         if self.martingale and self.perda_acumulada > 0:
-            stake = self._calcular_stake_recuperacao()
-        elif hasattr(self.strategy, 'get_stake'):
-            stake = self.strategy.get_stake()
-        elif self.martingale:
-            stake = self.martingale.stake_atual
-        else:
-            stake = self.current_stake
+            return self._calcular_stake_recuperacao()
+        if hasattr(self.strategy, 'get_stake'):
+            return self.strategy.get_stake()
+        if self.martingale:
+            return self.martingale.stake_atual
+        return self.current_stake
+
+    def _preparar_propostas(self):
+        """
+        EXECUTION_MODE="stream": mantém assinadas as propostas do próximo
+        contrato provável. Estratégias de dígito sempre operam DIGITOVER/
+        DIGITUNDER na barreira atual; o stake é o que executar_trade usaria.
+        """
+        if BotConfig.EXECUTION_MODE != "stream" or not self.is_running:
+            return
+        barrier = getattr(self.strategy, '_last_barrier', None)
+        if barrier is None or not hasattr(self.strategy, 'digit_history'):
+            return
+        stake = self._proximo_stake()
+        self.api.prime_proposals([
+            {'contract_type': contract_type, 'symbol': BotConfig.DEFAULT_SYMBOL,
+             'amount': stake, 'duration': 1, 'duration_unit': 't', 'barrier': barrier}
+            for contract_type in ('DIGITOVER', 'DIGITUNDER')
+        ])
+
+    def executar_trade(self, direction, signal_data=None):
+        stake = self._proximo_stake()
 
         if self.api.balance < stake:
             self.log(f"Saldo insuficiente! Necessário: ${stake:.2f} | Disponível: ${self.api.balance:.2f}", "ERROR")
@@ -222,10 +322,11 @@ class AlphaDolar:
             proposal_params['barrier'] = barrier
 
         self._ultimo_stake_usado = stake
-        self.api.get_proposal(**proposal_params)
+        self.api.open_contract(**proposal_params, signal_time=(signal_data or {}).get('t_sinal'))
         self.waiting_contract = True
         self.trades_hoje += 1
         self._ultimo_trade_time = time.time()
+        self._agendar_watchdog()
 
         if self.martingale:
             self.martingale.registrar_trade(stake)
@@ -240,6 +341,8 @@ class AlphaDolar:
             self.current_contract_id = None
             self._ultimo_trade_time = time.time()
             self._ultimo_sinal_time = time.time()
+            self._agendar_watchdog()
+            self._preparar_propostas()
             return
 
         if status not in ["won", "lost"]:
@@ -263,6 +366,7 @@ class AlphaDolar:
         self._ultimo_trade_time = time.time()
         self._ultimo_sinal_time = time.time()
         self._sem_sinal_streak  = 0
+        self._agendar_watchdog()
 
         if vitoria:
             self.log(f"🎉 VITÓRIA! Lucro: ${profit:.2f} | ID: {contract_id}", "WIN")
@@ -308,11 +412,58 @@ class AlphaDolar:
         deve_parar, motivo = self.stop_loss.deve_parar()
         if deve_parar and "saldo" in motivo.lower():
             self._disparar_stop_loss(motivo)
+            return
+
+        # Stake/barreira do próximo contrato já conhecidos: re-chaveia os streams
+        self._preparar_propostas()
 
     def on_balance_update(self, balance):
         self.log(f"💰 Saldo atualizado: ${balance:.2f}", "INFO")
 
-    def start(self):
+    def _feed(self):
+        """tick_feed explícito, ou tick_hub com USE_TICK_HUB (None = conexão própria)"""
+        if self.tick_feed is not None:
+            return self.tick_feed
+        return tick_hub if BotConfig.USE_TICK_HUB else None
+
+    def _assinar_ticks(self):
+        """
+        Assina ticks do símbolo. Com USE_TICK_HUB o stream vem do feed público
+        compartilhado; a conexão autorizada fica só com proposal/buy/balance.
+        """
+        self._tick_symbol = BotConfig.DEFAULT_SYMBOL
+        feed = self._feed()
+        if feed is not None:
+            if self._usando_hub:
+                feed.ensure(self._tick_symbol)
+                return
+            if feed.subscribe(self._tick_symbol, self.on_tick):
+                self._usando_hub = True
+                return
+            self.log("Feed compartilhado indisponível — usando conexão própria", "WARNING")
+        self.api.set_tick_callback(self.on_tick)
+        self.api.subscribe_ticks(self._tick_symbol)
+
+    def _reassinar_ticks(self):
+        """Versão não bloqueante de _assinar_ticks para o watchdog (thread do timer)"""
+        if self._usando_hub:
+            self._feed().ensure(self._tick_symbol)
+        else:
+            self.api.resubscribe_ticks(self._tick_symbol or BotConfig.DEFAULT_SYMBOL)
+
+    def _cancelar_ticks(self):
+        if self._usando_hub:
+            self._feed().unsubscribe(self._tick_symbol, self.on_tick)
+            self._usando_hub = False
+
+    def start(self, block=True):
+        """
+        Conecta, aquece e assina os ticks
+
+        Args:
+            block (bool): Espera o stop() nesta thread; False retorna logo após
+                iniciar (o bot segue nos callbacks do feed e do timer_service)
+        """
         try:
             if not validate_config():
                 return False
@@ -335,98 +486,26 @@ class AlphaDolar:
                 self.log("Saldo zerado! Impossível operar.", "ERROR")
                 return False
 
-            self.api.set_tick_callback(self.on_tick)
             self.api.set_contract_callback(self.on_contract_update)
             self.api.set_balance_callback(self.on_balance_update)
 
-            self.api.subscribe_ticks(BotConfig.DEFAULT_SYMBOL)
+            self._warm_start(BotConfig.DEFAULT_SYMBOL)
+            self._assinar_ticks()
 
             self.is_running = True
+            self._parado.clear()
             self.api._bot_ref = self
+            self._preparar_propostas()
             self.log("🚀 Bot iniciado! Aguardando sinais...", "SUCCESS")
 
             self._ultimo_trade_time = time.time()
             self._ultimo_tick_time  = time.time()
             self._ultimo_sinal_time = time.time()
 
-            WATCHDOG_CONTRATO = 45
-            TICK_TIMEOUT      = 30
-            TRADE_TIMEOUT     = 60
-
-            while self.is_running:
-                time.sleep(1)
-                agora = time.time()
-
-                if self.waiting_contract:
-                    tempo_preso = agora - self._ultimo_trade_time
-                    if tempo_preso > WATCHDOG_CONTRATO:
-                        self.log(f"⏰ WATCHDOG contrato: preso {tempo_preso:.0f}s — liberando!", "WARNING")
-                        self.waiting_contract    = False
-                        self.current_contract_id = None
-                        self._ultimo_trade_time  = agora
-                        self._ultimo_sinal_time  = agora
-                    continue
-
-                sem_tick = agora - self._ultimo_tick_time
-                if sem_tick > TICK_TIMEOUT:
-                    self.log(f"⚠️ WATCHDOG: sem tick {sem_tick:.0f}s — reconectando WebSocket!", "WARNING")
-                    try:
-                        self.api.subscribe_ticks(BotConfig.DEFAULT_SYMBOL)
-                        self._ultimo_tick_time  = agora
-                        self._ultimo_sinal_time = agora
-                    except Exception as e_tick:
-                        self.log(f"Erro ao re-subscrever: {e_tick}", "ERROR")
-                    continue
-
-                sem_trade = agora - self._ultimo_sinal_time
-                if sem_trade > TRADE_TIMEOUT:
-                    self.log(f"⚠️ WATCHDOG: {sem_trade:.0f}s sem operar — forçando trade!", "WARNING")
-
-                    if hasattr(self.strategy, 'reset_state'):
-                        self.strategy.reset_state()
-
-                    if 0 < len(self.tick_history) < 30:
-                        ultimo = self.tick_history[-1]
-                        while len(self.tick_history) < 30:
-                            self.tick_history.append(ultimo)
-                    elif len(self.tick_history) == 0:
-                        self.api.subscribe_ticks(BotConfig.DEFAULT_SYMBOL)
-                        self._ultimo_sinal_time = agora
-                        self._sem_sinal_streak  = 0
-                        continue
-
-                    try:
-                        direction = "CALL"
-                        signal_data_forcado = None
-                        # Reset martingale antes de forçar trade
-                        self.stop_loss._perda_acumulada = 0.0
-                        self.martingale.reset()
-
-                        # ✅ FIX 03/03: tenta obter sinal completo com barrier
-                        if hasattr(self.strategy, 'analyze'):
-                            resultado = self.strategy.analyze(self.tick_history)
-                            if resultado and resultado.get('signal'):
-                                direction = resultado['signal']
-                                signal_data_forcado = resultado
-
-                        # Se não veio signal_data mas estratégia é digit, monta manualmente
-                        if signal_data_forcado is None and hasattr(self.strategy, 'get_contract_params'):
-                            params = self.strategy.get_contract_params(direction)
-                            if params.get('barrier') is not None:
-                                signal_data_forcado = {
-                                    'signal': direction,
-                                    'contract_type': params.get('contract_type', direction),
-                                    'confidence': 0,
-                                    'parameters': params
-                                }
-
-                        self.log(f"🔧 Forçando trade {direction} para desbloquear bot", "WARNING")
-                        self.executar_trade(direction, signal_data_forcado)
-                    except Exception as e_force:
-                        self.log(f"Erro ao forçar trade: {e_force}", "ERROR")
-
-                    self._ultimo_sinal_time = agora
-                    self._sem_sinal_streak  = 0
+            # Watchdog no timer_service compartilhado; esta thread só espera o stop()
+            self._agendar_watchdog()
+            if block:
+                self._parado.wait()
 
             return True
 
@@ -440,10 +519,118 @@ class AlphaDolar:
             traceback.print_exc()
             return False
 
+    def _agendar_watchdog(self):
+        """
+        (Re)agenda o watchdog para o próximo deadline: contrato preso,
+        silêncio de ticks ou TRADE_TIMEOUT — o que vencer primeiro.
+        """
+        with self._watchdog_lock:
+            if self._watchdog_timer:
+                self._watchdog_timer.cancel()
+                self._watchdog_timer = None
+            if not self.is_running:
+                return
+            if self.waiting_contract:
+                deadline = self._ultimo_trade_time + self.WATCHDOG_CONTRATO
+            else:
+                deadline = min(self._ultimo_tick_time + self.TICK_TIMEOUT,
+                               self._ultimo_sinal_time + self.TRADE_TIMEOUT)
+            # +0.1s: o teste no disparo é estrito (>), como no loop de 1s original
+            espera = max(deadline - time.time(), 0) + 0.1
+            self._watchdog_timer = timer_service.call_later(espera, self._watchdog)
+
+    def _watchdog(self):
+        try:
+            self._verificar_watchdog()
+        finally:
+            self._agendar_watchdog()
+
+    def _verificar_watchdog(self):
+        if not self.is_running:
+            return
+        agora = time.time()
+
+        if self.waiting_contract:
+            tempo_preso = agora - self._ultimo_trade_time
+            if tempo_preso > self.WATCHDOG_CONTRATO:
+                self.log(f"⏰ WATCHDOG contrato: preso {tempo_preso:.0f}s — liberando!", "WARNING")
+                self.waiting_contract    = False
+                self.current_contract_id = None
+                self._ultimo_trade_time  = agora
+                self._ultimo_sinal_time  = agora
+            return
+
+        sem_tick = agora - self._ultimo_tick_time
+        if sem_tick > self.TICK_TIMEOUT:
+            self.log(f"⚠️ WATCHDOG: sem tick {sem_tick:.0f}s — reconectando WebSocket!", "WARNING")
+            try:
+                self._reassinar_ticks()
+                self._ultimo_tick_time  = agora
+                self._ultimo_sinal_time = agora
+            except Exception as e_tick:
+                self.log(f"Erro ao re-subscrever: {e_tick}", "ERROR")
+            return
+
+        sem_trade = agora - self._ultimo_sinal_time
+        if sem_trade > self.TRADE_TIMEOUT:
+            self.log(f"⚠️ WATCHDOG: {sem_trade:.0f}s sem operar — forçando trade!", "WARNING")
+
+            if hasattr(self.strategy, 'reset_state'):
+                self.strategy.reset_state()
+
+            if 0 < len(self.tick_history) < 30:
+                ultimo = self.tick_history[-1]
+                while len(self.tick_history) < 30:
+                    self.tick_history.append(ultimo)
+            elif len(self.tick_history) == 0:
+                self._reassinar_ticks()
+                self._ultimo_sinal_time = agora
+                self._sem_sinal_streak  = 0
+                return
+
+            try:
+                direction = "CALL"
+                signal_data_forcado = None
+                # Reset martingale antes de forçar trade
+                self.stop_loss._perda_acumulada = 0.0
+                self.martingale.reset()
+
+                # ✅ FIX 03/03: tenta obter sinal completo com barrier
+                if hasattr(self.strategy, 'analyze'):
+                    resultado = self.strategy.analyze(self.tick_history)
+                    if resultado and resultado.get('signal'):
+                        direction = resultado['signal']
+                        signal_data_forcado = resultado
+
+                # Se não veio signal_data mas estratégia é digit, monta manualmente
+                if signal_data_forcado is None and hasattr(self.strategy, 'get_contract_params'):
+                    params = self.strategy.get_contract_params(direction)
+                    if params.get('barrier') is not None:
+                        signal_data_forcado = {
+                            'signal': direction,
+                            'contract_type': params.get('contract_type', direction),
+                            'confidence': 0,
+                            'parameters': params
+                        }
+
+                self.log(f"🔧 Forçando trade {direction} para desbloquear bot", "WARNING")
+                self.executar_trade(direction, signal_data_forcado)
+            except Exception as e_force:
+                self.log(f"Erro ao forçar trade: {e_force}", "ERROR")
+
+            self._ultimo_sinal_time = agora
+            self._sem_sinal_streak  = 0
+
     def stop(self):
         self.is_running = False
+        self._parado.set()
+        if self._watchdog_timer:
+            self._watchdog_timer.cancel()
+        self._cancelar_ticks()
         self.exibir_relatorio_final()
         if self.api:
+            if self.api.is_connected:
+                self.api.forget_proposals()
             self.api.disconnect()
         self.log("Bot encerrado", "INFO")
 
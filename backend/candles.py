@@ -0,0 +1,208 @@
+"""
+Candles — agregador OHLC incremental alimentado pelo stream de ticks
+Alpha Dolar 2.0
+
+Cada tick atualiza em O(1) o candle parcial de cada timeframe; quando o
+epoch entra no próximo intervalo, o parcial é fechado e guardado no
+histórico do timeframe. Ninguém precisa reconstruir candles a partir da
+lista de ticks (estratégias, /api/ctx-ia, /api/candles e o frontend leem
+daqui).
+
+    agg = CandleAggregator("R_100")            # 5 s, 15 s, 1 m, 5 m
+    fechados = agg.update(quote, epoch)        # candles fechados neste tick
+    agg.candles(60, 20)                        # últimos 20 candles de 1 m
+    agg.partial(60)                            # candle de 1 m em formação
+
+Os intervalos seguem o relógio (epoch // timeframe), como os candles da
+Deriv. Intervalos sem nenhum tick não geram candle. Ticks com epoch
+anterior ao candle parcial (fora de ordem) são ignorados.
+"""
+from collections import deque
+
+# Timeframes padrão em segundos (5 s, 15 s, 1 m, 5 m)
+TIMEFRAMES = (5, 15, 60, 300)
+# Candles fechados mantidos por timeframe
+CANDLE_HISTORY = 200
+
+
+class Candle:
+    """Candle OHLC de um intervalo (epoch = início do intervalo)"""
+
+    __slots__ = ("epoch", "open", "high", "low", "close", "ticks")
+
+    def __init__(self, epoch, quote):
+        self.epoch = epoch
+        self.open  = quote
+        self.high  = quote
+        self.low   = quote
+        self.close = quote
+        self.ticks = 1
+
+    def update(self, quote):
+        if quote > self.high:
+            self.high = quote
+        elif quote < self.low:
+            self.low = quote
+        self.close = quote
+        self.ticks += 1
+
+    @property
+    def direction(self):
+        """'UP', 'DOWN' ou 'FLAT' (fechamento contra abertura)"""
+        if self.close > self.open:
+            return "UP"
+        if self.close < self.open:
+            return "DOWN"
+        return "FLAT"
+
+    @property
+    def body(self):
+        return abs(self.close - self.open)
+
+    def to_dict(self):
+        return {
+            "epoch": self.epoch,
+            "open":  self.open,
+            "high":  self.high,
+            "low":   self.low,
+            "close": self.close,
+            "ticks": self.ticks,
+        }
+
+    def __repr__(self):
+        return f"Candle({self.epoch}, O={self.open} H={self.high} L={self.low} C={self.close}, {self.ticks} ticks)"
+
+
+class CandleSeries:
+    """Candles de um timeframe: histórico de fechados + parcial em formação"""
+
+    def __init__(self, timeframe, maxlen=CANDLE_HISTORY, history=None):
+        """
+        Args:
+            timeframe (int): Duração do candle em segundos
+            maxlen (int): Candles fechados mantidos
+            history (deque): Deque onde guardar os fechados (ex.: candles_history
+                da estratégia); padrão: um deque novo com maxlen
+        """
+        self.timeframe = int(timeframe)
+        self.closed    = history if history is not None else deque(maxlen=maxlen)
+        self.partial   = None
+
+    def update(self, quote, epoch):
+        """
+        Aplica o tick
+
+        Returns:
+            Candle: o candle fechado por este tick, ou None
+        """
+        start = int(epoch) - int(epoch) % self.timeframe
+        partial = self.partial
+        if partial is not None:
+            if start == partial.epoch:
+                partial.update(quote)
+                return None
+            if start < partial.epoch:
+                return None
+            self.closed.append(partial)
+        self.partial = Candle(start, quote)
+        return partial
+
+    def last(self, n=None, include_partial=False):
+        """
+        Últimos n candles fechados (mais antigo primeiro)
+
+        Args:
+            n (int): Quantidade (None = todos)
+            include_partial (bool): Acrescenta o parcial no fim
+        """
+        candles = list(self.closed)
+        if n is not None:
+            candles = candles[-n:] if n > 0 else []
+        if include_partial and self.partial is not None:
+            candles.append(self.partial)
+        return candles
+
+    def clear(self):
+        self.closed.clear()
+        self.partial = None
+
+    def __len__(self):
+        return len(self.closed)
+
+
+class CandleAggregator:
+    """Candles de vários timeframes de um símbolo, atualizados juntos por tick"""
+
+    def __init__(self, symbol=None, timeframes=TIMEFRAMES, maxlen=CANDLE_HISTORY):
+        self.symbol = symbol
+        self.series = {int(tf): CandleSeries(tf, maxlen) for tf in timeframes}
+        self.epoch  = None
+
+    @property
+    def timeframes(self):
+        return tuple(self.series)
+
+    def update(self, quote, epoch):
+        """
+        Aplica o tick em todos os timeframes
+
+        Returns:
+            list: (timeframe, Candle) fechados por este tick (geralmente vazia)
+        """
+        fechados = []
+        for tf, series in self.series.items():
+            candle = series.update(quote, epoch)
+            if candle is not None:
+                fechados.append((tf, candle))
+        self.epoch = epoch
+        return fechados
+
+    def candles(self, timeframe, n=None, include_partial=False):
+        """Últimos n candles do timeframe (KeyError se não agregado)"""
+        return self.series[int(timeframe)].last(n, include_partial)
+
+    def partial(self, timeframe):
+        return self.series[int(timeframe)].partial
+
+    def clear(self):
+        for series in self.series.values():
+            series.clear()
+        self.epoch = None
+
+    def snapshot(self, timeframe, n=50, include_partial=True):
+        """Candles serializados para a API/frontend"""
+        series = self.series[int(timeframe)]
+        return {
+            "symbol":    self.symbol,
+            "timeframe": series.timeframe,
+            "candles":   [c.to_dict() for c in series.last(n)],
+            "partial":   series.partial.to_dict() if include_partial and series.partial is not None else None,
+        }
+
+    def get_info(self):
+        return {
+            "epoch": self.epoch,
+            "candles": {tf: len(series) for tf, series in self.series.items()},
+        }
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    agg = CandleAggregator("R_100")
+    epoch, preco = 1_700_000_000, 1000.0
+    fechados = 0
+    for _ in range(3600):
+        epoch += 1
+        preco += random.gauss(0, 0.5)
+        fechados += len(agg.update(round(preco, 2), epoch))
+    print(f"✅ 3600 ticks → {fechados} candles fechados {agg.get_info()['candles']}")
+    for c in agg.candles(60, 3, include_partial=True):
+        print(f"   {c}")
+
+    inicio = time.perf_counter()
+    for _ in range(200_000):
+        epoch += 1
+        agg.update(preco, epoch)
+    print(f"⏱️ {(time.perf_counter() - inicio) / 200_000 * 1e6:.2f} µs/tick (4 timeframes)")
@@ -29,6 +29,15 @@ class BotConfig:
     # ===== MERCADO =====
     DEFAULT_SYMBOL = "R_100"  # Volatility 100 Index
 
+    # ===== CONEXÃO =====
+    USE_TICK_HUB = True       # Ticks via feed público compartilhado (1 socket por símbolo)
+    ASYNC_TRANSPORT = True    # Todas as conexões em um único event loop asyncio (False = 1 thread por conexão)
+    BACKFILL_MAX_TICKS = 1000 # Máximo de ticks perdidos reenviados após reconexão
+
+    # ===== PAPER TRADING =====
+    PAPER_FEED = "live"       # live = ticks reais do feed público | synthetic = gerador calibrado por índice
+    PAPER_BALANCE = 10000.0   # Saldo virtual inicial da conta paper
+
     # ===== ESTRATÉGIA =====
     DEFAULT_STRATEGY = "dc_bot_1"
 
@@ -50,6 +59,8 @@ class BotConfig:
     DURATION = 1              # 1 tick
     DURATION_UNIT = "t"       # t = ticks, m = minutes, h = hours
     BASIS = "stake"           # stake ou payout
+    EXECUTION_MODE = "direct" # direct = buy com parameters (1 round trip) | proposal = proposal → buy
+                              # stream = compra proposta pré-assinada (estratégias de dígito)
 
     # ===== LIMITES =====
     MAX_TRADES_PER_DAY = 1000
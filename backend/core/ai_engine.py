@@ -7,6 +7,11 @@ import random
 from datetime import datetime
 from typing import Dict, List, Optional
 
+try:
+    from ..digits import last_digit
+except ImportError:
+    from digits import last_digit
+
 
 class AIEngine:
     """Motor de IA para análise e tomada de decisões"""
@@ -73,7 +78,8 @@ class AIEngine:
             }
 
         # Extrai últimos dígitos
-        digits = [int(str(float(tick)).replace('.', '')[-1]) for tick in ticks[-50:]]
+        symbol = config.get('symbol')
+        digits = [last_digit(float(tick), symbol=symbol) for tick in ticks[-50:]]
 
         # Conta frequência
         even_count = sum(1 for d in digits if d % 2 == 0)
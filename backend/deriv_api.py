@@ -4,18 +4,27 @@ Alpha Dolar 2.0 - VERSÃO ULTRA ESTÁVEL COM AUTO-COMPRA + TIMEOUT DE CONTRATO
 """
 import json
 import time
+import itertools
 import websocket
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
+from concurrent.futures import Future
 import threading
 
 try:
     from .config import BotConfig
+    from .timer_service import timer_service
+    from .tick_record import TickRecord, json_loads
 except ImportError:
     from config import BotConfig
+    from timer_service import timer_service
+    from tick_record import TickRecord, json_loads
 
 class DerivAPI:
-    def __init__(self, api_token=None):
-        self.api_token  = api_token or BotConfig.API_TOKEN
+    def __init__(self, api_token=None, public=False):
+        # public=True: conexão só de ticks, sem token (usada pelo TickHub)
+        self.public     = public
+        self.api_token  = None if public else (api_token or BotConfig.API_TOKEN)
         self.app_id     = BotConfig.APP_ID
         self.ws         = None
         self.is_connected  = False
@@ -30,12 +39,35 @@ class DerivAPI:
 
         self.should_reconnect = True
         self.ws_thread        = None
-        self.keep_alive_thread = None
+        self._keep_alive_timer = None
         self.last_message_time = time.time()
+        self._opened = threading.Event()
+
+        # Requisições em voo: req_id → Future resolvido em _on_message
+        self._req_seq = itertools.count(1)
+        self._pending = {}
+
+        # Epoch do último tick ao vivo: na reconexão, os ticks perdidos desde ele são reenviados
+        self.last_tick_epoch = None
+
+        # Latência sinal→compra (perf_counter do sinal até a confirmação do buy)
+        self._signal_time        = None
+        self.last_buy_latency_ms = None
+        self.buy_latencies       = deque(maxlen=100)
+
+        # Assinaturas ativas: (tipo, chave) → id da subscription (None até a 1ª resposta)
+        self._subscriptions   = {}
+        self._sub_by_req      = {}             # req_id → (tipo, chave)
+        self._forgotten_reqs  = OrderedDict()  # req_id esquecido → forget já enviado?
+
+        # Propostas pré-assinadas (EXECUTION_MODE="stream"): shape → proposta atual
+        self._proposal_streams   = {}
+        self._desired_proposals  = []
 
         # ✅ Controle de timeout de contrato (evita bot travar)
         self.current_contract_id  = None
         self.contract_timeout_sec = 30
+        self._contract_timer      = None
 
     def log(self, message, level="INFO"):
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -44,37 +76,42 @@ class DerivAPI:
 
     # ─── TIMEOUT DE CONTRATO ────────────────────────────────────────────────
     def _start_contract_timeout(self, contract_id):
-        """Watchdog: se contrato não resolver em 30s, libera o bot"""
+        """Watchdog: se contrato não resolver em 30s, libera o bot (timer compartilhado)"""
         self.current_contract_id = contract_id
-
-        def _watchdog():
-            time.sleep(self.contract_timeout_sec)
-            if self.current_contract_id == contract_id:
-                self.log(f"⏰ Timeout contrato {contract_id}! Liberando bot...", "WARNING")
-                self.current_contract_id = None
-                if self.on_contract_callback:
-                    self.on_contract_callback({
-                        "status": "lost", "profit": 0,
-                        "contract_id": contract_id, "_timeout": True
-                    })
-
-        threading.Thread(target=_watchdog, daemon=True).start()
+        if self._contract_timer:
+            self._contract_timer.cancel()
+        self._contract_timer = timer_service.call_later(
+            self.contract_timeout_sec, self._on_contract_timeout, contract_id
+        )
+
+    def _on_contract_timeout(self, contract_id):
+        if self.current_contract_id == contract_id:
+            self.log(f"⏰ Timeout contrato {contract_id}! Liberando bot...", "WARNING")
+            self.current_contract_id = None
+            self.forget_subscription("contract", contract_id)
+            if self.on_contract_callback:
+                self.on_contract_callback({
+                    "status": "lost", "profit": 0,
+                    "contract_id": contract_id, "_timeout": True
+                })
 
     def _clear_contract(self):
         self.current_contract_id = None
+        timer, self._contract_timer = self._contract_timer, None
+        if timer:
+            timer.cancel()
 
     # ─── KEEP-ALIVE ─────────────────────────────────────────────────────────
-    def _keep_alive_loop(self):
-        while self.should_reconnect and self.ws:
-            try:
-                if self.is_connected:
-                    self._send({"ping": 1})
-                    if time.time() - self.last_message_time > 90:
-                        self.log("⚠️ Sem mensagens há 90s, reconectando...", "WARNING")
-                        self._reconnect()
-                time.sleep(30)
-            except:
-                pass
+    def _keep_alive_tick(self):
+        """Roda a cada 30s na thread do timer_service"""
+        if not (self.should_reconnect and self.ws):
+            return
+        if self.is_connected:
+            self._send({"ping": 1})
+            if time.time() - self.last_message_time > 90:
+                self.log("⚠️ Sem mensagens há 90s, reconectando...", "WARNING")
+                # Reconexão bloqueia alguns segundos — fora da thread do timer
+                threading.Thread(target=self._reconnect, daemon=True).start()
 
     # ─── CONEXÃO ────────────────────────────────────────────────────────────
     def _get_otp_ws_url(self):
@@ -117,58 +154,78 @@ class DerivAPI:
             self.log(f"Erro ao buscar OTP: {e}", "ERROR")
             return None
 
+    def _build_url(self):
+        # Verifica se é token OAuth novo
+        if self.api_token and self.api_token.startswith('ory_at_'):
+            otp_url = self._get_otp_ws_url()
+            if otp_url:
+                self._using_otp = True
+                return otp_url
+            self.log("OTP falhou, tentando WebSocket padrão", "WARN")
+            self._using_otp = False
+            return f"wss://ws.derivws.com/websockets/v3?app_id={self.app_id}"
+        self._using_otp = False
+        return f"wss://ws.binaryws.com/websockets/v3?app_id={self.app_id}"
+
     def connect(self):
         try:
-            # Verifica se é token OAuth novo
-            if self.api_token and self.api_token.startswith('ory_at_'):
-                otp_url = self._get_otp_ws_url()
-                if otp_url:
-                    url = otp_url
-                    self._using_otp = True
-                else:
-                    self.log("OTP falhou, tentando WebSocket padrão", "WARN")
-                    url = f"wss://ws.derivws.com/websockets/v3?app_id={self.app_id}"
-                    self._using_otp = False
-            else:
-                url = f"wss://ws.binaryws.com/websockets/v3?app_id={self.app_id}"
-                self._using_otp = False
+            url = self._build_url()
             self.log("Conectando à Deriv API...", "INFO")
-            self.ws = websocket.WebSocketApp(
-                url,
-                on_open=self._on_open,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close
-            )
-            self.ws_thread = threading.Thread(
-                target=lambda: self.ws.run_forever(
-                    ping_interval=30, ping_timeout=10, skip_utf8_validation=True
-                ), daemon=True
-            )
-            self.ws_thread.start()
-
-            start = time.time()
-            while not self.is_connected and (time.time() - start) < 10:
-                time.sleep(0.1)
-            if not self.is_connected:
-                raise Exception("Timeout na conexão")
-
-            self.keep_alive_thread = threading.Thread(target=self._keep_alive_loop, daemon=True)
-            self.keep_alive_thread.start()
+            self._open_transport(url)
             return True
         except Exception as e:
             self.log(f"Erro ao conectar: {e}", "ERROR")
             return False
 
+    # ─── TRANSPORTE (websocket-client, uma thread por conexão) ──────────────
+    def _open_transport(self, url):
+        self._opened.clear()
+        self.ws = websocket.WebSocketApp(
+            url,
+            on_open=self._on_open,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close
+        )
+        self.ws_thread = threading.Thread(
+            target=lambda: self.ws.run_forever(
+                ping_interval=30, ping_timeout=10, skip_utf8_validation=True
+            ), daemon=True
+        )
+        self.ws_thread.start()
+
+        if not self._opened.wait(timeout=10):
+            raise Exception("Timeout na conexão")
+
+        self._keep_alive_timer = timer_service.call_every(30, self._keep_alive_tick)
+
+    def _close_transport(self):
+        if self.ws:
+            try: self.ws.close()
+            except: pass
+            self.ws = None
+        timer, self._keep_alive_timer = self._keep_alive_timer, None
+        if timer:
+            timer.cancel()
+        # Aguarda a thread encerrar (exceto a própria — disconnect pode vir de um callback)
+        if self.ws_thread and self.ws_thread.is_alive() and self.ws_thread is not threading.current_thread():
+            self.ws_thread.join(timeout=3)
+        self.ws_thread = None
+
+    def _write(self, text):
+        self.ws.send(text)
+
     def _reconnect(self):
         try:
             self.log("🔄 Reconectando...", "INFO")
-            if self.ws:
-                try: self.ws.close()
-                except: pass
-
             self.is_connected  = False
             self.is_authorized = False
+            self._fail_pending("Reconectando")
+            # Assinaturas morrem com a conexão; ticks/propostas são refeitos após autorizar
+            self._subscriptions.clear()
+            self._sub_by_req.clear()
+            self._forgotten_reqs.clear()
+            self._proposal_streams.clear()
 
             # ✅ Libera contrato preso ao reconectar
             if self.current_contract_id:
@@ -181,19 +238,16 @@ class DerivAPI:
                         "contract_id": cid, "_reconnect": True
                     })
 
+            # Encerra conexão e thread antiga antes de reconectar
+            self._close_transport()
             time.sleep(2)
-            # Encerra threads antigas antes de reconectar
-            if self.ws_thread and self.ws_thread.is_alive():
-                self.ws_thread.join(timeout=3)
-                self.ws_thread = None
-            if self.keep_alive_thread and self.keep_alive_thread.is_alive():
-                self.keep_alive_thread.join(timeout=3)
-                self.keep_alive_thread = None
             if self.connect():
-                if self.authorize():
+                if self.public or self.authorize():
                     self.log("✅ Reconexão bem-sucedida!", "SUCCESS")
                     if hasattr(self, '_subscribed_symbol'):
-                        self.subscribe_ticks(self._subscribed_symbol)
+                        self.subscribe_ticks(self._subscribed_symbol, since_epoch=self.last_tick_epoch)
+                    if self._desired_proposals:
+                        self.prime_proposals(self._desired_proposals)
         except Exception as e:
             self.log(f"Erro na reconexão: {e}", "ERROR")
 
@@ -201,17 +255,9 @@ class DerivAPI:
         self.should_reconnect = False
         self.is_connected  = False
         self.is_authorized = False
-        if self.ws:
-            try: self.ws.close()
-            except: pass
-            self.ws = None
-        # Aguarda threads encerrarem
-        if self.ws_thread and self.ws_thread.is_alive():
-            self.ws_thread.join(timeout=3)
-            self.ws_thread = None
-        if self.keep_alive_thread and self.keep_alive_thread.is_alive():
-            self.keep_alive_thread.join(timeout=3)
-            self.keep_alive_thread = None
+        self._clear_contract()
+        self._close_transport()
+        self._fail_pending("Desconectado")
         self.log("Desconectado da Deriv API", "INFO")
 
     def authorize(self):
@@ -222,40 +268,160 @@ class DerivAPI:
             # Se usando OTP, já está autenticado — só pede balance
             if getattr(self, '_using_otp', False):
                 self.log("OTP WebSocket — pulando authorize, pedindo balance...", "INFO")
-                self._send({"balance": 1, "subscribe": 1})
-                start = time.time()
-                while self.balance == 0.0 and (time.time() - start) < 15:
-                    time.sleep(0.1)
+                # Espera a primeira resposta de balance (mesmo que o saldo seja 0)
+                future   = self.subscribe_balance()
+                resposta = future.result(timeout=15) if future else {}
+                if "error" in resposta:
+                    raise Exception(resposta["error"].get("message", "Erro no balance"))
                 self.is_authorized = True
                 self.log(f"✅ Conectado via OTP! Saldo: ${self.balance:.2f} {self.currency}", "SUCCESS")
                 return True
             self.log("Autorizando...", "INFO")
-            self._send({"authorize": self.api_token})
-            start = time.time()
-            while not self.is_authorized and (time.time() - start) < 15:
-                time.sleep(0.1)
+            resposta = self.request({"authorize": self.api_token}, timeout=15)
             if not self.is_authorized:
-                raise Exception("Timeout na autorização")
+                raise Exception(resposta.get("error", {}).get("message", "Autorização recusada"))
             self.log(f"✅ Autorizado! Saldo: ${self.balance:.2f} {self.currency}", "SUCCESS")
             return True
+        except TimeoutError:
+            self.log("Erro na autorização: Timeout na autorização", "ERROR")
+            return False
         except Exception as e:
             self.log(f"Erro na autorização: {e}", "ERROR")
             return False
 
-    def subscribe_ticks(self, symbol):
+    def subscribe_ticks(self, symbol, since_epoch=None):
+        """
+        Assina ticks do símbolo. Com since_epoch, usa ticks_history+subscribe:
+        os ticks perdidos desde esse epoch chegam primeiro (marcados com
+        "_replay": True) e o stream ao vivo continua sem buraco.
+        """
         self._subscribed_symbol = symbol
-        # Novo OAuth usa ticks_history diferente, mas ticks funciona igual
-        self._send({"ticks": symbol, "subscribe": 1})
-        self.log(f"Inscrito em ticks de {symbol}", "INFO")
+        if since_epoch:
+            data = {"ticks_history": symbol, "start": int(since_epoch) + 1, "end": "latest",
+                    "style": "ticks", "count": BotConfig.BACKFILL_MAX_TICKS}
+        else:
+            # Novo OAuth usa ticks_history diferente, mas ticks funciona igual
+            data = {"ticks": symbol}
+        if self._subscribe("ticks", symbol, data) is None:
+            self.log(f"Já inscrito em ticks de {symbol}", "INFO")
+            return
+        self.log(f"Inscrito em ticks de {symbol}" + (f" (backfill desde {since_epoch})" if since_epoch else ""), "INFO")
+
+    def resubscribe_ticks(self, symbol):
+        """Troca o stream de ticks (watchdog): forget do antigo + nova assinatura"""
+        self.forget_subscription("ticks", symbol)
+        self.subscribe_ticks(symbol)
+
+    def get_ticks_history(self, symbol, count, timeout=15):
+        """
+        Últimos `count` ticks do símbolo em uma única requisição (warm-start).
+        Retorna lista de ticks em ordem cronológica — vazia em caso de erro.
+        """
+        try:
+            resposta = self.request({"ticks_history": symbol, "count": int(count),
+                                     "end": "latest", "style": "ticks"}, timeout=timeout)
+        except Exception as e:
+            self.log(f"Erro ao buscar histórico de {symbol}: {e}", "ERROR")
+            return []
+        if "error" in resposta:
+            self.log(f"Erro ticks_history: {resposta['error']['message']}", "ERROR")
+            return []
+        history = resposta.get("history", {})
+        return [{"symbol": symbol, "quote": price, "epoch": epoch, "pip_size": resposta.get("pip_size")}
+                for epoch, price in zip(history.get("times", []), history.get("prices", []))]
 
     def subscribe_balance(self):
-        self._send({"balance": 1, "subscribe": 1})
-
-    def get_proposal(self, contract_type, symbol, amount, duration, duration_unit="t", barrier=None):
+        return self._subscribe("balance", None, {"balance": 1})
+
+    # ─── ASSINATURAS ────────────────────────────────────────────────────────
+    def _subscribe(self, kind, key, data):
+        """
+        Envia data com subscribe=1, registrado como (kind, key).
+
+        Returns:
+            Future da primeira resposta, ou None se (kind, key) já está
+            assinado — duplicatas são recusadas sem ir para o socket
+        """
+        sub_key = (kind, key)
+        if sub_key in self._subscriptions:
+            return None
+        data["subscribe"] = 1
+        req_id = data.setdefault("req_id", next(self._req_seq))
+        # Registra antes de enviar: a primeira resposta pode chegar antes do _send retornar
+        self._subscriptions[sub_key] = None
+        self._sub_by_req[req_id]     = sub_key
+        future = self._send(data)
+        if future.done() and future.exception():
+            self._subscriptions.pop(sub_key, None)
+            self._sub_by_req.pop(req_id, None)
+        return future
+
+    def forget_subscription(self, kind, key):
+        sub_key = (kind, key)
+        if sub_key not in self._subscriptions:
+            return
+        sub_id = self._subscriptions.pop(sub_key)
+        for req_id, registrada in list(self._sub_by_req.items()):
+            if registrada == sub_key:
+                del self._sub_by_req[req_id]
+                # Mensagens em voo desse stream serão descartadas em _track_subscription
+                self._forgotten_reqs[req_id] = bool(sub_id)
+                if len(self._forgotten_reqs) > 256:
+                    self._forgotten_reqs.popitem(last=False)
+        if sub_id and self.is_connected:
+            self._send({"forget": sub_id})
+
+    def _track_subscription(self, data):
+        """
+        Guarda o id da subscription na primeira resposta.
+
+        Returns:
+            bool: False se a mensagem é de um stream já esquecido (descartar)
+        """
+        req_id  = data.get("req_id")
+        sub_key = self._sub_by_req.get(req_id)
+        if sub_key is not None:
+            if "error" in data:
+                self._subscriptions.pop(sub_key, None)
+                self._sub_by_req.pop(req_id, None)
+                if sub_key[0] == "proposal":
+                    self._proposal_streams.pop(sub_key[1], None)
+            elif sub_key in self._subscriptions and self._subscriptions[sub_key] is None:
+                self._subscriptions[sub_key] = data.get("subscription", {}).get("id")
+            return True
+        if req_id in self._forgotten_reqs:
+            sub_id = data.get("subscription", {}).get("id")
+            # Esquecido antes do id chegar: o forget só pode ir agora
+            if sub_id and not self._forgotten_reqs[req_id] and self.is_connected:
+                self._forgotten_reqs[req_id] = True
+                self._send({"forget": sub_id})
+            return False
+        return True
+
+    def _replay_history(self, symbol, data):
+        """Reenvia ao callback, em ordem, os ticks perdidos durante a reconexão"""
+        history = data.get("history", {})
+        prices  = history.get("prices", [])
+        times   = history.get("times", [])
+        novos   = [(epoch, price) for epoch, price in zip(times, prices)
+                   if not self.last_tick_epoch or epoch > self.last_tick_epoch]
+        if not novos:
+            return
+        self.log(f"⏪ Backfill {symbol}: {len(novos)} ticks perdidos reenviados", "INFO")
+        for epoch, price in novos:
+            self.last_tick_epoch = epoch
+            if self.on_tick_callback:
+                self.on_tick_callback(TickRecord(epoch, price, symbol, data.get("pip_size"), replay=True))
+
+    def get_subscription_info(self):
+        """Contagem de assinaturas vivas nesta conexão"""
+        por_tipo = Counter(kind for kind, _ in self._subscriptions)
+        return {"total": len(self._subscriptions), **por_tipo}
+
+    def _contract_parameters(self, contract_type, symbol, amount, duration, duration_unit="t", barrier=None):
         # Novo OAuth usa underlying_symbol, legado usa symbol
         symbol_key = "underlying_symbol" if getattr(self, '_using_otp', False) else "symbol"
-        proposal = {
-            "proposal": 1,
+        params = {
             "amount": amount,
             "basis": BotConfig.BASIS,
             "contract_type": contract_type,
@@ -265,10 +431,109 @@ class DerivAPI:
             symbol_key: symbol
         }
         if barrier is not None:
-            proposal["barrier"] = str(barrier)
+            params["barrier"] = str(barrier)
+        return params
+
+    def get_proposal(self, contract_type, symbol, amount, duration, duration_unit="t", barrier=None):
+        proposal = {"proposal": 1}
+        proposal.update(self._contract_parameters(contract_type, symbol, amount, duration, duration_unit, barrier))
         self._send(proposal)
         self.log(f"Solicitando proposta: {contract_type} {symbol}", "INFO")
 
+    def buy_with_parameters(self, contract_type, symbol, amount, duration, duration_unit="t", barrier=None):
+        """Compra direta em um round trip: buy=1 + parameters, sem proposal antes"""
+        params = self._contract_parameters(contract_type, symbol, amount, duration, duration_unit, barrier)
+        self._send({"buy": 1, "price": amount, "parameters": params})
+        self.log(f"Comprando direto: {contract_type} {symbol} ${amount}", "TRADE")
+
+    def open_contract(self, contract_type, symbol, amount, duration, duration_unit="t",
+                      barrier=None, signal_time=None):
+        """
+        Abre contrato conforme BotConfig.EXECUTION_MODE
+        ("direct" = buy com parameters, "proposal" = proposal → buy,
+        "stream" = compra a proposta pré-assinada; sem ela, cai no "direct").
+
+        Args:
+            signal_time: time.perf_counter() do sinal, para medir latência até o buy
+        """
+        self._signal_time = signal_time or time.perf_counter()
+        mode = BotConfig.EXECUTION_MODE
+        if mode == "stream":
+            stream = self._proposal_streams.get(
+                self._proposal_key(contract_type, symbol, amount, duration, duration_unit, barrier))
+            if stream and stream["id"]:
+                # Cada id de proposta só compra uma vez; o próximo chega no stream
+                proposal_id, stream["id"] = stream["id"], None
+                self.buy_contract(proposal_id, stream["ask_price"])
+                return
+        if mode in ("direct", "stream"):
+            self.buy_with_parameters(contract_type, symbol, amount, duration, duration_unit, barrier)
+        else:
+            self.get_proposal(contract_type, symbol, amount, duration, duration_unit, barrier)
+
+    # ─── PROPOSTAS PRÉ-ASSINADAS ────────────────────────────────────────────
+    @staticmethod
+    def _proposal_key(contract_type, symbol, amount, duration, duration_unit="t", barrier=None):
+        return (contract_type, symbol, round(float(amount), 2), duration, duration_unit,
+                None if barrier is None else str(barrier))
+
+    def prime_proposals(self, shapes):
+        """
+        Mantém assinado um stream de proposal para cada shape (dict com os
+        argumentos de get_proposal). Streams que saíram da lista — stake
+        mudou por martingale/recuperação, barreira mudou — são esquecidos.
+        """
+        self._desired_proposals = list(shapes)
+        desejadas = {self._proposal_key(**shape): shape for shape in shapes}
+        for key in list(self._proposal_streams):
+            if key not in desejadas:
+                self._forget_proposal(key)
+        for key, shape in desejadas.items():
+            if key in self._proposal_streams:
+                continue
+            proposal = {"proposal": 1}
+            proposal.update(self._contract_parameters(**shape))
+            self._proposal_streams[key] = {"id": None, "ask_price": None}
+            future = self._subscribe("proposal", key, proposal)
+            if future is None or (future.done() and future.exception()):
+                self._proposal_streams.pop(key, None)
+
+    def forget_proposals(self):
+        self.prime_proposals([])
+
+    def _forget_proposal(self, key):
+        if self._proposal_streams.pop(key, None) is not None:
+            self.forget_subscription("proposal", key)
+
+    def _update_proposal_stream(self, key, data):
+        stream = self._proposal_streams.get(key)
+        if stream is None:
+            return
+        proposal = data.get("proposal", {})
+        stream["id"]        = proposal.get("id")
+        stream["ask_price"] = proposal.get("ask_price")
+
+    def _register_buy_latency(self):
+        if self._signal_time is None:
+            return
+        latency_ms = round((time.perf_counter() - self._signal_time) * 1000, 1)
+        self._signal_time        = None
+        self.last_buy_latency_ms = latency_ms
+        self.buy_latencies.append(latency_ms)
+        self.log(f"⚡ Latência sinal→compra: {latency_ms:.1f} ms ({BotConfig.EXECUTION_MODE})", "INFO")
+
+    def get_latency_stats(self):
+        """Resumo das últimas latências sinal→compra (ms)"""
+        amostras = sorted(self.buy_latencies)
+        if not amostras:
+            return {"amostras": 0, "ultima": None, "media": None, "p95": None}
+        return {
+            "amostras": len(amostras),
+            "ultima":   self.last_buy_latency_ms,
+            "media":    round(sum(amostras) / len(amostras), 1),
+            "p95":      amostras[min(len(amostras) - 1, int(len(amostras) * 0.95))],
+        }
+
     def buy_contract(self, proposal_id, price):
         self._send({"buy": proposal_id, "price": price})
         self.log(f"Comprando contrato ID: {proposal_id}", "TRADE")
@@ -277,30 +542,97 @@ class DerivAPI:
         self._send({"sell": contract_id, "price": price})
 
     def get_contract_info(self, contract_id):
-        self._send({"proposal_open_contract": 1, "contract_id": contract_id, "subscribe": 1})
+        self._subscribe("contract", contract_id, {"proposal_open_contract": 1, "contract_id": contract_id})
 
     def _send(self, data):
+        """
+        Envia mensagem com req_id próprio.
+
+        Returns:
+            Future: resolvido com a resposta de mesmo req_id (dict completo,
+            inclusive com "error") ou com exceção se não foi possível enviar
+        """
+        future = Future()
+        req_id = data.setdefault("req_id", next(self._req_seq))
         if self.ws and self.is_connected:
+            self._pending[req_id] = future
             try:
-                self.ws.send(json.dumps(data))
+                self._write(json.dumps(data))
             except Exception as e:
+                self._pending.pop(req_id, None)
+                future.set_exception(ConnectionError(str(e)))
                 self.log(f"Erro ao enviar: {e}", "ERROR")
                 self._reconnect()
         else:
+            future.set_exception(ConnectionError("WebSocket não conectado"))
             self.log("WebSocket não conectado!", "ERROR")
+        return future
+
+    def request(self, data, timeout=15):
+        """Envia e aguarda a resposta correlacionada (TimeoutError após timeout)"""
+        future = self._send(data)
+        try:
+            return future.result(timeout=timeout)
+        finally:
+            self._pending.pop(data.get("req_id"), None)
+
+    def _resolve_request(self, data):
+        future = self._pending.pop(data.get("req_id"), None)
+        if future and not future.done():
+            future.set_result(data)
+
+    def _fail_pending(self, motivo):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(motivo))
 
     # ─── CALLBACKS ──────────────────────────────────────────────────────────
     def _on_open(self, ws):
         self.is_connected      = True
         self.last_message_time = time.time()
+        self._opened.set()
         self.log("Conexão WebSocket aberta", "SUCCESS")
 
+    def _tick_rapido(self, data):
+        """
+        Caminho rápido: tick de stream já confirmado vai direto ao callback,
+        sem rastreio de assinatura, cadeia de msg_type nem resolução de request.
+
+        Returns:
+            bool: False se o tick precisa do caminho genérico
+        """
+        sub_key = self._sub_by_req.get(data.get("req_id"))
+        if sub_key is None or self._subscriptions.get(sub_key) is None:
+            return False
+        try:
+            tick = TickRecord.from_tick(data["tick"])
+            self.last_tick_epoch = tick.epoch or self.last_tick_epoch
+            if self.on_tick_callback:
+                self.on_tick_callback(tick)
+        except Exception as e:
+            self.log(f"Erro ao processar tick: {e}", "ERROR")
+        return True
+
     def _on_message(self, ws, message):
+        self.last_message_time = time.time()
+        try:
+            data = json_loads(message)
+        except ValueError:
+            self.log(f"Erro JSON: {message}", "ERROR")
+            return
+
+        # O frame já está decodificado: decide pelo msg_type, sem reler a string
+        if data.get("msg_type") == "tick" and self._tick_rapido(data):
+            return
+
         try:
-            self.last_message_time = time.time()
-            data     = json.loads(message)
             msg_type = data.get("msg_type")
 
+            # Streams esquecidos (contrato já liquidado, ticks trocados) não chegam aos callbacks
+            if "req_id" in data and not self._track_subscription(data):
+                return
+
             if msg_type == "ping":
                 self._send({"pong": 1})
 
@@ -321,11 +653,26 @@ class DerivAPI:
                     self.on_balance_callback(self.balance)
 
             elif msg_type == "tick":
+                tick = TickRecord.from_tick(data.get("tick", {}))
+                self.last_tick_epoch = tick.epoch or self.last_tick_epoch
                 if self.on_tick_callback:
-                    self.on_tick_callback(data.get("tick", {}))
+                    self.on_tick_callback(tick)
 
-            elif msg_type == "proposal":
+            elif msg_type == "history":
+                sub_key = self._sub_by_req.get(data.get("req_id"))
                 if "error" in data:
+                    self.log(f"Erro ticks_history: {data['error']['message']}", "ERROR")
+                elif sub_key and sub_key[0] == "ticks":
+                    self._replay_history(sub_key[1], data)
+
+            elif msg_type == "proposal":
+                sub_key = self._sub_by_req.get(data.get("req_id"))
+                if sub_key and sub_key[0] == "proposal":
+                    self._update_proposal_stream(sub_key[1], data)
+                elif "subscription" in data:
+                    # Stream já esquecido por nós — nunca compra automaticamente
+                    self._send({"forget": data["subscription"]["id"]})
+                elif "error" in data:
                     self.log(f"Erro proposta: {data['error']['message']}", "ERROR")
                 else:
                     proposal    = data.get("proposal", {})
@@ -339,6 +686,7 @@ class DerivAPI:
             elif msg_type == "buy":
                 if "error" in data:
                     self.log(f"Erro compra: {data['error']['message']}", "ERROR")
+                    self._signal_time = None
                     # ✅ Libera waiting_contract em caso de erro na compra
                     self._clear_contract()
                     if self.on_contract_callback:
@@ -350,6 +698,7 @@ class DerivAPI:
                     buy_data    = data.get("buy", {})
                     contract_id = buy_data.get("contract_id")
                     self.log(f"✅ Compra realizada! ID: {contract_id}", "SUCCESS")
+                    self._register_buy_latency()
                     # ✅ Inicia timeout para este contrato
                     self._start_contract_timeout(contract_id)
                     self.get_contract_info(contract_id)
@@ -365,8 +714,9 @@ class DerivAPI:
                     profit = float(contract.get("profit", 0))
                     emoji  = "🎉 VITÓRIA" if status == "won" else "😞 DERROTA"
                     self.log(f"{emoji}! Lucro: ${profit:.2f}", "TRADE")
-                    # ✅ Limpa timeout ao receber resultado
+                    # ✅ Limpa timeout e encerra o stream do contrato liquidado
                     self._clear_contract()
+                    self.forget_subscription("contract", contract.get("contract_id"))
 
             elif msg_type == "sell":
                 if "error" in data:
@@ -374,10 +724,12 @@ class DerivAPI:
                 else:
                     self.log(f"✅ Venda realizada!", "SUCCESS")
 
-        except json.JSONDecodeError:
-            self.log(f"Erro JSON: {message}", "ERROR")
         except Exception as e:
             self.log(f"Erro ao processar mensagem: {e}", "ERROR")
+        finally:
+            # Acorda quem espera esta resposta só depois do estado atualizado acima
+            if "req_id" in data:
+                self._resolve_request(data)
 
     def _on_error(self, ws, error):
         self.log(f"Erro WebSocket: {error}", "ERROR")
@@ -385,6 +737,7 @@ class DerivAPI:
     def _on_close(self, ws, close_status_code, close_msg):
         self.is_connected  = False
         self.is_authorized = False
+        self._fail_pending("Conexão fechada")
         self.log(f"Conexão fechada: {close_status_code} - {close_msg}", "WARNING")
         if self.should_reconnect:
             time.sleep(2)
@@ -0,0 +1,195 @@
+"""
+Conexão com Deriv API via asyncio (websockets)
+Alpha Dolar 2.0 - TODAS AS SESSÕES EM UM ÚNICO EVENT LOOP
+
+Mesma interface do DerivAPI (set_tick_callback, set_contract_callback,
+set_balance_callback, get_proposal, ...), mas sem thread por conexão:
+leitura, keep-alive e timeout de contrato rodam como tasks/timers de um
+event loop compartilhado pelo processo inteiro.
+
+Os callbacks dos bots são chamados dentro do loop — precisam ser rápidos
+e não podem bloquear (o que já vale para on_tick/on_contract_update).
+"""
+import asyncio
+import threading
+import time
+
+import websockets
+
+try:
+    from .deriv_api import DerivAPI
+    from .config import BotConfig
+except ImportError:
+    from deriv_api import DerivAPI
+    from config import BotConfig
+
+
+# ─── EVENT LOOP COMPARTILHADO ───────────────────────────────────────────────
+_loop        = None
+_loop_thread = None
+_loop_lock   = threading.Lock()
+
+
+def get_event_loop():
+    """Retorna o event loop do processo, iniciando sua thread na primeira chamada"""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="deriv-asyncio", daemon=True
+            )
+            _loop_thread.start()
+        return _loop
+
+
+def _in_loop():
+    return threading.current_thread() is _loop_thread
+
+
+class AsyncDerivAPI(DerivAPI):
+    def __init__(self, api_token=None, public=False):
+        super().__init__(api_token=api_token, public=public)
+        self.loop = get_event_loop()
+        self._reader_task = None
+
+    # ─── TIMEOUT DE CONTRATO ────────────────────────────────────────────────
+    def _start_contract_timeout(self, contract_id):
+        """Watchdog via call_later (sem thread por contrato)"""
+        self.current_contract_id = contract_id
+        self.loop.call_soon_threadsafe(self._arm_contract_timer, contract_id)
+
+    def _arm_contract_timer(self, contract_id):
+        if self._contract_timer:
+            self._contract_timer.cancel()
+        self._contract_timer = self.loop.call_later(
+            self.contract_timeout_sec, self._on_contract_timeout, contract_id
+        )
+
+    def _clear_contract(self):
+        self.current_contract_id = None
+        timer, self._contract_timer = self._contract_timer, None
+        if timer:
+            self.loop.call_soon_threadsafe(timer.cancel)
+
+    # ─── KEEP-ALIVE ─────────────────────────────────────────────────────────
+    def _keep_alive_tick(self):
+        self._keep_alive_timer = None
+        if not (self.should_reconnect and self.ws):
+            return
+        if self.is_connected:
+            self._send({"ping": 1})
+            if time.time() - self.last_message_time > 90:
+                self.log("⚠️ Sem mensagens há 90s, reconectando...", "WARNING")
+                self._reconnect()
+                return
+        self._keep_alive_timer = self.loop.call_later(30, self._keep_alive_tick)
+
+    # ─── TRANSPORTE (websockets, event loop compartilhado) ──────────────────
+    def _open_transport(self, url):
+        if _in_loop():
+            raise Exception("connect() não pode ser chamado de dentro do event loop")
+        future = asyncio.run_coroutine_threadsafe(self._open_async(url), self.loop)
+        try:
+            future.result(timeout=10)
+        except TimeoutError:
+            future.cancel()
+            raise Exception("Timeout na conexão")
+
+    async def _open_async(self, url):
+        ws = await websockets.connect(
+            url, ping_interval=30, ping_timeout=10, max_size=None, close_timeout=3
+        )
+        self.ws = ws
+        self._on_open(ws)
+        self._reader_task = self.loop.create_task(self._reader(ws))
+        self._keep_alive_timer = self.loop.call_later(30, self._keep_alive_tick)
+
+    async def _reader(self, ws):
+        code, reason = None, None
+        try:
+            async for message in ws:
+                self._on_message(ws, message)
+        except websockets.ConnectionClosed as e:
+            code, reason = e.code, e.reason
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            self._on_error(ws, e)
+        # Só reage se este ainda é o socket ativo (não foi fechado por nós)
+        if ws is self.ws:
+            self._on_close(ws, code or ws.close_code, reason or ws.close_reason)
+
+    def _close_transport(self):
+        ws, self.ws = self.ws, None
+        timer, self._keep_alive_timer = self._keep_alive_timer, None
+        if timer:
+            self.loop.call_soon_threadsafe(timer.cancel)
+        self._reader_task = None
+        if ws is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(ws.close(), self.loop)
+        if not _in_loop():
+            try:
+                future.result(timeout=3)
+            except Exception:
+                pass
+
+    def _write(self, text):
+        future = asyncio.run_coroutine_threadsafe(self.ws.send(text), self.loop)
+        future.add_done_callback(self._on_write_done)
+
+    def _on_write_done(self, future):
+        if not future.cancelled() and future.exception():
+            self.log(f"Erro ao enviar: {future.exception()}", "ERROR")
+
+    # ─── REQUISIÇÕES ────────────────────────────────────────────────────────
+    def request(self, data, timeout=15):
+        if _in_loop():
+            raise Exception("request() bloqueante dentro do event loop — use arequest()")
+        return super().request(data, timeout)
+
+    async def arequest(self, data, timeout=15):
+        """Versão awaitable de request() para código que roda no event loop"""
+        future = self._send(data)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        finally:
+            self._pending.pop(data.get("req_id"), None)
+
+    # ─── RECONEXÃO ──────────────────────────────────────────────────────────
+    def _reconnect(self):
+        # connect()/authorize() esperam respostas do próprio loop: dentro dele,
+        # a reconexão é despachada para o executor padrão
+        if _in_loop():
+            self.loop.run_in_executor(None, super()._reconnect)
+            return
+        super()._reconnect()
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self.is_connected  = False
+        self.is_authorized = False
+        self._fail_pending("Conexão fechada")
+        self.log(f"Conexão fechada: {close_status_code} - {close_msg}", "WARNING")
+        if self.should_reconnect:
+            self.loop.call_later(2, self._reconnect)
+
+
+def criar_api(api_token=None, public=False):
+    """Transporte escolhido por BotConfig.ASYNC_TRANSPORT"""
+    if BotConfig.ASYNC_TRANSPORT:
+        return AsyncDerivAPI(api_token=api_token, public=public)
+    return DerivAPI(api_token=api_token, public=public)
+
+
+if __name__ == "__main__":
+    # Teste rápido: feed público de R_100 por 10 segundos
+    recebidos = []
+    api = AsyncDerivAPI(public=True)
+    api.set_tick_callback(lambda tick: recebidos.append(tick.get("quote")))
+    if api.connect():
+        api.subscribe_ticks("R_100")
+        time.sleep(10)
+        print(f"Ticks recebidos: {len(recebidos)} | Últimos: {recebidos[-3:]}")
+        api.disconnect()
+    print(f"Threads ativas: {threading.active_count()}")
@@ -0,0 +1,122 @@
+"""
+Digits — extração do último dígito da cotação
+Alpha Dolar 2.0
+
+O último dígito de um contrato DIGIT é o último decimal da cotação no
+pip_size do símbolo (R_100: 2 casas, R_50: 4 casas...). O jeito antigo,
+int(str(float(price)).replace('.', '')[-1]), além de lento, erra quando
+a cotação termina em zero: 1234.50 vira "1234.5" → 5 em vez de 0.
+
+Aqui o dígito sai de aritmética inteira sobre a cotação escalada:
+    round(quote * 10**casas) % 10
+
+Casas decimais, em ordem de preferência:
+    1. pip_size do próprio tick (a Deriv envia em tick e ticks_history)
+    2. tabela PIP_SIZES por símbolo (markets/markets_data.py)
+    3. sem nenhum dos dois: texto da cotação (comportamento antigo)
+
+last_digits() é a forma vetorizada (NumPy quando instalado) para arrays
+inteiros — backtest, treino do ML e análise em lote usam a mesma regra.
+"""
+import math
+
+try:
+    from .markets.markets_data import PIP_SIZES
+except ImportError:
+    from markets.markets_data import PIP_SIZES
+
+try:
+    from .lazy_import import lazy_module
+except ImportError:
+    from lazy_import import lazy_module
+
+# NumPy só é importado no primeiro last_digits()
+np = lazy_module('numpy')
+
+_SCALES = [10 ** d for d in range(16)]
+
+
+def decimals_for(symbol=None, pip_size=None):
+    """
+    Casas decimais da cotação
+
+    Args:
+        symbol (str): Símbolo (consulta PIP_SIZES)
+        pip_size (int|float): pip_size do tick — casas (2) ou tamanho do pip (0.01)
+
+    Returns:
+        int: Casas decimais, ou None se desconhecidas
+    """
+    if pip_size is not None:
+        if pip_size >= 1 or pip_size == 0:
+            return int(pip_size)
+        return int(round(-math.log10(pip_size)))
+    return PIP_SIZES.get(symbol)
+
+
+def _legacy_digit(quote):
+    return int(str(float(quote)).replace('.', '')[-1])
+
+
+def last_digit(quote, decimals=None, symbol=None):
+    """
+    Último dígito da cotação
+
+    Args:
+        quote (float): Cotação
+        decimals (int): Casas decimais (pip_size); se None, usa PIP_SIZES[symbol]
+
+    Returns:
+        int: Dígito 0-9
+    """
+    if decimals is None:
+        decimals = PIP_SIZES.get(symbol)
+        if decimals is None:
+            return _legacy_digit(quote)
+    return round(quote * _SCALES[decimals]) % 10
+
+
+def tick_digit(tick):
+    """Último dígito de um tick (dict ou TickRecord) usando pip_size/symbol do próprio tick"""
+    decimals = decimals_for(tick.get('symbol'), tick.get('pip_size'))
+    return last_digit(float(tick.get('quote', 0)), decimals)
+
+
+def last_digits(quotes, decimals=None, symbol=None):
+    """
+    Forma vetorizada de last_digit
+
+    Args:
+        quotes: Sequência, memoryview ou ndarray de cotações
+        decimals (int): Casas decimais; se None, usa PIP_SIZES[symbol]
+
+    Returns:
+        ndarray int64 com NumPy instalado, senão list de int
+    """
+    if decimals is None:
+        decimals = PIP_SIZES.get(symbol)
+        if decimals is None:
+            return [_legacy_digit(q) for q in quotes]
+    scale = _SCALES[decimals]
+    if np:
+        return np.rint(np.asarray(quotes, dtype=np.float64) * scale).astype(np.int64) % 10
+    return [round(q * scale) % 10 for q in quotes]
+
+
+if __name__ == "__main__":
+    import random
+
+    print(f"1234.50 (R_100) → {last_digit(1234.50, symbol='R_100')} | antigo: {_legacy_digit(1234.50)}")
+    print(f"6543.2100 (R_50) → {last_digit(6543.21, symbol='R_50')} | antigo: {_legacy_digit(6543.21)}")
+
+    # Conferência contra a formatação decimal exata
+    erros = 0
+    for _ in range(200000):
+        casas = random.choice([1, 2, 3, 4, 5])
+        inteiro = random.randrange(10 ** (casas + 4))
+        quote = inteiro / _SCALES[casas]
+        erros += last_digit(quote, casas) != int(f"{quote:.{casas}f}"[-1])
+    print(f"Divergências vs formatação em 200k cotações: {erros}")
+    quotes = [random.randrange(10 ** 6) / 100 for _ in range(1000)]
+    assert list(last_digits(quotes, 2)) == [last_digit(q, 2) for q in quotes]
+    print("✅ last_digits confere com last_digit")
@@ -20,11 +20,17 @@ from datetime import datetime
 from collections import deque
 
 try:
-    from .deriv_api import DerivAPI
+    from .deriv_api_async import criar_api
+    from .tick_hub import tick_hub
+    from .timer_service import timer_service
     from .config import BotConfig
+    from .digits import tick_digit
 except ImportError:
-    from deriv_api import DerivAPI
+    from deriv_api_async import criar_api
+    from tick_hub import tick_hub
+    from timer_service import timer_service
     from config import BotConfig
+    from digits import tick_digit
 
 
 # ═══════════════════════════════════════════
@@ -229,6 +235,10 @@ class IABot:
     Usa o mesmo DerivAPI e BotConfig existentes.
     """
 
+    # Watchdog (segundos)
+    WATCHDOG_CONTRATO = 45
+    TICK_TIMEOUT      = 15
+
     def __init__(self, config: dict = None):
         cfg = config or {}
 
@@ -248,7 +258,7 @@ class IABot:
         self.ml = MLMotorOnline()
 
         # API Deriv (reutiliza o mesmo do projeto)
-        self.api = DerivAPI(api_token=self.api_token)
+        self.api = criar_api(api_token=self.api_token)
 
         # Estado runtime
         self.is_running          = False
@@ -263,6 +273,10 @@ class IABot:
         self._ultimo_trade_time  = time.time()
         self.stop_reason         = None
         self.stop_message        = None
+        self._usando_hub         = False
+        self._watchdog_timer     = None
+        self._watchdog_lock      = threading.Lock()
+        self._parado             = threading.Event()
 
         # Histórico de trades para o dashboard
         self.trades = []
@@ -277,28 +291,29 @@ class IABot:
         print(f"[{ts}][IA] {emoji} {msg}")
 
     # ─── EXTRAI DÍGITO DO TICK ──────────────────────────────────────────────
-    def _extrair_digito(self, quote: float) -> int:
-        """Extrai último dígito da cotação."""
-        try:
-            s = f"{quote:.5f}".replace('.', '')
-            return int(s[-1])
-        except:
-            return int(str(quote).replace('.', '')[-1]) if quote else 0
+    def _extrair_digito(self, tick_data: dict) -> int:
+        """Extrai último dígito da cotação (pip_size do tick ou tabela do símbolo)."""
+        return tick_digit(tick_data)
 
     # ─── CALLBACK TICK ──────────────────────────────────────────────────────
     def on_tick(self, tick_data: dict):
         self._ultimo_tick_time = time.time()
+        replay = tick_data.get('_replay')
 
-        if self.waiting_contract:
+        if self.waiting_contract and not replay:
             return
 
         quote = float(tick_data.get('quote', 0))
         if not quote:
             return
 
-        digito = self._extrair_digito(quote)
+        digito = self._extrair_digito(tick_data)
         self.ml.add_digit(digito)  # alimenta ML
 
+        # Backfill de reconexão: só alimenta o ML, nunca opera
+        if replay:
+            return
+
         # Verifica se pode operar
         if not self.is_running:
             return
@@ -393,22 +408,34 @@ class IABot:
         self._ultimo_stake_usado = stake
         self.waiting_contract    = True
         self._ultimo_trade_time  = time.time()
+        self._agendar_watchdog()
 
-        barrier = None
-        if self.contract_type == 'DIGITOVER':
-            barrier = 4
-        elif self.contract_type == 'DIGITUNDER':
-            barrier = 5
-
-        self.api.get_proposal(
+        self.api.open_contract(
             contract_type=self.contract_type,
             symbol=self.symbol,
             amount=stake,
             duration=1,
             duration_unit='t',
-            barrier=barrier
+            barrier=self._barreira()
         )
 
+    def _barreira(self):
+        if self.contract_type == 'DIGITOVER':
+            return 4
+        if self.contract_type == 'DIGITUNDER':
+            return 5
+        return None
+
+    def _preparar_propostas(self):
+        """Modo stream: contrato fixo, só o stake muda — mantém a proposta assinada."""
+        if BotConfig.EXECUTION_MODE != "stream" or not self.is_running:
+            return
+        self.api.prime_proposals([{
+            'contract_type': self.contract_type, 'symbol': self.symbol,
+            'amount': self._calcular_stake(), 'duration': 1, 'duration_unit': 't',
+            'barrier': self._barreira(),
+        }])
+
     # ─── CALLBACK CONTRATO ──────────────────────────────────────────────────
     def on_contract_update(self, contract_data: dict):
         status = contract_data.get('status')
@@ -419,6 +446,8 @@ class IABot:
             self.log("⚠️ Operação interrompida — liberando para próximo sinal", "WARNING")
             self.waiting_contract = False
             self._ultimo_trade_time = time.time()
+            self._agendar_watchdog()
+            self._preparar_propostas()
             return
 
         if status not in ['won', 'lost']:
@@ -433,6 +462,7 @@ class IABot:
 
         self.waiting_contract   = False
         self._ultimo_trade_time = time.time()
+        self._agendar_watchdog()
 
         if won:
             self.log(f"🎉 WIN! Lucro: ${profit:.2f}", "WIN")
@@ -464,6 +494,7 @@ class IABot:
             'win_rate':    wr,
             'total_trades': trades_total,
             'exit_tick':   str(exit_tick) if exit_tick else None,
+            'latency_ms':  self.api.last_buy_latency_ms,
             'ml_fase':     self.ml.get_info()['fase'],
             'ml_acuracia': self.ml.get_info()['acuracia'],
             'timestamp':   datetime.now().strftime('%H:%M:%S'),
@@ -487,12 +518,21 @@ class IABot:
             self._parar('take_profit', f'Lucro alvo atingido: ${self.lucro_sessao:.2f}')
         elif self.perda_acumulada >= self.limite_perda:
             self._parar('stop_loss', f'Limite de perda atingido: ${self.perda_acumulada:.2f}')
+        else:
+            self._preparar_propostas()
 
     def on_balance_update(self, balance: float):
         self.log(f"💰 Saldo: ${balance:.2f}", "INFO")
 
     # ─── START / STOP ────────────────────────────────────────────────────────
-    def start(self):
+    def start(self, block=True):
+        """
+        Conecta, aquece o ML e assina os ticks
+
+        Args:
+            block (bool): Espera o stop() nesta thread; False retorna logo após
+                iniciar (o bot segue nos callbacks do feed e do timer_service)
+        """
         self.log("Conectando à Deriv API...", "INFO")
         if not self.api.connect():
             self.log("Falha na conexão!", "ERROR")
@@ -507,43 +547,89 @@ class IABot:
         self.log(f"🎯 Contrato: {self.contract_type} | Mercado: {self.symbol}", "INFO")
         self.log(f"🔮 Perdas virtuais: {self.perdas_virt} | Mult: {self.multiplicador}×", "INFO")
 
-        self.api.set_tick_callback(self.on_tick)
         self.api.set_contract_callback(self.on_contract_update)
         self.api.set_balance_callback(self.on_balance_update)
-        self.api.subscribe_ticks(self.symbol)
+        # Warm-start: o ML já nasce com as amostras mínimas (um único ticks_history)
+        historico = self.api.get_ticks_history(self.symbol, self.ml.MIN_SAMPLES + self.ml.WINDOW + 1)
+        for tick in historico:
+            self.on_tick({**tick, '_replay': True})
+        if historico:
+            self.log(f"🔥 Warm-start: {len(historico)} ticks de {self.symbol} pré-carregados no ML", "ML")
+
+        self._usando_hub = BotConfig.USE_TICK_HUB and tick_hub.subscribe(self.symbol, self.on_tick)
+        if not self._usando_hub:
+            self.api.set_tick_callback(self.on_tick)
+            self.api.subscribe_ticks(self.symbol)
         self.api._bot_ref = self
 
         self.is_running = True
+        self._preparar_propostas()
 
-        WATCHDOG_CONTRATO = 45
-        TICK_TIMEOUT      = 15
+        # Watchdog no timer_service compartilhado; esta thread só espera o stop()
+        self._parado.clear()
+        self._agendar_watchdog()
+        if block:
+            self._parado.wait()
 
-        while self.is_running:
-            time.sleep(1)
-            agora = time.time()
+        return True
 
-            # Watchdog contrato preso
+    def _agendar_watchdog(self):
+        with self._watchdog_lock:
+            if self._watchdog_timer:
+                self._watchdog_timer.cancel()
+                self._watchdog_timer = None
+            if not self.is_running:
+                return
             if self.waiting_contract:
-                if agora - self._ultimo_trade_time > WATCHDOG_CONTRATO:
-                    self.log("⏰ WATCHDOG: contrato preso — liberando!", "WARNING")
-                    self.waiting_contract   = False
-                    self._ultimo_trade_time = agora
-                continue
-
-            # Watchdog sem ticks
-            if agora - self._ultimo_tick_time > TICK_TIMEOUT:
-                self.log("⚠️ WATCHDOG: sem ticks — reconectando...", "WARNING")
-                try:
-                    self.api._reconnect()
-                    self._ultimo_tick_time = time.time()
-                except Exception as e:
-                    self.log(f"Erro reconexão: {e}", "ERROR")
+                deadline = self._ultimo_trade_time + self.WATCHDOG_CONTRATO
+            else:
+                deadline = self._ultimo_tick_time + self.TICK_TIMEOUT
+            espera = max(deadline - time.time(), 0) + 0.1
+            self._watchdog_timer = timer_service.call_later(espera, self._watchdog)
 
-        return True
+    def _watchdog(self):
+        try:
+            self._verificar_watchdog()
+        finally:
+            self._agendar_watchdog()
+
+    def _verificar_watchdog(self):
+        if not self.is_running:
+            return
+        agora = time.time()
+
+        # Watchdog contrato preso
+        if self.waiting_contract:
+            if agora - self._ultimo_trade_time > self.WATCHDOG_CONTRATO:
+                self.log("⏰ WATCHDOG: contrato preso — liberando!", "WARNING")
+                self.waiting_contract   = False
+                self._ultimo_trade_time = agora
+            return
+
+        # Watchdog sem ticks
+        if agora - self._ultimo_tick_time > self.TICK_TIMEOUT:
+            self.log("⚠️ WATCHDOG: sem ticks — reconectando...", "WARNING")
+            try:
+                if self._usando_hub:
+                    tick_hub.ensure(self.symbol)
+                else:
+                    # Reconexão bloqueia — fora da thread do timer
+                    threading.Thread(target=self.api._reconnect, daemon=True).start()
+                self._ultimo_tick_time = time.time()
+            except Exception as e:
+                self.log(f"Erro reconexão: {e}", "ERROR")
 
     def stop(self):
         self.is_running = False
+        self._parado.set()
+        if self._watchdog_timer:
+            self._watchdog_timer.cancel()
+        if self._usando_hub:
+            tick_hub.unsubscribe(self.symbol, self.on_tick)
+            self._usando_hub = False
         if self.api:
+            if self.api.is_connected:
+                self.api.forget_proposals()
             self.api.disconnect()
         self.log("Bot IA encerrado.", "INFO")
 
@@ -551,7 +637,8 @@ class IABot:
         self.log(f"🛑 {mensagem}", "WARNING")
         self.stop_reason  = motivo
         self.stop_message = mensagem
-        self.is_running   = False
+        # Sem thread esperando em start(): o stop() é quem libera feed, propostas e conexão
+        self.stop()
 
     # ─── STATS PARA O DASHBOARD ─────────────────────────────────────────────
     def get_stats(self) -> dict:
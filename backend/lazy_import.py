@@ -0,0 +1,108 @@
+"""
+Lazy Import — módulos e objetos criados só no primeiro uso
+Alpha Dolar 2.0
+
+No cold start da API (deploy ou restart do gunicorn) o processo pagava
+na importação o NumPy (~140 ms), o cliente Supabase e todos os módulos
+de estratégia, mesmo que a primeira requisição não usasse nada disso.
+
+    np = lazy_module('numpy')        # nada é importado aqui
+    if np:                           # só verifica se o pacote existe
+        arr = np.asarray(...)        # importa na primeira leitura de atributo
+
+    client = LazyObject(criar_cliente)   # criar_cliente() roda no 1º uso
+
+Os tempos das importações feitas por aqui ficam em import_times
+(relatório --profile-imports do registro de estratégias).
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+
+# nome do módulo → segundos gastos na primeira importação
+import_times = {}
+
+
+def timed_import(name, package=None):
+    """importlib.import_module registrando o tempo da primeira importação"""
+    absolute = importlib.util.resolve_name(name, package) if name.startswith('.') else name
+    if absolute in sys.modules:
+        return sys.modules[absolute]
+    start = time.perf_counter()
+    module = importlib.import_module(absolute)
+    import_times.setdefault(absolute, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Módulo importado na primeira leitura de atributo"""
+
+    def __init__(self, name):
+        self._name      = name
+        self._module    = None
+        self._available = None
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            module = self._module = timed_import(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __bool__(self):
+        """True se o módulo pode ser importado (sem importá-lo)"""
+        if self._available is None:
+            if self._module is not None or self._name in sys.modules:
+                self._available = True
+            else:
+                try:
+                    self._available = importlib.util.find_spec(self._name) is not None
+                except (ImportError, ValueError):
+                    self._available = False
+        return self._available
+
+    @property
+    def loaded(self):
+        return self._module is not None or self._name in sys.modules
+
+    def __repr__(self):
+        estado = "carregado" if self.loaded else "pendente"
+        return f"<lazy module '{self._name}' ({estado})>"
+
+
+def lazy_module(name):
+    """Proxy de módulo importado no primeiro uso (ver LazyModule)"""
+    return LazyModule(name)
+
+
+class LazyObject:
+    """Objeto criado pela factory no primeiro acesso a atributo (thread-safe)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._target  = None
+        self._lock    = threading.Lock()
+
+    def _resolve(self):
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._target = self._factory()
+        return target
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    @property
+    def loaded(self):
+        return self._target is not None
+
+    def __repr__(self):
+        estado = "criado" if self.loaded else "pendente"
+        return f"<lazy object {getattr(self._factory, '__name__', '?')} ({estado})>"
@@ -5,10 +5,12 @@ Módulo de mercados e tipos de contrato
 
 from .markets_data import (
     MARKETS,
+    PIP_SIZES,
     CATEGORIES as MARKET_CATEGORIES,
     get_all_markets,
     get_markets_by_category,
     get_market_info,
+    get_pip_size,
     search_markets
 )
 
@@ -23,6 +25,7 @@ from .contract_types import (
 
 __all__ = [
     'MARKETS',
+    'PIP_SIZES',
     'MARKET_CATEGORIES',
     'CONTRACT_TYPES',
     'CONTRACT_CATEGORIES',
@@ -30,6 +33,7 @@ __all__ = [
     'get_all_markets',
     'get_markets_by_category',
     'get_market_info',
+    'get_pip_size',
     'search_markets',
     'get_all_contract_types',
     'get_contracts_by_category',
@@ -149,6 +149,41 @@ MARKETS = {
 }
 
 
+# Casas decimais da cotação (pip_size) por símbolo — define o último dígito
+# dos contratos DIGIT. O pip_size que vem no próprio tick tem prioridade.
+PIP_SIZES = {
+    # Contínuos
+    "R_10": 3, "R_25": 3, "R_50": 4, "R_75": 4, "R_100": 2,
+    "1HZ10V": 2, "1HZ25V": 2, "1HZ50V": 2, "1HZ75V": 2, "1HZ100V": 2,
+    "1HZ150V": 2, "1HZ200V": 2, "1HZ250V": 2, "1HZ300V": 2,
+    # Jump
+    "JD10": 2, "JD25": 2, "JD50": 2, "JD75": 2, "JD100": 2,
+    # Crash/Boom
+    "CRASH300N": 3, "CRASH500": 3, "CRASH600N": 3, "CRASH900N": 3, "CRASH1000": 3,
+    "BOOM300N": 3, "BOOM500": 3, "BOOM600N": 3, "BOOM900N": 3, "BOOM1000": 3,
+    # Step / Range Break
+    "stpRNG": 1, "RDBULL": 4, "RDBEAR": 4,
+    # Cripto
+    "cryBTCUSD": 2, "cryETHUSD": 2, "cryLTCUSD": 2,
+    # Forex (pares com JPY: 3 casas)
+    "frxEURUSD": 5, "frxGBPUSD": 5, "frxUSDJPY": 3, "frxAUDUSD": 5, "frxUSDCAD": 5,
+    "frxUSDCHF": 5, "frxNZDUSD": 5, "frxEURGBP": 5, "frxEURJPY": 3, "frxGBPJPY": 3,
+    "frxAUDCAD": 5, "frxAUDCHF": 5, "frxAUDJPY": 3, "frxAUDNZD": 5, "frxEURAUD": 5,
+    "frxEURCAD": 5, "frxEURCHF": 5, "frxEURNZD": 5, "frxGBPAUD": 5, "frxGBPCAD": 5,
+    "frxGBPCHF": 5, "frxGBPNZD": 5,
+    # Metais
+    "frxXAUUSD": 2, "frxXAGUSD": 4, "frxXPDUSD": 2, "frxXPTUSD": 2,
+    # Índices de ações
+    "OTC_AEX": 2, "OTC_AS51": 2, "OTC_DJI": 2, "OTC_FCHI": 2, "OTC_FTSE": 2, "OTC_GDAXI": 2,
+    "OTC_HSI": 2, "OTC_N225": 2, "OTC_SPC": 2, "OTC_SSMI": 2, "OTC_SX5E": 2,
+}
+
+
+def get_pip_size(symbol):
+    """Retorna as casas decimais da cotação de um símbolo (None se desconhecido)"""
+    return PIP_SIZES.get(symbol)
+
+
 def get_all_markets():
     """Retorna todos os mercados disponíveis"""
     all_markets = []
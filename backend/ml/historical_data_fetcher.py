@@ -11,6 +11,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict
 
+try:
+    from ..digits import decimals_for, last_digits
+except ImportError:
+    from digits import decimals_for, last_digits
+
 
 class HistoricalDataFetcher:
     """Baixa dados históricos da Deriv API"""
@@ -57,6 +62,7 @@ class HistoricalDataFetcher:
             if "history" in response:
                 history = response["history"]
                 ticks = []
+                digits = last_digits(history["prices"], decimals_for(symbol, response.get("pip_size")))
 
                 for i, (timestamp, price) in enumerate(zip(history["times"], history["prices"])):
                     tick = {
@@ -66,9 +72,8 @@ class HistoricalDataFetcher:
                         'price': float(price)
                     }
 
-                    # Extrai dígito
-                    price_str = str(tick['price'])
-                    last_digit = int(price_str.replace('.', '')[-1])
+                    # Dígito no pip_size do símbolo
+                    last_digit = int(digits[i])
                     tick['last_digit'] = last_digit
                     tick['is_even'] = last_digit % 2 == 0
 
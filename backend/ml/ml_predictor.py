@@ -11,6 +11,11 @@ from pathlib import Path
 from typing import List, Dict, Tuple
 import numpy as np
 
+try:
+    from ..digits import last_digits
+except ImportError:
+    from digits import last_digits
+
 
 class MLPredictor:
     """Preditor usando Machine Learning"""
@@ -216,13 +221,16 @@ class MLPredictor:
         }
 
 
-def prepare_features(ticks: List[float], window_size: int = 10) -> List:
+def prepare_features(ticks: List[float], window_size: int = 10,
+                     decimals: int = None, symbol: str = None) -> List:
     """
     Prepara features para predição
 
     Args:
         ticks: Lista dos últimos ticks
         window_size: Tamanho da janela
+        decimals: Casas decimais da cotação (pip_size)
+        symbol: Símbolo, para consultar PIP_SIZES quando decimals não vier
 
     Returns:
         Lista de features
@@ -232,7 +240,7 @@ def prepare_features(ticks: List[float], window_size: int = 10) -> List:
 
     # Extrai últimos dígitos
     recent_ticks = ticks[-window_size:]
-    digits = [int(str(float(t)).replace('.', '')[-1]) for t in recent_ticks]
+    digits = [int(d) for d in last_digits(recent_ticks, decimals, symbol)]
 
     # Features básicas
     features = digits.copy()
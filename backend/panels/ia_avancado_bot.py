@@ -22,6 +22,9 @@ from markets import (
 )
 
 from core import AIEngine, TradeManager
+from digits import last_digit
+from settlement import SettlementEngine, CONTRACT_TYPES
+from paper_trading import SyntheticTickGenerator, calibracao
 
 
 class IAAvancado:
@@ -91,6 +94,10 @@ class IAAvancado:
         # Saldo simulado
         self.saldo_demo = 100.0
 
+        # Trades liquidados pelos próprios ticks simulados
+        self.settlement = SettlementEngine()
+        self.contrato_aberto = None
+
     def print_header(self):
         """Cabeçalho bonito"""
         print("\n" + "=" * 70)
@@ -351,6 +358,10 @@ class IAAvancado:
         try:
             tick_count = 0
             ticks_simulados = []
+            # Ticks do gerador calibrado pelo índice (o dígito liquidado varia como
+            # no mercado); símbolo que não é índice de volatilidade usa o R_100
+            symbol = self.config['symbol']
+            gerador = SyntheticTickGenerator(symbol if calibracao(symbol) is not None else 'R_100')
 
             # Pega intervalo do modo
             modo_config = self.modos.get(self.config['modo_operacao'], self.modos['balanceado'])
@@ -363,15 +374,17 @@ class IAAvancado:
             while self.is_running:
                 # Simula recebimento de ticks
                 tick_count += 1
-                novo_tick = 10000 + (tick_count % 100) * 0.5
-                ticks_simulados.append(novo_tick)
+                tick = gerador.next_tick()
+                ticks_simulados.append(tick.quote)
+                self.settlement.on_tick(tick, symbol)
 
                 # Mantém últimos 100 ticks
                 if len(ticks_simulados) > 100:
                     ticks_simulados = ticks_simulados[-100:]
 
-                # Analisa baseado no intervalo do modo
-                if tick_count % intervalo_analise == 0 and len(ticks_simulados) >= 10:
+                # Analisa baseado no intervalo do modo (um contrato por vez)
+                if (tick_count % intervalo_analise == 0 and len(ticks_simulados) >= 10
+                        and self.contrato_aberto is None):
                     self.processar_analise(ticks_simulados)
 
                 # Exibe status a cada 10 ticks
@@ -395,7 +408,7 @@ class IAAvancado:
         contract_type = self.config['contract_type']
 
         # Extrai últimos 5 dígitos
-        digits = [int(str(float(t)).replace('.', '')[-1]) for t in ticks[-5:]]
+        digits = [last_digit(float(t), symbol=self.config.get('symbol')) for t in ticks[-5:]]
         even = sum(1 for d in digits if d % 2 == 0)
         odd = len(digits) - even
 
@@ -461,30 +474,31 @@ class IAAvancado:
         # Prepara trade
         params = self.trade_manager.preparar_trade(decision)
 
+        if params and params['contract_type'] not in CONTRACT_TYPES:
+            print(f"\n⚠️ {params['contract_type']} não tem liquidação local — trade ignorado")
+            return
+
         if params:
-            # Simula execução
             print(f"\n🎯 EXECUTANDO TRADE:")
             print(f"   Tipo: {params['contract_type']}")
             print(f"   Stake: ${params['amount']:.2f}")
             print(f"   Virtual: {'SIM' if params['is_virtual'] else 'NÃO'}")
 
-            # Simula resultado (65% win rate - mais realista)
-            import random
-            vitoria = random.random() < 0.65
-
-            profit = params['amount'] * 0.95 if vitoria else -params['amount']
-
-            resultado = {
-                'status': 'won' if vitoria else 'lost',
-                'profit': profit,
-                'contract_id': f"DEMO_{int(time.time())}"
-            }
-
-            # Registra
-            self.trade_manager.registrar_trade(params, resultado)
-
-            emoji = "🎉" if vitoria else "😞"
-            print(f"   {emoji} {'VITÓRIA' if vitoria else 'DERROTA'}: ${profit:+.2f}")
+            # Liquidado pelos próximos ticks (settlement local)
+            def liquidado(resultado):
+                self.contrato_aberto = None
+                resultado['contract_id'] = f"DEMO_{resultado['contract_id']}"
+                self.trade_manager.registrar_trade(params, resultado)
+                vitoria = resultado['status'] == 'won'
+                emoji = "🎉" if vitoria else "😞"
+                print(f"   {emoji} {'VITÓRIA' if vitoria else 'DERROTA'}: ${resultado['profit']:+.2f} "
+                      f"(dígito {resultado['digito']})")
+
+            self.contrato_aberto = self.settlement.open(
+                params['contract_type'], params['amount'], self.config['symbol'],
+                duration=params['duration'], duration_unit=params['duration_unit'],
+                barrier=params.get('barrier'), callback=liquidado,
+            )
 
     def mostrar_status(self):
         """Mostra status em tempo real"""
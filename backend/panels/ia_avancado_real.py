@@ -24,6 +24,7 @@ from markets import (
 )
 
 from core import AIEngine, TradeManager
+from digits import last_digit
 
 # Importa config
 try:
@@ -417,7 +418,7 @@ class IAAvancadoReal:
 
         try:
             # Prepara features
-            features = prepare_features(ticks, window_size=10)
+            features = prepare_features(ticks, window_size=10, symbol=self.config.get('symbol'))
 
             if features is None:
                 return None
@@ -455,7 +456,7 @@ class IAAvancadoReal:
             return {'should_trade': False, 'reason': 'Aguardando ticks'}
 
         contract_type = self.config['contract_type']
-        digits = [int(str(float(t)).replace('.', '')[-1]) for t in ticks[-5:]]
+        digits = [last_digit(float(t), symbol=self.config.get('symbol')) for t in ticks[-5:]]
         even = sum(1 for d in digits if d % 2 == 0)
         odd = len(digits) - even
 
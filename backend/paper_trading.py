@@ -0,0 +1,423 @@
+"""
+Paper Trading — conta virtual movida a ticks
+Alpha Dolar 2.0
+
+Substitui o SimulatedBot (cara ou coroa de 65% a cada 5s) e o gerador de
+brinquedo do DerivBridge: o AlphaDolar e as estratégias reais rodam sobre
+uma conta virtual, com contratos liquidados localmente (settlement.py)
+pelos mesmos ticks que geram os sinais.
+
+Fontes de ticks (BotConfig.PAPER_FEED):
+    - "live":      feed público compartilhado (tick_hub) — ticks reais,
+                   uma conexão por símbolo para o processo inteiro
+    - "synthetic": gerador calibrado por índice de volatilidade (R_10…R_100,
+                   1HZ10V…1HZ300V), um timer por símbolo no timer_service
+
+Nenhuma conexão autorizada por usuário e nenhuma thread por bot: o bot
+paper inicia sem bloquear (AlphaDolar.start(block=False)) e roda inteiro
+nos callbacks do feed e do timer_service.
+
+Calibração: movimento browniano geométrico com a volatilidade anual do
+índice (10% no R_10, 100% no R_100…), um tick a cada 2s nos R_ e a cada
+1s nos 1HZ, cotação arredondada no pip_size do símbolo.
+
+As estratégias paper rodam com use_shared_cache = False: os ticks
+sintéticos levam o nome real do símbolo e não podem entrar no
+indicator_cache lido pelos bots reais.
+
+Uso:
+    strategy.use_shared_cache = False
+    api = PaperDerivAPI(paper_feed("R_100", "synthetic"))
+    bot = AlphaDolar(strategy=strategy, api=api, tick_feed=api)
+    bot.start(block=False)
+
+    python -m backend.paper_trading     # calibração dos geradores
+"""
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+try:
+    from .config import BotConfig
+    from .digits import decimals_for
+    from .settlement import SettlementEngine
+    from .tick_hub import tick_hub
+    from .tick_record import TickRecord
+    from .timer_service import timer_service
+except ImportError:
+    from config import BotConfig
+    from digits import decimals_for
+    from settlement import SettlementEngine
+    from tick_hub import tick_hub
+    from tick_record import TickRecord
+    from timer_service import timer_service
+
+SEGUNDOS_ANO = 365 * 86400
+
+# Ticks pré-gerados por símbolo sintético (warm-start imediato das estratégias)
+HISTORICO_SINTETICO = 1000
+
+# Nível inicial das cotações sintéticas (ordem de grandeza das reais; só
+# afeta o nível — a distribuição dos dígitos vem de σ por tick vs. pip_size)
+PRECOS_INICIAIS = {
+    "R_10": 6000.0, "R_25": 2500.0, "R_50": 250.0, "R_75": 60000.0, "R_100": 1000.0,
+    "1HZ10V": 9000.0, "1HZ25V": 700000.0, "1HZ50V": 250.0, "1HZ75V": 5000.0, "1HZ100V": 1000.0,
+}
+
+_INDICE = re.compile(r"R_(\d+)|1HZ(\d+)V")
+
+
+def calibracao(symbol):
+    """
+    Parâmetros do índice de volatilidade
+
+    Returns:
+        tuple: (volatilidade anual, segundos entre ticks), ou None se o
+            símbolo não é um índice de volatilidade
+    """
+    m = _INDICE.fullmatch(symbol or "")
+    if m is None:
+        return None
+    if m.group(1) is not None:
+        return int(m.group(1)) / 100, 2
+    return int(m.group(2)) / 100, 1
+
+
+# ─── GERADOR ────────────────────────────────────────────────────────────────
+class SyntheticTickGenerator:
+    """Ticks de um índice de volatilidade (GBM com a volatilidade do índice)"""
+
+    def __init__(self, symbol, seed=None, start_price=None, epoch=None):
+        """
+        Args:
+            symbol (str): Índice de volatilidade (R_10…R_100, 1HZ10V…)
+            seed: Semente do gerador (None = aleatória)
+            start_price (float): Cotação inicial (padrão: PRECOS_INICIAIS)
+            epoch (int): Epoch do último tick antes do primeiro gerado (padrão: agora)
+
+        Raises:
+            ValueError: símbolo que não é índice de volatilidade
+        """
+        params = calibracao(symbol)
+        if params is None:
+            raise ValueError(f"Sem calibração sintética para {symbol}")
+        volatilidade, self.interval = params
+        self.symbol   = symbol
+        self.pip_size = decimals_for(symbol)
+        self.sigma    = volatilidade * math.sqrt(self.interval / SEGUNDOS_ANO)
+        self._drift   = -0.5 * self.sigma ** 2   # martingale: E[S(t+1)] = S(t)
+        self.price    = float(start_price or PRECOS_INICIAIS.get(symbol, 1000.0))
+        self.epoch    = int(time.time() if epoch is None else epoch)
+        self._gauss   = random.Random(seed).gauss
+
+    def next_tick(self):
+        """Próximo tick (TickRecord, mesmo formato do feed ao vivo)"""
+        self.epoch += self.interval
+        self.price *= math.exp(self._drift + self.sigma * self._gauss(0.0, 1.0))
+        quote = round(self.price, self.pip_size) if self.pip_size is not None else self.price
+        return TickRecord(self.epoch, quote, self.symbol, self.pip_size)
+
+
+# ─── FEED SINTÉTICO ─────────────────────────────────────────────────────────
+class _SyntheticSymbol:
+    """Gerador de um símbolo + histórico recente + callbacks inscritos"""
+
+    def __init__(self, symbol, seed=None):
+        params = calibracao(symbol)
+        inicio = int(time.time()) - HISTORICO_SINTETICO * params[1]
+        self.generator = SyntheticTickGenerator(symbol, seed=seed, epoch=inicio)
+        self.history   = deque((self.generator.next_tick() for _ in range(HISTORICO_SINTETICO)),
+                               maxlen=HISTORICO_SINTETICO)
+        self.callbacks = []
+        self.ticks_gerados = 0
+        self.timer = None
+
+    def _emitir(self):
+        tick = self.generator.next_tick()
+        self.history.append(tick)
+        self.ticks_gerados += 1
+        for callback in tuple(self.callbacks):
+            try:
+                callback(tick)
+            except Exception as e:
+                _log(f"Erro no callback de tick ({self.generator.symbol}): {e}", "ERROR")
+
+
+class SyntheticFeed:
+    """
+    Mesma interface do tick_hub (subscribe/unsubscribe/ensure/history) com
+    ticks gerados localmente: um gerador e um timer por símbolo, compartilhados
+    por todos os bots inscritos
+    """
+
+    def __init__(self, seed=None):
+        self.seed   = seed
+        self._feeds = {}
+        self._lock  = threading.Lock()
+
+    def subscribe(self, symbol, callback):
+        """
+        Returns:
+            bool: False se o símbolo não tem calibração sintética
+        """
+        with self._lock:
+            feed = self._feeds.get(symbol)
+            if feed is None:
+                if calibracao(symbol) is None:
+                    _log(f"Sem gerador sintético para {symbol}", "ERROR")
+                    return False
+                feed = self._feeds[symbol] = _SyntheticSymbol(symbol, self.seed)
+                feed.timer = timer_service.call_every(feed.generator.interval, feed._emitir)
+                _log(f"Feed sintético aberto: {symbol}", "SUCCESS")
+            if callback not in feed.callbacks:
+                feed.callbacks.append(callback)
+            return True
+
+    def unsubscribe(self, symbol, callback):
+        """Remove callback. Para o gerador quando não sobra nenhum inscrito."""
+        with self._lock:
+            feed = self._feeds.get(symbol)
+            if feed is None:
+                return
+            if callback in feed.callbacks:
+                feed.callbacks.remove(callback)
+            if not feed.callbacks:
+                del self._feeds[symbol]
+                feed.timer.cancel()
+                _log(f"Feed sintético fechado: {symbol}", "INFO")
+
+    def ensure(self, symbol):
+        """Gerador local não trava: nada a reconectar"""
+
+    def history(self, symbol, count):
+        """Últimos `count` ticks gerados do símbolo ([] se o feed não está aberto)"""
+        with self._lock:
+            feed = self._feeds.get(symbol)
+            if feed is None or count <= 0:
+                return []
+            return list(feed.history)[-int(count):]
+
+    def get_info(self):
+        with self._lock:
+            return {
+                symbol: {"bots": len(feed.callbacks), "ticks": feed.ticks_gerados,
+                         "cotacao": feed.history[-1].quote}
+                for symbol, feed in self._feeds.items()
+            }
+
+
+# Instância única do processo
+synthetic_feed = SyntheticFeed()
+
+
+def paper_feed(symbol, kind=None):
+    """
+    Feed de ticks da conta paper
+
+    Args:
+        kind (str): "live" ou "synthetic" (padrão: BotConfig.PAPER_FEED);
+            símbolo sem calibração sintética usa o feed ao vivo
+    """
+    kind = kind or BotConfig.PAPER_FEED
+    if kind == "synthetic":
+        if calibracao(symbol) is not None:
+            return synthetic_feed
+        _log(f"{symbol} não é índice de volatilidade — paper usando ticks ao vivo", "WARNING")
+    return tick_hub
+
+
+# ─── CONTA PAPER ────────────────────────────────────────────────────────────
+class PaperDerivAPI:
+    """
+    Mesma interface usada pelo AlphaDolar no DerivAPI, sem conexão autorizada:
+    ticks do feed compartilhado, compra imediata e liquidação local.
+
+    Também serve de tick_feed do próprio bot (subscribe/unsubscribe/ensure),
+    para que o tick chegue primeiro aqui e o contrato aberto nele use o
+    tick seguinte como entrada, como na Deriv.
+    """
+
+    def __init__(self, feed=None, balance=None, currency="USD", payouts=None):
+        """
+        Args:
+            feed: tick_hub, synthetic_feed ou outro objeto com a mesma interface
+                (padrão: paper_feed(BotConfig.DEFAULT_SYMBOL))
+            balance (float): Saldo virtual inicial (padrão: BotConfig.PAPER_BALANCE)
+            payouts: Tabela de payout da liquidação (ver settlement.PayoutTable)
+        """
+        self.feed          = feed if feed is not None else paper_feed(BotConfig.DEFAULT_SYMBOL)
+        self.balance       = float(BotConfig.PAPER_BALANCE if balance is None else balance)
+        self.currency      = currency
+        self.is_connected  = False
+        self.is_authorized = False
+        self.settlement    = SettlementEngine(payouts)
+
+        self.on_tick_callback     = None
+        self.on_contract_callback = None
+        self.on_balance_callback  = None
+
+        self.symbol     = None      # símbolo acompanhado no feed
+        self.last_tick  = None
+        self.abertos    = 0
+        self.total_trades = 0
+        self._lock      = threading.Lock()
+
+    # ─── INTERFACE DO DerivAPI ──────────────────────────────────────────────
+    def connect(self):
+        self.is_connected = True
+        return True
+
+    def authorize(self):
+        self.is_authorized = True
+        return True
+
+    def disconnect(self):
+        self._soltar()
+        self.is_connected = False
+
+    def set_tick_callback(self, callback):
+        self.on_tick_callback = callback
+
+    def set_contract_callback(self, callback):
+        self.on_contract_callback = callback
+
+    def set_balance_callback(self, callback):
+        self.on_balance_callback = callback
+
+    def subscribe_ticks(self, symbol, since_epoch=None):
+        return self._acompanhar(symbol)
+
+    def resubscribe_ticks(self, symbol):
+        self.feed.ensure(symbol)
+
+    def get_ticks_history(self, symbol, count, timeout=15):
+        if not count or not self._acompanhar(symbol):
+            return []
+        return self.feed.history(symbol, count)
+
+    def prime_proposals(self, shapes):
+        pass
+
+    def forget_proposals(self):
+        pass
+
+    def get_subscription_info(self):
+        return {"total": 0}
+
+    def get_latency_stats(self):
+        return {}
+
+    def open_contract(self, contract_type, symbol, amount, duration, duration_unit="t",
+                      barrier=None, signal_time=None):
+        """Compra imediata: debita o stake e liquida a partir do próximo tick"""
+        tick = self.last_tick
+        contrato = self.settlement.open(contract_type, amount, symbol, duration, duration_unit, barrier,
+                                        callback=self._liquidado,
+                                        after_epoch=tick.get("epoch") if tick is not None else None)
+        with self._lock:
+            self.balance = round(self.balance - contrato.stake, 2)
+            self.abertos += 1
+        self._acompanhar(symbol)
+        return contrato
+
+    # ─── INTERFACE DE FEED (tick_feed do AlphaDolar) ────────────────────────
+    def subscribe(self, symbol, callback):
+        self.on_tick_callback = callback
+        return self._acompanhar(symbol)
+
+    def unsubscribe(self, symbol, callback):
+        if self.on_tick_callback == callback:
+            self.on_tick_callback = None
+
+    def ensure(self, symbol):
+        self.feed.ensure(symbol)
+
+    # ─── STREAM DE TICKS ────────────────────────────────────────────────────
+    def _acompanhar(self, symbol):
+        """Inscreve a conta no feed do símbolo (uma vez)"""
+        with self._lock:
+            if self.symbol == symbol:
+                return True
+            anterior, self.symbol = self.symbol, symbol
+        if anterior is not None:
+            self.feed.unsubscribe(anterior, self._on_tick)
+        if self.feed.subscribe(symbol, self._on_tick):
+            return True
+        with self._lock:
+            self.symbol = None
+        return False
+
+    def _soltar(self):
+        with self._lock:
+            symbol, self.symbol = self.symbol, None
+        if symbol is not None:
+            # stop() do bot costuma vir de um callback na thread do próprio feed
+            threading.Thread(target=self.feed.unsubscribe, args=(symbol, self._on_tick), daemon=True).start()
+
+    def _on_tick(self, tick):
+        self.last_tick = tick
+        if self.on_tick_callback:
+            self.on_tick_callback(tick)
+        if self.abertos:
+            self.settlement.on_tick(tick, self.symbol)
+
+    def _liquidado(self, resultado):
+        with self._lock:
+            self.abertos -= 1
+            self.total_trades += 1
+            self.balance = round(self.balance + resultado["sell_price"], 2)
+        if self.on_contract_callback:
+            self.on_contract_callback(resultado)
+
+    def get_info(self):
+        return {
+            "symbol": self.symbol,
+            "feed": "synthetic" if self.feed is synthetic_feed else "live",
+            "balance": self.balance,
+            "abertos": self.abertos,
+            "trades": self.total_trades,
+        }
+
+
+def _log(message, level="INFO"):
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    emoji = {"INFO": "ℹ️", "SUCCESS": "✅", "ERROR": "❌", "WARNING": "⚠️"}.get(level, "📝")
+    print(f"[{timestamp}] {emoji} [Paper] {message}")
+
+
+if __name__ == "__main__":
+    # Calibração: volatilidade anual realizada e frequência dos últimos dígitos
+    N = 200_000
+    for symbol in ("R_10", "R_25", "R_50", "R_75", "R_100", "1HZ10V", "1HZ100V"):
+        gerador = SyntheticTickGenerator(symbol, seed=7)
+        anterior = gerador.price
+        soma2 = 0.0
+        digitos = [0] * 10
+        for _ in range(N):
+            tick = gerador.next_tick()
+            r = math.log(tick.quote / anterior)
+            soma2 += r * r
+            anterior = tick.quote
+            digitos[int(round(tick.quote * 10 ** gerador.pip_size)) % 10] += 1
+        vol = math.sqrt(soma2 / N * SEGUNDOS_ANO / gerador.interval)
+        esperado = N / 10
+        chi2 = sum((d - esperado) ** 2 / esperado for d in digitos)
+        print(f"  {symbol:8s} vol {vol:6.1%} (alvo {calibracao(symbol)[0]:.0%}) | "
+              f"tick {gerador.interval}s | χ² dígitos {chi2:5.1f} (9 g.l.)")
+
+    # Conta paper sobre o feed sintético: contratos liquidados pelos ticks gerados
+    api = PaperDerivAPI(synthetic_feed, balance=100.0)
+    resultados = []
+    api.set_contract_callback(resultados.append)
+    api.connect()
+    print(f"📈 Warm-start: {len(api.get_ticks_history('1HZ100V', 50))} ticks")
+    api.set_tick_callback(lambda tick: api.open_contract("DIGITEVEN", "1HZ100V", 1.0, 1)
+                          if not api.abertos else None)
+    time.sleep(5)
+    api.disconnect()
+    time.sleep(0.1)
+    print(f"✅ {len(resultados)} contratos liquidados | saldo ${api.balance:.2f} | {api.get_info()}")
@@ -4,6 +4,7 @@ Alpha Dolar 2.0
 """
 from .martingale import Martingale, AntiMartingale, DAlembert, Fibonacci
 from .stop_loss import StopLoss, TrailingStop, SessionManager
+from .monte_carlo import simular_sessoes, comparar_sistemas, ResultadoMonteCarlo
 
 __all__ = [
     'Martingale',
@@ -12,5 +13,8 @@ __all__ = [
     'Fibonacci',
     'StopLoss',
     'TrailingStop',
-    'SessionManager'
+    'SessionManager',
+    'simular_sessoes',
+    'comparar_sistemas',
+    'ResultadoMonteCarlo'
 ]
\ No newline at end of file
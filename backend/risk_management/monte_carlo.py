@@ -0,0 +1,350 @@
+"""
+Monte Carlo de risco de ruína das progressões de stake
+Alpha Dolar 2.0
+
+Simula milhões de sessões em paralelo com NumPy: cada sessão é uma posição
+dos vetores de estado (lucro, step da progressão, perda acumulada) e cada
+iteração do laço é um trade de todas as sessões ativas ao mesmo tempo.
+Sessões que param saem dos vetores, então o custo acompanha as sessões
+ainda vivas.
+
+Progressões (mesmas regras das classes de martingale.py e do AlphaDolar):
+    - fixed:        stake sempre STAKE_INICIAL
+    - martingale:   × multiplicador após derrota, volta ao inicial após
+                    vitória ou ao passar de max_steps
+    - anti:         × multiplicador após vitória (Paroli), reset na derrota
+    - dalembert:    + incremento após derrota, - incremento após vitória
+    - fibonacci:    avança 1 na sequência após derrota, volta 2 após vitória
+    - recuperacao:  fórmula do AlphaDolar._calcular_stake_recuperacao,
+                    (perda_acumulada + STAKE_INICIAL) / PAYOUT_RATE limitada
+                    a 70% do saldo
+
+Regras de parada por sessão (como no bot):
+    - lucro ≥ LUCRO_ALVO                          → "alvo"
+    - lucro ≤ -LIMITE_PERDA                        → "limite"
+    - saldo ≤ STAKE_INICIAL                        → "saldo"
+    - max_trades atingido                          → "max_trades"
+    Stake maior que o saldo zera a progressão (executar_trade faz o mesmo).
+
+Uso:
+    python -m backend.risk_management.monte_carlo --win 0.55 --payout 0.95
+    r = simular_sessoes("martingale", sessoes=1_000_000, win_prob=0.55)
+    r.risco_ruina()          # P(LIMITE_PERDA ou saldo zerado)
+"""
+import time
+
+try:
+    from ..config import BotConfig
+    from ..lazy_import import lazy_module
+except ImportError:
+    from config import BotConfig
+    from lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+# Retorno usado pela fórmula de recuperação do AlphaDolar (self.PAYOUT_RATE)
+PAYOUT_RATE_RECUPERACAO = 0.88
+# Fração máxima do saldo num stake de recuperação
+MAX_STAKE_SALDO = 0.70
+# Sessões simuladas por lote (limita a memória: ~10 vetores float64 por lote)
+LOTE_SESSOES = 1_000_000
+
+MOTIVOS = ("max_trades", "alvo", "limite", "saldo")
+_MAX_TRADES, _ALVO, _LIMITE, _SALDO = range(4)
+
+FIBONACCI = (1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+
+# ─── PROGRESSÕES VETORIZADAS ────────────────────────────────────────────────
+class _Progressao:
+    """Regra de stake sobre vetores (um elemento por sessão)"""
+
+    def __init__(self, stake_inicial):
+        self.stake_inicial = stake_inicial
+
+    def estado_inicial(self, n):
+        return np.zeros(n, dtype=np.int64)
+
+    def stake(self, estado, saldo):
+        return np.full(len(estado), self.stake_inicial)
+
+    def atualizar(self, estado, vitoria, stake):
+        return estado
+
+
+class _Fixa(_Progressao):
+    nome = "fixed"
+
+
+class _Martingale(_Progressao):
+    nome = "martingale"
+
+    def __init__(self, stake_inicial, multiplicador=None, max_steps=None):
+        super().__init__(stake_inicial)
+        self.multiplicador = multiplicador or BotConfig.MULTIPLICADOR_MARTINGALE
+        self.max_steps = max_steps or BotConfig.MAX_MARTINGALE_STEPS
+        self._tabela = np.round(stake_inicial * self.multiplicador ** np.arange(self.max_steps + 1), 2)
+
+    def stake(self, estado, saldo):
+        return self._tabela[estado]
+
+    def atualizar(self, estado, vitoria, stake):
+        return np.where(vitoria, 0, np.where(estado < self.max_steps, estado + 1, 0))
+
+
+class _AntiMartingale(_Martingale):
+    nome = "anti"
+
+    def atualizar(self, estado, vitoria, stake):
+        return np.where(vitoria, np.where(estado < self.max_steps, estado + 1, 0), 0)
+
+
+class _DAlembert(_Progressao):
+    nome = "dalembert"
+
+    def __init__(self, stake_inicial, incremento=None, max_steps=None):
+        super().__init__(stake_inicial)
+        self.incremento = incremento or 1.0
+        self.max_steps = max_steps or BotConfig.MAX_MARTINGALE_STEPS
+        self._tabela = np.round(stake_inicial + self.incremento * np.arange(self.max_steps + 1), 2)
+
+    def stake(self, estado, saldo):
+        return self._tabela[estado]
+
+    def atualizar(self, estado, vitoria, stake):
+        return np.where(vitoria, np.maximum(estado - 1, 0), np.where(estado < self.max_steps, estado + 1, 0))
+
+
+class _Fibonacci(_Progressao):
+    nome = "fibonacci"
+
+    def __init__(self, stake_inicial, max_steps=None):
+        super().__init__(stake_inicial)
+        self.max_steps = max_steps or 10
+        self._limite = min(len(FIBONACCI) - 1, self.max_steps)
+        self._tabela = np.round(stake_inicial * np.array(FIBONACCI, dtype=float), 2)
+
+    def stake(self, estado, saldo):
+        return self._tabela[estado]
+
+    def atualizar(self, estado, vitoria, stake):
+        return np.where(vitoria, np.maximum(estado - 2, 0), np.where(estado < self._limite, estado + 1, 0))
+
+
+class _Recuperacao(_Progressao):
+    """Estado = perda acumulada desde a última vitória"""
+    nome = "recuperacao"
+
+    def __init__(self, stake_inicial, payout_rate=PAYOUT_RATE_RECUPERACAO, max_stake_saldo=MAX_STAKE_SALDO):
+        super().__init__(stake_inicial)
+        self.payout_rate = payout_rate
+        self.max_stake_saldo = max_stake_saldo
+
+    def estado_inicial(self, n):
+        return np.zeros(n)
+
+    def stake(self, estado, saldo):
+        s0 = round(self.stake_inicial, 2)
+        ideal = np.maximum(np.round((estado + self.stake_inicial) / self.payout_rate, 2), s0)
+        limitado = np.round(np.minimum(ideal, saldo * self.max_stake_saldo), 2)
+        return np.where(estado > 0, limitado, s0)
+
+    def atualizar(self, estado, vitoria, stake):
+        return np.where(vitoria, 0.0, estado + stake)
+
+
+SISTEMAS = {
+    "fixed":       _Fixa,
+    "martingale":  _Martingale,
+    "anti":        _AntiMartingale,
+    "dalembert":   _DAlembert,
+    "fibonacci":   _Fibonacci,
+    "recuperacao": _Recuperacao,
+}
+
+
+# ─── RESULTADO ──────────────────────────────────────────────────────────────
+class ResultadoMonteCarlo:
+    """Distribuição do lucro por sessão e motivos de parada"""
+
+    def __init__(self, sistema, parametros, lucro, trades, motivo, segundos):
+        self.sistema    = sistema
+        self.parametros = parametros
+        self.lucro      = lucro      # float64[sessões]
+        self.trades     = trades     # int32[sessões]
+        self.motivo     = motivo     # int8[sessões] (índice em MOTIVOS)
+        self.segundos   = segundos
+
+    @property
+    def sessoes(self):
+        return len(self.lucro)
+
+    def probabilidade(self, motivo):
+        """Fração das sessões encerradas pelo motivo ('alvo', 'limite', 'saldo', 'max_trades')"""
+        return float(np.count_nonzero(self.motivo == MOTIVOS.index(motivo)) / self.sessoes)
+
+    def risco_ruina(self):
+        """P(atingir LIMITE_PERDA ou ficar sem saldo)"""
+        return float(np.count_nonzero(self.motivo >= _LIMITE) / self.sessoes)
+
+    def percentis(self, qs=(1, 5, 25, 50, 75, 95, 99)):
+        return dict(zip(qs, np.percentile(self.lucro, qs).round(2).tolist()))
+
+    def histograma(self, bins=20):
+        """(contagens, bordas) do lucro por sessão"""
+        return np.histogram(self.lucro, bins=bins)
+
+    def get_info(self):
+        return {
+            "sistema":         self.sistema,
+            "sessoes":         self.sessoes,
+            "lucro_medio":     round(float(self.lucro.mean()), 4),
+            "lucro_desvio":    round(float(self.lucro.std()), 4),
+            "percentis":       self.percentis(),
+            "trades_medio":    round(float(self.trades.mean()), 1),
+            "p_alvo":          round(self.probabilidade("alvo"), 4),
+            "p_limite":        round(self.probabilidade("limite"), 4),
+            "p_saldo":         round(self.probabilidade("saldo"), 4),
+            "p_max_trades":    round(self.probabilidade("max_trades"), 4),
+            "risco_ruina":     round(self.risco_ruina(), 4),
+            "sessoes_por_seg": int(self.sessoes / self.segundos) if self.segundos > 0 else 0,
+        }
+
+
+# ─── SIMULAÇÃO ──────────────────────────────────────────────────────────────
+def _simular_lote(n, progressao, win_prob, payout, saldo_inicial, lucro_alvo, limite_perda,
+                  max_trades, rng):
+    lucro_final  = np.zeros(n)
+    trades_final = np.zeros(n, dtype=np.int32)
+    motivo_final = np.full(n, _MAX_TRADES, dtype=np.int8)
+
+    ids    = np.arange(n)
+    lucro  = np.zeros(n)
+    estado = progressao.estado_inicial(n)
+    s0     = progressao.stake_inicial
+
+    for t in range(max_trades):
+        saldo = saldo_inicial + lucro
+        stake = progressao.stake(estado, saldo)
+        # executar_trade: stake acima do saldo zera a progressão
+        estouro = stake > saldo
+        if estouro.any():
+            estado = np.where(estouro, progressao.estado_inicial(1), estado)
+            stake = np.where(estouro, s0, stake)
+
+        vitoria = rng.random(len(ids)) < win_prob
+        lucro = lucro + np.where(vitoria, np.round(stake * payout, 2), -stake)
+        estado = progressao.atualizar(estado, vitoria, stake)
+
+        motivo = np.full(len(ids), -1, dtype=np.int8)
+        motivo[lucro >= lucro_alvo] = _ALVO
+        motivo[lucro <= -limite_perda] = _LIMITE
+        motivo[(motivo < 0) & (saldo_inicial + lucro <= s0)] = _SALDO
+        fim = motivo >= 0
+        if fim.any():
+            parados = ids[fim]
+            lucro_final[parados]  = lucro[fim]
+            trades_final[parados] = t + 1
+            motivo_final[parados] = motivo[fim]
+            vivos = ~fim
+            ids, lucro, estado = ids[vivos], lucro[vivos], estado[vivos]
+            if not len(ids):
+                break
+
+    lucro_final[ids]  = lucro
+    trades_final[ids] = max_trades
+    return lucro_final, trades_final, motivo_final
+
+
+def simular_sessoes(sistema="martingale", sessoes=LOTE_SESSOES, win_prob=0.5, payout=0.95,
+                    stake_inicial=None, lucro_alvo=None, limite_perda=None, saldo=1000.0,
+                    max_trades=BotConfig.MAX_TRADES_PER_DAY, seed=None, **kwargs):
+    """
+    Simula sessões independentes de uma progressão
+
+    Args:
+        sistema (str): Chave de SISTEMAS
+        sessoes (int): Número de sessões
+        win_prob (float): Probabilidade de vitória por trade
+        payout (float): Lucro por unidade de stake na vitória (0.95 = 95%)
+        stake_inicial / lucro_alvo / limite_perda: Padrão do BotConfig
+        saldo (float): Saldo no início de cada sessão
+        max_trades (int): Trades máximos por sessão
+        seed (int): Semente do gerador
+        **kwargs: Parâmetros da progressão (multiplicador, max_steps,
+            incremento, payout_rate, max_stake_saldo)
+
+    Returns:
+        ResultadoMonteCarlo
+    """
+    if sistema not in SISTEMAS:
+        raise ValueError(f"Sistema '{sistema}' desconhecido. Disponíveis: {list(SISTEMAS)}")
+    if not np:
+        raise ImportError("numpy é necessário para o Monte Carlo de risco")
+    stake_inicial = stake_inicial or BotConfig.STAKE_INICIAL
+    lucro_alvo    = lucro_alvo or BotConfig.LUCRO_ALVO
+    limite_perda  = limite_perda or BotConfig.LIMITE_PERDA
+    progressao = SISTEMAS[sistema](stake_inicial, **kwargs)
+    rng = np.random.default_rng(seed)
+
+    inicio = time.perf_counter()
+    lucros, trades, motivos = [], [], []
+    for offset in range(0, sessoes, LOTE_SESSOES):
+        n = min(LOTE_SESSOES, sessoes - offset)
+        l, t, m = _simular_lote(n, progressao, win_prob, payout, saldo, lucro_alvo,
+                                limite_perda, max_trades, rng)
+        lucros.append(l)
+        trades.append(t)
+        motivos.append(m)
+    segundos = time.perf_counter() - inicio
+
+    parametros = {
+        "win_prob": win_prob, "payout": payout, "stake_inicial": stake_inicial,
+        "lucro_alvo": lucro_alvo, "limite_perda": limite_perda, "saldo": saldo,
+        "max_trades": max_trades, **kwargs,
+    }
+    return ResultadoMonteCarlo(sistema, parametros, np.concatenate(lucros),
+                               np.concatenate(trades), np.concatenate(motivos), segundos)
+
+
+def comparar_sistemas(sistemas=None, **kwargs):
+    """simular_sessoes para cada sistema com os mesmos parâmetros"""
+    return [simular_sessoes(s, **kwargs) for s in (sistemas or SISTEMAS)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Risco de ruína das progressões de stake (Monte Carlo)")
+    parser.add_argument("--sistemas", nargs="*", choices=list(SISTEMAS), default=list(SISTEMAS))
+    parser.add_argument("--sessoes", type=int, default=LOTE_SESSOES)
+    parser.add_argument("--win", type=float, default=0.5, help="Probabilidade de vitória por trade")
+    parser.add_argument("--payout", type=float, default=0.95, help="Lucro por stake na vitória")
+    parser.add_argument("--stake", type=float, default=None, help="BotConfig.STAKE_INICIAL")
+    parser.add_argument("--lucro-alvo", type=float, default=None, help="BotConfig.LUCRO_ALVO")
+    parser.add_argument("--limite-perda", type=float, default=None, help="BotConfig.LIMITE_PERDA")
+    parser.add_argument("--saldo", type=float, default=1000.0)
+    parser.add_argument("--max-trades", type=int, default=BotConfig.MAX_TRADES_PER_DAY)
+    parser.add_argument("--multiplicador", type=float, default=None)
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    base = dict(sessoes=args.sessoes, win_prob=args.win, payout=args.payout, stake_inicial=args.stake,
+                lucro_alvo=args.lucro_alvo, limite_perda=args.limite_perda, saldo=args.saldo,
+                max_trades=args.max_trades, seed=args.seed)
+    print(f"\n🎲 Monte Carlo: {args.sessoes:,} sessões | win {args.win:.1%} | payout {args.payout:.0%}")
+    print("-" * 104)
+    print(f"{'sistema':12s} {'lucro médio':>11s} {'p5':>8s} {'p50':>8s} {'p95':>8s} {'trades':>7s} "
+          f"{'P(alvo)':>8s} {'P(limite)':>9s} {'P(saldo)':>8s} {'RUÍNA':>7s} {'tempo':>7s}")
+    for sistema in args.sistemas:
+        extras = {}
+        if sistema in ("martingale", "anti", "dalembert", "fibonacci") and args.max_steps:
+            extras["max_steps"] = args.max_steps
+        if sistema in ("martingale", "anti") and args.multiplicador:
+            extras["multiplicador"] = args.multiplicador
+        r = simular_sessoes(sistema, **base, **extras)
+        info, p = r.get_info(), r.percentis((5, 50, 95))
+        print(f"{sistema:12s} {info['lucro_medio']:>11.3f} {p[5]:>8.2f} {p[50]:>8.2f} {p[95]:>8.2f} "
+              f"{info['trades_medio']:>7.1f} {info['p_alvo']:>8.2%} {info['p_limite']:>9.2%} "
+              f"{info['p_saldo']:>8.2%} {info['risco_ruina']:>7.2%} {r.segundos:>6.2f}s")
@@ -0,0 +1,79 @@
+"""
+ALPHA DOLAR 2.0 - Benchmark do processamento de ticks
+Mede ticks/s por núcleo em DerivAPI._on_message, sem rede:
+caminho genérico (json stdlib + cadeia de msg_type) vs caminho rápido
+(msg_type "tick" direto ao callback + TickRecord + backend JSON mais rápido).
+
+Uso: python backend/scripts/bench_ticks.py [quantidade]
+"""
+
+import sys
+import os
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deriv_api
+from deriv_api import DerivAPI
+from tick_record import JSON_BACKEND
+
+
+def montar_frame(epoch):
+    """Frame de tick no formato compacto que a Deriv envia"""
+    return json.dumps({
+        "echo_req": {"subscribe": 1, "ticks": "1HZ100V", "req_id": 1},
+        "msg_type": "tick",
+        "req_id": 1,
+        "subscription": {"id": "f1d2c3b4-0000-1111-2222-333344445555"},
+        "tick": {"ask": 1234.57, "bid": 1234.55, "epoch": epoch, "id": "f1d2c3b4-0000-1111-2222-333344445555",
+                 "pip_size": 2, "quote": 1234.56, "symbol": "1HZ100V"},
+    }, separators=(",", ":"))
+
+
+def medir(api, frames):
+    inicio = time.perf_counter()
+    for frame in frames:
+        api._on_message(None, frame)
+    return len(frames) / (time.perf_counter() - inicio)
+
+
+def criar_api():
+    api = DerivAPI(public=True)
+    api.log = lambda *args, **kwargs: None
+    # Assinatura de ticks já confirmada, como após a primeira resposta
+    api._subscriptions[("ticks", "1HZ100V")] = "f1d2c3b4-0000-1111-2222-333344445555"
+    api._sub_by_req[1] = ("ticks", "1HZ100V")
+    recebidos = []
+    api.set_tick_callback(lambda tick: recebidos.append(tick.get("quote")))
+    return api, recebidos
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    frames = [montar_frame(1700000000 + i) for i in range(quantidade)]
+
+    print("=" * 60)
+    print("⚡ ALPHA DOLAR 2.0 - BENCHMARK DE TICKS")
+    print("=" * 60)
+    print(f"Frames: {quantidade} | Backend JSON: {JSON_BACKEND}")
+
+    # Antes: json da stdlib e sem caminho rápido
+    json_loads_original = deriv_api.json_loads
+    deriv_api.json_loads = json.loads
+    api, recebidos = criar_api()
+    api._tick_rapido = lambda data: False
+    antes = medir(api, frames)
+    deriv_api.json_loads = json_loads_original
+
+    api, recebidos = criar_api()
+    depois = medir(api, frames)
+    assert len(recebidos) == quantidade
+
+    print(f"\n📉 Caminho genérico : {antes:>12,.0f} ticks/s")
+    print(f"📈 Caminho rápido   : {depois:>12,.0f} ticks/s")
+    print(f"🚀 Ganho            : {depois / antes:.2f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""
+Settlement — liquidação local de contratos por ticks
+Alpha Dolar 2.0
+
+Decide o resultado de contratos de dígitos (DIGITEVEN/ODD/OVER/UNDER/
+MATCH/DIFF) e Rise/Fall (CALL/PUT, CALLE/PUTE) a partir do próprio stream de ticks,
+sem ida ao servidor. Usado pelo backtest, pelos trades virtuais e
+simulados dos painéis (DerivBridge) e pela conferência de sinais do robô
+mestre, que antes abria um WebSocket novo só para ler um dígito.
+
+Regras (contratos em ticks):
+    - ticks com epoch ≤ o da compra são ignorados; o primeiro tick depois
+      da compra é o spot de entrada
+    - DIGIT*: último dígito do tick nº `duração` após a compra (pip_size do
+      símbolo)
+    - CALL/PUT: saída `duração` ticks depois da entrada (empate perde;
+      CALLE/PUTE ganham no empate)
+    - durações em s/m/h/d: saída no primeiro tick com epoch ≥ entrada + duração
+
+Payout (lucro por unidade de stake): PayoutTable, com valores por contrato
+ou por (contrato, barreira) e, no resto, margem fixa da casa:
+    (1 - house_edge) / probabilidade - 1
+
+Uso:
+    engine = SettlementEngine(payouts={"DIGITEVEN": 0.95})
+    c = engine.open("DIGITEVEN", 1.0, symbol="R_100")
+    engine.on_tick(tick)          # liquida os contratos que vencem no tick
+    c.result                      # {"status": "won", "profit": 0.95, ...}
+
+    settle_live("R_100", "DIGITODD")   # espera o resultado no feed público (tick_hub)
+"""
+import threading
+
+try:
+    from .digits import decimals_for, last_digit
+    from .lazy_import import LazyObject
+except ImportError:
+    from digits import decimals_for, last_digit
+    from lazy_import import LazyObject
+
+# Margem da casa usada no payout padrão (≈ 95% em Rise/Fall e Over 4/Under 5)
+HOUSE_EDGE = 0.025
+
+CONTRACT_TYPES = ("CALL", "PUT", "CALLE", "PUTE", "DIGITEVEN", "DIGITODD", "DIGITOVER", "DIGITUNDER", "DIGITMATCH", "DIGITDIFF")
+
+_DURATION_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+# ─── REGRAS ─────────────────────────────────────────────────────────────────
+def win_probability(contract_type, barrier=None):
+    """Probabilidade teórica de vitória (dígitos uniformes, Rise/Fall 50%)"""
+    if contract_type in ("DIGITOVER", "DIGITUNDER", "DIGITMATCH", "DIGITDIFF"):
+        b = int(barrier)
+        return {"DIGITOVER": (9 - b) / 10, "DIGITUNDER": b / 10,
+                "DIGITMATCH": 0.1, "DIGITDIFF": 0.9}[contract_type]
+    return 0.5
+
+
+def default_payout(contract_type, barrier=None, house_edge=HOUSE_EDGE):
+    """Lucro por unidade de stake para o contrato (modelo de margem fixa)"""
+    p = win_probability(contract_type, barrier)
+    if p <= 0:
+        return 0.0
+    return round((1 - house_edge) / p - 1, 4)
+
+
+def contract_won(contract_type, entry_quote, exit_quote, exit_digit, barrier=None):
+    """Resultado do contrato no tick de saída"""
+    if contract_type == "CALL":
+        return exit_quote > entry_quote
+    if contract_type == "PUT":
+        return exit_quote < entry_quote
+    if contract_type == "CALLE":
+        return exit_quote >= entry_quote
+    if contract_type == "PUTE":
+        return exit_quote <= entry_quote
+    if contract_type == "DIGITEVEN":
+        return exit_digit % 2 == 0
+    if contract_type == "DIGITODD":
+        return exit_digit % 2 == 1
+    b = int(barrier)
+    if contract_type == "DIGITOVER":
+        return exit_digit > b
+    if contract_type == "DIGITUNDER":
+        return exit_digit < b
+    if contract_type == "DIGITMATCH":
+        return exit_digit == b
+    if contract_type == "DIGITDIFF":
+        return exit_digit != b
+    raise ValueError(f"Tipo de contrato não suportado na liquidação local: {contract_type}")
+
+
+class PayoutTable:
+    """Lucro por unidade de stake de cada contrato"""
+
+    def __init__(self, table=None, house_edge=HOUSE_EDGE):
+        """
+        Args:
+            table (dict): contract_type → lucro, ou (contract_type, barreira) → lucro
+                (ex.: {"CALL": 0.95, ("DIGITOVER", 4): 0.96})
+            house_edge (float): Margem do modelo padrão para o que não estiver na tabela
+        """
+        self.table = {}
+        for chave, valor in (table or {}).items():
+            if isinstance(chave, tuple):
+                chave = (chave[0], int(chave[1]))
+            self.table[chave] = float(valor)
+        self.house_edge = house_edge
+
+    def get(self, contract_type, barrier=None):
+        if barrier is not None:
+            valor = self.table.get((contract_type, int(barrier)))
+            if valor is not None:
+                return valor
+        valor = self.table.get(contract_type)
+        if valor is not None:
+            return valor
+        return default_payout(contract_type, barrier, self.house_edge)
+
+
+# ─── CONTRATOS ──────────────────────────────────────────────────────────────
+class Contract:
+    """Contrato aberto na liquidação local"""
+
+    __slots__ = ("contract_id", "contract_type", "symbol", "stake", "barrier", "duration",
+                 "duration_unit", "after_epoch", "ticks", "entry_quote", "entry_epoch",
+                 "callback", "result", "_done")
+
+    def __init__(self, contract_id, contract_type, symbol, stake, duration, duration_unit,
+                 barrier, after_epoch, callback):
+        self.contract_id   = contract_id
+        self.contract_type = contract_type
+        self.symbol        = symbol
+        self.stake         = round(float(stake), 2)
+        self.barrier       = barrier
+        self.duration      = int(duration)
+        self.duration_unit = duration_unit
+        self.after_epoch   = after_epoch
+        self.ticks         = 0        # ticks recebidos desde a compra
+        self.entry_quote   = None
+        self.entry_epoch   = None
+        self.callback      = callback
+        self.result        = None
+        self._done         = threading.Event()
+
+    @property
+    def settled(self):
+        return self.result is not None
+
+    def wait(self, timeout=None):
+        """Bloqueia até a liquidação; retorna o resultado ou None no timeout"""
+        self._done.wait(timeout)
+        return self.result
+
+    def _expired(self, epoch):
+        if self.duration_unit == "t":
+            if self.contract_type.startswith("DIGIT"):
+                return self.ticks >= self.duration
+            return self.ticks >= self.duration + 1
+        segundos = self.duration * _DURATION_SECONDS.get(self.duration_unit, 1)
+        return epoch is not None and epoch >= self.entry_epoch + segundos
+
+
+class SettlementEngine:
+    """
+    Contratos abertos por símbolo, liquidados pelos ticks recebidos em
+    on_tick(). Com feed (tick_hub), assina o símbolo enquanto houver
+    contrato aberto nele.
+    """
+
+    def __init__(self, payouts=None, feed=None, house_edge=HOUSE_EDGE):
+        """
+        Args:
+            payouts: PayoutTable ou dict aceito por ela
+            feed: Objeto com subscribe(symbol, cb)/unsubscribe(symbol, cb)
+                (tick_hub); None = ticks entregues por quem usa o engine
+        """
+        self.payouts = payouts if isinstance(payouts, PayoutTable) else PayoutTable(payouts, house_edge)
+        self.feed = feed
+        self.settled = 0
+        self._pending    = {}   # símbolo → [Contract]
+        self._last_epoch = {}   # símbolo → epoch do último tick visto
+        self._decimals   = {}
+        self._watchers   = {}   # símbolo → callback inscrito no feed
+        self._next_id    = 1
+        self._lock       = threading.Lock()
+
+    def open(self, contract_type, stake, symbol=None, duration=1, duration_unit="t",
+             barrier=None, callback=None, after_epoch=None):
+        """
+        Abre o contrato
+
+        Args:
+            contract_type (str): Um de CONTRACT_TYPES
+            stake (float): Valor apostado
+            symbol (str): Símbolo dos ticks que liquidam o contrato
+            callback: Chamado com o dict de resultado na liquidação
+            after_epoch (int): Epoch da compra (padrão: último tick visto do símbolo)
+
+        Returns:
+            Contract (cancelado, com wait() → None, se o feed não assinar o símbolo)
+        """
+        if contract_type not in CONTRACT_TYPES:
+            raise ValueError(f"Tipo de contrato não suportado na liquidação local: {contract_type}")
+        with self._lock:
+            if after_epoch is None:
+                after_epoch = self._last_epoch.get(symbol)
+            contrato = Contract(self._next_id, contract_type, symbol, stake, duration,
+                                duration_unit, barrier, after_epoch, callback)
+            self._next_id += 1
+            self._pending.setdefault(symbol, []).append(contrato)
+            assinar = self.feed is not None and symbol is not None and symbol not in self._watchers
+            if assinar:
+                self._watchers[symbol] = lambda tick: self.on_tick(tick, symbol)
+        if assinar and not self.feed.subscribe(symbol, self._watchers[symbol]):
+            # Sem feed nada liquida os contratos do símbolo: cancela todos
+            with self._lock:
+                self._watchers.pop(symbol, None)
+                cancelados = self._pending.pop(symbol, [])
+            for c in cancelados:
+                c._done.set()
+        return contrato
+
+    def cancel(self, contrato):
+        """
+        Retira o contrato não liquidado (ex.: timeout de settle_live); sem
+        contratos abertos no símbolo, desinscreve o feed
+
+        Returns:
+            bool: False se o contrato já tinha sido liquidado ou cancelado
+        """
+        symbol = contrato.symbol
+        with self._lock:
+            lista = self._pending.get(symbol, [])
+            if contrato not in lista:
+                return False
+            lista.remove(contrato)
+            soltar = self._watchers.pop(symbol, None) if not lista else None
+        contrato._done.set()
+        if soltar is not None:
+            self._soltar_feed(symbol, soltar)
+        return True
+
+    def pending(self, symbol=None):
+        """Contratos ainda abertos (de um símbolo ou todos)"""
+        if symbol is not None:
+            return list(self._pending.get(symbol, ()))
+        return [c for lista in self._pending.values() for c in lista]
+
+    def on_tick(self, tick, symbol=None):
+        """
+        Aplica o tick aos contratos abertos do símbolo
+
+        Args:
+            tick: dict ou TickRecord com quote (epoch, symbol e pip_size opcionais)
+            symbol (str): Símbolo, se o tick não trouxer
+
+        Returns:
+            list: Contratos liquidados neste tick
+        """
+        if symbol is None:
+            symbol = tick.get("symbol")
+        epoch = tick.get("epoch")
+        if epoch is not None:
+            self._last_epoch[symbol] = epoch
+        if not self._pending.get(symbol):
+            return []
+
+        quote = float(tick.get("quote"))
+        fechados = []
+        with self._lock:
+            restantes = []
+            for c in self._pending.get(symbol, ()):
+                if c.after_epoch is not None and epoch is not None and epoch <= c.after_epoch:
+                    restantes.append(c)
+                    continue
+                c.ticks += 1
+                if c.entry_quote is None:
+                    c.entry_quote, c.entry_epoch = quote, epoch
+                if c._expired(epoch):
+                    fechados.append(c)
+                else:
+                    restantes.append(c)
+            self._pending[symbol] = restantes
+            soltar = self._watchers.pop(symbol, None) if not restantes else None
+        if soltar is not None:
+            self._soltar_feed(symbol, soltar)
+
+        for c in fechados:
+            self._close(c, tick, symbol, quote, epoch)
+        return fechados
+
+    def _soltar_feed(self, symbol, callback):
+        # on_tick roda na thread do próprio feed: desinscreve fora dela
+        threading.Thread(target=self.feed.unsubscribe, args=(symbol, callback), daemon=True).start()
+
+    def _close(self, c, tick, symbol, quote, epoch):
+        decimals = self._decimals.get(symbol)
+        if decimals is None:
+            decimals = self._decimals[symbol] = decimals_for(symbol, tick.get("pip_size"))
+        digito = last_digit(quote, decimals, symbol)
+        won = contract_won(c.contract_type, c.entry_quote, quote, digito, c.barrier)
+        payout = self.payouts.get(c.contract_type, c.barrier)
+        sell_price = round(c.stake * (1 + payout), 2) if won else 0.0
+        c.result = {
+            "contract_id":   c.contract_id,
+            "contract_type": c.contract_type,
+            "barrier":       c.barrier,
+            "symbol":        symbol,
+            "status":        "won" if won else "lost",
+            "buy_price":     c.stake,
+            "sell_price":    sell_price,
+            "profit":        round(sell_price - c.stake, 2),
+            "payout":        payout,
+            "entry_tick":    c.entry_quote,
+            "exit_tick":     quote,
+            "exit_epoch":    epoch,
+            "digito":        digito,
+        }
+        self.settled += 1
+        c._done.set()
+        if c.callback:
+            c.callback(c.result)
+
+    def get_info(self):
+        return {
+            "abertos": {str(s): len(lista) for s, lista in self._pending.items() if lista},
+            "liquidados": self.settled,
+            "feeds": list(self._watchers),
+        }
+
+
+def _tick_hub():
+    try:
+        from .tick_hub import tick_hub
+    except ImportError:
+        from tick_hub import tick_hub
+    return tick_hub
+
+
+# Instância do processo ligada ao feed público compartilhado (tick_hub importado no 1º uso)
+settlement_engine = SettlementEngine(feed=LazyObject(_tick_hub))
+
+
+def settle_live(symbol, contract_type, stake=1.0, duration=1, barrier=None, timeout=15):
+    """
+    Abre o contrato no settlement_engine e espera a liquidação pelos ticks
+    do feed público do símbolo
+
+    Returns:
+        dict: Resultado (ver SettlementEngine._close) ou None no timeout ou
+        sem feed do símbolo (o contrato é cancelado)
+    """
+    contrato = settlement_engine.open(contract_type, stake, symbol, duration, barrier=barrier)
+    resultado = contrato.wait(timeout)
+    if resultado is None and not settlement_engine.cancel(contrato):
+        # Saiu da fila no último tick: a liquidação está terminando
+        resultado = contrato.wait(1)
+    return resultado
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    engine = SettlementEngine(payouts={"CALL": 0.95, ("DIGITOVER", 4): 0.96})
+    resultados = []
+    epoch, preco = 1_700_000_000, 1000.0
+    tipos = [("DIGITEVEN", None), ("DIGITODD", None), ("DIGITOVER", 4), ("DIGITUNDER", 5),
+             ("DIGITMATCH", 7), ("DIGITDIFF", 7), ("CALL", None), ("PUT", None)]
+    inicio = time.perf_counter()
+    for i in range(200_000):
+        epoch += 1
+        preco = round(preco + random.gauss(0, 0.5), 2)
+        if i % 2 == 0:
+            tipo, barreira = tipos[i // 2 % len(tipos)]
+            engine.open(tipo, 1.0, "R_100", duration=random.choice((1, 5)), barrier=barreira,
+                        callback=resultados.append, after_epoch=epoch)
+        engine.on_tick({"epoch": epoch, "quote": preco, "symbol": "R_100"})
+    dt = time.perf_counter() - inicio
+    for tipo, _ in tipos:
+        r = [x for x in resultados if x["contract_type"] == tipo]
+        wins = sum(x["status"] == "won" for x in r)
+        print(f"  {tipo:11s} {len(r):6d} contratos | win {wins / len(r):6.1%} | lucro {sum(x['profit'] for x in r):+9.2f}")
+    print(f"✅ {engine.settled} liquidados | {dt / engine.settled * 1e6:.2f} µs por contrato")
@@ -91,6 +91,11 @@ def get_bot_instance(deriv_id, bot_type):
     with _local_lock:
         return _local_instances.get(deriv_id, {}).get(bot_type)
 
+def list_bot_instances():
+    """Todas as instâncias de bot vivas neste worker"""
+    with _local_lock:
+        return [inst for bots in _local_instances.values() for inst in bots.values()]
+
 def clear_bot_instance(deriv_id, bot_type):
     """Remove instância do bot"""
     with _local_lock:
@@ -1,17 +1,43 @@
 """
 Módulo de Estratégias de Trading
 Alpha Dolar 2.0
+
+As classes de estratégia são importadas sob demanda (registry.py): o
+primeiro acesso a strategies.AlphaBot1 ou get_strategy('alpha_bot_1')
+carrega o módulo correspondente.
 """
 from .base_strategy import BaseStrategy
-from .alpha_bot_1 import AlphaBot1, AlphaBot1Reverse, AlphaBot1MA
-from .alpha_bot_4_digit import AlphaBot4DigitPattern
-from .digit_sniper import DigitSniper
-from .digit_pulse import DigitPulse
-from .mega_digit import MegaDigit1, MegaDigit2
+from .indicators import IndicatorEngine
+from .digit_windows import DigitWindows
+from .indicator_cache import indicator_cache, IndicatorCache
+from .quantile_sketch import QuantileSketch, WindowedQuantileSketch, VolatilityRegime
+from .ensemble import StrategyEnsemble
+from .batch import BatchResult
+from .registry import strategy_registry, panel_registry, StrategyRegistry, STRATEGY_PATHS, DIGIT_STRATEGIES
+
+# Classe → ".módulo" de cada estratégia exportada (importada no primeiro acesso)
+_LAZY_CLASSES = {path.rsplit('.', 1)[1]: path.rsplit('.', 1)[0] for path in STRATEGY_PATHS.values()}
+_LAZY_CLASSES.update({
+    'AlphaBot1Reverse': '.alpha_bot_1',
+    'AlphaBot1MA':      '.alpha_bot_1',
+})
 
 __all__ = [
     # Base
     'BaseStrategy',
+    'IndicatorEngine',
+    'DigitWindows',
+    'IndicatorCache',
+    'indicator_cache',
+    'QuantileSketch',
+    'WindowedQuantileSketch',
+    'VolatilityRegime',
+    'StrategyEnsemble',
+    'BatchResult',
+    # Registro
+    'StrategyRegistry',
+    'strategy_registry',
+    'get_strategy',
     # Rise/Fall
     'AlphaBot1',
     'AlphaBot1Reverse',
@@ -26,25 +52,17 @@ __all__ = [
     'MegaDigit2',
 ]
 
-# Mapa de estratégias por chave (usado pelos painéis)
-STRATEGY_MAP = {
-    # Rise/Fall
-    "alpha_bot_1":  AlphaBot1,
-    "alpha_bot_2":  AlphaBot1Reverse,
-    "alpha_bot_3":  AlphaBot1MA,
-    # Dígitos FREE
-    "alpha_bot_4":  AlphaBot4DigitPattern,
-    # Dígitos VIP
-    "digit_sniper": DigitSniper,
-    "digit_pulse":  DigitPulse,
-    # Dígitos PREMIUM
-    "mega_digit_1": MegaDigit1,
-    "mega_digit_2": MegaDigit2,
-}
+
+def __getattr__(name):
+    module = _LAZY_CLASSES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 def get_strategy(key):
-    """Retorna instância da estratégia pelo nome"""
-    cls = STRATEGY_MAP.get(key)
-    if cls is None:
-        raise ValueError(f"Estratégia '{key}' não encontrada. Disponíveis: {list(STRATEGY_MAP.keys())}")
-    return cls()
\ No newline at end of file
+    """Retorna instância da estratégia pelo nome (chaves dos painéis, ver PANEL_STRATEGY_PATHS)"""
+    return panel_registry.create(key, default=None)
@@ -0,0 +1,35 @@
+"""
+Catálogo de estratégias e tempos de importação
+
+    python -m backend.strategies                     # ids → módulo.Classe
+    python -m backend.strategies --profile-imports   # ms por módulo
+"""
+import sys
+
+try:
+    from .registry import strategy_registry
+except ImportError:
+    from registry import strategy_registry
+
+
+def main(argv):
+    if '--profile-imports' not in argv:
+        print("Uso: python -m backend.strategies --profile-imports")
+        for strategy_id in strategy_registry.ids():
+            print(f"  {strategy_id:20s} {strategy_registry.path(strategy_id)}")
+        return 0
+
+    report = strategy_registry.profile_imports()
+    total = 0.0
+    print("\n⏱️  Importação dos módulos de estratégia")
+    print("-" * 60)
+    for module, secs, ids in sorted(report, key=lambda r: -r[1]):
+        total += secs
+        print(f"  {secs * 1000:8.2f} ms  {module:45s} {', '.join(ids)}")
+    print("-" * 60)
+    print(f"  {total * 1000:8.2f} ms  total ({len(report)} módulos, {len(strategy_registry)} estratégias)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
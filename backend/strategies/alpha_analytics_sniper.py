@@ -4,8 +4,8 @@ Análise estatística avançada de padrões
 Lógica: Z-score + correlação de padrões históricos
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, rsi, momentum, zscore, count_true, score_signals
 from ..config import BotConfig
-import statistics
 
 class AlphaAnalytics(BaseStrategy):
     TRADING_MODE_CONFIG = {
@@ -62,17 +62,7 @@ class AlphaAnalytics(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-30:]]
-            current = prices[-1]
-            mean = statistics.mean(prices)
-            std  = statistics.stdev(prices) or 0.001
-            zscore = (current - mean) / std
-
-            # Padrão de alternância
-            last6 = prices[-6:]
-            alternating = sum(1 for i in range(1, 6) if (last6[i]-last6[i-1]) * (last6[i-1]-last6[i-2] if i > 1 else -1) < 0)
-            momentum = (prices[-1] - prices[-5]) / prices[-5] * 100
-            vol = statistics.stdev(prices[-10:])
+            zscore = self.indicators.zscore(30)
 
             # Z-score negativo extremo → CALL (preço muito abaixo da média)
             if zscore < -self.zscore_threshold:
@@ -93,6 +83,15 @@ class AlphaAnalytics(BaseStrategy):
             print(f"⚠️ Alpha Analytics erro: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        z = zscore(quotes, 30)
+        conf = (0.62 + abs(z) * 0.06).clip(max=0.92)
+        call_score = z < -self.zscore_threshold
+        put_score  = z > self.zscore_threshold
+        direction, confidence = score_signals(call_score, put_score, 1, lambda s: conf, self.min_confidence)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
@@ -157,14 +156,6 @@ class AlphaSniper(BaseStrategy):
 
     def get_stake(self): return self.stake_atual
 
-    def _rsi(self, prices, period=14):
-        if len(prices) < period+1: return 50.0
-        gains  = [max(0, prices[-i]-prices[-i-1]) for i in range(1, period+1)]
-        losses = [max(0, prices[-i-1]-prices[-i]) for i in range(1, period+1)]
-        ag = statistics.mean(gains) or 0.001
-        al = statistics.mean(losses) or 0.001
-        return 100 - (100/(1+ag/al))
-
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
         if len(self.ticks_history) < self.min_history:
@@ -172,15 +163,14 @@ class AlphaSniper(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-35:]]
-            current = prices[-1]
-            ma10 = statistics.mean(prices[-10:])
-            ma20 = statistics.mean(prices[-20:])
-            ma35 = statistics.mean(prices)
-            std  = statistics.stdev(prices[-20:])
-            rsi  = self._rsi(prices)
-            mom  = (prices[-1]-prices[-8])/prices[-8]*100
-            vol  = statistics.stdev(prices[-10:])
+            ind = self.indicators
+            current = ind.last
+            ma10 = ind.sma(10)
+            ma20 = ind.sma(20)
+            ma35 = ind.sma(35)
+            std  = ind.stdev(20)
+            rsi  = ind.rsi()
+            mom  = ind.momentum(7)
             zscore = (current - ma35) / (std or 0.001)
 
             # SNIPER CALL — tudo alinhado
@@ -220,6 +210,21 @@ class AlphaSniper(BaseStrategy):
             print(f"⚠️ Alpha Sniper erro: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ma10 = rolling_mean(quotes, 10)
+        ma20 = rolling_mean(quotes, 20)
+        ma35 = rolling_mean(quotes, 35)
+        std  = rolling_stdev(quotes, 20)
+        r    = rsi(quotes)
+        mom  = momentum(quotes, 7)
+        z    = (quotes - ma35) / (std + 0.001 * (std == 0))   # (std or 0.001)
+        cs = count_true(r < 32, quotes < ma10, quotes < ma20, ma10 < ma20, mom < -0.15, z < -1.8)
+        ps = count_true(r > 68, quotes > ma10, quotes > ma20, ma10 > ma20, mom > 0.15, z > 1.8)
+        direction, confidence = score_signals(cs, ps, self.min_conditions,
+                                              lambda s: 0.70 + (s / 6) * 0.25, self.min_confidence, cap=0.95)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
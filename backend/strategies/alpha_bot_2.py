@@ -4,8 +4,8 @@ FREE | Win Rate esperado: 74%
 Lógica: Detecta sobrecompra/sobrevenda e entra na reversão
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, momentum, consecutive, count_true, score_signals
 from ..config import BotConfig
-import statistics
 
 class AlphaBot2(BaseStrategy):
     TRADING_MODE_CONFIG = {
@@ -64,21 +64,21 @@ class AlphaBot2(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-20:]]
-            current = prices[-1]
-            ma20 = statistics.mean(prices)
-            std  = statistics.stdev(prices)
+            ind = self.indicators
+            current = ind.last
+            ma20 = ind.sma(20)
+            std  = ind.stdev(20)
 
             # Bandas de Bollinger simples
             upper_band = ma20 + (2 * std)
             lower_band = ma20 - (2 * std)
 
             # Sequência dos últimos 5 ticks (direção)
-            last5 = prices[-5:]
+            last5 = [ind.price(k) for k in range(4, -1, -1)]
             consec_up   = all(last5[i] > last5[i-1] for i in range(1, 5))
             consec_down = all(last5[i] < last5[i-1] for i in range(1, 5))
 
-            momentum = (prices[-1] - prices[-5]) / prices[-5] * 100
+            momentum = ind.momentum(4)
 
             # CALL: preço bateu na banda inferior e começa a reverter
             call_conditions = [
@@ -115,6 +115,18 @@ class AlphaBot2(BaseStrategy):
             print(f"⚠️ Alpha Bot 2 erro: {e}")
             return False, None, 0.0
 
+
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ma20 = rolling_mean(quotes, 20)
+        std  = rolling_stdev(quotes, 20)
+        mom  = momentum(quotes, 4)
+        call_score = count_true(quotes <= ma20 - (2 * std), consecutive(quotes, 4, up=False), mom < -0.1, std > 0.05)
+        put_score  = count_true(quotes >= ma20 + (2 * std), consecutive(quotes, 4, up=True), mom > 0.1, std > 0.05)
+        direction, confidence = score_signals(call_score, put_score, self.min_conditions,
+                                              lambda s: 0.60 + (s / 4) * 0.30, self.min_confidence)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
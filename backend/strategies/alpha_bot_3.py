@@ -4,6 +4,7 @@ FREE | Win Rate esperado: 71%
 Lógica: RSI simplificado + filtro de ruído por desvio padrão
 """
 from .base_strategy import BaseStrategy
+from .batch import rsi_split_means, rolling_stdev, momentum, count_true, score_signals
 from ..config import BotConfig
 import statistics
 
@@ -78,7 +79,7 @@ class AlphaBot3(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-20:]]
+            prices = self.ticks_history.last(20)
             rsi = self._calc_rsi(prices)
             volatility = statistics.stdev(prices[-10:]) if len(prices) >= 10 else 0
             momentum = (prices[-1] - prices[-5]) / prices[-5] * 100 if len(prices) >= 5 else 0
@@ -117,6 +118,21 @@ class AlphaBot3(BaseStrategy):
             print(f"⚠️ Alpha Bot 3 erro: {e}")
             return False, None, 0.0
 
+
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        rsi, valid = rsi_split_means(quotes, 14)
+        volatility = rolling_stdev(quotes, 10)
+        mom = momentum(quotes, 4)
+        noise = volatility / (abs(mom) + 0.001)
+        call_score = count_true(rsi < 35, mom < -0.05, noise < 5, volatility > 0.02)
+        put_score  = count_true(rsi > 65, mom > 0.05, noise < 5, volatility > 0.02)
+        direction, confidence = score_signals(call_score, put_score, self.min_conditions,
+                                              lambda s: 0.55 + (s / 4) * 0.35, self.min_confidence)
+        direction[~valid] = 0
+        confidence[~valid] = 0.0
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
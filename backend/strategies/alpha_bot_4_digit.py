@@ -3,17 +3,20 @@ Alpha Bot 4 - Digit Pattern Analysis (FREE)
 Analisa frequência dos últimos 100 dígitos e encontra barreira ótima.
 FIX 03/03: Barreira mínima 5 para payout justo + fallback seguro no watchdog
 """
-from collections import Counter, deque
+from collections import deque
 
 try:
     from .base_strategy import BaseStrategy
+    from .digit_windows import DigitWindows
 except ImportError:
     try:
         from strategies.base_strategy import BaseStrategy
+        from strategies.digit_windows import DigitWindows
     except ImportError:
         import sys, os
         sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         from strategies.base_strategy import BaseStrategy
+        from strategies.digit_windows import DigitWindows
 
 try:
     from ..config import BotConfig
@@ -32,6 +35,7 @@ class AlphaBot4DigitPattern(BaseStrategy):
         self.tier = "FREE"
         self.contract_type = "DIGITOVER/DIGITUNDER"
         self.digit_history = deque(maxlen=200)
+        self.digit_windows = DigitWindows((100,))
         self.min_ticks = 50
         self.min_confidence = 60.0
         self._last_barrier = 5       # ✅ Padrão: barreira 5 (50/50, payout justo)
@@ -39,33 +43,26 @@ class AlphaBot4DigitPattern(BaseStrategy):
         self._last_contract = "DIGITOVER"
 
     def _get_last_digit(self, price):
-        return int(str(float(price)).replace(".", "")[-1])
+        return self.last_digit(float(price))
 
-    def _calc_frequency(self, digits):
-        c = Counter(digits)
-        t = len(digits)
-        return {d: c.get(d, 0) / t * 100 for d in range(10)}
+    def preload(self, ticks):
+        super().preload(ticks)
+        digits = [self._get_last_digit(float(t.get("quote", 0))) for t in ticks]
+        self.digit_history.extend(digits)
+        self.digit_windows.extend(digits)
 
-    def _find_best_barrier(self, frequency):
+    def _find_best_barrier(self, windows):
         """
         Busca barreira com melhor probabilidade, mínimo 5.
         Barreira < 5 = payout muito baixo (não vale o risco).
         """
-        best = None
         # ✅ Começa em 3, mas só aceita barreira >= 4
-        for barrier in range(3, 9):
-            prob_over  = sum(frequency.get(d, 0) for d in range(barrier + 1, 10))
-            prob_under = sum(frequency.get(d, 0) for d in range(0, barrier))
-            direction, confidence = ("OVER", prob_over) if prob_over >= prob_under else ("UNDER", prob_under)
-            if best is None or confidence > best[2]:
-                best = (barrier, direction, confidence)
+        barrier, direction, confidence = windows.best_barrier(100, first=3, last=8)
 
         # ✅ Garante barreira mínima 4 para payout razoável
-        barrier, direction, confidence = best
         if barrier < 4:
             barrier = 5
-            prob_over  = sum(frequency.get(d, 0) for d in range(6, 10))
-            prob_under = sum(frequency.get(d, 0) for d in range(0, 5))
+            prob_over, prob_under = windows.over_under_pct(100, barrier)
             direction = "OVER" if prob_over >= prob_under else "UNDER"
             confidence = max(prob_over, prob_under)
 
@@ -86,11 +83,14 @@ class AlphaBot4DigitPattern(BaseStrategy):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_last_digit(float(tick_data.get("quote", 0))))
+        digit = self._get_last_digit(float(tick_data.get("quote", 0)))
+        self.digit_history.append(digit)
+        self.digit_windows.push(digit)
         if len(self.digit_history) < self.min_ticks:
             return False, None, 0.0
-        freq = self._calc_frequency(list(self.digit_history)[-100:])
-        barrier, direction, confidence = self._find_best_barrier(freq)
+        windows = self.shared.digits if self.shared is not None else self.digit_windows
+        barrier, direction, confidence = self.shared_value(
+            (AlphaBot4DigitPattern, "barrier"), lambda: self._find_best_barrier(windows))
         self._last_barrier = barrier
         self._last_direction = direction
         if confidence >= self.min_confidence:
@@ -132,17 +132,17 @@ class AlphaBot4DigitPattern(BaseStrategy):
                 "parameters": self._get_safe_params(contract)
             }
 
-        digits = [self._get_last_digit(float(t)) for t in ticks[-100:]]
-        self.digit_history.extend(digits)
-        freq = self._calc_frequency(digits)
-        barrier, direction, confidence = self._find_best_barrier(freq)
+        # Só as cotações que ainda não passaram pelas janelas
+        self.digit_history.extend(self.digit_windows.sync(ticks, self._get_last_digit))
+        windows = self.digit_windows
+        barrier, direction, confidence = self._find_best_barrier(windows)
         self._last_barrier = barrier
         self._last_direction = direction
 
         if confidence >= self.min_confidence:
             contract = "DIGITOVER" if direction == "OVER" else "DIGITUNDER"
             self._last_contract = contract
-            cold = [d for d, f in freq.items() if f < 8.0]
+            cold = [d for d, f in windows.frequency(100).items() if f < 8.0]
             return {
                 "signal": contract,
                 "contract_type": contract,
@@ -181,6 +181,7 @@ class AlphaBot4DigitPattern(BaseStrategy):
 
     def reset_state(self):
         self.digit_history.clear()
+        self.digit_windows.clear()
         self.last_signal = None
         self.signal_count = 0
         # ✅ Não reseta _last_barrier nem _last_contract ao resetar estado
\ No newline at end of file
@@ -7,6 +7,7 @@ Frequência: 2-5 trades/hora
 v2.0 — Suporte a trading_mode e risk_mode do frontend
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, momentum, count_true, score_signals
 from ..config import BotConfig
 import statistics
 
@@ -100,8 +101,8 @@ class AlphaBotBalanced(BaseStrategy):
             return False, None, 0.0
 
         try:
-            recent_10 = [t['quote'] for t in list(self.ticks_history)[-10:]]
-            recent_20 = [t['quote'] for t in list(self.ticks_history)[-20:]]
+            recent_10 = self.ticks_history.last(10)
+            recent_20 = self.ticks_history.last(20)
 
             current_price = recent_10[-1]
             ma_10 = statistics.mean(recent_10)
@@ -147,6 +148,18 @@ class AlphaBotBalanced(BaseStrategy):
             print(f"⚠️ Erro na análise: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ma_20 = rolling_mean(quotes, 20)
+        mom = momentum(quotes, 9)
+        volatility = rolling_stdev(quotes, 10)
+        distance_from_ma = ((quotes - ma_20) / ma_20) * 100
+        call_score = count_true(quotes < ma_20, mom < -0.05, distance_from_ma < -0.15, volatility > 0.1)
+        put_score  = count_true(quotes > ma_20, mom > 0.05, distance_from_ma > 0.15, volatility > 0.1)
+        direction, confidence = score_signals(call_score, put_score, self.min_conditions,
+                                              lambda s: (s / 4) * 0.85 + 0.15, self.min_confidence)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {
             "contract_type": direction,
@@ -4,8 +4,8 @@ IA Neural com análise preditiva de curto prazo
 Lógica: EMA tripla + padrão de aceleração
 """
 from .base_strategy import BaseStrategy
+from .batch import ema, lagged, rolling_stdev, count_true, score_signals
 from ..config import BotConfig
-import statistics
 
 class AlphaMind(BaseStrategy):
     TRADING_MODE_CONFIG = {
@@ -55,14 +55,6 @@ class AlphaMind(BaseStrategy):
 
     def get_stake(self): return self.stake_atual
 
-    def _ema(self, prices, period):
-        if len(prices) < period: return None
-        mult = 2 / (period + 1)
-        ema = statistics.mean(prices[:period])
-        for p in prices[period:]:
-            ema = (p * mult) + (ema * (1 - mult))
-        return ema
-
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
         if len(self.ticks_history) < self.min_history:
@@ -70,15 +62,15 @@ class AlphaMind(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-25:]]
-            ema5  = self._ema(prices, 5)
-            ema10 = self._ema(prices, 10)
-            ema20 = self._ema(prices, 20)
+            ind = self.indicators
+            ema5  = ind.ema(5)
+            ema10 = ind.ema(10)
+            ema20 = ind.ema(20)
             if not all([ema5, ema10, ema20]): return False, None, 0.0
 
-            current = prices[-1]
-            accel = (prices[-1] - 2*prices[-3] + prices[-5]) if len(prices) >= 5 else 0
-            vol = statistics.stdev(prices[-10:])
+            current = ind.last
+            accel = ind.price(0) - 2*ind.price(2) + ind.price(4)
+            vol = ind.stdev(10)
 
             call_conditions = [ema5 > ema10, ema10 > ema20, current > ema5, accel > 0, vol > 0.05]
             put_conditions  = [ema5 < ema10, ema10 < ema20, current < ema5, accel < 0, vol > 0.05]
@@ -101,6 +93,18 @@ class AlphaMind(BaseStrategy):
             print(f"⚠️ Alpha Mind erro: {e}")
             return False, None, 0.0
 
+
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ema5, ema10, ema20 = ema(quotes, 5), ema(quotes, 10), ema(quotes, 20)
+        accel = quotes - 2 * lagged(quotes, 2) + lagged(quotes, 4)
+        vol = rolling_stdev(quotes, 10)
+        cs = count_true(ema5 > ema10, ema10 > ema20, quotes > ema5, accel > 0, vol > 0.05)
+        ps = count_true(ema5 < ema10, ema10 < ema20, quotes < ema5, accel < 0, vol > 0.05)
+        direction, confidence = score_signals(cs, ps, self.min_conditions,
+                                              lambda s: 0.60 + (s / 5) * 0.30, self.min_confidence)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
@@ -4,6 +4,7 @@ Detecção de pulsos de mercado em tempo real
 Lógica: Detecta aceleração e desaceleração súbita de preço (pulsos)
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, lagged, count_true, score_signals
 from ..config import BotConfig
 import statistics
 
@@ -62,7 +63,7 @@ class AlphaPulse(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-20:]]
+            prices = self.ticks_history.last(20)
             # Calcula variações tick a tick
             changes = [prices[i]-prices[i-1] for i in range(1, len(prices))]
             recent_changes = changes[-5:]
@@ -110,6 +111,23 @@ class AlphaPulse(BaseStrategy):
             print(f"⚠️ Alpha Pulse erro: {e}")
             return False, None, 0.0
 
+
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        changes = quotes - lagged(quotes, 1)
+        recent_vol = rolling_stdev(changes, 5)
+        older_vol  = lagged(recent_vol, 5)
+        # older_vol == 0 → ZeroDivisionError no should_enter → sem sinal
+        valid = older_vol != 0
+        pulse_ratio = recent_vol / (older_vol + (~valid))
+        avg_recent  = rolling_mean(changes, 5)
+        ma20        = rolling_mean(quotes, 20)
+        cs = count_true(avg_recent < -self.pulse_threshold, pulse_ratio > 1.5, quotes < ma20, recent_vol > 0.03)
+        ps = count_true(avg_recent > self.pulse_threshold, pulse_ratio > 1.5, quotes > ma20, recent_vol > 0.03)
+        conf = 0.60 + (pulse_ratio / 10).clip(max=0.25)
+        direction, confidence = score_signals(cs * valid, ps * valid, 3, lambda s: conf, self.min_confidence)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
@@ -4,8 +4,8 @@ Scalping inteligente com gestão automática de risco
 Lógica: Micro-tendências de 3-5 ticks com confirmação de volume implícito
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, momentum, count_true, score_signals
 from ..config import BotConfig
-import statistics
 
 class AlphaSmart(BaseStrategy):
     TRADING_MODE_CONFIG = {
@@ -62,18 +62,16 @@ class AlphaSmart(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-15:]]
-            current = prices[-1]
-            micro3  = prices[-3:]
-            micro5  = prices[-5:]
+            ind = self.indicators
+            current = ind.last
 
             # Micro tendência 3 ticks
-            micro_trend3 = (micro3[-1] - micro3[0]) / micro3[0] * 100
+            micro_trend3 = ind.momentum(2)
             # Micro tendência 5 ticks
-            micro_trend5 = (micro5[-1] - micro5[0]) / micro5[0] * 100
+            micro_trend5 = ind.momentum(4)
             # Média geral
-            ma15 = statistics.mean(prices)
-            vol  = statistics.stdev(prices[-8:]) if len(prices) >= 8 else 0
+            ma15 = ind.sma(15)
+            vol  = ind.stdev(8)
 
             # Scalp CALL: micro-tendência de alta confirmada
             call_conditions = [
@@ -108,6 +106,19 @@ class AlphaSmart(BaseStrategy):
             print(f"⚠️ Alpha Smart erro: {e}")
             return False, None, 0.0
 
+
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        micro_trend3 = momentum(quotes, 2)
+        micro_trend5 = momentum(quotes, 4)
+        ma15 = rolling_mean(quotes, 15)
+        vol  = rolling_stdev(quotes, 8)
+        cs = count_true(micro_trend3 > 0.02, micro_trend5 > 0.01, quotes > ma15, vol > 0.02)
+        ps = count_true(micro_trend3 < -0.02, micro_trend5 < -0.01, quotes < ma15, vol > 0.02)
+        direction, confidence = score_signals(cs, ps, self.min_conditions,
+                                              lambda s: 0.60 + (s / 4) * 0.28, self.min_confidence)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
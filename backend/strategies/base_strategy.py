@@ -3,19 +3,41 @@ Classe Base para todas as estratégias
 Alpha Dolar 2.0
 """
 from abc import ABC, abstractmethod
-from datetime import datetime
 from collections import deque
 
+try:
+    from .indicators import IndicatorEngine
+    from .tick_buffer import TickRing
+    from .indicator_cache import indicator_cache
+    from .batch import evaluate_batch
+    from ..digits import decimals_for, last_digit
+    from ..candles import CandleSeries
+except ImportError:
+    from indicators import IndicatorEngine
+    from tick_buffer import TickRing
+    from indicator_cache import indicator_cache
+    from batch import evaluate_batch
+    from digits import decimals_for, last_digit
+    from candles import CandleSeries
+
 class BaseStrategy(ABC):
     """
     Classe base abstrata para estratégias de trading
     Todas as estratégias devem herdar desta classe
     """
 
+    # Timeframe (segundos) dos candles em candles_history
+    CANDLE_TIMEFRAME = 60
+
     def __init__(self, name="Base Strategy"):
         self.name = name
-        self.ticks_history = deque(maxlen=100)  # Histórico de ticks
-        self.candles_history = deque(maxlen=50)  # Histórico de candles
+        self.ticks_history = TickRing(100)  # Histórico de ticks (arrays float64/int64, janelas sem cópia)
+        self.candles_history = deque(maxlen=50)  # Candles fechados de CANDLE_TIMEFRAME (mais antigo primeiro)
+        self.candle_series = CandleSeries(self.CANDLE_TIMEFRAME, history=self.candles_history)
+        self.own_indicators = IndicatorEngine(ring=self.ticks_history)  # Indicadores O(1) por tick
+        self.shared = None  # SymbolIndicators do tick atual (cache por símbolo), se houver
+        self.use_shared_cache = True  # False = isolada do cache do processo (backtest)
+        self.digit_decimals = None  # Casas decimais da cotação (pip_size) — define o último dígito
         self.last_signal = None
         self.signal_count = 0
 
@@ -54,12 +76,128 @@ class BaseStrategy(ABC):
         Args:
             tick_data (dict): Dados do tick
         """
-        self.ticks_history.append({
-            'quote': float(tick_data.get('quote', 0)),
-            'epoch': tick_data.get('epoch'),
-            'symbol': tick_data.get('symbol'),
-            'timestamp': datetime.now()
-        })
+        quote = float(tick_data.get('quote', 0))
+        symbol = tick_data.get('symbol')
+        if self.digit_decimals is None or symbol != self.ticks_history.symbol:
+            self.update_pip_size(tick_data)
+        epoch = tick_data.get('epoch')
+        self.ticks_history.append(quote, epoch, symbol)
+        self.own_indicators.update(quote)
+        if epoch is not None:
+            self.candle_series.update(quote, epoch)
+        if not self.use_shared_cache:
+            return
+        shared = indicator_cache.observe(tick_data)
+        # Só usa o cache se ele tem pelo menos o histórico local (ex.: preload sem epoch não entra nele)
+        self.shared = shared if shared is not None and len(shared.ring) >= len(self.ticks_history) else None
+
+    @property
+    def indicators(self):
+        """
+        IndicatorEngine para ler no tick atual: o compartilhado do símbolo
+        (calculado uma vez por tick para todos os bots) ou, para ticks sem
+        symbol/epoch ou fora de ordem, o da própria estratégia
+        """
+        return self.shared.engine if self.shared is not None else self.own_indicators
+
+    @property
+    def current_candle(self):
+        """Candle de CANDLE_TIMEFRAME em formação (None antes do primeiro tick com epoch)"""
+        return self.candle_series.partial
+
+    def volatility_percentile(self):
+        """
+        Percentil (0–100) da volatilidade atual dos retornos do símbolo nas
+        últimas horas (VolatilityRegime do cache de indicadores)
+
+        Returns:
+            float: ou None sem cache do símbolo ou antes de amostras suficientes
+        """
+        return self.shared.regime.percentile() if self.shared is not None else None
+
+    def volatility_quantile(self, q):
+        """Volatilidade dos retornos no quantil q (0–1) das últimas horas, ou None"""
+        return self.shared.regime.quantile(q) if self.shared is not None else None
+
+    def shared_value(self, key, compute):
+        """
+        Valor que depende só dos dados do símbolo: com cache, calculado uma
+        vez por tick para todas as estratégias; sem cache, calculado aqui
+
+        Args:
+            key: Chave hashable (inclua a classe/parâmetros que afetam o valor)
+            compute: Função sem argumentos
+        """
+        if self.shared is None:
+            return compute()
+        return self.shared.cached(key, compute)
+
+    def update_pip_size(self, tick_data):
+        """
+        Atualiza as casas decimais usadas na extração de dígitos
+
+        Args:
+            tick_data (dict): Tick com pip_size e/ou symbol
+        """
+        decimals = decimals_for(tick_data.get('symbol'), tick_data.get('pip_size'))
+        if decimals is not None:
+            self.digit_decimals = decimals
+
+    def last_digit(self, price):
+        """
+        Último dígito da cotação no pip_size do símbolo
+
+        Args:
+            price (float): Cotação
+
+        Returns:
+            int: Dígito 0-9
+        """
+        return last_digit(price, self.digit_decimals)
+
+    def preload(self, ticks):
+        """
+        Aquece o histórico com ticks passados sem avaliar sinais
+        (backfill de reconexão, warm-start via ticks_history)
+
+        Args:
+            ticks (list): Ticks em ordem cronológica
+        """
+        for tick in ticks:
+            self.update_tick(tick)
+
+    def warmup_ticks(self):
+        """
+        Quantidade de ticks que a estratégia precisa antes do primeiro sinal
+
+        Returns:
+            int: Maior entre min_ticks, MIN_TICKS e min_history (0 se nenhum)
+        """
+        return max(
+            getattr(self, 'min_ticks', 0) or 0,
+            getattr(self, 'MIN_TICKS', 0) or 0,
+            getattr(self, 'min_history', 0) or 0,
+        )
+
+    def evaluate_batch(self, quotes, epochs=None, decimals=None, symbol=None):
+        """
+        Avalia um array inteiro de cotações de uma vez (pesquisa/backtest)
+
+        Equivale a uma estratégia nova com esta configuração recebendo os
+        ticks em ordem via should_enter; o estado desta instância não muda.
+        Estratégias com _batch_signals usam NumPy vetorizado; as demais
+        caem no replay tick a tick (ver strategies/batch.py).
+
+        Args:
+            quotes: Cotações em ordem cronológica
+            epochs: Epochs correspondentes (opcional)
+            decimals (int): Casas decimais (pip_size) para dígitos
+            symbol (str): Símbolo (define o pip_size se decimals não vier)
+
+        Returns:
+            BatchResult: arrays direction, confidence, barrier e enter
+        """
+        return evaluate_batch(self, quotes, epochs, decimals, symbol)
 
     def get_last_ticks(self, n=10):
         """
@@ -69,9 +207,9 @@ class BaseStrategy(ABC):
             n (int): Quantidade de ticks
 
         Returns:
-            list: Lista com últimos N ticks
+            list: Lista com últimos N ticks (dicts quote/epoch/symbol)
         """
-        return list(self.ticks_history)[-n:]
+        return self.ticks_history.records(n)
 
     def get_tick_prices(self, n=10):
         """
@@ -83,8 +221,7 @@ class BaseStrategy(ABC):
         Returns:
             list: Lista com preços
         """
-        ticks = self.get_last_ticks(n)
-        return [tick['quote'] for tick in ticks]
+        return self.ticks_history.last(n).tolist()
 
     def get_last_digits(self, n=10):
         """
@@ -96,8 +233,7 @@ class BaseStrategy(ABC):
         Returns:
             list: Lista com últimos dígitos (0-9)
         """
-        prices = self.get_tick_prices(n)
-        return [int(str(price).split('.')[-1][-1]) for price in prices]
+        return [last_digit(price, self.digit_decimals) for price in self.ticks_history.last(n)]
 
     def calculate_trend(self, n=10):
         """
@@ -109,7 +245,7 @@ class BaseStrategy(ABC):
         Returns:
             str: "UP", "DOWN" ou "SIDEWAYS"
         """
-        prices = self.get_tick_prices(n)
+        prices = self.ticks_history.last(n)
 
         if len(prices) < 2:
             return "SIDEWAYS"
@@ -148,15 +284,7 @@ class BaseStrategy(ABC):
         Returns:
             float: Volatilidade (desvio padrão)
         """
-        prices = self.get_tick_prices(n)
-
-        if len(prices) < 2:
-            return 0.0
-
-        # Calcula desvio padrão
-        mean = sum(prices) / len(prices)
-        variance = sum((x - mean) ** 2 for x in prices) / len(prices)
-        return variance ** 0.5
+        return self.indicators.pstdev(n) or 0.0
 
     def detect_pattern(self, pattern_type="consecutive"):
         """
@@ -168,7 +296,7 @@ class BaseStrategy(ABC):
         Returns:
             dict: Informações do padrão detectado
         """
-        prices = self.get_tick_prices(10)
+        prices = self.ticks_history.last(10)
 
         if len(prices) < 3:
             return {"detected": False}
@@ -207,12 +335,7 @@ class BaseStrategy(ABC):
         Returns:
             float: SMA
         """
-        prices = self.get_tick_prices(n)
-
-        if len(prices) < n:
-            return None
-
-        return sum(prices) / len(prices)
+        return self.indicators.sma(n)
 
     def get_ema(self, n=10, smoothing=2):
         """
@@ -223,21 +346,9 @@ class BaseStrategy(ABC):
             smoothing (int): Fator de suavização
 
         Returns:
-            float: EMA
+            float: EMA recursiva sobre todo o histórico (None antes de N ticks)
         """
-        prices = self.get_tick_prices(n)
-
-        if len(prices) < n:
-            return None
-
-        # Calcula EMA
-        multiplier = smoothing / (1 + n)
-        ema = prices[0]  # Começa com o primeiro preço
-
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-
-        return ema
+        return self.indicators.ema(n, smoothing)
 
     def is_ready(self):
         """
@@ -251,7 +362,9 @@ class BaseStrategy(ABC):
     def reset(self):
         """Reset da estratégia"""
         self.ticks_history.clear()
-        self.candles_history.clear()
+        self.candle_series.clear()
+        self.own_indicators.reset()
+        self.shared = None
         self.last_signal = None
         self.signal_count = 0
 
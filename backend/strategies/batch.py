@@ -0,0 +1,410 @@
+"""
+Batch — avaliação vetorizada de estratégias sobre arrays de cotações
+Alpha Dolar 2.0
+
+should_enter(tick) avalia um tick por chamada. Em 500k ticks de histórico
+são 500k chamadas Python, cada uma atualizando ring, indicadores e cache.
+Para pesquisa e backtest, evaluate_batch(quotes, epochs) avalia o array
+inteiro de uma vez:
+
+    - indicadores em janelas deslizantes (sliding_window_view do NumPy)
+    - sinal de cada tick calculado sem estado (_batch_signals de cada estratégia)
+    - cooldown resolvido depois, só nos ticks candidatos
+
+O resultado equivale a uma estratégia nova (mesma configuração) recebendo
+os ticks em ordem, tick a tick: mesmas entradas, direções, confianças e
+barreiras. Diferenças só aparecem em empates de ponto flutuante (a média
+incremental e a de janela podem diferir no último bit).
+
+O contador do cooldown é len(ticks_history), que satura na capacidade do
+ring (100): o lote reproduz isso também.
+
+Estratégias sem _batch_signals caem no replay: uma cópia zerada da
+estratégia recebe os ticks via should_enter (resultado exato, sem ganho
+de velocidade). Nesse caso direction/confidence só existem nos ticks de
+entrada, já que o sinal bloqueado pelo cooldown nunca é calculado.
+
+Requer NumPy (opcional no resto do backend).
+"""
+import copy
+
+try:
+    from ..digits import decimals_for, last_digits
+    from ..lazy_import import lazy_module
+except ImportError:
+    from digits import decimals_for, last_digits
+    from lazy_import import lazy_module
+
+# NumPy só é importado na primeira avaliação em lote
+np = lazy_module('numpy')
+
+
+def sliding_window_view(x, n):
+    return np.lib.stride_tricks.sliding_window_view(x, n)
+
+# Códigos de direção nos arrays (CALL/OVER = 1, PUT/UNDER = -1, sem sinal = 0)
+CALL, PUT = 1, -1
+OVER, UNDER = 1, -1
+
+
+class BatchResult:
+    """
+    Saída de evaluate_batch (arrays do mesmo tamanho das cotações)
+
+    direction:  int8, sinal do tick ignorando o cooldown (1, -1 ou 0)
+    confidence: float64, confiança do sinal (0.0 sem sinal)
+    barrier:    int8, barreira do contrato de dígito (-1 em Rise/Fall)
+    enter:      bool, True onde should_enter teria entrado (cooldown aplicado)
+    """
+
+    __slots__ = ("direction", "confidence", "barrier", "enter", "epochs", "labels")
+
+    def __init__(self, direction, confidence, barrier, enter, epochs=None, labels=("CALL", "PUT")):
+        self.direction  = direction
+        self.confidence = confidence
+        self.barrier    = barrier
+        self.enter      = enter
+        self.epochs     = epochs
+        self.labels     = labels   # contrato para direção 1 / -1
+
+    def __len__(self):
+        return len(self.enter)
+
+    def entries(self):
+        """Índices dos ticks com entrada"""
+        return np.flatnonzero(self.enter)
+
+    def signal(self, i):
+        """Tupla (should_enter, contrato, confiança) que should_enter devolveria no tick i"""
+        if not self.enter[i]:
+            return False, None, 0.0
+        contract = self.labels[0] if self.direction[i] > 0 else self.labels[1]
+        return True, contract, float(self.confidence[i])
+
+    def get_info(self):
+        entradas = self.entries()
+        return {
+            "ticks": len(self),
+            "sinais": int(np.count_nonzero(self.direction)),
+            "entradas": len(entradas),
+            "call": int(np.count_nonzero(self.direction[entradas] > 0)),
+            "put": int(np.count_nonzero(self.direction[entradas] < 0)),
+        }
+
+
+# ─── INDICADORES EM JANELA ──────────────────────────────────────────────────
+# Todos devolvem um array alinhado às cotações: posição i = valor no tick i.
+# Antes da janela completa o valor é NaN (comparações com NaN dão False).
+
+def _pad(values, n):
+    out = np.full(n, np.nan)
+    if len(values):
+        out[n - len(values):] = values
+    return out
+
+
+def lagged(x, k):
+    """Cotação de k ticks atrás (engine.price(k))"""
+    out = np.full(len(x), np.nan)
+    out[k:] = x[:len(x) - k] if k else x
+    return out
+
+
+def rolling_mean(x, n):
+    """engine.sma(n) / statistics.mean(prices[-n:])"""
+    if len(x) < n:
+        return np.full(len(x), np.nan)
+    return _pad(sliding_window_view(x, n).mean(axis=1), len(x))
+
+
+def rolling_stdev(x, n, ddof=1):
+    """engine.stdev(n) (ddof=1) / engine.pstdev(n) (ddof=0); janela constante → 0.0 exato"""
+    if len(x) < n:
+        return np.full(len(x), np.nan)
+    windows = sliding_window_view(x, n)
+    dev = windows - windows.mean(axis=1)[:, None]
+    std = np.sqrt(np.einsum('ij,ij->i', dev, dev) / (n - ddof))
+    # Janela sem nenhuma variação (como o _equal_run do RollingStats)
+    changes = np.concatenate(([0], np.cumsum(x[1:] != x[:-1])))
+    std[changes[n - 1:] == changes[:len(x) - n + 1]] = 0.0
+    return _pad(std, len(x))
+
+
+def rolling_min(x, n):
+    if len(x) < n:
+        return np.full(len(x), np.nan)
+    return _pad(sliding_window_view(x, n).min(axis=1), len(x))
+
+
+def rolling_max(x, n):
+    if len(x) < n:
+        return np.full(len(x), np.nan)
+    return _pad(sliding_window_view(x, n).max(axis=1), len(x))
+
+
+def rolling_sum(x, n):
+    if len(x) < n:
+        return np.full(len(x), np.nan)
+    return _pad(sliding_window_view(x, n).sum(axis=1), len(x))
+
+
+def ema(x, period, smoothing=2):
+    """
+    engine.ema(period): recursiva, semeada com a média dos primeiros
+    `period` preços. A recursão não vetoriza sem perder exatidão, então
+    é um laço sobre floats Python (mesma ordem de operações do EMA).
+    """
+    alpha = smoothing / (period + 1)
+    out = np.full(len(x), np.nan)
+    if len(x) < period:
+        return out
+    values = x.tolist()
+    seed = 0.0
+    for price in values[:period - 1]:
+        seed += price
+    value = (seed + values[period - 1]) / period
+    result = [value]
+    append = result.append
+    for price in values[period:]:
+        value = price * alpha + value * (1 - alpha)
+        append(value)
+    out[period - 1:] = result
+    return out
+
+
+def rsi(x, period=14):
+    """engine.rsi(period): médias simples de ganhos/perdas com piso 0.001 (50.0 antes de period variações)"""
+    n = len(x)
+    out = np.full(n, 50.0)
+    if n <= period:
+        return out
+    change = np.diff(x)
+    ag = rolling_sum(np.maximum(change, 0.0), period)[period - 1:] / period
+    al = rolling_sum(np.maximum(-change, 0.0), period)[period - 1:] / period
+    ag[ag == 0] = 0.001
+    al[al == 0] = 0.001
+    out[period:] = 100 - (100 / (1 + ag / al))
+    return out
+
+
+def rsi_split_means(x, period=14):
+    """
+    RSI com a média só dos ganhos (> 0) e só das perdas (<= 0, zeros
+    incluídos) das últimas `period` variações — o _calc_rsi do Alpha Bot 3
+
+    Returns:
+        tuple: (rsi, valid) — valid False onde a média das perdas é zero
+        (ZeroDivisionError no should_enter, que então não dá sinal)
+    """
+    n = len(x)
+    out, valid = np.full(n, 50.0), np.ones(n, dtype=bool)
+    if n <= period:
+        return out, valid
+    change = np.diff(x)
+    up = change > 0
+    n_gains  = rolling_sum(up.astype(np.float64), period)[period - 1:]
+    gain_sum = rolling_sum(np.where(up, change, 0.0), period)[period - 1:]
+    loss_sum = rolling_sum(np.where(up, 0.0, -change), period)[period - 1:]
+    n_losses = period - n_gains
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_gain = np.where(n_gains > 0, gain_sum / n_gains, 0.001)
+        avg_loss = np.where(n_losses > 0, loss_sum / n_losses, 0.001)
+        out[period:] = 100 - (100 / (1 + avg_gain / avg_loss))
+    valid[period:] = avg_loss != 0
+    return out, valid
+
+
+def momentum(x, lag):
+    """engine.momentum(lag): variação % contra o preço de lag ticks atrás"""
+    anterior = lagged(x, lag)
+    return (x - anterior) / anterior * 100
+
+
+def zscore(x, n):
+    """engine.zscore(n)"""
+    std = rolling_stdev(x, n)
+    std[std == 0] = 0.001
+    return (x - rolling_mean(x, n)) / std
+
+
+def consecutive(x, k, up=True):
+    """True onde as últimas k variações foram todas de alta (ou de baixa)"""
+    change = np.diff(x, prepend=np.nan)
+    step = change > 0 if up else change < 0
+    run = rolling_sum(step.astype(np.float64), k)
+    return run == k
+
+
+def rolling_digit_counts(digits, window):
+    """
+    Contagem por dígito na janela (DigitWindows.counts) para cada tick
+
+    Returns:
+        ndarray (n, 10) int32 — antes da janela completa conta o que houver
+    """
+    n = len(digits)
+    acc = np.zeros((10, n + 1), dtype=np.int32)
+    for d in range(10):
+        np.cumsum(digits == d, out=acc[d, 1:])
+    start = np.maximum(np.arange(1, n + 1) - window, 0)
+    return (acc[:, 1:] - acc[:, start]).T
+
+
+# ─── SINAL E COOLDOWN ──────────────────────────────────────────────────────
+def count_true(*conditions):
+    """sum([cond1, cond2, ...]) do should_enter, elemento a elemento"""
+    total = np.zeros(len(conditions[0]), dtype=np.int64)
+    for condition in conditions:
+        total += condition
+    return total
+
+
+def score_signals(call_score, put_score, min_score, confidence, min_confidence, cap=None):
+    """
+    Padrão "if call_score >= mínimo e conf >= mínima → CALL; senão testa PUT"
+
+    Args:
+        call_score, put_score: arrays de pontos
+        confidence: função pontos → confiança (mesmas operações do should_enter)
+        cap: teto aplicado à confiança devolvida (min(conf, cap)), se houver
+
+    Returns:
+        tuple: (direction int8, confidence float64)
+    """
+    call_conf = confidence(call_score)
+    put_conf  = confidence(put_score)
+    call_ok = (call_score >= min_score) & (call_conf >= min_confidence)
+    put_ok  = ~call_ok & (put_score >= min_score) & (put_conf >= min_confidence)
+    direction = np.where(call_ok, CALL, np.where(put_ok, PUT, 0)).astype(np.int8)
+    conf = np.where(call_ok, call_conf, np.where(put_ok, put_conf, 0.0))
+    if cap is not None:
+        conf = np.minimum(conf, cap)
+    return direction, conf
+
+
+def digit_signals(direction, confidence, barrier, min_confidence):
+    """
+    Fecha o sinal das estratégias de dígito: exige confidence/100 >= mínima
+    e devolve a confiança como _emit_signal (round(conf / 100, 4))
+
+    Args:
+        direction: OVER/UNDER/0 por tick (0 = sem sinal)
+        confidence: confiança em % por tick
+        barrier: barreira por tick
+    """
+    ok = (direction != 0) & (confidence / 100 >= min_confidence)
+    direction = np.where(ok, direction, 0).astype(np.int8)
+    conf = np.zeros(len(direction))
+    conf[ok] = [round(c / 100, 4) for c in confidence[ok].tolist()]
+    return direction, conf, np.where(ok, barrier, -1).astype(np.int8)
+
+
+def resolve_entries(direction, warmup, cooldown, capacity):
+    """
+    Aplica aquecimento e cooldown como should_enter faria tick a tick
+
+    O contador é len(ticks_history) = min(i + 1, capacity); a entrada no
+    tick i exige contador - último_sinal >= cooldown. Só os ticks com sinal
+    passam pelo laço.
+    """
+    enter = np.zeros(len(direction), dtype=bool)
+    last = 0
+    for i in np.flatnonzero(direction).tolist():
+        if i + 1 < warmup:
+            continue
+        count = i + 1 if i + 1 < capacity else capacity
+        if count - last >= cooldown:
+            enter[i] = True
+            last = count
+    return enter
+
+
+# ─── ENTRADA ────────────────────────────────────────────────────────────────
+def _defining_class(cls, name):
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass
+    return None
+
+
+def _fresh_copy(strategy):
+    """Cópia da estratégia com a mesma configuração e estado de tick zerado"""
+    clone = object.__new__(type(strategy))
+    state = dict(strategy.__dict__, shared=None)
+    clone.__dict__.update(copy.deepcopy(state, {id(strategy): clone}))
+    clone.reset()
+    clone.digit_decimals = None
+    if hasattr(clone, 'last_signal_tick'):
+        clone.last_signal_tick = 0
+    if hasattr(clone, 'reset_state'):
+        clone.reset_state()
+    if hasattr(clone, 'digit_history'):
+        clone.digit_history.clear()
+    if hasattr(clone, 'digit_windows'):
+        clone.digit_windows.clear()
+    return clone
+
+
+def replay(strategy, quotes, epochs=None, decimals=None, symbol=None):
+    """
+    Avalia via should_enter numa cópia zerada da estratégia (exato, sem
+    vetorização). Os ticks vão sem epoch para não avançar o indicator_cache.
+    """
+    clone = _fresh_copy(strategy)
+    n = len(quotes)
+    direction  = np.zeros(n, dtype=np.int8)
+    confidence = np.zeros(n)
+    barrier    = np.full(n, -1, dtype=np.int8)
+    enter      = np.zeros(n, dtype=bool)
+    labels = None
+    for i, quote in enumerate(quotes.tolist()):
+        entrou, contrato, conf = clone.should_enter({'quote': quote, 'symbol': symbol, 'pip_size': decimals})
+        if entrou and contrato:
+            if labels is None:
+                labels = ("DIGITOVER", "DIGITUNDER") if contrato.startswith("DIGIT") else ("CALL", "PUT")
+            enter[i] = True
+            direction[i] = CALL if contrato in ("CALL", "DIGITOVER") else PUT
+            confidence[i] = conf
+            if hasattr(clone, '_last_barrier'):
+                barrier[i] = clone._last_barrier
+    return BatchResult(direction, confidence, barrier, enter, epochs, labels or ("CALL", "PUT"))
+
+
+def evaluate_batch(strategy, quotes, epochs=None, decimals=None, symbol=None):
+    """
+    Avalia a estratégia sobre o array inteiro de cotações
+
+    Args:
+        strategy: Instância de BaseStrategy (o estado dela não é alterado)
+        quotes: Cotações em ordem cronológica (ndarray, lista, memoryview)
+        epochs: Epochs correspondentes (opcional, repassado ao resultado)
+        decimals: Casas decimais (pip_size) para os dígitos; padrão: PIP_SIZES[symbol]
+        symbol (str): Símbolo das cotações
+
+    Returns:
+        BatchResult
+    """
+    if not np:
+        raise RuntimeError("evaluate_batch requer NumPy (pip install numpy)")
+    quotes = np.ascontiguousarray(quotes, dtype=np.float64)
+    if epochs is not None:
+        epochs = np.asarray(epochs, dtype=np.int64)
+    decimals = decimals_for(symbol, decimals)
+
+    cls = type(strategy)
+    vetorizada = _defining_class(cls, '_batch_signals')
+    if vetorizada is None or vetorizada is not _defining_class(cls, 'should_enter'):
+        # should_enter sobrescrito numa subclasse: o lote do pai não vale para ela
+        return replay(strategy, quotes, epochs, decimals, symbol)
+
+    digits = None
+    if getattr(strategy, 'BATCH_DIGITS', False):
+        digits = np.asarray(last_digits(quotes, decimals, symbol), dtype=np.int64)
+    direction, confidence, barrier = strategy._batch_signals(quotes, digits)
+    if barrier is None:
+        barrier = np.full(len(quotes), -1, dtype=np.int8)
+    enter = resolve_entries(direction, strategy.warmup_ticks(),
+                            getattr(strategy, 'cooldown_ticks', 0),
+                            strategy.ticks_history.maxlen)
+    labels = ("DIGITOVER", "DIGITUNDER") if digits is not None else ("CALL", "PUT")
+    return BatchResult(direction, confidence, barrier, enter, epochs, labels)
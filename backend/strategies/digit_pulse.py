@@ -6,9 +6,11 @@ os últimos N ticks, entra na reversão esperada.
 from collections import deque
 try:
     from .base_strategy import BaseStrategy
+    from .digit_windows import DigitWindows
     from ..config import BotConfig
 except ImportError:
     from base_strategy import BaseStrategy
+    from digit_windows import DigitWindows
     from config import BotConfig
 
 class DigitPulse(BaseStrategy):
@@ -20,25 +22,32 @@ class DigitPulse(BaseStrategy):
         self.min_ticks = 40
         self.pulse_window = 8   # janela para detectar pulso
         self.pulse_threshold = 6  # quantos do mesmo lado para acionar
+        self.digit_windows = DigitWindows((self.pulse_window,))
         self._last_barrier = 4
         self._last_direction = "OVER"
 
     def _get_last_digit(self, price):
-        return int(str(float(price)).replace(".", "")[-1])
+        return self.last_digit(float(price))
 
-    def _detect_pulse(self, digits):
+    def preload(self, ticks):
+        super().preload(ticks)
+        digits = [self._get_last_digit(float(t.get("quote", 0))) for t in ticks]
+        self.digit_history.extend(digits)
+        self.digit_windows.extend(digits)
+
+    def _detect_pulse(self, windows):
         """
-        Analisa os últimos N dígitos.
+        Analisa os últimos N dígitos (janela pulse_window).
         Se >= pulse_threshold forem altos (>4), entra UNDER.
         Se >= pulse_threshold forem baixos (<5), entra OVER.
         Retorna (barrier, direction, confidence).
         """
-        recent = list(digits)[-self.pulse_window:]
-        if len(recent) < self.pulse_window:
+        total = windows.total(self.pulse_window)
+        if total < self.pulse_window:
             return None
 
-        highs = sum(1 for d in recent if d > 4)
-        lows  = sum(1 for d in recent if d < 5)
+        highs = windows.count_high(self.pulse_window)
+        lows  = total - highs
 
         if highs >= self.pulse_threshold:
             # Muitos dígitos altos — reversão para baixo
@@ -58,10 +67,12 @@ class DigitPulse(BaseStrategy):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_last_digit(float(tick_data.get("quote", 0))))
+        digit = self._get_last_digit(float(tick_data.get("quote", 0)))
+        self.digit_history.append(digit)
+        self.digit_windows.push(digit)
         if len(self.digit_history) < self.min_ticks:
             return False, None, 0.0
-        result = self._detect_pulse(self.digit_history)
+        result = self._detect_pulse(self.digit_windows)
         if result is None:
             return False, None, 0.0
         barrier, direction, confidence = result
@@ -82,12 +93,11 @@ class DigitPulse(BaseStrategy):
     def analyze(self, ticks):
         if len(ticks) < self.min_ticks:
             return {"signal": None, "reason": f"Aguardando dados ({len(ticks)}/{self.min_ticks})", "confidence": 0}
-        digits = [self._get_last_digit(float(t)) for t in ticks[-50:]]
-        self.digit_history.extend(digits)
-        result = self._detect_pulse(self.digit_history)
+        # Só as cotações que ainda não passaram pela janela
+        self.digit_history.extend(self.digit_windows.sync(ticks, self._get_last_digit))
+        result = self._detect_pulse(self.digit_windows)
         if result is None:
-            recent = list(self.digit_history)[-self.pulse_window:]
-            highs = sum(1 for d in recent if d > 4)
+            highs = self.digit_windows.count_high(self.pulse_window)
             return {"signal": None, "confidence": 0,
                     "reason": f"Sem pulso detectado (altos: {highs}/{self.pulse_window})"}
         barrier, direction, confidence = result
@@ -95,7 +105,7 @@ class DigitPulse(BaseStrategy):
         self._last_direction = direction
         if confidence >= 58.0:
             contract = "DIGITOVER" if direction == "OVER" else "DIGITUNDER"
-            recent = list(self.digit_history)[-self.pulse_window:]
+            recent = [self._get_last_digit(t) for t in ticks[-self.pulse_window:]]
             return {"signal": contract, "contract_type": contract, "barrier": barrier,
                     "confidence": round(confidence, 2),
                     "reason": f"Pulso detectado! {direction} {barrier} | Últimos {self.pulse_window}: {recent}",
@@ -109,5 +119,6 @@ class DigitPulse(BaseStrategy):
 
     def reset_state(self):
         self.digit_history.clear()
+        self.digit_windows.clear()
         self.last_signal = None
         self.signal_count = 0
\ No newline at end of file
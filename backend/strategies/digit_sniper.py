@@ -4,12 +4,14 @@ Foca no dígito MAIS FRIO e entra com barreira exata (Under X ou Over X).
 Lógica: quando um dígito específico está muito abaixo de 10%, ele tende a aparecer.
 Entra com Over/Under de forma a EXCLUIR o dígito mais quente.
 """
-from collections import Counter, deque
+from collections import deque
 try:
     from .base_strategy import BaseStrategy
+    from .digit_windows import DigitWindows
     from ..config import BotConfig
 except ImportError:
     from base_strategy import BaseStrategy
+    from digit_windows import DigitWindows
     from config import BotConfig
 
 class DigitSniper(BaseStrategy):
@@ -18,26 +20,33 @@ class DigitSniper(BaseStrategy):
         self.tier = "VIP"
         self.contract_type = "DIGITOVER/DIGITUNDER"
         self.digit_history = deque(maxlen=300)
+        self.digit_windows = DigitWindows((100,))
         self.min_ticks = 60
         self.min_confidence = 62.0
         self._last_barrier = 5
         self._last_direction = "OVER"
 
     def _get_last_digit(self, price):
-        return int(str(float(price)).replace(".", "")[-1])
+        return self.last_digit(float(price))
 
-    def _calc_frequency(self, digits):
-        c = Counter(digits)
-        t = len(digits)
-        return {d: c.get(d, 0) / t * 100 for d in range(10)}
+    def preload(self, ticks):
+        super().preload(ticks)
+        digits = [self._get_last_digit(float(t.get("quote", 0))) for t in ticks]
+        self.digit_history.extend(digits)
+        self.digit_windows.extend(digits)
 
-    def _snipe(self, freq):
+    def _snipe(self, windows):
         """
         Estratégia Sniper: identifica o dígito MAIS QUENTE e
         entra para que ele NÃO apareça — ou seja, entra no lado oposto.
+
+        Args:
+            windows (DigitWindows): janela dos últimos 100 dígitos
         """
-        hottest = max(freq, key=freq.get)
-        coldest = min(freq, key=freq.get)
+        hottest = windows.hottest(100)
+        coldest = windows.coldest(100)
+        over, under = windows.over_under(100, hottest - 1 if hottest >= 5 else hottest + 1)
+        t = windows.total(100)
 
         # Se o dígito mais quente for alto (6-9), entra UNDER hottest-1
         # Se o dígito mais quente for baixo (0-3), entra OVER hottest+1
@@ -45,25 +54,27 @@ class DigitSniper(BaseStrategy):
             barrier = hottest - 1
             direction = "UNDER"
             # confiança = freq acumulada dos dígitos < barrier
-            confidence = sum(freq.get(d, 0) for d in range(0, barrier))
+            confidence = under * 100 / t
         else:
             barrier = hottest + 1
             direction = "OVER"
-            confidence = sum(freq.get(d, 0) for d in range(barrier + 1, 10))
+            confidence = over * 100 / t
 
         # Bonus de confiança se o dígito frio está muito abaixo de 10%
-        cold_bonus = max(0, (10.0 - freq.get(coldest, 10)) * 0.5)
+        cold_bonus = max(0, (10.0 - windows.percent(100, coldest)) * 0.5)
         confidence = min(confidence + cold_bonus, 95.0)
 
         return barrier, direction, confidence
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_last_digit(float(tick_data.get("quote", 0))))
+        digit = self._get_last_digit(float(tick_data.get("quote", 0)))
+        self.digit_history.append(digit)
+        self.digit_windows.push(digit)
         if len(self.digit_history) < self.min_ticks:
             return False, None, 0.0
-        freq = self._calc_frequency(list(self.digit_history)[-100:])
-        barrier, direction, confidence = self._snipe(freq)
+        windows = self.shared.digits if self.shared is not None else self.digit_windows
+        barrier, direction, confidence = self.shared_value((DigitSniper, "snipe"), lambda: self._snipe(windows))
         self._last_barrier = barrier
         self._last_direction = direction
         if confidence >= self.min_confidence:
@@ -81,14 +92,15 @@ class DigitSniper(BaseStrategy):
     def analyze(self, ticks):
         if len(ticks) < self.min_ticks:
             return {"signal": None, "reason": f"Aguardando dados ({len(ticks)}/{self.min_ticks})", "confidence": 0}
-        digits = [self._get_last_digit(float(t)) for t in ticks[-100:]]
-        self.digit_history.extend(digits)
-        freq = self._calc_frequency(digits)
-        barrier, direction, confidence = self._snipe(freq)
+        # Só as cotações que ainda não passaram pelas janelas
+        self.digit_history.extend(self.digit_windows.sync(ticks, self._get_last_digit))
+        windows = self.digit_windows
+        barrier, direction, confidence = self._snipe(windows)
         self._last_barrier = barrier
         self._last_direction = direction
-        hottest = max(freq, key=freq.get)
-        coldest = min(freq, key=freq.get)
+        freq = windows.frequency(100)
+        hottest = windows.hottest(100)
+        coldest = windows.coldest(100)
         if confidence >= self.min_confidence:
             contract = "DIGITOVER" if direction == "OVER" else "DIGITUNDER"
             return {"signal": contract, "contract_type": contract, "barrier": barrier,
@@ -105,5 +117,6 @@ class DigitSniper(BaseStrategy):
 
     def reset_state(self):
         self.digit_history.clear()
+        self.digit_windows.clear()
         self.last_signal = None
         self.signal_count = 0
\ No newline at end of file
@@ -4,7 +4,7 @@ Compatível com alpha_bot_api_production.py
 FREE: Alpha Bot 4 | VIP: Digit Sniper, Digit Pulse | PREMIUM: Mega Digit 1.0, 2.0
 FIX 03/03: Barreira mínima 4 em _best_barrier para payout justo
 """
-from collections import Counter, deque
+from collections import deque
 
 # ==================== BASE STRATEGY ====================
 try:
@@ -14,6 +14,7 @@ except ImportError:
         from backend.strategies.base_strategy import BaseStrategy
     except ImportError:
         class BaseStrategy:
+            shared = None
             def __init__(self, name=""):
                 self.name = name
                 self.ticks_history = deque(maxlen=500)
@@ -21,6 +22,22 @@ except ImportError:
                 self.signal_count = 0
             def update_tick(self, tick_data):
                 self.ticks_history.append(tick_data)
+            def shared_value(self, key, compute):
+                return compute()
+
+try:
+    from .digit_windows import DigitWindows
+    from .batch import np, rolling_digit_counts, digit_signals, OVER, UNDER
+    from ..digits import last_digit
+except ImportError:
+    try:
+        from backend.strategies.digit_windows import DigitWindows
+        from backend.strategies.batch import np, rolling_digit_counts, digit_signals, OVER, UNDER
+        from backend.digits import last_digit
+    except ImportError:
+        from digit_windows import DigitWindows
+        from batch import np, rolling_digit_counts, digit_signals, OVER, UNDER
+        from digits import last_digit
 
 try:
     from ..__init__ import BotConfig  # noqa
@@ -41,6 +58,11 @@ except ImportError:
 # ==================== BASE DIGIT ====================
 class _DigitBase(BaseStrategy):
 
+    # Janelas de dígitos mantidas incrementalmente (ver DigitWindows)
+    DIGIT_WINDOWS = (100,)
+    # evaluate_batch entrega os dígitos das cotações a _batch_signals
+    BATCH_DIGITS = True
+
     TRADING_MODE_CONFIG = {
         'lowRisk':  {'min_confidence': 0.72, 'cooldown': 20},
         'accurate': {'min_confidence': 0.68, 'cooldown': 14},
@@ -57,6 +79,7 @@ class _DigitBase(BaseStrategy):
     def __init__(self, name, trading_mode='faster', risk_mode='conservative'):
         super().__init__(name=name)
         self.digit_history = deque(maxlen=300)
+        self.digit_windows = DigitWindows(self.DIGIT_WINDOWS)
         self._last_barrier = 5
         self._last_direction = 'OVER'
         self.last_signal_tick = 0
@@ -94,14 +117,26 @@ class _DigitBase(BaseStrategy):
         return self.stake_atual
 
     def _get_digit(self, price):
-        return int(str(float(price)).replace('.', '')[-1])
-
-    def _freq(self, digits):
-        c = Counter(digits)
-        t = len(digits)
-        return {d: c.get(d, 0) / t * 100 for d in range(10)}
-
-    def _best_barrier(self, freq):
+        return last_digit(float(price), getattr(self, 'digit_decimals', None))
+
+    def preload(self, ticks):
+        for t in ticks:
+            self.update_tick(t)
+        digits = [self._get_digit(float(t.get('quote', 0))) for t in ticks]
+        self.digit_history.extend(digits)
+        self.digit_windows.extend(digits)
+
+    def _push_digit(self, tick_data):
+        digit = self._get_digit(float(tick_data.get('quote', 0)))
+        self.digit_history.append(digit)
+        self.digit_windows.push(digit)
+
+    @property
+    def windows(self):
+        """Janelas de dígitos do tick atual: as compartilhadas do símbolo ou as próprias"""
+        return self.shared.digits if self.shared is not None else self.digit_windows
+
+    def _best_barrier(self, window=100):
         """
         ✅ FIX 03/03: Barreira FIXA em 5 = payout justo (~95%).
         Barreira 5 é o único ponto de equilíbrio real:
@@ -110,12 +145,16 @@ class _DigitBase(BaseStrategy):
         Barreiras 1-4 e 6-9 = desequilíbrio de payout (ganho irrisório vs risco).
         """
         barrier = 5
-        po = sum(freq.get(d, 0) for d in range(6, 10))   # prob dígito > 5
-        pu = sum(freq.get(d, 0) for d in range(0, 5))    # prob dígito < 5
-        direction  = 'OVER' if po >= pu else 'UNDER'
-        confidence = max(po, pu)
+        windows = self.windows
+        over, under = windows.over_under(window, barrier)   # dígitos > 5 / < 5
+        direction  = 'OVER' if over >= under else 'UNDER'
+        confidence = max(over, under) * 100 / windows.total(window)
         return barrier, direction, confidence
 
+    def _shared_best_barrier(self, window=100):
+        """_best_barrier calculado uma vez por tick para todos os bots do símbolo"""
+        return self.shared_value(('digit_base_barrier5', window), lambda: self._best_barrier(window))
+
     def _cooldown_ok(self):
         return (len(self.ticks_history) - self.last_signal_tick) >= self.cooldown_ticks
 
@@ -137,6 +176,19 @@ class _DigitBase(BaseStrategy):
         self.signal_count += 1
         return True, contract, round(confidence / 100, 4)
 
+    @staticmethod
+    def _batch_window(digits, window):
+        """Contagens por dígito e total da janela em cada tick (lote)"""
+        total = np.minimum(np.arange(1, len(digits) + 1), window)
+        return rolling_digit_counts(digits, window), total
+
+    def _batch_barrier5(self, digits, window=100):
+        """_best_barrier(window) para cada tick: (direção, confiança %)"""
+        counts, total = self._batch_window(digits, window)
+        over  = counts[:, 6:].sum(axis=1)
+        under = counts[:, :5].sum(axis=1)
+        return np.where(over >= under, OVER, UNDER), np.maximum(over, under) * 100 / total
+
 
 # ==================== ALPHA BOT 4 — FREE ====================
 class AlphaBot4Digit(_DigitBase):
@@ -149,15 +201,19 @@ class AlphaBot4Digit(_DigitBase):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_digit(float(tick_data.get('quote', 0))))
+        self._push_digit(tick_data)
         if len(self.digit_history) < self.MIN_TICKS or not self._cooldown_ok():
             return False, None, 0.0
-        freq = self._freq(list(self.digit_history)[-100:])
-        barrier, direction, confidence = self._best_barrier(freq)
+        barrier, direction, confidence = self._shared_best_barrier(100)
         if confidence / 100 >= self.min_confidence:
             return self._emit_signal(direction, barrier, confidence)
         return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits):
+        """should_enter vetorizado sobre o array de dígitos (ver strategies/batch.py)"""
+        direction, confidence = self._batch_barrier5(digits, 100)
+        return digit_signals(direction, confidence, np.full(len(digits), 5), self.min_confidence)
+
     def get_info(self):
         return {'name': self.name, 'tier': 'FREE', 'win_rate': '70%',
                 'trading_mode': self.trading_mode, 'risk_mode': self.risk_mode}
@@ -174,28 +230,46 @@ class DigitSniper(_DigitBase):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_digit(float(tick_data.get('quote', 0))))
+        self._push_digit(tick_data)
         if len(self.digit_history) < self.MIN_TICKS or not self._cooldown_ok():
             return False, None, 0.0
-        freq    = self._freq(list(self.digit_history)[-100:])
-        hottest = max(freq, key=freq.get)
-        coldest = min(freq, key=freq.get)
+        windows = self.windows
+        hottest = windows.hottest(100)
+        coldest = windows.coldest(100)
         if hottest >= 5:
             barrier    = hottest - 1
             direction  = 'UNDER'
-            confidence = sum(freq.get(d, 0) for d in range(0, barrier))
+            confidence = windows.over_under(100, barrier)[1] * 100 / windows.total(100)
         else:
             barrier    = hottest + 1
             direction  = 'OVER'
-            confidence = sum(freq.get(d, 0) for d in range(barrier + 1, 10))
+            confidence = windows.over_under(100, barrier)[0] * 100 / windows.total(100)
         # ✅ Garante barreira mínima 4
         barrier = max(barrier, 4)
-        cold_bonus = max(0, (10.0 - freq.get(coldest, 10)) * 0.5)
+        cold_bonus = max(0, (10.0 - windows.percent(100, coldest)) * 0.5)
         confidence = min(confidence + cold_bonus, 95.0)
         if confidence / 100 >= self.min_confidence:
             return self._emit_signal(direction, barrier, confidence)
         return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits):
+        """should_enter vetorizado sobre o array de dígitos (ver strategies/batch.py)"""
+        counts, total = self._batch_window(digits, 100)
+        rows    = np.arange(len(digits))
+        hottest = counts.argmax(axis=1)   # primeiro máximo = menor dígito, como hottest()
+        coldest = counts.argmin(axis=1)
+        high    = hottest >= 5
+        barrier = np.where(high, hottest - 1, hottest + 1)
+        ate     = counts.cumsum(axis=1)[rows, barrier]          # dígitos <= barreira
+        under   = ate - counts[rows, barrier]
+        over    = total - ate
+        direction  = np.where(high, UNDER, OVER)
+        confidence = np.where(high, under, over) * 100 / total
+        barrier    = np.maximum(barrier, 4)
+        cold_bonus = np.maximum(0, (10.0 - counts[rows, coldest] / total * 100) * 0.5)
+        confidence = np.minimum(confidence + cold_bonus, 95.0)
+        return digit_signals(direction, confidence, barrier, self.min_confidence)
+
     def get_info(self):
         return {'name': self.name, 'tier': 'VIP', 'win_rate': '73%',
                 'trading_mode': self.trading_mode, 'risk_mode': self.risk_mode}
@@ -207,6 +281,7 @@ class DigitPulse(_DigitBase):
     MIN_TICKS   = 40
     PULSE_WIN   = 8
     PULSE_THRES = 6
+    DIGIT_WINDOWS = (PULSE_WIN,)
 
     def __init__(self, trading_mode='faster', risk_mode='conservative'):
         super().__init__("Digit Pulse", trading_mode, risk_mode)
@@ -214,12 +289,12 @@ class DigitPulse(_DigitBase):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_digit(float(tick_data.get('quote', 0))))
+        self._push_digit(tick_data)
         if len(self.digit_history) < self.MIN_TICKS or not self._cooldown_ok():
             return False, None, 0.0
-        recent = list(self.digit_history)[-self.PULSE_WIN:]
-        highs  = sum(1 for d in recent if d > 4)
-        lows   = len(recent) - highs
+        windows = self.windows
+        highs  = windows.count_high(self.PULSE_WIN)
+        lows   = windows.total(self.PULSE_WIN) - highs
         if highs >= self.PULSE_THRES:
             barrier, direction = 5, 'UNDER'
             confidence = 50 + (highs - self.PULSE_THRES) * 8.0
@@ -233,6 +308,17 @@ class DigitPulse(_DigitBase):
             return self._emit_signal(direction, barrier, confidence)
         return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits):
+        """should_enter vetorizado sobre o array de dígitos (ver strategies/batch.py)"""
+        counts, total = self._batch_window(digits, self.PULSE_WIN)
+        highs = counts[:, 5:].sum(axis=1)
+        lows  = total - highs
+        high_pulse = highs >= self.PULSE_THRES
+        low_pulse  = ~high_pulse & (lows >= self.PULSE_THRES)
+        direction  = np.where(high_pulse, UNDER, np.where(low_pulse, OVER, 0))
+        confidence = np.minimum(50 + (np.where(high_pulse, highs, lows) - self.PULSE_THRES) * 8.0, 90.0)
+        return digit_signals(direction, confidence, np.where(high_pulse, 5, 4), self.min_confidence)
+
     def get_info(self):
         return {'name': self.name, 'tier': 'VIP', 'win_rate': '72%',
                 'trading_mode': self.trading_mode, 'risk_mode': self.risk_mode}
@@ -242,6 +328,7 @@ class DigitPulse(_DigitBase):
 class MegaDigit1(_DigitBase):
     """Score combinado: frequência (40%) + pulso (35%) + par/ímpar (25%)"""
     MIN_TICKS = 70
+    DIGIT_WINDOWS = (10, 50, 100)
 
     def __init__(self, trading_mode='faster', risk_mode='conservative'):
         super().__init__("Mega Digit 1.0", trading_mode, risk_mode)
@@ -249,18 +336,16 @@ class MegaDigit1(_DigitBase):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_digit(float(tick_data.get('quote', 0))))
+        self._push_digit(tick_data)
         if len(self.digit_history) < self.MIN_TICKS or not self._cooldown_ok():
             return False, None, 0.0
-        digits = list(self.digit_history)
+        windows = self.windows
 
-        freq = self._freq(digits[-100:])
-        barrier, freq_dir, freq_conf = self._best_barrier(freq)
+        barrier, freq_dir, freq_conf = self._shared_best_barrier(100)
         freq_score = (freq_conf - 50) * 0.8
 
-        recent = digits[-10:]
-        highs  = sum(1 for d in recent if d > 4)
-        lows   = len(recent) - highs
+        highs  = windows.count_high(10)
+        lows   = windows.total(10) - highs
         if highs > lows:
             pulse_dir   = 'UNDER'
             pulse_score = (highs / 10 - 0.5) * 70
@@ -268,10 +353,8 @@ class MegaDigit1(_DigitBase):
             pulse_dir   = 'OVER'
             pulse_score = (lows / 10 - 0.5) * 70
 
-        pi_conf  = max(
-            sum(1 for d in digits[-50:] if d % 2 == 0),
-            sum(1 for d in digits[-50:] if d % 2 != 0)
-        ) / 50 * 100
+        pares    = windows.count_even(50)
+        pi_conf  = max(pares, windows.total(50) - pares) / 50 * 100
         pi_score = (pi_conf - 50) * 0.5
 
         total     = min(50 + (freq_score * 0.40 + pulse_score * 0.35 + pi_score * 0.25), 95)
@@ -281,6 +364,24 @@ class MegaDigit1(_DigitBase):
             return self._emit_signal(direction, barrier, total)
         return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits):
+        """should_enter vetorizado sobre o array de dígitos (ver strategies/batch.py)"""
+        freq_dir, freq_conf = self._batch_barrier5(digits, 100)
+        freq_score = (freq_conf - 50) * 0.8
+
+        counts10, total10 = self._batch_window(digits, 10)
+        highs = counts10[:, 5:].sum(axis=1)
+        lows  = total10 - highs
+        pulse_score = np.where(highs > lows, (highs / 10 - 0.5) * 70, (lows / 10 - 0.5) * 70)
+
+        counts50, total50 = self._batch_window(digits, 50)
+        pares    = counts50[:, 0::2].sum(axis=1)
+        pi_conf  = np.maximum(pares, total50 - pares) / 50 * 100
+        pi_score = (pi_conf - 50) * 0.5
+
+        total = np.minimum(50 + (freq_score * 0.40 + pulse_score * 0.35 + pi_score * 0.25), 95)
+        return digit_signals(freq_dir, total, np.full(len(digits), 5), self.min_confidence)
+
     def get_info(self):
         return {'name': self.name, 'tier': 'PREMIUM', 'win_rate': '75%',
                 'trading_mode': self.trading_mode, 'risk_mode': self.risk_mode}
@@ -290,27 +391,26 @@ class MegaDigit1(_DigitBase):
 class MegaDigit2(_DigitBase):
     """Janelas deslizantes 25/50/100 ticks com pesos 50%/30%/20%"""
     MIN_TICKS = 100
+    DIGIT_WINDOWS = (25, 50, 100)
 
     def __init__(self, trading_mode='faster', risk_mode='conservative'):
         super().__init__("Mega Digit 2.0", trading_mode, risk_mode)
         print(f"⚙️ Mega Digit 2.0 | Modo: {trading_mode} | Confiança: {self.min_confidence:.0%}")
 
-    def _analyze_window(self, digits, size):
-        w = digits[-size:]
-        if len(w) < size // 2:
+    def _analyze_window(self, size):
+        if self.windows.total(size) < size // 2:
             return None
-        return self._best_barrier(self._freq(w))
+        return self._shared_best_barrier(size)
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_digit(float(tick_data.get('quote', 0))))
+        self._push_digit(tick_data)
         if len(self.digit_history) < self.MIN_TICKS or not self._cooldown_ok():
             return False, None, 0.0
-        digits  = list(self.digit_history)
         windows = [
-            (self._analyze_window(digits, 25),  0.50),
-            (self._analyze_window(digits, 50),  0.30),
-            (self._analyze_window(digits, 100), 0.20),
+            (self._analyze_window(25),  0.50),
+            (self._analyze_window(50),  0.30),
+            (self._analyze_window(100), 0.20),
         ]
         windows = [(w, p) for w, p in windows if w is not None]
         if not windows:
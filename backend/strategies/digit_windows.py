@@ -0,0 +1,230 @@
+"""
+Digit Windows — histogramas de dígitos em janelas deslizantes
+Alpha Dolar 2.0
+
+As estratégias de dígitos refaziam um Counter sobre 25–300 dígitos a cada
+tick e depois somavam o dict de frequências para cada barreira 1..8.
+Aqui cada janela (ex.: 10, 25, 50, 100) mantém a contagem dos dígitos 0-9:
+a cada tick incrementa o dígito novo e decrementa o que saiu da janela.
+
+    push(d)                    O(número de janelas), sem alocação
+    sync(quotes, digit)        caminho analyze(ticks): empurra só as cotações novas
+    counts(w) / total(w)       contagens da janela w
+    best_barrier(w)            melhor OVER/UNDER em O(10) com soma prefixada
+    over_under(w, barreira)    acertos OVER/UNDER para uma barreira fixa
+
+Confianças em % (0-100), com as mesmas regras de desempate do código
+antigo, que somava percentuais em float (freq = c / t * 100): só quando
+as contagens empatam a escolha cai nessas somas, com o mesmo arredondamento
+— OVER se po >= pu, e entre barreiras empatadas a de maior soma (a
+primeira, se as somas também empatam).
+"""
+from array import array
+
+
+class DigitWindows:
+    """Contagem dos dígitos 0-9 em várias janelas deslizantes ao mesmo tempo"""
+
+    __slots__ = ("sizes", "capacity", "_ring", "_head", "_size", "_counts", "_last")
+
+    def __init__(self, sizes=(100,)):
+        self.sizes    = tuple(sorted(set(sizes)))
+        self.capacity = self.sizes[-1]
+        self._ring    = array("b", bytes(self.capacity))
+        self._head    = 0
+        self._size    = 0
+        self._counts  = {w: [0] * 10 for w in self.sizes}
+        self._last    = None   # última cotação vista por sync()
+
+    @classmethod
+    def from_digits(cls, digits, sizes=(100,)):
+        """Monta as janelas de uma vez a partir de uma sequência de dígitos"""
+        windows = cls(sizes)
+        for d in digits[-windows.capacity:]:
+            windows.push(d)
+        return windows
+
+    def push(self, digit):
+        head, ring = self._head, self._ring
+        size = self._size
+        for w, counts in self._counts.items():
+            counts[digit] += 1
+            if size >= w:
+                # Dígito que entrou há w ticks sai da janela
+                counts[ring[head - w]] -= 1
+        ring[head] = digit
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        if size < self.capacity:
+            self._size = size + 1
+
+    def extend(self, digits):
+        digits = list(digits)
+        if len(digits) >= self.capacity:
+            # Só os últimos `capacity` dígitos sobrevivem: recomeça deles
+            self.clear()
+            digits = digits[-self.capacity:]
+        for d in digits:
+            self.push(d)
+
+    def sync(self, quotes, digit):
+        """
+        Caminho analyze(ticks): `quotes` é o histórico do bot (append no fim,
+        descarte no início). Empurra só as cotações depois da última vista
+        na chamada anterior — reconhecida pela identidade do objeto, achada
+        em O(1) no caso normal — e deixa as janelas cobrindo as últimas
+        `capacity` cotações da lista. Lista desconhecida recomeça do zero.
+
+        Args:
+            quotes (list): Cotações em ordem cronológica
+            digit: Função cotação → dígito
+
+        Returns:
+            list: Dígitos empurrados nesta chamada
+        """
+        novos = None
+        last = self._last
+        if last is not None:
+            for i in range(len(quotes) - 1, -1, -1):
+                if quotes[i] is last:
+                    novos = quotes[i + 1:]
+                    break
+        if novos is None:
+            self.clear()
+            novos = quotes[-self.capacity:]
+        digits = [digit(q) for q in novos]
+        for d in digits:
+            self.push(d)
+        if quotes:
+            self._last = quotes[-1]
+        return digits
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self._last = None
+        for counts in self._counts.values():
+            counts[:] = [0] * 10
+
+    def __len__(self):
+        return self._size
+
+    # ─── LEITURAS ───────────────────────────────────────────────────────────
+    def counts(self, window):
+        """Contagem por dígito (lista de 10, não alterar)"""
+        return self._counts[window]
+
+    def total(self, window):
+        return self._size if self._size < window else window
+
+    def count_high(self, window):
+        """Dígitos > 4 na janela"""
+        c = self._counts[window]
+        return c[5] + c[6] + c[7] + c[8] + c[9]
+
+    def count_even(self, window):
+        c = self._counts[window]
+        return c[0] + c[2] + c[4] + c[6] + c[8]
+
+    def hottest(self, window):
+        """Dígito mais frequente (o menor em caso de empate)"""
+        c = self._counts[window]
+        return max(range(10), key=c.__getitem__)
+
+    def coldest(self, window):
+        """Dígito menos frequente (o menor em caso de empate)"""
+        c = self._counts[window]
+        return min(range(10), key=c.__getitem__)
+
+    def percent(self, window, digit):
+        t = self.total(window)
+        return self._counts[window][digit] / t * 100 if t else 0.0
+
+    def frequency(self, window):
+        """Dict dígito → % (mesmo formato do antigo _calc_frequency; aloca)"""
+        t = self.total(window) or 1
+        return {d: c / t * 100 for d, c in enumerate(self._counts[window])}
+
+    def over_under(self, window, barrier):
+        """(dígitos > barreira, dígitos < barreira) na janela"""
+        c = self._counts[window]
+        under = 0
+        for d in range(barrier):
+            under += c[d]
+        return self.total(window) - under - c[barrier], under
+
+    @staticmethod
+    def _soma_pct(c, t, digits):
+        """Soma de freq = c / t * 100 na ordem do código antigo (mesmo arredondamento)"""
+        return sum(c[d] / t * 100 for d in digits)
+
+    def over_under_pct(self, window, barrier):
+        """(% > barreira, % < barreira) somados como o antigo po/pu"""
+        c = self._counts[window]
+        t = self.total(window)
+        if not t:
+            return 0.0, 0.0
+        return self._soma_pct(c, t, range(barrier + 1, 10)), self._soma_pct(c, t, range(barrier))
+
+    def best_barrier(self, window, first=1, last=8):
+        """
+        Barreira com maior desequilíbrio entre first e last.
+
+        Returns:
+            tuple: (barreira, "OVER"/"UNDER", confiança em %) ou None sem dados
+        """
+        c = self._counts[window]
+        t = self.total(window)
+        if not t:
+            return None
+        pct = self._soma_pct
+
+        def soma(barrier, direction):
+            return pct(c, t, range(barrier + 1, 10) if direction == "OVER" else range(barrier))
+
+        below = 0
+        for d in range(first):
+            below += c[d]
+        best_barrier, best_direction, best_hits, best_pct = first, "OVER", -1, None
+        for barrier in range(first, last + 1):
+            over = t - below - c[barrier]
+            if over > below:
+                direction, hits, atual = "OVER", over, None
+            elif over < below:
+                direction, hits, atual = "UNDER", below, None
+            else:
+                # Contagens empatadas: decide pelas somas em float, como antes
+                po, pu = pct(c, t, range(barrier + 1, 10)), pct(c, t, range(barrier))
+                direction, hits, atual = ("OVER", over, po) if po >= pu else ("UNDER", below, pu)
+            if hits > best_hits:
+                best_barrier, best_direction, best_hits, best_pct = barrier, direction, hits, atual
+            elif hits == best_hits:
+                if atual is None:
+                    atual = soma(barrier, direction)
+                if best_pct is None:
+                    best_pct = soma(best_barrier, best_direction)
+                if atual > best_pct:
+                    best_barrier, best_direction, best_pct = barrier, direction, atual
+            below += c[barrier]
+        if best_pct is None:
+            best_pct = soma(best_barrier, best_direction)
+        return best_barrier, best_direction, best_pct
+
+    def __repr__(self):
+        return f"DigitWindows({self._size}/{self.capacity} janelas={self.sizes})"
+
+
+if __name__ == "__main__":
+    # Conferência contra o Counter refeito a cada tick
+    import random
+    from collections import Counter, deque
+
+    janelas = DigitWindows((10, 25, 50, 100))
+    historico = deque(maxlen=300)
+    for i in range(20000):
+        d = random.choice(range(10)) if random.random() < 0.8 else 7
+        janelas.push(d)
+        historico.append(d)
+        for w in janelas.sizes:
+            c = Counter(list(historico)[-w:])
+            assert janelas.counts(w) == [c.get(k, 0) for k in range(10)], (i, w)
+    print(f"OK: {janelas!r} confere com Counter em {i + 1} ticks")
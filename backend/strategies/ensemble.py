@@ -0,0 +1,103 @@
+"""
+Strategy Ensemble — modo multi-estratégia com todas as estratégias aquecidas
+Alpha Dolar 2.0
+
+No modo "multi" só uma estratégia ficava viva; após uma perda, a próxima
+era criada do zero e precisava de 40–100 ticks para voltar a operar.
+
+O ensemble cria uma instância de cada estratégia escolhida uma única vez
+e avalia todas em uma passada por tick (should_enter de cada uma). Como
+o tick passa pelo cache de indicadores do símbolo (indicator_cache), EMA,
+RSI, desvio etc. são calculados uma vez para todas elas.
+
+Só o sinal da estratégia ativa é operado. As demais seguem avaliando
+como se estivessem operando, então a troca após perda é instantânea.
+
+Uso:
+    ensemble = StrategyEnsemble({"alpha_bot_1": AlphaBot1(...), ...})
+    bot = AlphaDolar(strategy=ensemble.active, ...)
+    bot.ensemble = ensemble
+    ...
+    bot.trocar_estrategia(ensemble.next_strategy())   # após perda
+"""
+import random
+
+_SEM_SINAL = (False, None, 0.0)
+
+
+class StrategyEnsemble:
+    """Conjunto de estratégias should_enter avaliadas juntas, uma ativa por vez"""
+
+    def __init__(self, strategies, active_id=None):
+        """
+        Args:
+            strategies (dict): id → instância de estratégia (ordem preservada)
+            active_id (str): Estratégia ativa inicial (padrão: sorteada)
+        """
+        if not strategies:
+            raise ValueError("Ensemble precisa de pelo menos uma estratégia")
+        self.strategies = dict(strategies)
+        self.active_id  = active_id if active_id in self.strategies else random.choice(list(self.strategies))
+        self.results    = {}   # id → (should_enter, direction, confidence) do último tick
+        self.ticks      = 0
+
+    @property
+    def active(self):
+        return self.strategies[self.active_id]
+
+    def __contains__(self, strategy):
+        return any(s is strategy for s in self.strategies.values())
+
+    def __len__(self):
+        return len(self.strategies)
+
+    def evaluate(self, tick_data):
+        """
+        Avalia todas as estratégias com o tick (uma passada)
+
+        Returns:
+            tuple: (should_enter, direction, confidence) da estratégia ativa
+        """
+        results = self.results
+        for sid, strategy in self.strategies.items():
+            try:
+                results[sid] = strategy.should_enter(tick_data)
+            except Exception as e:
+                results[sid] = _SEM_SINAL
+                print(f"⚠️ Ensemble: erro em {sid}: {e}")
+        self.ticks += 1
+        return results.get(self.active_id, _SEM_SINAL)
+
+    def preload(self, ticks):
+        """Aquece todas as estratégias sem avaliar sinais"""
+        for strategy in self.strategies.values():
+            if hasattr(strategy, 'preload'):
+                strategy.preload(ticks)
+
+    def warmup_ticks(self):
+        """Maior aquecimento entre as estratégias"""
+        return max((getattr(s, 'warmup_ticks', lambda: 0)() for s in self.strategies.values()), default=0)
+
+    def next_strategy(self):
+        """
+        Sorteia outra estratégia (diferente da ativa) e a torna ativa
+
+        Returns:
+            BaseStrategy: A nova estratégia ativa (já aquecida)
+        """
+        opcoes = [sid for sid in self.strategies if sid != self.active_id]
+        if opcoes:
+            self.active_id = random.choice(opcoes)
+        return self.active
+
+    def signaling(self):
+        """Ids das estratégias com sinal no último tick"""
+        return [sid for sid, (entrar, direcao, _) in self.results.items() if entrar and direcao]
+
+    def get_info(self):
+        return {
+            "active": self.active_id,
+            "strategies": list(self.strategies),
+            "ticks": self.ticks,
+            "signaling": self.signaling(),
+        }
@@ -0,0 +1,172 @@
+"""
+Indicator Cache — indicadores compartilhados por símbolo
+Alpha Dolar 2.0
+
+Com 50 bots no R_100, cada estratégia recalculava as mesmas EMA(5/15/30),
+RSI(14), desvio padrão e frequências de dígitos para o mesmo tick.
+Aqui cada símbolo tem um único IndicatorEngine + DigitWindows para o
+processo inteiro:
+
+    - o primeiro a receber um tick (symbol + epoch) atualiza o símbolo —
+      com o TickHub, o próprio feed, antes do fan-out; os bots veem o
+      mesmo epoch e não refazem nada
+    - indicadores são registrados na primeira leitura (semeados com o
+      histórico do símbolo) e daí em diante avançam uma vez por tick
+    - cached(chave, função) guarda qualquer valor derivado até o próximo
+      tick: o cálculo roda uma vez por tick para todas as estratégias
+    - candles OHLC (5 s, 15 s, 1 m, 5 m) avançam no mesmo tick e ficam
+      disponíveis para a API (/api/candles, /api/ctx-ia), mesmo sem
+      estratégia lendo o cache
+    - o regime de volatilidade (quantile_sketch.py) guarda o percentil da
+      volatilidade atual nas últimas horas sem armazenar os ticks
+
+Ticks sem symbol/epoch (testes, simulação) ou mais antigos que o último
+visto (backtest, bot atrasado) não entram no cache: a estratégia usa os
+próprios indicadores (BaseStrategy.indicators cai para o engine local).
+
+Com o TickHub, todos os bots de um símbolo recebem o tick na mesma
+thread do feed, então leitura e atualização nunca se sobrepõem.
+"""
+import threading
+
+try:
+    from .indicators import IndicatorEngine
+    from .tick_buffer import TickRing
+    from .digit_windows import DigitWindows
+    from .quantile_sketch import VolatilityRegime
+    from ..digits import decimals_for, last_digit
+    from ..candles import CandleAggregator
+except ImportError:
+    from indicators import IndicatorEngine
+    from tick_buffer import TickRing
+    from digit_windows import DigitWindows
+    from quantile_sketch import VolatilityRegime
+    from digits import decimals_for, last_digit
+    from candles import CandleAggregator
+
+# Histórico mantido por símbolo (semeia indicadores registrados depois)
+SHARED_HISTORY = 300
+# Janelas de dígitos usadas pelas estratégias de dígitos (pulso 8/10, Mega 25/50/100)
+SHARED_DIGIT_WINDOWS = (8, 10, 25, 50, 100)
+
+_MISSING = object()
+
+
+class SymbolIndicators:
+    """Indicadores e janelas de dígitos de um símbolo, avançados uma vez por tick"""
+
+    def __init__(self, symbol, capacity=SHARED_HISTORY, digit_windows=SHARED_DIGIT_WINDOWS):
+        self.symbol   = symbol
+        self.ring     = TickRing(capacity)
+        self.engine   = IndicatorEngine(ring=self.ring)
+        self.digits   = DigitWindows(digit_windows)
+        self.candles  = CandleAggregator(symbol)
+        self.regime   = VolatilityRegime()
+        self.decimals = None
+        self.epoch    = None
+        self.ticks    = 0
+        self._memo    = {}
+        self._lock    = threading.Lock()
+
+    def observe(self, tick_data, epoch):
+        """
+        Avança o símbolo com o tick se ele for novo
+
+        Returns:
+            bool: True se o estado atual corresponde a este tick
+        """
+        if self.epoch is not None and epoch <= self.epoch:
+            return epoch == self.epoch
+        with self._lock:
+            if self.epoch is not None and epoch <= self.epoch:
+                return epoch == self.epoch
+            quote = float(tick_data.get('quote', 0))
+            if self.decimals is None or tick_data.get('pip_size') is not None:
+                self.decimals = decimals_for(self.symbol, tick_data.get('pip_size'))
+            self.ring.append(quote, epoch, self.symbol)
+            self.engine.update(quote)
+            self.digits.push(last_digit(quote, self.decimals))
+            self.candles.update(quote, epoch)
+            self.regime.update(quote, epoch)
+            self._memo.clear()
+            self.epoch = epoch
+            self.ticks += 1
+            return True
+
+    def cached(self, key, compute):
+        """
+        Valor derivado do tick atual, calculado na primeira leitura e
+        guardado até o próximo tick
+
+        Args:
+            key: Chave hashable (inclua a classe/parâmetros da estratégia)
+            compute: Função sem argumentos que calcula o valor
+        """
+        value = self._memo.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self._memo[key] = value
+        return value
+
+    def best_barrier(self, window, first=1, last=8):
+        """DigitWindows.best_barrier memoizado por tick"""
+        return self.cached(("best_barrier", window, first, last),
+                           lambda: self.digits.best_barrier(window, first, last))
+
+    def get_info(self):
+        return {
+            "ticks": self.ticks,
+            "epoch": self.epoch,
+            "indicadores": len(self.engine._indicators),
+            "memo": len(self._memo),
+            "candles": self.candles.get_info()["candles"],
+            "regime": self.regime.get_info(),
+        }
+
+
+class IndicatorCache:
+    """Registro de SymbolIndicators por símbolo (um por processo)"""
+
+    def __init__(self):
+        self._symbols = {}
+        self._lock    = threading.Lock()
+
+    def get(self, symbol):
+        shared = self._symbols.get(symbol)
+        if shared is None:
+            with self._lock:
+                shared = self._symbols.get(symbol)
+                if shared is None:
+                    shared = self._symbols[symbol] = SymbolIndicators(symbol)
+        return shared
+
+    def observe(self, tick_data):
+        """
+        Registra o tick no cache do símbolo
+
+        Returns:
+            SymbolIndicators: estado compartilhado deste tick, ou None se o
+            tick não tem symbol/epoch ou não é o tick atual do símbolo
+        """
+        symbol = tick_data.get('symbol')
+        epoch  = tick_data.get('epoch')
+        if not symbol or epoch is None:
+            return None
+        shared = self.get(symbol)
+        return shared if shared.observe(tick_data, epoch) else None
+
+    def candles(self, symbol):
+        """CandleAggregator do símbolo, ou None se nenhum tick dele passou por aqui"""
+        shared = self._symbols.get(symbol)
+        return shared.candles if shared is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._symbols.clear()
+
+    def get_info(self):
+        return {symbol: shared.get_info() for symbol, shared in list(self._symbols.items())}
+
+
+# Instância única do processo (um worker gunicorn = um cache)
+indicator_cache = IndicatorCache()
@@ -0,0 +1,342 @@
+"""
+Indicadores incrementais — O(1) por tick
+Alpha Dolar 2.0
+
+Cada estratégia tem um IndicatorEngine alimentado uma única vez por tick
+em BaseStrategy.update_tick. Em vez de refazer listas e recalcular EMA,
+RSI, média e desvio padrão a cada should_enter, os indicadores mantêm
+estado (somas móveis, variância de Welford, EMA recursiva) e a leitura
+do valor atual é O(1).
+
+Indicadores são registrados na primeira leitura e semeados com o buffer
+de preços do engine, então podem ser pedidos a qualquer momento.
+
+Equivalências com o código antigo:
+    statistics.mean(prices[-n:])   → engine.sma(n)
+    min(prices[-n:]) / max(...)    → engine.min(n) / engine.max(n)
+    statistics.stdev(prices[-n:])  → engine.stdev(n)
+    (current - ma) / (std or 0.001) → engine.zscore(n)
+    _rsi(prices) (médias simples)  → engine.rsi(14)
+    (p[-1] - p[-1-k]) / p[-1-k] * 100 → engine.momentum(k)
+"""
+import math
+from collections import deque
+
+try:
+    from .tick_buffer import TickRing
+except ImportError:
+    from tick_buffer import TickRing
+
+# A cada N atualizações as somas móveis são recalculadas do zero (limita deriva de ponto flutuante)
+RESYNC_INTERVAL = 1000
+
+
+class RollingStats:
+    """Média e variância de uma janela deslizante (Welford com remoção)"""
+
+    __slots__ = ("window", "values", "mean", "m2", "_updates", "_equal_run")
+
+    def __init__(self, window):
+        self.window     = window
+        self.values     = deque(maxlen=window)
+        self.mean       = 0.0
+        self.m2         = 0.0
+        self._updates   = 0
+        self._equal_run = 0     # preços iguais consecutivos no fim: janela constante → variância 0 exata
+
+    def push(self, x):
+        self._equal_run = self._equal_run + 1 if self.values and self.values[-1] == x else 1
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.values.append(x)
+            old_mean   = self.mean
+            self.mean += (x - old) / self.window
+            self.m2   += (x - old) * (x - self.mean + old - old_mean)
+        else:
+            self.values.append(x)
+            delta      = x - self.mean
+            self.mean += delta / len(self.values)
+            self.m2   += delta * (x - self.mean)
+
+        self._updates += 1
+        if self._updates >= RESYNC_INTERVAL:
+            self._resync()
+
+    def _resync(self):
+        self._updates = 0
+        n = len(self.values)
+        self.mean = math.fsum(self.values) / n
+        self.m2   = math.fsum((v - self.mean) ** 2 for v in self.values)
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window
+
+    def _m2(self):
+        return 0.0 if self._equal_run >= len(self.values) else max(self.m2, 0.0)
+
+    def variance(self):
+        """Variância amostral (n-1), como statistics.variance"""
+        n = len(self.values)
+        return self._m2() / (n - 1) if n > 1 else 0.0
+
+    def stdev(self):
+        return math.sqrt(self.variance())
+
+    def pstdev(self):
+        """Desvio padrão populacional (n), como statistics.pstdev"""
+        n = len(self.values)
+        return math.sqrt(self._m2() / n) if n else 0.0
+
+
+class RollingExtremes:
+    """Mínimo e máximo de uma janela deslizante (deques monotônicos, O(1) amortizado)"""
+
+    __slots__ = ("window", "_index", "_mins", "_maxs")
+
+    def __init__(self, window):
+        self.window = window
+        self._index = 0
+        self._mins  = deque()   # (índice, preço) com preços crescentes
+        self._maxs  = deque()   # (índice, preço) com preços decrescentes
+
+    def push(self, x):
+        self._index += 1
+        while self._mins and self._mins[-1][1] >= x:
+            self._mins.pop()
+        while self._maxs and self._maxs[-1][1] <= x:
+            self._maxs.pop()
+        self._mins.append((self._index, x))
+        self._maxs.append((self._index, x))
+        inicio = self._index - self.window
+        if self._mins[0][0] <= inicio:
+            self._mins.popleft()
+        if self._maxs[0][0] <= inicio:
+            self._maxs.popleft()
+
+    @property
+    def min(self):
+        return self._mins[0][1] if self._mins else None
+
+    @property
+    def max(self):
+        return self._maxs[0][1] if self._maxs else None
+
+
+class EMA:
+    """EMA recursiva, semeada com a média simples dos primeiros `period` preços"""
+
+    __slots__ = ("period", "alpha", "value", "_count", "_seed")
+
+    def __init__(self, period, smoothing=2):
+        self.period = period
+        self.alpha  = smoothing / (period + 1)
+        self.value  = None
+        self._count = 0
+        self._seed  = 0.0
+
+    def push(self, x):
+        self._count += 1
+        if self._count < self.period:
+            self._seed += x
+        elif self._count == self.period:
+            self.value = (self._seed + x) / self.period
+        else:
+            self.value = x * self.alpha + self.value * (1 - self.alpha)
+
+
+class RSI:
+    """
+    RSI sobre as últimas `period` variações.
+
+    wilder=False: médias simples de ganhos/perdas (Cutler) — mesmo valor
+    do _rsi das estratégias, inclusive o piso de 0.001.
+    wilder=True: suavização de Wilder (média móvel exponencial 1/period).
+    """
+
+    __slots__ = ("period", "wilder", "last", "gains", "losses", "gain_sum", "loss_sum",
+                 "_gain_nz", "_loss_nz", "_avg_gain", "_avg_loss", "_count", "_updates")
+
+    def __init__(self, period=14, wilder=False):
+        self.period    = period
+        self.wilder    = wilder
+        self.last      = None
+        self.gains     = deque(maxlen=period)
+        self.losses    = deque(maxlen=period)
+        self.gain_sum  = 0.0
+        self.loss_sum  = 0.0
+        self._gain_nz  = 0      # variações não nulas na janela: soma zero exata quando não há nenhuma
+        self._loss_nz  = 0
+        self._avg_gain = None
+        self._avg_loss = None
+        self._count    = 0
+        self._updates  = 0
+
+    def push(self, x):
+        if self.last is None:
+            self.last = x
+            return
+        change, self.last = x - self.last, x
+        gain, loss = max(0, change), max(0, -change)
+        self._count += 1
+
+        if len(self.gains) == self.period:
+            old_gain, old_loss = self.gains[0], self.losses[0]
+            self.gain_sum -= old_gain
+            self.loss_sum -= old_loss
+            self._gain_nz -= old_gain != 0
+            self._loss_nz -= old_loss != 0
+        self.gains.append(gain)
+        self.losses.append(loss)
+        self.gain_sum += gain
+        self.loss_sum += loss
+        self._gain_nz += gain != 0
+        self._loss_nz += loss != 0
+
+        self._updates += 1
+        if self._updates >= RESYNC_INTERVAL:
+            self._updates = 0
+            self.gain_sum = math.fsum(self.gains)
+            self.loss_sum = math.fsum(self.losses)
+
+        if self.wilder:
+            if self._count == self.period:
+                self._avg_gain = self.gain_sum / self.period
+                self._avg_loss = self.loss_sum / self.period
+            elif self._count > self.period:
+                self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+                self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+    @property
+    def value(self):
+        if self._count < self.period:
+            return 50.0
+        if self.wilder:
+            ag, al = self._avg_gain, self._avg_loss
+        else:
+            ag = self.gain_sum / self.period if self._gain_nz else 0.0
+            al = self.loss_sum / self.period if self._loss_nz else 0.0
+        ag = ag or 0.001
+        al = al or 0.001
+        return 100 - (100 / (1 + ag / al))
+
+
+class IndicatorEngine:
+    """
+    Indicadores de uma estratégia, atualizados uma vez por tick.
+
+    Uso:
+        engine.update(price)          # em update_tick
+        engine.sma(20), engine.stdev(10), engine.ema(15), engine.rsi(),
+        engine.zscore(40), engine.momentum(7), engine.price(4)
+
+    ring: TickRing compartilhado (ticks_history da estratégia). Quem o
+    alimenta é o dono; sem ring, o engine mantém o próprio buffer.
+    """
+
+    def __init__(self, maxlen=100, ring=None):
+        self._owns_ring  = ring is None
+        self.prices      = TickRing(maxlen) if ring is None else ring
+        self._indicators = {}
+
+    def update(self, price):
+        if self._owns_ring:
+            self.prices.append(price)
+        for indicator in self._indicators.values():
+            indicator.push(price)
+
+    def reset(self):
+        if self._owns_ring:
+            self.prices.clear()
+        self._indicators.clear()
+
+    def __len__(self):
+        return len(self.prices)
+
+    def _get(self, key, factory):
+        indicator = self._indicators.get(key)
+        if indicator is None:
+            # Registro preguiçoso: semeia com o histórico já recebido
+            indicator = factory()
+            for price in self.prices.last():
+                indicator.push(price)
+            self._indicators[key] = indicator
+        return indicator
+
+    # ─── LEITURAS O(1) ──────────────────────────────────────────────────────
+    @property
+    def last(self):
+        return self.prices.quote() if self.prices else None
+
+    def price(self, back=0):
+        """Preço de `back` ticks atrás (0 = atual)"""
+        return self.prices.quote(back)
+
+    def sma(self, n):
+        stats = self._get(("stats", n), lambda: RollingStats(n))
+        return stats.mean if stats.ready else None
+
+    def stdev(self, n):
+        stats = self._get(("stats", n), lambda: RollingStats(n))
+        return stats.stdev() if len(stats.values) > 1 else None
+
+    def pstdev(self, n):
+        stats = self._get(("stats", n), lambda: RollingStats(n))
+        return stats.pstdev() if len(stats.values) > 1 else None
+
+    def zscore(self, n):
+        stats = self._get(("stats", n), lambda: RollingStats(n))
+        if len(stats.values) < 2:
+            return 0.0
+        return (self.prices.quote() - stats.mean) / (stats.stdev() or 0.001)
+
+    def min(self, n):
+        return self._get(("extremes", n), lambda: RollingExtremes(n)).min
+
+    def max(self, n):
+        return self._get(("extremes", n), lambda: RollingExtremes(n)).max
+
+    def ema(self, period, smoothing=2):
+        return self._get(("ema", period, smoothing), lambda: EMA(period, smoothing)).value
+
+    def rsi(self, period=14, wilder=False):
+        return self._get(("rsi", period, wilder), lambda: RSI(period, wilder)).value
+
+    def momentum(self, lag):
+        """Variação percentual contra o preço de `lag` ticks atrás"""
+        if len(self.prices) <= lag:
+            return 0.0
+        anterior = self.prices.quote(lag)
+        return (self.prices.quote() - anterior) / anterior * 100
+
+
+if __name__ == "__main__":
+    # Conferência contra o cálculo antigo (listas + statistics)
+    import random
+    import statistics
+
+    def rsi_antigo(prices, period=14):
+        gains  = [max(0, prices[-i] - prices[-i - 1]) for i in range(1, period + 1)]
+        losses = [max(0, prices[-i - 1] - prices[-i]) for i in range(1, period + 1)]
+        ag = statistics.mean(gains) or 0.001
+        al = statistics.mean(losses) or 0.001
+        return 100 - (100 / (1 + ag / al))
+
+    engine = IndicatorEngine()
+    preco, historico, maior_erro = 1000.0, [], 0.0
+    for i in range(20000):
+        preco = round(preco + random.choice([-1, 0, 0, 1]) * random.random(), 2)
+        historico.append(preco)
+        engine.update(preco)
+        if len(historico) >= 40:
+            janela = historico[-40:]
+            erros = [
+                abs(engine.sma(40) - statistics.mean(janela)),
+                abs(engine.stdev(40) - statistics.stdev(janela)),
+                abs(engine.stdev(10) - statistics.stdev(janela[-10:])),
+                abs(engine.rsi() - rsi_antigo(janela)),
+                abs(engine.momentum(7) - (janela[-1] - janela[-8]) / janela[-8] * 100),
+                abs(engine.min(30) - min(janela[-30:])) + abs(engine.max(30) - max(janela[-30:])),
+            ]
+            maior_erro = max(maior_erro, *erros)
+    print(f"Ticks: {len(historico)} | Maior diferença vs statistics: {maior_erro:.2e}")
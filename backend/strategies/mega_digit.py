@@ -5,12 +5,14 @@ Mega Digit 1.0: Combina frequência + pulso + par/ímpar em score unificado.
 Mega Digit 2.0: Janelas deslizantes (25/50/100 ticks) com pesos diferentes —
                 mais peso para o mais recente, menos para o histórico.
 """
-from collections import Counter, deque
+from collections import deque
 try:
     from .base_strategy import BaseStrategy
+    from .digit_windows import DigitWindows
     from ..config import BotConfig
 except ImportError:
     from base_strategy import BaseStrategy
+    from digit_windows import DigitWindows
     from config import BotConfig
 
 
@@ -22,58 +24,56 @@ class MegaDigit1(BaseStrategy):
         self.tier = "PREMIUM"
         self.contract_type = "DIGITOVER/DIGITUNDER"
         self.digit_history = deque(maxlen=300)
+        self.digit_windows = DigitWindows((10, 50, 100))  # pulso, par/ímpar, frequência
         self.min_ticks = 70
         self.min_score = 65.0
         self._last_barrier = 5
         self._last_direction = "OVER"
 
     def _get_last_digit(self, price):
-        return int(str(float(price)).replace(".", "")[-1])
+        return self.last_digit(float(price))
 
-    def _combined_score(self, digits):
+    def preload(self, ticks):
+        super().preload(ticks)
+        digits = [self._get_last_digit(float(t.get("quote", 0))) for t in ticks]
+        self.digit_history.extend(digits)
+        self.digit_windows.extend(digits)
+
+    def _combined_score(self, windows):
         """
         Calcula score combinado de 3 fontes:
         1. Frequência (40%): barreira ótima por desequilíbrio
         2. Pulso (35%): dominância recente de um lado
         3. Par/Ímpar (25%): desequilíbrio par vs ímpar
+
+        Args:
+            windows (DigitWindows): janelas 10/50/100 dos dígitos
         """
         # --- 1. Frequência ---
-        c = Counter(digits[-100:])
-        t = len(digits[-100:])
-        freq = {d: c.get(d, 0) / t * 100 for d in range(10)}
-
-        best_freq = None
-        for barrier in range(1, 9):
-            po = sum(freq.get(d, 0) for d in range(barrier + 1, 10))
-            pu = sum(freq.get(d, 0) for d in range(0, barrier))
-            direction = "OVER" if po >= pu else "UNDER"
-            confidence = max(po, pu)
-            if best_freq is None or confidence > best_freq[2]:
-                best_freq = (barrier, direction, confidence)
-
-        freq_barrier, freq_dir, freq_conf = best_freq
+        freq_barrier, freq_dir, freq_conf = windows.best_barrier(100)
         freq_score = (freq_conf - 50) * 0.8  # normaliza para 0-40
 
         # --- 2. Pulso (últimos 10) ---
-        recent = digits[-10:]
-        highs = sum(1 for d in recent if d > 4)
-        lows  = len(recent) - highs
+        recent = windows.total(10)
+        highs = windows.count_high(10)
+        lows  = recent - highs
         if highs > lows:
             pulse_dir = "UNDER"
             pulse_barrier = 5
-            pulse_score = (highs / len(recent) - 0.5) * 70
+            pulse_score = (highs / recent - 0.5) * 70
         else:
             pulse_dir = "OVER"
             pulse_barrier = 4
-            pulse_score = (lows / len(recent) - 0.5) * 70
+            pulse_score = (lows / recent - 0.5) * 70
 
         # --- 3. Par/Ímpar ---
-        pares   = sum(1 for d in digits[-50:] if d % 2 == 0)
-        impares = len(digits[-50:]) - pares
+        janela  = windows.total(50)
+        pares   = windows.count_even(50)
+        impares = janela - pares
         if pares > impares:
-            pi_conf = pares / len(digits[-50:]) * 100
+            pi_conf = pares / janela * 100
         else:
-            pi_conf = impares / len(digits[-50:]) * 100
+            pi_conf = impares / janela * 100
         pi_score = (pi_conf - 50) * 0.5
 
         # --- Score final ponderado ---
@@ -99,10 +99,14 @@ class MegaDigit1(BaseStrategy):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_last_digit(float(tick_data.get("quote", 0))))
+        digit = self._get_last_digit(float(tick_data.get("quote", 0)))
+        self.digit_history.append(digit)
+        self.digit_windows.push(digit)
         if len(self.digit_history) < self.min_ticks:
             return False, None, 0.0
-        barrier, direction, confidence = self._combined_score(list(self.digit_history))
+        windows = self.shared.digits if self.shared is not None else self.digit_windows
+        barrier, direction, confidence = self.shared_value(
+            (MegaDigit1, "combined"), lambda: self._combined_score(windows))
         self._last_barrier = barrier
         self._last_direction = direction
         if confidence >= self.min_score:
@@ -120,9 +124,10 @@ class MegaDigit1(BaseStrategy):
     def analyze(self, ticks):
         if len(ticks) < self.min_ticks:
             return {"signal": None, "reason": f"Aguardando dados ({len(ticks)}/{self.min_ticks})", "confidence": 0}
-        digits = [self._get_last_digit(float(t)) for t in ticks]
-        self.digit_history.extend(digits)
-        barrier, direction, confidence = self._combined_score(digits)
+        # Só as cotações que ainda não passaram pelas janelas
+        self.digit_history.extend(self.digit_windows.sync(ticks, self._get_last_digit))
+        windows = self.digit_windows
+        barrier, direction, confidence = self._combined_score(windows)
         self._last_barrier = barrier
         self._last_direction = direction
         if confidence >= self.min_score:
@@ -141,6 +146,7 @@ class MegaDigit1(BaseStrategy):
 
     def reset_state(self):
         self.digit_history.clear()
+        self.digit_windows.clear()
         self.last_signal = None
         self.signal_count = 0
 
@@ -153,42 +159,37 @@ class MegaDigit2(BaseStrategy):
         self.tier = "PREMIUM"
         self.contract_type = "DIGITOVER/DIGITUNDER"
         self.digit_history = deque(maxlen=300)
+        self.digit_windows = DigitWindows((25, 50, 100))
         self.min_ticks = 100
         self.min_confidence = 66.0
         self._last_barrier = 5
         self._last_direction = "OVER"
 
     def _get_last_digit(self, price):
-        return int(str(float(price)).replace(".", "")[-1])
+        return self.last_digit(float(price))
 
-    def _analyze_window(self, digits, size):
+    def preload(self, ticks):
+        super().preload(ticks)
+        digits = [self._get_last_digit(float(t.get("quote", 0))) for t in ticks]
+        self.digit_history.extend(digits)
+        self.digit_windows.extend(digits)
+
+    def _analyze_window(self, windows, size):
         """Analisa uma janela de N dígitos e retorna (barrier, direction, confidence)"""
-        window = digits[-size:]
-        if len(window) < size // 2:
+        if windows.total(size) < size // 2:
             return None
-        c = Counter(window)
-        t = len(window)
-        freq = {d: c.get(d, 0) / t * 100 for d in range(10)}
-        best = None
-        for barrier in range(1, 9):
-            po = sum(freq.get(d, 0) for d in range(barrier + 1, 10))
-            pu = sum(freq.get(d, 0) for d in range(0, barrier))
-            direction = "OVER" if po >= pu else "UNDER"
-            confidence = max(po, pu)
-            if best is None or confidence > best[2]:
-                best = (barrier, direction, confidence)
-        return best
-
-    def _weighted_analysis(self, digits):
+        return windows.best_barrier(size)
+
+    def _weighted_analysis(self, windows):
         """
         Combina 3 janelas com pesos:
         - Últimos 25 ticks: peso 50% (mais recente = mais relevante)
         - Últimos 50 ticks: peso 30%
         - Últimos 100 ticks: peso 20%
         """
-        w25  = self._analyze_window(digits, 25)
-        w50  = self._analyze_window(digits, 50)
-        w100 = self._analyze_window(digits, 100)
+        w25  = self._analyze_window(windows, 25)
+        w50  = self._analyze_window(windows, 50)
+        w100 = self._analyze_window(windows, 100)
 
         windows = [(w25, 0.50), (w50, 0.30), (w100, 0.20)]
         windows = [(w, p) for w, p in windows if w is not None]
@@ -218,10 +219,13 @@ class MegaDigit2(BaseStrategy):
 
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
-        self.digit_history.append(self._get_last_digit(float(tick_data.get("quote", 0))))
+        digit = self._get_last_digit(float(tick_data.get("quote", 0)))
+        self.digit_history.append(digit)
+        self.digit_windows.push(digit)
         if len(self.digit_history) < self.min_ticks:
             return False, None, 0.0
-        result = self._weighted_analysis(list(self.digit_history))
+        windows = self.shared.digits if self.shared is not None else self.digit_windows
+        result = self.shared_value((MegaDigit2, "weighted"), lambda: self._weighted_analysis(windows))
         if result is None:
             return False, None, 0.0
         barrier, direction, confidence = result
@@ -242,9 +246,9 @@ class MegaDigit2(BaseStrategy):
     def analyze(self, ticks):
         if len(ticks) < self.min_ticks:
             return {"signal": None, "reason": f"Aguardando dados ({len(ticks)}/{self.min_ticks})", "confidence": 0}
-        digits = [self._get_last_digit(float(t)) for t in ticks]
-        self.digit_history.extend(digits)
-        result = self._weighted_analysis(digits)
+        # Só as cotações que ainda não passaram pelas janelas
+        self.digit_history.extend(self.digit_windows.sync(ticks, self._get_last_digit))
+        result = self._weighted_analysis(self.digit_windows)
         if result is None:
             return {"signal": None, "confidence": 0, "reason": "Janelas insuficientes"}
         barrier, direction, confidence = result
@@ -266,5 +270,6 @@ class MegaDigit2(BaseStrategy):
 
     def reset_state(self):
         self.digit_history.clear()
+        self.digit_windows.clear()
         self.last_signal = None
         self.signal_count = 0
\ No newline at end of file
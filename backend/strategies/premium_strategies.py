@@ -3,8 +3,8 @@ PREMIUM STRATEGIES
 Mega Alpha 1.0, 2.0, 3.0, Alpha Elite, Alpha Nexus
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, ema, rsi, momentum, zscore, count_true, score_signals
 from ..config import BotConfig
-import statistics
 
 # ============================================================
 # BASE PREMIUM — herança para todas as premium
@@ -57,21 +57,6 @@ class _PremiumBase(BaseStrategy):
 
     def get_stake(self): return self.stake_atual
 
-    def _ema(self, prices, period):
-        if len(prices) < period: return None
-        mult = 2 / (period + 1)
-        ema = statistics.mean(prices[:period])
-        for p in prices[period:]: ema = (p * mult) + (ema * (1 - mult))
-        return ema
-
-    def _rsi(self, prices, period=14):
-        if len(prices) < period+1: return 50.0
-        gains  = [max(0, prices[-i]-prices[-i-1]) for i in range(1, period+1)]
-        losses = [max(0, prices[-i-1]-prices[-i]) for i in range(1, period+1)]
-        ag = statistics.mean(gains) or 0.001
-        al = statistics.mean(losses) or 0.001
-        return 100 - (100/(1+ag/al))
-
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
@@ -91,17 +76,14 @@ class MegaAlpha1(_PremiumBase):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-40:]]
-            current = prices[-1]
-            ema5  = self._ema(prices, 5)
-            ema15 = self._ema(prices, 15)
-            ema30 = self._ema(prices, 30)
-            rsi   = self._rsi(prices)
-            ma40  = statistics.mean(prices)
-            std   = statistics.stdev(prices)
-            zscore = (current - ma40) / (std or 0.001)
-            mom   = (prices[-1]-prices[-8])/prices[-8]*100
-            vol   = statistics.stdev(prices[-10:])
+            ind = self.indicators
+            current = ind.last
+            ema5  = ind.ema(5)
+            ema15 = ind.ema(15)
+            ema30 = ind.ema(30)
+            rsi   = ind.rsi()
+            zscore = ind.zscore(40)
+            mom   = ind.momentum(7)
 
             call_conditions = [
                 ema5 > ema15, ema15 > ema30,
@@ -132,6 +114,18 @@ class MegaAlpha1(_PremiumBase):
             print(f"⚠️ Mega Alpha 1.0 erro: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ema5, ema15, ema30 = ema(quotes, 5), ema(quotes, 15), ema(quotes, 30)
+        r   = rsi(quotes)
+        z   = zscore(quotes, 40)
+        mom = momentum(quotes, 7)
+        cs = count_true(ema5 > ema15, ema15 > ema30, r < 38, quotes < ema5, mom < -0.1, z < -1.5)
+        ps = count_true(ema5 < ema15, ema15 < ema30, r > 62, quotes > ema5, mom > 0.1, z > 1.5)
+        direction, confidence = score_signals(cs, ps, self.min_conditions,
+                                              lambda s: 0.68 + (s / 6) * 0.24, self.min_confidence, cap=0.94)
+        return direction, confidence, None
+
     def get_info(self): return {'name': self.name, 'tier': 'PREMIUM', 'win_rate': '84%'}
 
 
@@ -151,16 +145,13 @@ class MegaAlpha2(_PremiumBase):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-40:]]
-            current = prices[-1]
-            ema8  = self._ema(prices, 8)
-            ema21 = self._ema(prices, 21)
-            rsi   = self._rsi(prices)
-            ma40  = statistics.mean(prices)
-            std   = statistics.stdev(prices)
-            zscore = (current - ma40) / (std or 0.001)
-            mom5  = (prices[-1]-prices[-5])/prices[-5]*100
-            mom10 = (prices[-1]-prices[-10])/prices[-10]*100
+            ind = self.indicators
+            ema8  = ind.ema(8)
+            ema21 = ind.ema(21)
+            rsi   = ind.rsi()
+            zscore = ind.zscore(40)
+            mom5  = ind.momentum(4)
+            mom10 = ind.momentum(9)
 
             # Score ponderado
             call_score = 0.0
@@ -196,6 +187,27 @@ class MegaAlpha2(_PremiumBase):
             print(f"⚠️ Mega Alpha 2.0 erro: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ema8, ema21 = ema(quotes, 8), ema(quotes, 21)
+        r     = rsi(quotes)
+        z     = zscore(quotes, 40)
+        mom5  = momentum(quotes, 4)
+        mom10 = momentum(quotes, 9)
+        w = self.weights
+        # Mesma ordem de somas do should_enter (somar 0.0 não altera o float)
+        call_score = 0.0 + w['ema'] * (ema8 > ema21)
+        put_score  = 0.0 + w['ema'] * (ema8 <= ema21)
+        call_score = call_score + w['rsi'] * (r < 35)
+        put_score  = put_score + w['rsi'] * (r > 65)
+        call_score = call_score + w['momentum'] * ((mom5 < -0.1) & (mom10 < -0.05))
+        put_score  = put_score + w['momentum'] * ((mom5 > 0.1) & (mom10 > 0.05))
+        call_score = call_score + w['zscore'] * (z < -1.8)
+        put_score  = put_score + w['zscore'] * (z > 1.8)
+        direction, confidence = score_signals(call_score, put_score, 0.65,
+                                              lambda s: 0.70 + s * 0.20, self.min_confidence, cap=0.95)
+        return direction, confidence, None
+
     def get_info(self): return {'name': self.name, 'tier': 'PREMIUM', 'win_rate': '86%'}
 
 
@@ -213,31 +225,30 @@ class MegaAlpha3(_PremiumBase):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-40:]]
-            current = prices[-1]
+            ind = self.indicators
+            current = ind.last
 
-            # Camada 1: curto prazo (5 ticks)
-            c1_up   = statistics.mean(prices[-5:]) > statistics.mean(prices[-10:-5])
-            c1_down = statistics.mean(prices[-5:]) < statistics.mean(prices[-10:-5])
+            # Camada 1: curto prazo (5 ticks) — média dos 5 anteriores = 2·MA10 − MA5
+            ma5, ma10 = ind.sma(5), ind.sma(10)
+            c1_up   = ma5 > 2 * ma10 - ma5
+            c1_down = ma5 < 2 * ma10 - ma5
 
             # Camada 2: médio prazo (20 ticks)
-            ema10 = self._ema(prices, 10)
-            ema20 = self._ema(prices, 20)
+            ema10 = ind.ema(10)
+            ema20 = ind.ema(20)
             c2_up   = ema10 > ema20 if (ema10 and ema20) else False
             c2_down = ema10 < ema20 if (ema10 and ema20) else False
 
             # Camada 3: longo prazo + RSI
-            rsi  = self._rsi(prices)
-            ma40 = statistics.mean(prices)
+            rsi  = ind.rsi()
+            ma40 = ind.sma(40)
             c3_up   = rsi < 40 and current < ma40
             c3_down = rsi > 60 and current > ma40
 
-            call_conditions = [c1_up, c2_up, c3_up,
-                               (prices[-1]-prices[-6])/prices[-6]*100 < -0.08,
-                               statistics.stdev(prices[-10:]) > 0.05]
-            put_conditions  = [c1_down, c2_down, c3_down,
-                               (prices[-1]-prices[-6])/prices[-6]*100 > 0.08,
-                               statistics.stdev(prices[-10:]) > 0.05]
+            mom5 = ind.momentum(5)
+            vol  = ind.stdev(10)
+            call_conditions = [c1_up, c2_up, c3_up, mom5 < -0.08, vol > 0.05]
+            put_conditions  = [c1_down, c2_down, c3_down, mom5 > 0.08, vol > 0.05]
 
             cs = sum(call_conditions)
             ps = sum(put_conditions)
@@ -257,6 +268,20 @@ class MegaAlpha3(_PremiumBase):
             print(f"⚠️ Mega Alpha 3.0 erro: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ma5, ma10 = rolling_mean(quotes, 5), rolling_mean(quotes, 10)
+        ema10, ema20 = ema(quotes, 10), ema(quotes, 20)
+        r    = rsi(quotes)
+        ma40 = rolling_mean(quotes, 40)
+        mom5 = momentum(quotes, 5)
+        vol  = rolling_stdev(quotes, 10)
+        cs = count_true(ma5 > 2 * ma10 - ma5, ema10 > ema20, (r < 40) & (quotes < ma40), mom5 < -0.08, vol > 0.05)
+        ps = count_true(ma5 < 2 * ma10 - ma5, ema10 < ema20, (r > 60) & (quotes > ma40), mom5 > 0.08, vol > 0.05)
+        direction, confidence = score_signals(cs, ps, self.min_conditions,
+                                              lambda s: 0.68 + (s / 5) * 0.24, self.min_confidence, cap=0.94)
+        return direction, confidence, None
+
     def get_info(self): return {'name': self.name, 'tier': 'PREMIUM', 'win_rate': '85%'}
 
 
@@ -285,19 +310,15 @@ class AlphaElite(_PremiumBase):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-40:]]
-            current = prices[-1]
-            ema5  = self._ema(prices, 5)
-            ema10 = self._ema(prices, 10)
-            ema20 = self._ema(prices, 20)
-            ema40 = self._ema(prices, 40)
-            rsi   = self._rsi(prices)
-            ma40  = statistics.mean(prices)
-            std   = statistics.stdev(prices)
-            zscore = (current - ma40) / (std or 0.001)
-            mom3  = (prices[-1]-prices[-3])/prices[-3]*100
-            mom8  = (prices[-1]-prices[-8])/prices[-8]*100
-            vol   = statistics.stdev(prices[-10:])
+            ind = self.indicators
+            current = ind.last
+            ema5  = ind.ema(5)
+            ema10 = ind.ema(10)
+            ema20 = ind.ema(20)
+            rsi   = ind.rsi()
+            zscore = ind.zscore(40)
+            mom3  = ind.momentum(2)
+            mom8  = ind.momentum(7)
 
             call_conditions = [
                 ema5 > ema10, ema10 > ema20,
@@ -330,6 +351,19 @@ class AlphaElite(_PremiumBase):
             print(f"⚠️ Alpha Elite erro: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ema5, ema10, ema20 = ema(quotes, 5), ema(quotes, 10), ema(quotes, 20)
+        r    = rsi(quotes)
+        z    = zscore(quotes, 40)
+        mom3 = momentum(quotes, 2)
+        mom8 = momentum(quotes, 7)
+        cs = count_true(ema5 > ema10, ema10 > ema20, r < 36, quotes < ema5, mom3 < -0.05, mom8 < -0.08, z < -1.6)
+        ps = count_true(ema5 < ema10, ema10 < ema20, r > 64, quotes > ema5, mom3 > 0.05, mom8 > 0.08, z > 1.6)
+        direction, confidence = score_signals(cs, ps, self.min_conditions,
+                                              lambda s: 0.70 + (s / 7) * 0.25, self.min_confidence, cap=0.96)
+        return direction, confidence, None
+
     def get_info(self): return {'name': self.name, 'tier': 'PREMIUM', 'win_rate': '88%'}
 
 
@@ -347,41 +381,39 @@ class AlphaNexus(_PremiumBase):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-40:]]
-            current = prices[-1]
+            ind = self.indicators
+            current = ind.last
 
             # 5 indicadores independentes — cada um "vota"
             votes_call = 0
             votes_put  = 0
 
             # 1. EMA cruzamento
-            ema8  = self._ema(prices, 8)
-            ema21 = self._ema(prices, 21)
+            ema8  = ind.ema(8)
+            ema21 = ind.ema(21)
             if ema8 and ema21:
                 if ema8 > ema21 and current < ema8: votes_call += 1
                 if ema8 < ema21 and current > ema8: votes_put  += 1
 
             # 2. RSI
-            rsi = self._rsi(prices)
+            rsi = ind.rsi()
             if rsi < 35: votes_call += 1
             elif rsi > 65: votes_put += 1
 
             # 3. Bollinger
-            ma20 = statistics.mean(prices[-20:])
-            std  = statistics.stdev(prices[-20:])
+            ma20 = ind.sma(20)
+            std  = ind.stdev(20)
             if current < ma20 - 1.8*std: votes_call += 1
             elif current > ma20 + 1.8*std: votes_put += 1
 
             # 4. Momentum duplo
-            m5  = (prices[-1]-prices[-5])/prices[-5]*100
-            m15 = (prices[-1]-prices[-15])/prices[-15]*100
+            m5  = ind.momentum(4)
+            m15 = ind.momentum(14)
             if m5 < -0.08 and m15 < -0.05: votes_call += 1
             elif m5 > 0.08 and m15 > 0.05: votes_put  += 1
 
             # 5. Z-score
-            ma40   = statistics.mean(prices)
-            std40  = statistics.stdev(prices)
-            zscore = (current - ma40) / (std40 or 0.001)
+            zscore = ind.zscore(40)
             if zscore < -1.6: votes_call += 1
             elif zscore > 1.6: votes_put += 1
 
@@ -403,4 +435,22 @@ class AlphaNexus(_PremiumBase):
             print(f"⚠️ Alpha Nexus erro: {e}")
             return False, None, 0.0
 
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ema8, ema21 = ema(quotes, 8), ema(quotes, 21)
+        r    = rsi(quotes)
+        ma20 = rolling_mean(quotes, 20)
+        std  = rolling_stdev(quotes, 20)
+        m5, m15 = momentum(quotes, 4), momentum(quotes, 14)
+        z    = zscore(quotes, 40)
+        lower, upper = ma20 - 1.8*std, ma20 + 1.8*std
+        votes_call = count_true((ema8 > ema21) & (quotes < ema8), r < 35, quotes < lower,
+                                (m5 < -0.08) & (m15 < -0.05), z < -1.6)
+        votes_put  = count_true((ema8 < ema21) & (quotes > ema8), r > 65, quotes > upper,
+                                (m5 > 0.08) & (m15 > 0.05), z > 1.6)
+        min_votes = max(3, self.min_conditions - 1)
+        direction, confidence = score_signals(votes_call, votes_put, min_votes,
+                                              lambda s: 0.68 + (s / 5) * 0.26, self.min_confidence, cap=0.95)
+        return direction, confidence, None
+
     def get_info(self): return {'name': self.name, 'tier': 'PREMIUM', 'win_rate': '87%'}
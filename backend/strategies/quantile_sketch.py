@@ -0,0 +1,270 @@
+"""
+Quantile Sketch — percentis em streaming com memória limitada
+Alpha Dolar 2.0
+
+TitanCore, AlphaPulse, QuantumTrader e AlphaBotBalanced comparam o desvio
+de uma janela curta com limites fixos ou com a janela anterior. Para
+saber "a volatilidade atual está em que percentil das últimas N horas"
+sem guardar nem ordenar horas de ticks:
+
+    - QuantileSketch: histograma em escala logarítmica (estilo DDSketch)
+      com erro relativo fixo (1% por padrão). Cada bin é um contador numa
+      árvore de Fenwick, então inserir, remover, rank e quantil são
+      O(log bins), com ~2 mil bins cobrindo 1e-9 .. 1e9.
+    - WindowedQuantileSketch: o mesmo sketch restrito a um horizonte de
+      tempo. Os contadores são agrupados em blocos (5 min); quando um
+      bloco sai do horizonte, as contagens dele são subtraídas.
+    - VolatilityRegime: desvio padrão dos retornos dos últimos N ticks
+      (O(1) por tick) alimentando um WindowedQuantileSketch por símbolo.
+
+Uso (via cache de indicadores do símbolo):
+    regime = indicator_cache.get("R_100").regime
+    regime.percentile()        # 0–100: volatilidade atual vs últimas 4 h
+    regime.quantile(0.9)       # desvio no percentil 90 do horizonte
+"""
+import math
+from collections import deque
+
+try:
+    from .indicators import RollingStats
+except ImportError:
+    from indicators import RollingStats
+
+# Erro relativo dos quantis (valor devolvido fica a ±1% do real)
+RELATIVE_ACCURACY = 0.01
+# Faixa de valores representada; fora dela os valores vão para o bin da borda
+MIN_VALUE = 1e-9
+MAX_VALUE = 1e9
+# Horizonte e granularidade padrão da janela de regime
+REGIME_HORIZON_SEC = 4 * 3600
+REGIME_BLOCK_SEC   = 300
+# Ticks da janela curta de volatilidade e amostras mínimas para responder percentis
+REGIME_WINDOW      = 20
+REGIME_MIN_SAMPLES = 300
+
+
+class QuantileSketch:
+    """Quantis aproximados (erro relativo fixo) de valores não negativos"""
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY, min_value=MIN_VALUE, max_value=MAX_VALUE):
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.relative_accuracy = relative_accuracy
+        self.min_value   = min_value
+        self.max_value   = max_value
+        self._log_gamma  = math.log(gamma)
+        self._gamma      = gamma
+        self._offset     = math.ceil(math.log(min_value) / self._log_gamma)
+        self.bins        = math.ceil(math.log(max_value) / self._log_gamma) - self._offset + 1
+        self._tree       = [0] * (self.bins + 1)   # Fenwick (1-based)
+        self._top_bit    = 1 << (self.bins.bit_length() - 1)
+        self.count       = 0
+
+    # ─── BINS ────────────────────────────────────────────────────────────────
+    def bin_of(self, value):
+        """Índice do bin (0 .. bins-1) do valor; zero e valores pequenos vão para o bin 0"""
+        if value <= self.min_value:
+            return 0
+        if value >= self.max_value:
+            return self.bins - 1
+        return math.ceil(math.log(value) / self._log_gamma) - self._offset
+
+    def value_of(self, bin_index):
+        """Valor representativo do bin (erro relativo ≤ relative_accuracy)"""
+        if bin_index <= 0:
+            return 0.0
+        return 2 * self._gamma ** (bin_index + self._offset) / (self._gamma + 1)
+
+    def add_bin(self, bin_index, count=1):
+        i = bin_index + 1
+        tree = self._tree
+        while i <= self.bins:
+            tree[i] += count
+            i += i & -i
+        self.count += count
+
+    def add(self, value, count=1):
+        """
+        Registra o valor
+
+        Returns:
+            int: Bin usado (para remoção posterior)
+        """
+        b = self.bin_of(value)
+        self.add_bin(b, count)
+        return b
+
+    def remove_bin(self, bin_index, count=1):
+        self.add_bin(bin_index, -count)
+
+    # ─── CONSULTAS O(log bins) ───────────────────────────────────────────────
+    def rank(self, value):
+        """Quantidade de valores ≤ value (na resolução dos bins)"""
+        i = self.bin_of(value) + 1
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def percentile(self, value):
+        """Percentil (0–100) do valor na distribuição, ou None se vazia"""
+        if self.count <= 0:
+            return None
+        return 100.0 * self.rank(value) / self.count
+
+    def quantile(self, q):
+        """Valor no quantil q (0–1), ou None se vazia"""
+        if self.count <= 0:
+            return None
+        target = max(1, math.ceil(q * self.count))
+        tree = self._tree
+        pos, step = 0, self._top_bit
+        while step:
+            nxt = pos + step
+            if nxt <= self.bins and tree[nxt] < target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return self.value_of(pos)
+
+    def clear(self):
+        self._tree = [0] * (self.bins + 1)
+        self.count = 0
+
+
+class WindowedQuantileSketch:
+    """QuantileSketch limitado aos valores das últimas horizon segundos"""
+
+    def __init__(self, horizon=REGIME_HORIZON_SEC, block=REGIME_BLOCK_SEC, **sketch_kwargs):
+        self.horizon = int(horizon)
+        self.block   = int(block)
+        self.sketch  = QuantileSketch(**sketch_kwargs)
+        self._blocks = deque()   # (início do bloco, {bin: contagem})
+
+    @property
+    def count(self):
+        return self.sketch.count
+
+    def add(self, value, epoch):
+        """Registra o valor no bloco do epoch e descarta blocos fora do horizonte"""
+        epoch = int(epoch)
+        start = epoch - epoch % self.block
+        blocks = self._blocks
+        if not blocks or blocks[-1][0] < start:
+            blocks.append((start, {}))
+        elif blocks[-1][0] > start:
+            return   # tick fora de ordem
+        self.expire(epoch)
+        b = self.sketch.add(value)
+        counts = blocks[-1][1]
+        counts[b] = counts.get(b, 0) + 1
+
+    def expire(self, epoch):
+        """Remove blocos inteiramente anteriores a epoch - horizon"""
+        limite = int(epoch) - self.horizon
+        blocks = self._blocks
+        sketch = self.sketch
+        while blocks and blocks[0][0] + self.block <= limite:
+            _, counts = blocks.popleft()
+            for b, n in counts.items():
+                sketch.remove_bin(b, n)
+
+    def percentile(self, value):
+        return self.sketch.percentile(value)
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    def clear(self):
+        self._blocks.clear()
+        self.sketch.clear()
+
+    def get_info(self):
+        return {
+            "amostras": self.count,
+            "blocos": len(self._blocks),
+            "horizonte_h": round(self.horizon / 3600, 2),
+        }
+
+
+class VolatilityRegime:
+    """Volatilidade dos retornos por tick e o percentil dela no horizonte"""
+
+    def __init__(self, window=REGIME_WINDOW, horizon=REGIME_HORIZON_SEC, block=REGIME_BLOCK_SEC,
+                 min_samples=REGIME_MIN_SAMPLES):
+        self.window      = window
+        self.min_samples = min_samples
+        self.returns     = RollingStats(window)
+        self.history     = WindowedQuantileSketch(horizon, block)
+        self.current     = None   # desvio dos retornos dos últimos `window` ticks
+        self._last_quote = None
+
+    def update(self, quote, epoch):
+        """Aplica o tick (chamado uma vez por tick do símbolo)"""
+        last = self._last_quote
+        self._last_quote = quote
+        if last is None:
+            return
+        self.returns.push(quote - last)
+        if self.returns.ready:
+            self.current = self.returns.stdev()
+            self.history.add(self.current, epoch)
+
+    @property
+    def ready(self):
+        return self.current is not None and self.history.count >= self.min_samples
+
+    def percentile(self, value=None):
+        """
+        Percentil (0–100) da volatilidade atual (ou de value) no horizonte
+
+        Returns:
+            float: ou None antes de min_samples amostras
+        """
+        if not self.ready:
+            return None
+        return self.history.percentile(self.current if value is None else value)
+
+    def quantile(self, q):
+        """Volatilidade no quantil q (0–1) do horizonte, ou None antes de min_samples"""
+        return self.history.quantile(q) if self.ready else None
+
+    def clear(self):
+        self.returns = RollingStats(self.window)
+        self.history.clear()
+        self.current = None
+        self._last_quote = None
+
+    def get_info(self):
+        return {
+            "volatilidade": self.current,
+            "percentil": self.percentile(),
+            **self.history.get_info(),
+        }
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    sk = QuantileSketch()
+    valores = [random.lognormvariate(0, 1) for _ in range(100_000)]
+    for v in valores:
+        sk.add(v)
+    ordenados = sorted(valores)
+    for q in (0.1, 0.5, 0.9, 0.99):
+        real = ordenados[int(q * len(ordenados)) - 1]
+        print(f"q={q:<5} sketch={sk.quantile(q):.4f} real={real:.4f} erro={abs(sk.quantile(q) / real - 1) * 100:.2f}%")
+
+    regime = VolatilityRegime()
+    epoch, preco = 1_700_000_000, 1000.0
+    inicio = time.perf_counter()
+    for i in range(8 * 3600):
+        epoch += 1
+        sigma = 0.5 if (i // 1800) % 2 else 0.1     # alterna regimes a cada 30 min
+        preco += random.gauss(0, sigma)
+        regime.update(preco, epoch)
+    dt = time.perf_counter() - inicio
+    print(f"✅ {regime.get_info()}")
+    print(f"⏱️ {dt / (8 * 3600) * 1e6:.2f} µs/tick | bins={regime.history.sketch.bins}")
@@ -4,8 +4,8 @@ Múltiplos indicadores com decisão quantitativa
 Lógica: RSI + Bollinger + Momentum combinados com peso quantitativo
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, rsi, momentum, score_signals
 from ..config import BotConfig
-import statistics
 
 class QuantumTrader(BaseStrategy):
     TRADING_MODE_CONFIG = {
@@ -55,14 +55,6 @@ class QuantumTrader(BaseStrategy):
 
     def get_stake(self): return self.stake_atual
 
-    def _rsi(self, prices, period=14):
-        if len(prices) < period+1: return 50.0
-        gains = [max(0, prices[-i]-prices[-i-1]) for i in range(1, period+1)]
-        losses = [max(0, prices[-i-1]-prices[-i]) for i in range(1, period+1)]
-        ag = statistics.mean(gains) or 0.001
-        al = statistics.mean(losses) or 0.001
-        return 100 - (100/(1+ag/al))
-
     def should_enter(self, tick_data):
         self.update_tick(tick_data)
         if len(self.ticks_history) < self.min_history:
@@ -70,16 +62,16 @@ class QuantumTrader(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-30:]]
-            current = prices[-1]
-            ma20 = statistics.mean(prices[-20:])
-            std  = statistics.stdev(prices[-20:])
+            ind = self.indicators
+            current = ind.last
+            ma20 = ind.sma(20)
+            std  = ind.stdev(20)
             upper = ma20 + 2*std
             lower = ma20 - 2*std
-            rsi   = self._rsi(prices)
-            mom   = (prices[-1]-prices[-8])/prices[-8]*100
-            ma5   = statistics.mean(prices[-5:])
-            vol   = statistics.stdev(prices[-10:])
+            rsi   = ind.rsi()
+            mom   = ind.momentum(7)
+            ma5   = ind.sma(5)
+            vol   = ind.stdev(10)
 
             # Sistema de pontuação quantitativo (0-10 pontos)
             call_score = 0
@@ -120,6 +112,30 @@ class QuantumTrader(BaseStrategy):
             print(f"⚠️ Quantum Trader erro: {e}")
             return False, None, 0.0
 
+
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        ma20 = rolling_mean(quotes, 20)
+        std  = rolling_stdev(quotes, 20)
+        upper = ma20 + 2*std
+        lower = ma20 - 2*std
+        r    = rsi(quotes)
+        mom  = momentum(quotes, 7)
+        ma5  = rolling_mean(quotes, 5)
+        vol  = rolling_stdev(quotes, 10)
+
+        call_score = (3 * (r < 30) + 1 * ((r >= 30) & (r < 40))
+                      + 2 * (quotes < lower) + 1 * ((quotes >= lower) & (quotes < ma20))
+                      + 2 * (mom < -0.2) + 1 * ((mom >= -0.2) & (mom < -0.1))
+                      + 1 * (ma5 < ma20) + 1 * (vol > 0.1))
+        put_score  = (3 * (r > 70) + 1 * ((r <= 70) & (r > 60))
+                      + 2 * (quotes > upper) + 1 * ((quotes <= upper) & (quotes > ma20))
+                      + 2 * (mom > 0.2) + 1 * ((mom <= 0.2) & (mom > 0.1))
+                      + 1 * (ma5 > ma20) + 1 * (vol > 0.1))
+        direction, confidence = score_signals(call_score, put_score, self.min_score,
+                                              lambda s: 0.60 + (s / 10) * 0.30, self.min_confidence, cap=0.92)
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
@@ -0,0 +1,184 @@
+"""
+Strategy Registry — catálogo único de estratégias com importação sob demanda
+Alpha Dolar 2.0
+
+Antes existiam três catálogos: a API de produção importava as 15
+estratégias no boot, strategies/__init__.py tinha o próprio STRATEGY_MAP
+e o flask_app.py uma terceira lista. Aqui cada id aponta para o caminho
+do módulo/classe, e o módulo só é importado quando a estratégia é usada
+pela primeira vez (a classe fica em cache para as próximas criações).
+
+Uso:
+    from backend.strategies.registry import strategy_registry
+    strategy = strategy_registry.create('alpha_pulse', 'faster', 'conservative')
+
+Tempo de importação de cada módulo:
+    python -m backend.strategies --profile-imports
+"""
+import threading
+
+try:
+    from ..lazy_import import timed_import, import_times
+except ImportError:
+    from lazy_import import timed_import, import_times
+
+# id da estratégia → ".módulo.Classe" (relativo ao pacote strategies)
+STRATEGY_PATHS = {
+    # Rise/Fall FREE
+    'alpha_bot_1':        '.alpha_bot_1.AlphaBot1',
+    'alpha_bot_2':        '.alpha_bot_2.AlphaBot2',
+    'alpha_bot_3':        '.alpha_bot_3.AlphaBot3',
+    'alpha_bot_balanced': '.alpha_bot_balanced.AlphaBotBalanced',
+    # Rise/Fall VIP
+    'alpha_mind':         '.alpha_mind.AlphaMind',
+    'quantum_trader':     '.quantum_trader.QuantumTrader',
+    'titan_core':         '.titan_core.TitanCore',
+    'alpha_pulse':        '.alpha_pulse.AlphaPulse',
+    'alpha_smart':        '.alpha_smart.AlphaSmart',
+    'alpha_analytics':    '.alpha_analytics_sniper.AlphaAnalytics',
+    'alpha_sniper':       '.alpha_analytics_sniper.AlphaSniper',
+    # Rise/Fall PREMIUM
+    'mega_alpha_1':       '.premium_strategies.MegaAlpha1',
+    'mega_alpha_2':       '.premium_strategies.MegaAlpha2',
+    'mega_alpha_3':       '.premium_strategies.MegaAlpha3',
+    'alpha_elite':        '.premium_strategies.AlphaElite',
+    'alpha_nexus':        '.premium_strategies.AlphaNexus',
+    # Dígitos FREE
+    'alpha_bot_4':        '.alpha_bot_4_digit.AlphaBot4DigitPattern',
+    # Dígitos VIP
+    'digit_sniper':       '.digit_sniper.DigitSniper',
+    'digit_pulse':        '.digit_pulse.DigitPulse',
+    # Dígitos PREMIUM
+    'mega_digit_1':       '.mega_digit.MegaDigit1',
+    'mega_digit_2':       '.mega_digit.MegaDigit2',
+}
+
+# Estratégias de dígitos (construtor sem trading_mode/risk_mode)
+DIGIT_STRATEGIES = frozenset({'alpha_bot_4', 'digit_sniper', 'digit_pulse', 'mega_digit_1', 'mega_digit_2'})
+
+DEFAULT_STRATEGY = 'alpha_bot_1'
+
+# Chaves dos painéis (antigo STRATEGY_MAP de strategies/__init__.py, usado
+# por get_strategy): ali alpha_bot_2/alpha_bot_3 são as variantes do
+# AlphaBot1, não as estratégias AlphaBot2/AlphaBot3 da API
+PANEL_STRATEGY_PATHS = {
+    # Rise/Fall
+    'alpha_bot_1':  '.alpha_bot_1.AlphaBot1',
+    'alpha_bot_2':  '.alpha_bot_1.AlphaBot1Reverse',
+    'alpha_bot_3':  '.alpha_bot_1.AlphaBot1MA',
+    # Dígitos FREE
+    'alpha_bot_4':  STRATEGY_PATHS['alpha_bot_4'],
+    # Dígitos VIP
+    'digit_sniper': STRATEGY_PATHS['digit_sniper'],
+    'digit_pulse':  STRATEGY_PATHS['digit_pulse'],
+    # Dígitos PREMIUM
+    'mega_digit_1': STRATEGY_PATHS['mega_digit_1'],
+    'mega_digit_2': STRATEGY_PATHS['mega_digit_2'],
+}
+
+
+class StrategyRegistry:
+    """Ids de estratégia → classes importadas no primeiro uso"""
+
+    def __init__(self, paths=STRATEGY_PATHS, package=__package__):
+        self._paths   = dict(paths)
+        self._package = package
+        self._classes = {}
+        self._lock    = threading.Lock()
+
+    def __contains__(self, strategy_id):
+        return strategy_id in self._paths
+
+    def __len__(self):
+        return len(self._paths)
+
+    def ids(self):
+        return list(self._paths)
+
+    def path(self, strategy_id):
+        return self._paths[strategy_id]
+
+    def is_digit(self, strategy_id):
+        return strategy_id in DIGIT_STRATEGIES
+
+    def _module_name(self, strategy_id):
+        module = self._paths[strategy_id].rsplit('.', 1)[0]
+        return f"{self._package}{module}" if module.startswith('.') else module
+
+    def load(self, strategy_id):
+        """
+        Classe da estratégia (importa o módulo na primeira chamada)
+
+        Raises:
+            ValueError: id desconhecido
+        """
+        cls = self._classes.get(strategy_id)
+        if cls is not None:
+            return cls
+        if strategy_id not in self._paths:
+            raise ValueError(f"Estratégia '{strategy_id}' não encontrada. Disponíveis: {self.ids()}")
+        module_path, class_name = self._paths[strategy_id].rsplit('.', 1)
+        with self._lock:
+            cls = self._classes.get(strategy_id)
+            if cls is None:
+                module = timed_import(module_path, self._package)
+                cls = self._classes[strategy_id] = getattr(module, class_name)
+        return cls
+
+    def create(self, strategy_id, *args, default=DEFAULT_STRATEGY, **kwargs):
+        """
+        Nova instância da estratégia
+
+        Args:
+            strategy_id (str): Id da estratégia
+            *args, **kwargs: Repassados ao construtor (trading_mode, risk_mode);
+                estratégias de dígitos não recebem argumentos
+            default (str): Id usado quando strategy_id não existe (None = erro)
+        """
+        if strategy_id not in self._paths and default is not None:
+            strategy_id = default
+        cls = self.load(strategy_id)
+        if strategy_id in DIGIT_STRATEGIES:
+            return cls()
+        return cls(*args, **kwargs)
+
+    def loaded(self):
+        """Ids cujas classes já foram importadas"""
+        return list(self._classes)
+
+    def import_times(self):
+        """Módulo de estratégia → segundos gastos na importação"""
+        prefix = f"{self._package}."
+        return {name: secs for name, secs in import_times.items() if name.startswith(prefix)}
+
+    def profile_imports(self):
+        """
+        Importa cada módulo de estratégia medindo o tempo
+
+        Returns:
+            list: (módulo, segundos, ids) em ordem de importação; módulos já
+            importados pelo processo aparecem com o tempo já registrado (ou 0)
+        """
+        modules = {}
+        for strategy_id in self._paths:
+            modules.setdefault(self._module_name(strategy_id), []).append(strategy_id)
+        report = []
+        for module, ids in modules.items():
+            for strategy_id in ids:
+                self.load(strategy_id)
+            report.append((module, import_times.get(module, 0.0), ids))
+        return report
+
+    def get_info(self):
+        return {
+            "strategies": len(self._paths),
+            "loaded": self.loaded(),
+            "import_ms": {name: round(secs * 1000, 2) for name, secs in self.import_times().items()},
+        }
+
+
+# Instância única do processo
+strategy_registry = StrategyRegistry()
+# Catálogo dos painéis (get_strategy), com o mapeamento antigo das chaves
+panel_registry = StrategyRegistry(PANEL_STRATEGY_PATHS)
+
@@ -0,0 +1,131 @@
+"""
+Tick Buffer — histórico de ticks em buffer circular compacto
+Alpha Dolar 2.0
+
+Substitui a deque de dicts (4 chaves + datetime.now() por tick) por dois
+arrays paralelos pré-alocados: cotações em float64 e epochs em int64.
+Nenhuma alocação por tick.
+
+Cada valor é escrito duas vezes (posição i e i + capacidade), então os
+últimos N ticks estão sempre contíguos na memória e last(n) devolve uma
+memoryview sem cópia — indexável, fatiável e iterável como uma lista.
+Com NumPy instalado, as_array(n) devolve a mesma janela como ndarray
+(também sem cópia).
+
+Código legado que itera o histórico (`t['quote'] for t in ...`) continua
+funcionando: a iteração devolve dicts montados sob demanda.
+"""
+from array import array
+
+try:
+    from ..lazy_import import lazy_module
+except ImportError:
+    from lazy_import import lazy_module
+
+# NumPy só é importado no primeiro as_array()
+np = lazy_module('numpy')
+
+
+class TickRing:
+    """Histórico de ticks de tamanho fixo com janelas sem cópia"""
+
+    __slots__ = ("capacity", "symbol", "_quotes", "_epochs", "_qview", "_eview", "_head", "_size")
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.symbol   = None
+        self._quotes  = array("d", bytes(16 * capacity))   # 2 × capacidade, zerado
+        self._epochs  = array("q", bytes(16 * capacity))
+        self._qview   = memoryview(self._quotes)
+        self._eview   = memoryview(self._epochs)
+        self._head    = 0
+        self._size    = 0
+
+    @property
+    def maxlen(self):
+        """Compatível com deque.maxlen"""
+        return self.capacity
+
+    def append(self, quote, epoch=None, symbol=None):
+        head = self._head
+        epoch = epoch or 0
+        self._quotes[head] = self._quotes[head + self.capacity] = quote
+        self._epochs[head] = self._epochs[head + self.capacity] = epoch
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        if self._size < self.capacity:
+            self._size += 1
+        if symbol is not None:
+            self.symbol = symbol
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    # ─── JANELAS SEM CÓPIA ──────────────────────────────────────────────────
+    def _bounds(self, n):
+        n = self._size if n is None else min(n, self._size)
+        end = self._head + self.capacity
+        return end - n, end
+
+    def last(self, n=None):
+        """Últimas n cotações (mais antiga → mais recente) como memoryview"""
+        start, end = self._bounds(n)
+        return self._qview[start:end]
+
+    def last_epochs(self, n=None):
+        start, end = self._bounds(n)
+        return self._eview[start:end]
+
+    def as_array(self, n=None):
+        """Últimas n cotações como ndarray (view) — memoryview se NumPy não estiver instalado"""
+        view = self.last(n)
+        return np.frombuffer(view, dtype=np.float64) if np else view
+
+    def quote(self, back=0):
+        """Cotação de `back` ticks atrás (0 = atual)"""
+        if back >= self._size:
+            raise IndexError("TickRing: índice fora do histórico")
+        return self._quotes[self._head + self.capacity - 1 - back]
+
+    # ─── COMPATIBILIDADE COM A DEQUE DE DICTS ───────────────────────────────
+    def records(self, n=None):
+        """Últimos n ticks como dicts (quote, epoch, symbol) — só para código legado"""
+        return [{"quote": q, "epoch": e or None, "symbol": self.symbol}
+                for q, e in zip(self.last(n), self.last_epochs(n))]
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.records()[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("TickRing: índice fora do histórico")
+        pos = self._head + self.capacity - self._size + index
+        epoch = self._epochs[pos]
+        return {"quote": self._quotes[pos], "epoch": epoch or None, "symbol": self.symbol}
+
+    def __reduce__(self):
+        # memoryview não é copiável nem serializável: reconstrói a partir dos arrays
+        return (_restore_ring, (self.capacity, self.symbol, self._quotes, self._epochs, self._head, self._size))
+
+    def __repr__(self):
+        return f"TickRing({self._size}/{self.capacity} {self.symbol or ''})"
+
+
+def _restore_ring(capacity, symbol, quotes, epochs, head, size):
+    ring = TickRing(capacity)
+    ring.symbol = symbol
+    ring._quotes[:] = quotes
+    ring._epochs[:] = epochs
+    ring._head = head
+    ring._size = size
+    return ring
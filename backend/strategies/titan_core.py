@@ -4,8 +4,8 @@ Estratégia robusta com filtro de volatilidade
 Lógica: Só opera quando volatilidade está em faixa ideal. Usa suporte/resistência dinâmicos.
 """
 from .base_strategy import BaseStrategy
+from .batch import rolling_mean, rolling_stdev, rolling_min, rolling_max, momentum, count_true, score_signals
 from ..config import BotConfig
-import statistics
 
 class TitanCore(BaseStrategy):
     TRADING_MODE_CONFIG = {
@@ -63,21 +63,21 @@ class TitanCore(BaseStrategy):
         if (len(self.ticks_history) - self.last_signal_tick) < self.cooldown_ticks:
             return False, None, 0.0
         try:
-            prices = [t['quote'] for t in list(self.ticks_history)[-30:]]
-            current = prices[-1]
-            vol = statistics.stdev(prices[-20:])
+            ind = self.indicators
+            current = ind.last
+            vol = ind.stdev(20)
 
             # Filtro de volatilidade — só opera na faixa ideal
             if not (self.vol_min <= vol <= self.vol_max):
                 return False, None, 0.0
 
             # Suporte e resistência dinâmicos (últimos 30 ticks)
-            support    = min(prices)
-            resistance = max(prices)
+            support    = ind.min(30)
+            resistance = ind.max(30)
             mid        = (support + resistance) / 2
-            ma10       = statistics.mean(prices[-10:])
-            ma30       = statistics.mean(prices)
-            mom        = (prices[-1] - prices[-6]) / prices[-6] * 100
+            ma10       = ind.sma(10)
+            ma30       = ind.sma(30)
+            mom        = ind.momentum(5)
 
             call_conditions = [
                 current <= support * 1.002,   # Perto do suporte
@@ -110,6 +110,25 @@ class TitanCore(BaseStrategy):
             print(f"⚠️ Titan Core erro: {e}")
             return False, None, 0.0
 
+
+    def _batch_signals(self, quotes, digits=None):
+        """should_enter vetorizado sobre o array de cotações (ver strategies/batch.py)"""
+        vol = rolling_stdev(quotes, 20)
+        support    = rolling_min(quotes, 30)
+        resistance = rolling_max(quotes, 30)
+        mid        = (support + resistance) / 2
+        ma10       = rolling_mean(quotes, 10)
+        ma30       = rolling_mean(quotes, 30)
+        mom        = momentum(quotes, 5)
+        cs = count_true(quotes <= support * 1.002, quotes < mid, ma10 > ma30, mom < -0.05)
+        ps = count_true(quotes >= resistance * 0.998, quotes > mid, ma10 < ma30, mom > 0.05)
+        direction, confidence = score_signals(cs, ps, 3, lambda s: 0.62 + (s / 4) * 0.28, self.min_confidence)
+        # Filtro de volatilidade — fora da faixa não há sinal
+        fora = ~((self.vol_min <= vol) & (vol <= self.vol_max))
+        direction[fora] = 0
+        confidence[fora] = 0.0
+        return direction, confidence, None
+
     def get_contract_params(self, direction):
         return {"contract_type": direction, "duration": 1, "duration_unit": "t",
                 "symbol": BotConfig.DEFAULT_SYMBOL, "basis": BotConfig.BASIS}
@@ -0,0 +1,385 @@
+"""
+Sweep — varredura paralela de parâmetros sobre o backtest
+Alpha Dolar 2.0
+
+Cada estratégia fixa no código o TRADING_MODE_CONFIG (min_confidence,
+cooldown, min_conditions, zscore_threshold, ...) e o RISK_MODE_CONFIG
+(martingale, multiplier, max_steps). O sweep monta a grade estratégia ×
+trading_mode × risk_mode (× valores extras de parâmetros), divide o arquivo
+de ticks em sessões (1 dia por padrão) e distribui os backtests num
+ProcessPoolExecutor.
+
+Do RISK_MODE_CONFIG o AlphaDolar só usa o liga/desliga do martingale: após
+uma perda o stake vem da recuperação (_calcular_stake_recuperacao), não de
+multiplier/max_steps. Modos de risco que só diferem nesses valores entram
+uma vez na grade, e --param multiplier/max_steps é recusado.
+
+O dataset não é serializado para cada worker: o CSV é convertido uma vez
+num arquivo binário (.ticks) que cada processo abre com mmap, somente
+leitura. As páginas ficam no page cache do sistema, compartilhadas por
+todos os workers, e cada tarefa recebe só (arquivo, início, fim).
+
+Resultado: uma tabela por célula da grade com win rate, lucro líquido,
+drawdown máximo e risco de ruína (% das sessões que tocaram o
+LIMITE_PERDA ou ficaram sem saldo para o stake inicial).
+
+Uso:
+    python -m backend.sweep backend/data/R_100_20250301.csv
+    python -m backend.sweep dados.csv --strategies titan_core alpha_pulse \\
+        --param min_confidence=0.6,0.7,0.8 --param cooldown=3,5 --csv sweep.csv
+"""
+import ast
+import itertools
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from .config import BotConfig
+    from .backtest import Backtester, TickSeries, load_ticks_csv, SALDO_INICIAL
+    from .strategies.registry import strategy_registry
+except ImportError:
+    from config import BotConfig
+    from backtest import Backtester, TickSeries, load_ticks_csv, SALDO_INICIAL
+    from strategies.registry import strategy_registry
+
+TRADING_MODES = ("lowRisk", "accurate", "balanced", "faster")
+RISK_MODES    = ("fixed", "conservative", "optimized", "aggressive")
+# Duração de cada sessão independente (o risco de ruína é medido por sessão)
+SESSAO_SEGUNDOS = 24 * 3600
+# Sessões com menos ticks que isto são descartadas (mal passam do aquecimento)
+SESSAO_MIN_TICKS = 500
+# Únicas chaves do RISK_MODE_CONFIG que mudam o backtest (ver docstring)
+RISCO_EFETIVO = ("martingale",)
+
+# Arquivo .ticks: cabeçalho de 64 bytes + epochs int64[n] + quotes float64[n]
+_MAGIC  = b"ADTK"
+_VERSAO = 1
+_HEADER = struct.Struct("<4sH2xq32sd8x")
+
+
+# ─── DATASET MAPEADO ────────────────────────────────────────────────────────
+def write_tick_file(series, path):
+    """Grava o TickSeries no formato binário lido por open_tick_file"""
+    symbol = (series.symbol or "").encode()[:32]
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSAO, len(series), symbol, float(series.pip_size or 0.0)))
+        f.write(array("q", series.epochs).tobytes())
+        f.write(array("d", series.quotes).tobytes())
+    return path
+
+
+def open_tick_file(path):
+    """
+    Abre o arquivo .ticks com mmap (somente leitura)
+
+    Returns:
+        TickSeries: epochs/quotes são memoryviews sobre o mapeamento
+    """
+    with open(path, "rb") as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, versao, n, symbol, pip_size = _HEADER.unpack_from(mapa)
+    if magic != _MAGIC or versao != _VERSAO:
+        raise ValueError(f"{path}: não é um arquivo .ticks v{_VERSAO}")
+    dados = memoryview(mapa)[_HEADER.size:]
+    epochs = dados[:8 * n].cast("q")
+    quotes = dados[8 * n:16 * n].cast("d")
+    return TickSeries(symbol.rstrip(b"\0").decode() or None, epochs, quotes, pip_size or None)
+
+
+def prepare_dataset(path, cache_dir=None):
+    """
+    Caminho do .ticks do dataset (converte o CSV se preciso)
+
+    O .ticks é regenerado quando o CSV é mais novo que ele.
+    """
+    if path.endswith(".ticks"):
+        return path
+    cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "alpha_sweep")
+    os.makedirs(cache_dir, exist_ok=True)
+    destino = os.path.join(cache_dir, os.path.splitext(os.path.basename(path))[0] + ".ticks")
+    if not os.path.exists(destino) or os.path.getmtime(destino) < os.path.getmtime(path):
+        write_tick_file(load_ticks_csv(path), destino)
+    return destino
+
+
+def split_sessions(series, segundos=SESSAO_SEGUNDOS, min_ticks=SESSAO_MIN_TICKS):
+    """
+    Divide a série em sessões consecutivas de `segundos`
+
+    Returns:
+        list: (início, fim) em índices de tick
+    """
+    epochs = series.epochs
+    if not len(epochs):
+        return []
+    sessoes = []
+    inicio, limite = 0, epochs[0] + segundos
+    while inicio < len(epochs):
+        fim = bisect_left(epochs, limite, inicio)
+        if fim - inicio >= min_ticks:
+            sessoes.append((inicio, fim))
+        inicio, limite = fim, limite + segundos
+    return sessoes
+
+
+# ─── GRADE ──────────────────────────────────────────────────────────────────
+def default_strategies():
+    """Estratégias rise/fall com TRADING_MODE_CONFIG/RISK_MODE_CONFIG"""
+    return [sid for sid in strategy_registry.ids()
+            if not strategy_registry.is_digit(sid)
+            and getattr(strategy_registry.load(sid), "TRADING_MODE_CONFIG", None)]
+
+
+def build_grid(strategies=None, trading_modes=TRADING_MODES, risk_modes=RISK_MODES, params=None):
+    """
+    Células da grade
+
+    Args:
+        strategies (list): Ids (padrão: default_strategies())
+        params (dict): chave → lista de valores (produto cartesiano; cada
+            combinação é aplicada via backtest.strategy_with_params). Cada
+            estratégia só varia as chaves que existem nos modos dela.
+
+    Returns:
+        list: (strategy, trading_mode, risk_mode, params) — params como
+        tupla de pares (chave, valor); estratégias de dígitos entram uma vez,
+        sem modos nem params; por estratégia, só o primeiro de cada grupo de
+        risk_modes com o mesmo RISCO_EFETIVO
+
+    Raises:
+        ValueError: parâmetro do RISK_MODE_CONFIG sem efeito no AlphaDolar
+    """
+    strategies = list(strategies or default_strategies())
+    params = params or {}
+    classes = {sid: strategy_registry.load(sid) for sid in strategies if not strategy_registry.is_digit(sid)}
+    inertes = [k for k in params
+               if k not in RISCO_EFETIVO and any(_parametro_de_risco(cls, k) for cls in classes.values())]
+    if inertes:
+        raise ValueError(f"Parâmetros sem efeito no AlphaDolar (após perda o stake vem da recuperação): "
+                         f"{', '.join(inertes)}")
+    grade = []
+    for sid in strategies:
+        if sid not in classes:
+            grade.append((sid, "-", "-", ()))
+            continue
+        cls = classes[sid]
+        riscos, vistos = [], set()
+        for rm in risk_modes:
+            efetivo = _risco_efetivo(cls, rm, params)
+            if efetivo not in vistos:
+                vistos.add(efetivo)
+                riscos.append(rm)
+        for tm, rm in itertools.product(trading_modes, riscos):
+            chaves = sorted(k for k in params if _tem_parametro(cls, tm, rm, k))
+            for valores in itertools.product(*(params[k] for k in chaves)):
+                grade.append((sid, tm, rm, tuple(zip(chaves, valores))))
+    return grade
+
+
+def _risco_efetivo(cls, risk_mode, params):
+    """Valores de RISCO_EFETIVO do modo (os passados em params valem para todos)"""
+    tabela = getattr(cls, "RISK_MODE_CONFIG", None) or {}
+    modo = tabela.get(risk_mode, tabela.get("conservative", {}))
+    return tuple(None if k in params else modo.get(k) for k in RISCO_EFETIVO)
+
+
+def _parametro_de_risco(cls, chave):
+    """Chave só do RISK_MODE_CONFIG (não existe em nenhum TRADING_MODE_CONFIG)"""
+    risco = getattr(cls, "RISK_MODE_CONFIG", None) or {}
+    trading = getattr(cls, "TRADING_MODE_CONFIG", None) or {}
+    return (any(chave in modo for modo in risco.values())
+            and not any(chave in modo for modo in trading.values()))
+
+
+def _tem_parametro(cls, trading_mode, risk_mode, chave):
+    for nome, modo, padrao in (("TRADING_MODE_CONFIG", trading_mode, "faster"),
+                               ("RISK_MODE_CONFIG", risk_mode, "conservative")):
+        tabela = getattr(cls, nome, None) or {}
+        if chave in tabela.get(modo, tabela.get(padrao, {})):
+            return True
+    return False
+
+
+# ─── WORKER ─────────────────────────────────────────────────────────────────
+_series = {}   # arquivo .ticks → TickSeries mapeado (um por processo)
+
+
+def _serie(path):
+    series = _series.get(path)
+    if series is None:
+        series = _series[path] = open_tick_file(path)
+    return series
+
+
+def _rodar(tarefa):
+    """Backtest de uma célula numa sessão (executa no worker)"""
+    path, (sid, tm, rm, params), (inicio, fim), balance, config, payouts = tarefa
+    series = _serie(path).slice(inicio, fim)
+    r = Backtester(sid, tm, rm, balance=balance, payouts=payouts, config=config,
+                   params=dict(params)).run(series)
+    limite = config.get("LIMITE_PERDA", BotConfig.LIMITE_PERDA)
+    stake  = config.get("STAKE_INICIAL", BotConfig.STAKE_INICIAL)
+    arruinou = r["saldo_minimo"] <= balance - limite or r["saldo_minimo"] < stake
+    return (sid, tm, rm, params), {
+        "ticks": r["ticks"], "ticks_sessao": fim - inicio, "trades": r["trades"], "vitorias": r["vitorias"],
+        "lucro": r["lucro_liquido"], "drawdown": r["max_drawdown"], "arruinou": arruinou,
+    }
+
+
+# ─── SWEEP ──────────────────────────────────────────────────────────────────
+def _agregar(celula, sessoes):
+    sid, tm, rm, params = celula
+    trades = sum(s["trades"] for s in sessoes)
+    vitorias = sum(s["vitorias"] for s in sessoes)
+    lucros = [s["lucro"] for s in sessoes]
+    disponiveis = sum(s["ticks_sessao"] for s in sessoes)
+    return {
+        "strategy":      sid,
+        "trading_mode":  tm,
+        "risk_mode":     rm,
+        "params":        ",".join(f"{k}={v}" for k, v in params),
+        "sessoes":       len(sessoes),
+        "trades":        trades,
+        "win_rate":      round(vitorias / trades * 100, 2) if trades else 0.0,
+        "lucro_liquido": round(sum(lucros), 2),
+        "pior_sessao":   round(min(lucros), 2) if lucros else 0.0,
+        "max_drawdown":  round(max((s["drawdown"] for s in sessoes), default=0.0), 2),
+        "risco_ruina":   round(sum(s["arruinou"] for s in sessoes) / len(sessoes) * 100, 2) if sessoes else 0.0,
+        # % dos ticks das sessões efetivamente reproduzidos (< 100: sessões encerradas por meta/stop/limite)
+        "cobertura":     round(sum(s["ticks"] for s in sessoes) / disponiveis * 100, 2) if disponiveis else 0.0,
+    }
+
+
+def run_sweep(dataset, grid=None, sessao_segundos=SESSAO_SEGUNDOS, balance=SALDO_INICIAL,
+              config=None, payouts=None, workers=None, cache_dir=None, progress=True):
+    """
+    Executa a grade em paralelo
+
+    Args:
+        dataset (str): CSV de ticks ou arquivo .ticks
+        grid (list): Células de build_grid() (padrão: grade completa)
+        sessao_segundos (int): Duração de cada sessão independente
+        balance (float): Saldo inicial de cada sessão
+        config (dict): Atributos do BotConfig (STAKE_INICIAL, LIMITE_PERDA, ...)
+        payouts (dict): contract_type → lucro por stake
+        workers (int): Processos (padrão: os.cpu_count())
+
+    Returns:
+        list: Uma linha por célula, ordenada por lucro líquido
+    """
+    path = prepare_dataset(dataset, cache_dir)
+    sessoes = split_sessions(_serie(path), sessao_segundos)
+    if not sessoes:
+        raise ValueError(f"{dataset}: nenhuma sessão com {SESSAO_MIN_TICKS}+ ticks")
+    grid = grid if grid is not None else build_grid()
+    config = dict(config or {})
+    tarefas = [(path, celula, sessao, balance, config, payouts) for celula in grid for sessao in sessoes]
+
+    resultados = {celula: [] for celula in grid}
+    inicio = time.perf_counter()
+    if progress:
+        print(f"🚀 Sweep: {len(grid)} células × {len(sessoes)} sessões = {len(tarefas)} backtests "
+              f"({workers or os.cpu_count()} workers)")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = [executor.submit(_rodar, t) for t in tarefas]
+        passo = max(1, len(futuros) // 20)
+        for feitos, futuro in enumerate(as_completed(futuros), 1):
+            celula, resultado = futuro.result()
+            resultados[celula].append(resultado)
+            if progress and (feitos % passo == 0 or feitos == len(futuros)):
+                print(f"   ⏳ {feitos}/{len(futuros)} ({time.perf_counter() - inicio:.0f}s)")
+
+    tabela = [_agregar(celula, sessoes_celula) for celula, sessoes_celula in resultados.items()]
+    tabela.sort(key=lambda linha: linha["lucro_liquido"], reverse=True)
+    if progress:
+        ticks = sum(s["ticks"] for r in resultados.values() for s in r)
+        segundos = time.perf_counter() - inicio
+        print(f"✅ {len(tarefas)} backtests em {segundos:.1f}s ({ticks / segundos:,.0f} ticks/s no total)")
+    return tabela
+
+
+_COLUNAS = (
+    ("strategy", 20), ("trading_mode", 9), ("risk_mode", 12), ("params", 24), ("sessoes", 7),
+    ("trades", 7), ("win_rate", 8), ("lucro_liquido", 13), ("pior_sessao", 11),
+    ("max_drawdown", 12), ("risco_ruina", 11), ("cobertura", 9),
+)
+
+
+def print_table(tabela, top=None):
+    """Tabela de resultados no terminal"""
+    linhas = tabela[:top] if top else tabela
+    print("  ".join(f"{nome:>{largura}}" for nome, largura in _COLUNAS))
+    print("-" * (sum(largura for _, largura in _COLUNAS) + 2 * (len(_COLUNAS) - 1)))
+    for linha in linhas:
+        print("  ".join(f"{str(linha[nome]):>{largura}}" for nome, largura in _COLUNAS))
+
+
+def save_csv(tabela, path):
+    import csv
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[nome for nome, _ in _COLUNAS])
+        writer.writeheader()
+        writer.writerows(tabela)
+
+
+def _valores(texto):
+    """'0.6,0.7,True' → [0.6, 0.7, True]"""
+    valores = []
+    for item in texto.split(","):
+        try:
+            valores.append(ast.literal_eval(item.strip()))
+        except (ValueError, SyntaxError):
+            valores.append(item.strip())
+    return valores
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Varredura paralela de parâmetros com backtest")
+    parser.add_argument("dataset", help="CSV de ticks (DataCollector/HistoricalDataFetcher) ou .ticks")
+    parser.add_argument("--strategies", nargs="*", choices=strategy_registry.ids(),
+                        help="Padrão: todas as rise/fall com modos configuráveis")
+    parser.add_argument("--modes", nargs="*", default=list(TRADING_MODES))
+    parser.add_argument("--risks", nargs="*", default=list(RISK_MODES))
+    parser.add_argument("--param", action="append", default=[], metavar="CHAVE=V1,V2",
+                        help="Valores extras de TRADING_MODE_CONFIG/RISK_MODE_CONFIG (repetível)")
+    parser.add_argument("--sessao-horas", type=float, default=SESSAO_SEGUNDOS / 3600)
+    parser.add_argument("--saldo", type=float, default=SALDO_INICIAL)
+    parser.add_argument("--stake", type=float, default=None, help="BotConfig.STAKE_INICIAL")
+    parser.add_argument("--lucro-alvo", type=float, default=None, help="BotConfig.LUCRO_ALVO")
+    parser.add_argument("--limite-perda", type=float, default=None, help="BotConfig.LIMITE_PERDA")
+    parser.add_argument("--max-trades-dia", type=int, default=None,
+                        help="BotConfig.MAX_TRADES_PER_DAY (padrão no backtest: sem limite)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=None, help="Mostra só as N melhores linhas")
+    parser.add_argument("--csv", default=None, help="Salva a tabela completa em CSV")
+    args = parser.parse_args()
+
+    params = {}
+    for item in args.param:
+        chave, _, texto = item.partition("=")
+        if not texto:
+            parser.error(f"--param {item}: use CHAVE=V1,V2")
+        params[chave.strip()] = _valores(texto)
+    config = {k: v for k, v in (("STAKE_INICIAL", args.stake), ("LUCRO_ALVO", args.lucro_alvo),
+                                 ("LIMITE_PERDA", args.limite_perda),
+                                 ("MAX_TRADES_PER_DAY", args.max_trades_dia)) if v is not None}
+
+    try:
+        grade = build_grid(args.strategies, args.modes, args.risks, params)
+    except ValueError as e:
+        parser.error(str(e))
+    tabela = run_sweep(args.dataset, grade, sessao_segundos=int(args.sessao_horas * 3600),
+                       balance=args.saldo, config=config, workers=args.workers)
+    print()
+    print_table(tabela, args.top)
+    if args.csv:
+        save_csv(tabela, args.csv)
+        print(f"\n💾 Tabela salva em {args.csv}")
@@ -0,0 +1,176 @@
+"""
+Tick Hub — feed de ticks compartilhado por símbolo
+Alpha Dolar 2.0
+
+Uma única conexão pública (sem token) por símbolo para o processo inteiro.
+Cada tick é decodificado uma vez e entregue a todos os bots inscritos.
+Antes do fan-out o tick avança o indicator_cache do símbolo (candles,
+regime), então /api/candles não depende de estratégia usar o cache.
+As conexões autorizadas de cada usuário ficam só com proposal/buy/balance.
+"""
+import time
+import threading
+from datetime import datetime
+
+try:
+    from .deriv_api_async import criar_api
+    from .strategies.indicator_cache import indicator_cache
+except ImportError:
+    from deriv_api_async import criar_api
+    from strategies.indicator_cache import indicator_cache
+
+# Feed sem tick há mais que isso é considerado travado
+FEED_SILENCE_SEC  = 20
+# Intervalo mínimo entre duas reconexões forçadas do mesmo feed
+FEED_RESTART_GAP  = 10
+
+
+class _SymbolFeed:
+    """Conexão pública de um símbolo + lista de callbacks inscritos"""
+
+    def __init__(self, symbol):
+        self.symbol    = symbol
+        self.api       = criar_api(public=True)
+        self.callbacks = []
+        self.last_tick_time   = time.time()
+        self.last_restart     = 0.0
+        self.ticks_recebidos  = 0
+        # connect() roda fora do lock do hub: quem chega durante a abertura espera aqui
+        self.pronto = threading.Event()
+        self.ativo  = False
+        self.api.set_tick_callback(self._dispatch)
+
+    def start(self):
+        if not self.api.connect():
+            return False
+        self.api.subscribe_ticks(self.symbol)
+        self.last_tick_time = time.time()
+        return True
+
+    def stop(self):
+        self.api.disconnect()
+
+    def _dispatch(self, tick):
+        self.last_tick_time = time.time()
+        self.ticks_recebidos += 1
+        # O feed é o primeiro a ver o tick: os bots encontram o epoch já observado
+        try:
+            indicator_cache.observe(tick)
+        except Exception as e:
+            _log(f"Erro no indicator_cache ({self.symbol}): {e}", "ERROR")
+        # Cópia da lista: bots podem entrar/sair durante o fan-out
+        for callback in tuple(self.callbacks):
+            try:
+                callback(tick)
+            except Exception as e:
+                _log(f"Erro no callback de tick ({self.symbol}): {e}", "ERROR")
+
+
+class TickHub:
+    """Registro de feeds por símbolo compartilhados entre todos os bots"""
+
+    def __init__(self):
+        self._feeds = {}
+        self._lock  = threading.Lock()
+
+    def subscribe(self, symbol, callback):
+        """
+        Inscreve callback nos ticks do símbolo. Abre o feed no primeiro inscrito.
+
+        O connect() acontece fora do lock: com ASYNC_TRANSPORT ele espera o
+        event loop compartilhado, onde rodam os callbacks que chamam
+        unsubscribe() — segurar o lock ali travaria todas as conexões.
+
+        Returns:
+            bool: True se o feed está ativo
+        """
+        with self._lock:
+            feed = self._feeds.get(symbol)
+            abrir = feed is None
+            if abrir:
+                feed = self._feeds[symbol] = _SymbolFeed(symbol)
+            if callback not in feed.callbacks:
+                feed.callbacks.append(callback)
+        if not abrir:
+            feed.pronto.wait()
+            return feed.ativo
+
+        ok = feed.start()
+        with self._lock:
+            removido = self._feeds.get(symbol) is not feed
+            if not ok and not removido:
+                del self._feeds[symbol]
+            feed.ativo = ok and not removido
+        feed.pronto.set()
+        if removido:
+            # Todos saíram durante a abertura: unsubscribe() deixou o stop para cá
+            feed.stop()
+        elif ok:
+            _log(f"Feed público aberto: {symbol}", "SUCCESS")
+        else:
+            _log(f"Falha ao abrir feed público de {symbol}", "ERROR")
+        return feed.ativo
+
+    def unsubscribe(self, symbol, callback):
+        """Remove callback. Fecha o feed quando não sobra nenhum inscrito."""
+        with self._lock:
+            feed = self._feeds.get(symbol)
+            if feed is None:
+                return
+            if callback in feed.callbacks:
+                feed.callbacks.remove(callback)
+            if feed.callbacks:
+                return
+            del self._feeds[symbol]
+            if not feed.pronto.is_set():
+                return  # ainda abrindo: subscribe() fecha ao terminar
+        feed.stop()
+        _log(f"Feed público fechado: {symbol}", "INFO")
+
+    def ensure(self, symbol):
+        """
+        Chamado pelo watchdog dos bots quando não chegam ticks.
+        Reconecta o feed uma única vez mesmo que vários bots reclamem juntos.
+        """
+        with self._lock:
+            feed = self._feeds.get(symbol)
+            if feed is None or not feed.ativo:
+                return
+            agora = time.time()
+            if agora - feed.last_tick_time < FEED_SILENCE_SEC:
+                return
+            if agora - feed.last_restart < FEED_RESTART_GAP:
+                return
+            feed.last_restart = agora
+        _log(f"Feed {symbol} sem ticks — reconectando", "WARNING")
+        threading.Thread(target=feed.api._reconnect, daemon=True).start()
+
+    def history(self, symbol, count):
+        """Últimos `count` ticks pela conexão pública já aberta do símbolo ([] sem feed)"""
+        with self._lock:
+            feed = self._feeds.get(symbol)
+        if feed is None or not feed.pronto.wait(15) or not feed.ativo:
+            return []
+        return feed.api.get_ticks_history(symbol, count)
+
+    def get_info(self):
+        with self._lock:
+            return {
+                symbol: {
+                    "bots": len(feed.callbacks),
+                    "conectado": feed.api.is_connected,
+                    "ticks": feed.ticks_recebidos,
+                    "assinaturas": feed.api.get_subscription_info()["total"],
+                }
+                for symbol, feed in self._feeds.items()
+            }
+
+
+def _log(message, level="INFO"):
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    emoji = {"INFO": "ℹ️", "SUCCESS": "✅", "ERROR": "❌", "WARNING": "⚠️"}.get(level, "📝")
+    print(f"[{timestamp}] {emoji} [TickHub] {message}")
+
+
+# Instância única do processo (um worker gunicorn = um hub)
+tick_hub = TickHub()
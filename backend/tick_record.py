@@ -0,0 +1,80 @@
+"""
+Tick Record — caminho rápido de decodificação de ticks
+Alpha Dolar 2.0
+
+Ticks são de longe a mensagem mais frequente (10/s por símbolo nos 1HZ).
+Em vez de passar pela cadeia de if/elif do _on_message, o frame de tick
+é reconhecido pelo msg_type logo após o decode e vira um
+TickRecord de formato fixo (epoch, quote, symbol, pip_size), com
+__slots__ e sem dicionários aninhados.
+
+O TickRecord responde a get(), [] e `in` como o dict de tick antigo,
+então bots, tick_hub e estratégias continuam funcionando sem mudança.
+
+JSON: usa orjson ou ujson se instalados, senão o json da stdlib.
+"""
+import json
+
+try:
+    import orjson as _json_backend
+    JSON_BACKEND = "orjson"
+except ImportError:
+    try:
+        import ujson as _json_backend
+        JSON_BACKEND = "ujson"
+    except ImportError:
+        _json_backend = json
+        JSON_BACKEND = "json"
+
+json_loads = _json_backend.loads
+
+
+class TickRecord:
+    """Tick decodificado, imutável na prática e compartilhado entre os bots do feed"""
+
+    __slots__ = ("epoch", "quote", "symbol", "pip_size", "_replay")
+
+    _FIELDS = ("epoch", "quote", "symbol", "pip_size")
+
+    def __init__(self, epoch, quote, symbol, pip_size=None, replay=False):
+        self.epoch    = epoch
+        self.quote    = quote
+        self.symbol   = symbol
+        self.pip_size = pip_size
+        self._replay  = replay
+
+    @classmethod
+    def from_tick(cls, tick, replay=False):
+        """Monta a partir do objeto "tick" já decodificado da Deriv"""
+        return cls(tick.get("epoch"), tick.get("quote"), tick.get("symbol"), tick.get("pip_size"), replay)
+
+    # ─── COMPATIBILIDADE COM O DICT DE TICK ─────────────────────────────────
+    def get(self, key, default=None):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if key == "_replay" and not value:
+                return default
+            return value
+        return default
+
+    def __getitem__(self, key):
+        if key in self._FIELDS:
+            return getattr(self, key)
+        if key == "_replay" and self._replay:
+            return True
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._FIELDS or (key == "_replay" and self._replay)
+
+    def keys(self):
+        return self._FIELDS + ("_replay",) if self._replay else self._FIELDS
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self):
+        return f"TickRecord({self.symbol} {self.quote} @ {self.epoch})"
@@ -0,0 +1,118 @@
+"""
+Timer Service — agendador único de timeouts do processo
+Alpha Dolar 2.0
+
+Heap de deadlines + uma única thread. Substitui a thread dormindo por
+contrato, a thread de keep-alive por conexão e o loop de 1s por bot:
+timeout de contrato, silêncio de ticks e TRADE_TIMEOUT de todos os bots
+viram entradas no heap, e a thread só acorda no próximo deadline.
+
+Os callbacks rodam na thread do serviço — precisam ser rápidos. Trabalho
+bloqueante (reconexão, connect) deve ser despachado para outra thread.
+"""
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+
+
+class TimerHandle:
+    """Referência a um timer agendado; cancel() é O(1) (remoção preguiçosa do heap)"""
+
+    __slots__ = ("deadline", "callback", "args", "interval", "cancelled")
+
+    def __init__(self, deadline, callback, args, interval=None):
+        self.deadline  = deadline
+        self.callback  = callback
+        self.args      = args
+        self.interval  = interval
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerService:
+    def __init__(self):
+        self._heap  = []
+        self._seq   = itertools.count()
+        self._cond  = threading.Condition()
+        self._thread = None
+        self.disparos = 0
+
+    def call_later(self, delay, callback, *args):
+        """Executa callback(*args) uma vez daqui a `delay` segundos"""
+        return self._push(TimerHandle(time.monotonic() + delay, callback, args))
+
+    def call_every(self, interval, callback, *args):
+        """Executa callback(*args) a cada `interval` segundos até cancel()"""
+        return self._push(TimerHandle(time.monotonic() + interval, callback, args, interval))
+
+    def pending(self):
+        with self._cond:
+            return sum(1 for _, _, handle in self._heap if not handle.cancelled)
+
+    def get_info(self):
+        return {
+            "timers": self.pending(),
+            "disparos": self.disparos,
+            "thread_ativa": bool(self._thread and self._thread.is_alive()),
+        }
+
+    def _push(self, handle):
+        with self._cond:
+            heapq.heappush(self._heap, (handle.deadline, next(self._seq), handle))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="timer-service", daemon=True)
+                self._thread.start()
+            # Só acorda a thread se o novo timer passou a ser o próximo
+            if self._heap[0][2] is handle:
+                self._cond.notify()
+        return handle
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    espera = self._heap[0][0] - time.monotonic()
+                    if espera <= 0:
+                        break
+                    self._cond.wait(espera)
+                _, _, handle = heapq.heappop(self._heap)
+                if handle.interval is not None:
+                    handle.deadline += handle.interval
+                    heapq.heappush(self._heap, (handle.deadline, next(self._seq), handle))
+            self.disparos += 1
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                _log(f"Erro no timer {getattr(handle.callback, '__name__', handle.callback)}: {e}", "ERROR")
+
+
+def _log(message, level="INFO"):
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    emoji = {"INFO": "ℹ️", "SUCCESS": "✅", "ERROR": "❌", "WARNING": "⚠️"}.get(level, "📝")
+    print(f"[{timestamp}] {emoji} [Timer] {message}")
+
+
+# Instância única do processo
+timer_service = TimerService()
+
+
+if __name__ == "__main__":
+    inicio = time.monotonic()
+    disparos = []
+    timer_service.call_later(0.3, lambda: disparos.append(("0.3s", round(time.monotonic() - inicio, 2))))
+    cancelado = timer_service.call_later(0.2, lambda: disparos.append(("cancelado", 0)))
+    cancelado.cancel()
+    repetido = timer_service.call_every(0.1, lambda: disparos.append(("0.1s", round(time.monotonic() - inicio, 2))))
+    time.sleep(0.55)
+    repetido.cancel()
+    print(disparos)
+    print(timer_service.get_info())
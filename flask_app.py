@@ -502,7 +502,8 @@ STRATEGIES = {
     'mega_digit_2':    MegaDigit2,
 }
 
-DIGIT_STRATEGIES = {'alpha_bot_4', 'digit_sniper', 'digit_pulse', 'mega_digit_1', 'mega_digit_2'}
+# Ids de dígitos vêm do registro único de estratégias (backend/strategies/registry.py)
+from backend.strategies.registry import DIGIT_STRATEGIES
 
 # ─────────────────────────────────────────────
 # BOT PRINCIPAL
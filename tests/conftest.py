@@ -0,0 +1,32 @@
+"""
+Testes do backend — rodam a partir da raiz: python -m pytest -q
+O repositório é importado como pacote (backend.*), como no servidor.
+"""
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from array import array
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def serie_sintetica():
+    """Fábrica de TickSeries determinísticas (SyntheticTickGenerator)"""
+    from backend.backtest import TickSeries
+    from backend.paper_trading import SyntheticTickGenerator
+
+    def criar(n, symbol="R_100", seed=1, epoch=1_700_000_000):
+        gerador = SyntheticTickGenerator(symbol, seed=seed, epoch=epoch)
+        epochs, quotes = array("q"), array("d")
+        for _ in range(n):
+            tick = gerador.next_tick()
+            epochs.append(tick.epoch)
+            quotes.append(tick.quote)
+        return TickSeries(symbol, epochs, quotes, gerador.pip_size)
+
+    return criar
@@ -0,0 +1,76 @@
+import pytest
+
+from backend.backtest import Backtester, SimulatedDerivAPI, config_override, load_ticks_csv
+from backend.config import BotConfig
+
+# Metas fora de alcance: a sessão só termina quando os ticks acabam
+SEM_METAS = {"LUCRO_ALVO": 10 ** 9, "LIMITE_PERDA": 10 ** 9}
+
+
+@pytest.fixture(scope="module")
+def dois_dias(serie_sintetica):
+    # R_100: 1 tick a cada 2 s → 90 mil ticks ≈ 2 dias e meio
+    return serie_sintetica(90_000)
+
+
+def test_backtest_consome_todos_os_ticks(dois_dias):
+    r = Backtester("alpha_bot_4", config=SEM_METAS, balance=10 ** 9).run(dois_dias)
+    assert r["ticks"] == len(dois_dias)
+    assert not r["parou"] and r["motivo_parada"] is None
+    # Bem acima do MAX_TRADES_PER_DAY ao vivo: o limite não vale no backtest
+    assert r["trades"] > BotConfig.MAX_TRADES_PER_DAY
+    assert r["limite_trades_dia"] is None
+    assert r["vitorias"] + r["derrotas"] == r["trades"]
+
+
+def test_limite_diario_explicito_encerra_e_e_reportado(dois_dias):
+    config = {**SEM_METAS, "MAX_TRADES_PER_DAY": 50}
+    r = Backtester("alpha_bot_4", config=config, balance=10 ** 9).run(dois_dias)
+    assert r["parou"] and r["motivo_parada"] == "limite_trades_dia"
+    assert r["trades"] == 50 and r["limite_trades_dia"] == 50
+    assert r["ticks"] < len(dois_dias)
+
+
+def test_lucro_alvo_encerra_a_sessao(serie_sintetica):
+    r = Backtester("alpha_bot_4", config={"LUCRO_ALVO": 0.5, "LIMITE_PERDA": 10 ** 9},
+                   balance=10 ** 9).run(serie_sintetica(5_000))
+    assert r["motivo_parada"] == "lucro_alvo"
+    assert r["lucro_liquido"] >= 0.5
+
+
+def test_backtest_rise_fall_roda_ate_o_fim(serie_sintetica):
+    serie = serie_sintetica(20_000)
+    r = Backtester("alpha_pulse", "faster", "conservative", config=SEM_METAS, balance=10 ** 9).run(serie)
+    assert r["ticks"] == len(serie)
+    assert r["saldo_final"] == pytest.approx(10 ** 9 + r["lucro_liquido"], abs=0.01)
+
+
+def test_config_override_restaura_o_bot_config():
+    antes = BotConfig.MAX_TRADES_PER_DAY
+    with config_override(MAX_TRADES_PER_DAY=7):
+        assert BotConfig.MAX_TRADES_PER_DAY == 7
+    assert BotConfig.MAX_TRADES_PER_DAY == antes
+
+
+def test_conta_simulada_liquida_no_tick_seguinte(serie_sintetica):
+    serie = serie_sintetica(3)
+    api = SimulatedDerivAPI(balance=100)
+    resultados = []
+    api.set_contract_callback(resultados.append)
+    ticks = list(serie.ticks())
+    api.push_tick(ticks[0])
+    api.open_contract("DIGITEVEN", "R_100", 1.0, 1)
+    assert api.balance == 99.0
+    api.push_tick(ticks[1])
+    assert len(resultados) == 1 and resultados[0]["exit_epoch"] == ticks[1].epoch
+    assert api.balance == pytest.approx(99.0 + resultados[0]["sell_price"])
+
+
+def test_load_ticks_csv_descarta_epochs_repetidos(tmp_path):
+    csv = tmp_path / "R_50_20250301.csv"
+    csv.write_text("timestamp,datetime,symbol,price\n"
+                   "100,x,,10.5\n101,x,,10.6\n101,x,,10.7\n100,x,,10.8\n102,x,,10.9\n")
+    serie = load_ticks_csv(str(csv))
+    assert serie.symbol == "R_50"
+    assert list(serie.epochs) == [100, 101, 102]
+    assert list(serie.quotes) == [10.5, 10.6, 10.9]
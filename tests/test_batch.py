@@ -0,0 +1,72 @@
+import io
+import random
+from contextlib import redirect_stdout
+
+import numpy as np
+import pytest
+
+from backend.strategies.batch import _defining_class, evaluate_batch, resolve_entries
+from backend.strategies.registry import strategy_registry
+
+
+def passeio(n, seed, passo=0.4):
+    rnd, p, quotes = random.Random(seed), 1000.0, []
+    for _ in range(n):
+        p = round(p + rnd.gauss(0, passo), 2)
+        quotes.append(p)
+    return np.array(quotes)
+
+
+def criar(sid):
+    with redirect_stdout(io.StringIO()):
+        return strategy_registry.create(sid)
+
+
+VETORIZADAS = [sid for sid in strategy_registry.ids()
+               if _defining_class(strategy_registry.load(sid), "_batch_signals") is not None]
+
+
+def tick_a_tick(estrategia, quotes):
+    """Entradas de should_enter numa estratégia nova, tick a tick"""
+    entradas = {}
+    with redirect_stdout(io.StringIO()):
+        for i, quote in enumerate(quotes.tolist()):
+            entrou, contrato, conf = estrategia.should_enter({"quote": quote, "symbol": "R_100"})
+            if entrou and contrato:
+                entradas[i] = (contrato, conf)
+    return entradas
+
+
+def test_ha_estrategias_vetorizadas():
+    assert len(VETORIZADAS) >= 10
+
+
+@pytest.mark.parametrize("sid", VETORIZADAS)
+@pytest.mark.parametrize("seed", [1, 2])
+def test_evaluate_batch_igual_ao_should_enter(sid, seed):
+    quotes = passeio(3000, seed)
+    estrategia = criar(sid)
+    with redirect_stdout(io.StringIO()):
+        lote = evaluate_batch(estrategia, quotes, symbol="R_100")
+    assert len(estrategia.ticks_history) == 0          # o estado da instância não muda
+
+    esperado = tick_a_tick(criar(sid), quotes)
+    assert lote.entries().tolist() == sorted(esperado)
+    for i, (contrato, conf) in esperado.items():
+        entrou, contrato_lote, conf_lote = lote.signal(i)
+        assert entrou and contrato_lote == contrato
+        assert conf_lote == pytest.approx(conf, abs=1e-9)
+
+
+def test_resolve_entries_aquecimento_e_cooldown():
+    direction = np.array([1, 1, 0, -1, 1, 1, 1, 0, 0, -1], dtype=np.int8)
+    enter = resolve_entries(direction, warmup=2, cooldown=3, capacity=100)
+    # contador = i + 1 e último sinal começa em 0 (como last_signal_tick)
+    assert np.flatnonzero(enter).tolist() == [3, 6, 9]
+
+
+def test_resolve_entries_contador_satura_na_capacidade():
+    direction = np.ones(12, dtype=np.int8)
+    enter = resolve_entries(direction, warmup=1, cooldown=2, capacity=5)
+    # Depois de saturar em 5, contador - último nunca mais chega a 2
+    assert np.flatnonzero(enter).tolist() == [1, 3]
@@ -0,0 +1,64 @@
+from collections import Counter
+
+from backend.strategies.digit_windows import DigitWindows
+from backend.strategies.alpha_bot_4_digit import AlphaBot4DigitPattern
+
+
+def _digits(counts):
+    """Sequência com counts[d] ocorrências de cada dígito"""
+    return [d for d, n in enumerate(counts) for _ in range(n)]
+
+
+def _best_barrier_antigo(digits, first):
+    """_find_best_barrier/_analyze_window de antes das janelas incrementais"""
+    c = Counter(digits)
+    t = len(digits)
+    freq = {d: c.get(d, 0) / t * 100 for d in range(10)}
+    best = None
+    for barrier in range(first, 9):
+        po = sum(freq.get(d, 0) for d in range(barrier + 1, 10))
+        pu = sum(freq.get(d, 0) for d in range(0, barrier))
+        direction = "OVER" if po >= pu else "UNDER"
+        confidence = max(po, pu)
+        if best is None or confidence > best[2]:
+            best = (barrier, direction, confidence)
+    return best
+
+
+# 59 dígitos: barreiras 3 (OVER) e 8 (UNDER) empatam com 40 acertos, mas a
+# soma em float da 8 sai maior — o código antigo ficava com a 8
+EMPATE_59 = [2, 4, 7, 6, 4, 7, 4, 6, 8, 11]
+
+
+def test_empate_segue_o_arredondamento_antigo():
+    digits = _digits(EMPATE_59)
+    windows = DigitWindows.from_digits(digits, (100,))
+    assert windows.best_barrier(100, first=3, last=8) == _best_barrier_antigo(digits, 3)
+    assert windows.best_barrier(100, first=3, last=8)[:2] == (8, "UNDER")
+
+
+def test_alpha_bot_4_nao_cai_no_fallback_em_empate():
+    strategy = AlphaBot4DigitPattern()
+    windows = DigitWindows.from_digits(_digits(EMPATE_59), (100,))
+    barrier, direction, confidence = strategy._find_best_barrier(windows)
+    assert (barrier, direction) == (8, "UNDER")
+    assert confidence >= strategy.min_confidence
+
+
+def test_empate_exato_fica_com_a_primeira_barreira():
+    # 100 dígitos: somas em float também empatam, vence a primeira
+    counts = [10] * 10
+    windows = DigitWindows.from_digits(_digits(counts), (100,))
+    assert windows.best_barrier(100) == _best_barrier_antigo(_digits(counts), 1)
+    assert windows.best_barrier(100)[0] == 1
+
+
+def test_best_barrier_confere_com_o_codigo_antigo():
+    import random
+    rnd = random.Random(7)
+    for _ in range(3000):
+        size = rnd.choice((25, 50, 100))
+        digits = [rnd.randrange(10) for _ in range(rnd.randint(size // 2, size))]
+        windows = DigitWindows.from_digits(digits, (size,))
+        for first in (1, 3):
+            assert windows.best_barrier(size, first=first, last=8) == _best_barrier_antigo(digits, first)
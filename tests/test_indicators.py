@@ -0,0 +1,85 @@
+import io
+import math
+import random
+import statistics
+from contextlib import redirect_stdout
+
+import pytest
+
+from backend.strategies.indicators import EMA, IndicatorEngine
+from backend.strategies.premium_strategies import MegaAlpha1
+
+
+def senoide(n):
+    return [round(100 + 5 * math.sin(i / 7) + 0.01 * i, 2) for i in range(n)]
+
+
+def ema_recursiva(prices, period, smoothing=2):
+    """Referência: semente = média dos primeiros `period`, depois recursão sobre tudo"""
+    alpha = smoothing / (period + 1)
+    valor = sum(prices[:period]) / period
+    for p in prices[period:]:
+        valor = p * alpha + valor * (1 - alpha)
+    return valor
+
+
+def ema_antiga(prices, period):
+    """EMA de antes do IndicatorEngine: re-semeada nos últimos 40 preços a cada tick"""
+    janela = prices[-40:]
+    mult = 2 / (period + 1)
+    valor = statistics.mean(janela[:period])
+    for p in janela[period:]:
+        valor = p * mult + valor * (1 - mult)
+    return valor
+
+
+def test_ema_semente_e_recursao():
+    ema = EMA(3)
+    for p in (1, 2):
+        ema.push(p)
+        assert ema.value is None
+    ema.push(3)
+    assert ema.value == 2.0
+    for p in range(4, 11):
+        ema.push(p)
+    assert ema.value == 9.0
+
+
+def test_ema_valores_fixados():
+    # Valores da EMA recursiva sobre o histórico inteiro (mudança deliberada do user-011)
+    engine = IndicatorEngine()
+    engine.ema(5), engine.ema(30)
+    for p in senoide(300):
+        engine.update(p)
+    assert engine.ema(5) == pytest.approx(98.25257959062438, abs=1e-9)
+    assert engine.ema(30) == pytest.approx(101.31159507940225, abs=1e-9)
+
+
+@pytest.mark.parametrize("period", [5, 8, 10, 15, 20, 21, 30])
+def test_ema_do_engine_e_a_recursiva_do_historico(period):
+    rnd = random.Random(period)
+    engine, prices, p = IndicatorEngine(), [], 1000.0
+    engine.ema(period)
+    for _ in range(2000):
+        p = round(p + rnd.gauss(0, 0.5), 2)
+        prices.append(p)
+        engine.update(p)
+    assert engine.ema(period) == pytest.approx(ema_recursiva(prices, period), abs=1e-8)
+
+
+def test_ema_diverge_da_versao_re_semeada():
+    prices = senoide(300)
+    assert ema_recursiva(prices, 30) != pytest.approx(ema_antiga(prices, 30), abs=1e-3)
+    # Com o período bem menor que a janela, a semente antiga já foi esquecida
+    assert ema_recursiva(prices, 5) == pytest.approx(ema_antiga(prices, 5), abs=1e-3)
+
+
+def test_estrategia_le_a_ema_recursiva():
+    estrategia = MegaAlpha1()
+    prices = senoide(500)
+    with redirect_stdout(io.StringIO()):
+        for i, p in enumerate(prices):
+            estrategia.should_enter({"quote": p, "epoch": 1_700_000_000 + i, "symbol": "R_100"})
+    # Registrada ao bater min_history: semeada com os 40 primeiros ticks e recursiva desde então
+    assert estrategia.indicators.ema(30) == pytest.approx(ema_recursiva(prices, 30), abs=1e-8)
+    assert estrategia.indicators.ema(30) != pytest.approx(ema_antiga(prices, 30), abs=1e-3)
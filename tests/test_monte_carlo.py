@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from backend.risk_management.martingale import AntiMartingale, DAlembert, Fibonacci, Martingale
+from backend.risk_management.monte_carlo import SISTEMAS, simular_sessoes
+
+# Progressão vetorizada → classe tick a tick do martingale.py (mesmos parâmetros)
+PARES = [
+    ("martingale", Martingale, {"multiplicador": 2.0, "max_steps": 4}),
+    ("martingale", Martingale, {"multiplicador": 1.5, "max_steps": 2}),
+    ("anti", AntiMartingale, {"multiplicador": 2.0, "max_steps": 3}),
+    ("dalembert", DAlembert, {"incremento": 0.5, "max_steps": 4}),
+    ("fibonacci", Fibonacci, {"max_steps": 6}),
+    ("fibonacci", Fibonacci, {"max_steps": 20}),
+]
+
+
+@pytest.mark.parametrize("sistema, classe, kwargs", PARES)
+def test_progressao_vetorizada_igual_ao_martingale_py(sistema, classe, kwargs):
+    sessoes, passos, stake_inicial = 300, 40, 0.35
+    rng = np.random.default_rng(11)
+    vitorias = rng.random((passos, sessoes)) < 0.45
+
+    progressao = SISTEMAS[sistema](stake_inicial, **kwargs)
+    estado = progressao.estado_inicial(sessoes)
+    saldo = np.full(sessoes, 1e9)
+    vetorizado = []
+    for vitoria in vitorias:
+        stake = progressao.stake(estado, saldo)
+        vetorizado.append(stake)
+        estado = progressao.atualizar(estado, vitoria, stake)
+    vetorizado = np.array(vetorizado)
+
+    for s in range(sessoes):
+        objeto = classe(stake_inicial=stake_inicial, **kwargs)
+        stakes = [objeto.stake_atual]
+        for vitoria in vitorias[:-1, s]:
+            stakes.append(objeto.calcular_proximo_stake(bool(vitoria)))
+        np.testing.assert_allclose(vetorizado[:, s], np.round(stakes, 2), atol=0.005)
+
+
+def test_fixa_com_vitoria_certa_para_no_alvo():
+    r = simular_sessoes("fixed", sessoes=1000, win_prob=1.0, payout=0.95, stake_inicial=1.0,
+                        lucro_alvo=5.0, limite_perda=50.0, seed=1)
+    assert r.probabilidade("alvo") == 1.0 and r.risco_ruina() == 0.0
+    assert (r.trades == 6).all()                      # 5 × 0.95 < 5 ≤ 6 × 0.95
+    np.testing.assert_allclose(r.lucro, 6 * 0.95)
+
+
+def test_derrota_certa_para_no_limite():
+    r = simular_sessoes("martingale", sessoes=500, win_prob=0.0, stake_inicial=1.0,
+                        lucro_alvo=5.0, limite_perda=10.0, multiplicador=2.0, max_steps=5, seed=1)
+    # 1 + 2 + 4 = 7 < 10 ≤ 1 + 2 + 4 + 8
+    assert r.probabilidade("limite") == 1.0
+    assert (r.trades == 4).all() and (r.lucro == -15.0).all()
+
+
+def test_semente_reprodutivel_e_motivos_completos():
+    a = simular_sessoes("dalembert", sessoes=2000, seed=5, max_trades=200)
+    b = simular_sessoes("dalembert", sessoes=2000, seed=5, max_trades=200)
+    np.testing.assert_array_equal(a.lucro, b.lucro)
+    total = sum(a.probabilidade(m) for m in ("alvo", "limite", "saldo", "max_trades"))
+    assert total == pytest.approx(1.0)
+
+
+def test_sistema_desconhecido():
+    with pytest.raises(ValueError):
+        simular_sessoes("labouchere", sessoes=10)
@@ -0,0 +1,91 @@
+import pytest
+
+from backend import paper_trading
+from backend.paper_trading import PaperDerivAPI, SyntheticFeed, SyntheticTickGenerator, calibracao
+
+
+class FeedManual:
+    """Interface do tick_hub com ticks entregues pelo teste"""
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def subscribe(self, symbol, callback):
+        self.callbacks.setdefault(symbol, []).append(callback)
+        return True
+
+    def unsubscribe(self, symbol, callback):
+        self.callbacks.get(symbol, []).remove(callback)
+
+    def ensure(self, symbol):
+        pass
+
+    def history(self, symbol, count):
+        return []
+
+    def tick(self, symbol, epoch, quote):
+        for cb in tuple(self.callbacks.get(symbol, ())):
+            cb({"symbol": symbol, "epoch": epoch, "quote": quote})
+
+
+@pytest.fixture(autouse=True)
+def silencio(monkeypatch):
+    monkeypatch.setattr(paper_trading, "_log", lambda *a, **k: None)
+
+
+def test_gerador_deterministico_e_calibrado():
+    a = SyntheticTickGenerator("R_100", seed=3, epoch=1000)
+    b = SyntheticTickGenerator("R_100", seed=3, epoch=1000)
+    ticks = [a.next_tick() for _ in range(50)]
+    assert [t.quote for t in ticks] == [b.next_tick().quote for _ in range(50)]
+    assert [t.epoch for t in ticks[:3]] == [1002, 1004, 1006]           # R_100: 1 tick a cada 2 s
+    assert all(round(t.quote, 2) == t.quote for t in ticks)
+    assert SyntheticTickGenerator("1HZ100V", seed=1, epoch=0).next_tick().epoch == 1
+    assert calibracao("frxEURUSD") is None
+    with pytest.raises(ValueError):
+        SyntheticTickGenerator("frxEURUSD")
+
+
+def test_feed_sintetico_compartilhado_e_fechado_no_ultimo():
+    feed = SyntheticFeed(seed=1)
+    a, b = [], []
+    assert feed.subscribe("R_50", a.append) and feed.subscribe("R_50", b.append)
+    simbolo = feed._feeds["R_50"]
+    assert len(feed.history("R_50", 5000)) == paper_trading.HISTORICO_SINTETICO
+    simbolo._emitir()
+    assert len(a) == len(b) == 1 and a[0].symbol == "R_50"
+    feed.unsubscribe("R_50", a.append)
+    assert "R_50" in feed._feeds
+    feed.unsubscribe("R_50", b.append)
+    assert "R_50" not in feed._feeds and simbolo.timer.cancelled
+    assert feed.history("R_50", 10) == []
+    assert not feed.subscribe("frxEURUSD", a.append)
+
+
+def test_conta_paper_debita_liquida_e_credita():
+    feed = FeedManual()
+    api = PaperDerivAPI(feed=feed, balance=100.0, payouts={"DIGITEVEN": 0.9})
+    ticks, resultados = [], []
+    api.set_contract_callback(resultados.append)
+    assert api.subscribe("R_100", ticks.append)
+    feed.tick("R_100", 1, 1000.01)
+    api.open_contract("DIGITEVEN", "R_100", 10.0, 1)
+    assert api.balance == 90.0 and api.abertos == 1
+
+    feed.tick("R_100", 1, 1000.01)                  # mesmo epoch da compra: ignorado
+    assert resultados == []
+    feed.tick("R_100", 2, 1000.04)
+    assert resultados[0]["status"] == "won" and resultados[0]["sell_price"] == 19.0
+    assert api.balance == 109.0 and api.abertos == 0 and api.total_trades == 1
+    assert [t["epoch"] for t in ticks] == [1, 1, 2]  # o bot recebe todos os ticks
+
+
+def test_conta_paper_perde_o_stake():
+    feed = FeedManual()
+    api = PaperDerivAPI(feed=feed, balance=50.0)
+    api.subscribe_ticks("R_100")
+    feed.tick("R_100", 1, 1000.00)
+    api.open_contract("CALL", "R_100", 5.0, 1)
+    feed.tick("R_100", 2, 1000.10)                  # entrada
+    feed.tick("R_100", 3, 1000.05)                  # saída abaixo da entrada
+    assert api.balance == 45.0 and api.get_info()["trades"] == 1
@@ -0,0 +1,36 @@
+import pytest
+
+from backend.strategies import get_strategy
+from backend.strategies.alpha_bot_1 import AlphaBot1, AlphaBot1Reverse, AlphaBot1MA
+from backend.strategies.alpha_bot_4_digit import AlphaBot4DigitPattern
+from backend.strategies.digit_sniper import DigitSniper
+from backend.strategies.digit_pulse import DigitPulse
+from backend.strategies.mega_digit import MegaDigit1, MegaDigit2
+from backend.strategies.registry import strategy_registry
+
+# STRATEGY_MAP de strategies/__init__.py antes do registro sob demanda
+STRATEGY_MAP_ANTIGO = {
+    "alpha_bot_1":  AlphaBot1,
+    "alpha_bot_2":  AlphaBot1Reverse,
+    "alpha_bot_3":  AlphaBot1MA,
+    "alpha_bot_4":  AlphaBot4DigitPattern,
+    "digit_sniper": DigitSniper,
+    "digit_pulse":  DigitPulse,
+    "mega_digit_1": MegaDigit1,
+    "mega_digit_2": MegaDigit2,
+}
+
+
+@pytest.mark.parametrize("key,cls", sorted(STRATEGY_MAP_ANTIGO.items()))
+def test_get_strategy_mantem_o_mapa_antigo(key, cls):
+    assert type(get_strategy(key)) is cls
+
+
+def test_get_strategy_chave_desconhecida():
+    with pytest.raises(ValueError):
+        get_strategy("nao_existe")
+
+
+def test_registro_da_api_continua_com_as_proprias_classes():
+    assert strategy_registry.load("alpha_bot_2").__name__ == "AlphaBot2"
+    assert strategy_registry.load("alpha_bot_3").__name__ == "AlphaBot3"
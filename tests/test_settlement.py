@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from backend import settlement
+from backend.settlement import SettlementEngine, contract_won, default_payout
+
+
+class FeedFalso:
+    """Feed com subscribe/unsubscribe do tick_hub, ticks entregues à mão"""
+
+    def __init__(self, aceita=True):
+        self.aceita = aceita
+        self.callbacks = {}
+        self.soltos = threading.Event()
+
+    def subscribe(self, symbol, cb):
+        if self.aceita:
+            self.callbacks[symbol] = cb
+        return self.aceita
+
+    def unsubscribe(self, symbol, cb):
+        if self.callbacks.get(symbol) is cb:
+            del self.callbacks[symbol]
+        self.soltos.set()
+
+    def tick(self, symbol, epoch, quote):
+        self.callbacks[symbol]({"symbol": symbol, "epoch": epoch, "quote": quote})
+
+
+@pytest.fixture
+def engine_ao_vivo(monkeypatch):
+    feed = FeedFalso()
+    engine = SettlementEngine(feed=feed)
+    monkeypatch.setattr(settlement, "settlement_engine", engine)
+    return engine, feed
+
+
+def test_settle_live_timeout_cancela_e_desinscreve(engine_ao_vivo):
+    engine, feed = engine_ao_vivo
+    assert settlement.settle_live("R_100", "DIGITEVEN", timeout=0.05) is None
+    assert engine.pending() == [] and engine._pending["R_100"] == []
+    assert "R_100" not in engine._watchers
+    assert feed.soltos.wait(2) and feed.callbacks == {}
+
+
+def test_settle_live_liquida_pelo_feed(engine_ao_vivo):
+    engine, feed = engine_ao_vivo
+    def entregar():
+        while "R_100" not in feed.callbacks:
+            time.sleep(0.001)
+        feed.tick("R_100", 2, 1234.56)
+
+    threading.Thread(target=entregar, daemon=True).start()
+    resultado = settlement.settle_live("R_100", "DIGITEVEN", timeout=5)
+    assert resultado["status"] == "won" and resultado["digito"] == 6
+    assert engine.pending() == []
+    assert feed.soltos.wait(2)
+
+
+def test_falha_ao_assinar_cancela_o_contrato():
+    engine = SettlementEngine(feed=FeedFalso(aceita=False))
+    contrato = engine.open("DIGITODD", 1.0, "R_50")
+    assert contrato.wait(0) is None and not contrato.settled
+    assert engine.pending() == [] and engine._watchers == {}
+    assert not engine.cancel(contrato)
+
+
+def test_cancel_mantem_o_feed_com_outros_contratos_abertos():
+    feed = FeedFalso()
+    engine = SettlementEngine(feed=feed)
+    a = engine.open("DIGITEVEN", 1.0, "R_100", after_epoch=1)
+    b = engine.open("DIGITODD", 1.0, "R_100", after_epoch=1)
+    assert engine.cancel(a)
+    assert engine.pending("R_100") == [b] and "R_100" in feed.callbacks
+    feed.tick("R_100", 2, 100.03)
+    assert b.result["status"] == "won"
+    assert not engine.cancel(b)
+
+
+@pytest.mark.parametrize("tipo, barreira, entrada, saida, ganhou", [
+    ("CALL", None, 100.0, 100.1, True), ("CALL", None, 100.0, 100.0, False),
+    ("PUT", None, 100.0, 99.9, True), ("PUT", None, 100.0, 100.0, False),
+    ("CALLE", None, 100.0, 100.0, True), ("PUTE", None, 100.0, 100.0, True),
+    ("DIGITEVEN", None, 100.0, 100.04, True), ("DIGITODD", None, 100.0, 100.04, False),
+    ("DIGITOVER", 4, 100.0, 100.05, True), ("DIGITOVER", 4, 100.0, 100.04, False),
+    ("DIGITUNDER", 5, 100.0, 100.04, True), ("DIGITUNDER", 5, 100.0, 100.05, False),
+    ("DIGITMATCH", 7, 100.0, 100.07, True), ("DIGITMATCH", 7, 100.0, 100.08, False),
+    ("DIGITDIFF", 7, 100.0, 100.08, True), ("DIGITDIFF", 7, 100.0, 100.07, False),
+])
+def test_liquidacao_por_tipo(tipo, barreira, entrada, saida, ganhou):
+    engine = SettlementEngine(payouts={"CALL": 0.9})
+    c = engine.open(tipo, 2.0, "R_100", barrier=barreira, after_epoch=0)
+    if not tipo.startswith("DIGIT"):
+        engine.on_tick({"epoch": 1, "quote": entrada}, "R_100")   # spot de entrada
+    assert not c.settled
+    engine.on_tick({"epoch": 2, "quote": saida}, "R_100")
+    assert c.result["status"] == ("won" if ganhou else "lost")
+    lucro = 0.9 if tipo == "CALL" else default_payout(tipo, barreira)
+    assert c.result["profit"] == pytest.approx(round(2.0 * (1 + lucro), 2) - 2.0 if ganhou else -2.0)
+    assert contract_won(tipo, c.entry_quote, saida, c.result["digito"], barreira) is ganhou
+
+
+def test_ticks_anteriores_a_compra_sao_ignorados():
+    engine = SettlementEngine()
+    c = engine.open("DIGITEVEN", 1.0, "R_100", duration=2, after_epoch=10)
+    for epoch, quote in ((9, 100.01), (10, 100.03), (11, 100.05)):
+        engine.on_tick({"epoch": epoch, "quote": quote}, "R_100")
+    assert not c.settled and c.ticks == 1
+    engine.on_tick({"epoch": 12, "quote": 100.08}, "R_100")
+    assert c.result["status"] == "won" and c.result["exit_epoch"] == 12
+
+
+def test_duracao_em_segundos():
+    engine = SettlementEngine()
+    c = engine.open("CALL", 1.0, "R_100", duration=5, duration_unit="s", after_epoch=0)
+    engine.on_tick({"epoch": 1, "quote": 100.0}, "R_100")
+    engine.on_tick({"epoch": 5, "quote": 101.0}, "R_100")
+    assert not c.settled
+    engine.on_tick({"epoch": 6, "quote": 101.0}, "R_100")
+    assert c.result["status"] == "won"
@@ -0,0 +1,49 @@
+import pytest
+
+from backend.config import BotConfig
+from backend.sweep import (build_grid, open_tick_file, run_sweep, split_sessions, write_tick_file)
+
+SEM_METAS = {"LUCRO_ALVO": 10 ** 9, "LIMITE_PERDA": 10 ** 9}
+SESSAO = 4 * 3600   # R_100: 1 tick a cada 2 s → 7200 ticks por sessão
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory, serie_sintetica):
+    path = str(tmp_path_factory.mktemp("sweep") / "R_100.ticks")
+    write_tick_file(serie_sintetica(3 * SESSAO // 2), path)
+    return path
+
+
+def test_tick_file_ida_e_volta(tmp_path, serie_sintetica):
+    serie = serie_sintetica(1000)
+    path = str(tmp_path / "R_100.ticks")
+    write_tick_file(serie, path)
+    lida = open_tick_file(path)
+    assert lida.symbol == "R_100" and len(lida) == len(serie)
+    assert list(lida.epochs) == list(serie.epochs)
+    assert list(lida.quotes) == list(serie.quotes)
+
+
+def test_split_sessions_cobre_a_serie(serie_sintetica):
+    serie = serie_sintetica(10_000)
+    sessoes = split_sessions(serie, 3600, min_ticks=1)
+    assert sessoes[0][0] == 0 and sessoes[-1][1] == len(serie)
+    assert all(a[1] == b[0] for a, b in zip(sessoes, sessoes[1:]))
+
+
+def test_sweep_consome_sessoes_inteiras(dataset):
+    tabela = run_sweep(dataset, build_grid(["alpha_bot_4"]), sessao_segundos=SESSAO,
+                       config=SEM_METAS, balance=10 ** 9, workers=1, progress=False)
+    [linha] = tabela
+    assert linha["sessoes"] == 3
+    assert linha["cobertura"] == 100.0
+    # Mais trades que o MAX_TRADES_PER_DAY ao vivo: o sweep não herda o limite
+    assert linha["trades"] > BotConfig.MAX_TRADES_PER_DAY
+
+
+def test_sweep_reporta_sessoes_truncadas(dataset):
+    config = {**SEM_METAS, "MAX_TRADES_PER_DAY": 100}
+    [linha] = run_sweep(dataset, build_grid(["alpha_bot_4"]), sessao_segundos=SESSAO,
+                        config=config, balance=10 ** 9, workers=1, progress=False)
+    assert linha["trades"] == 3 * 100
+    assert linha["cobertura"] < 100.0
@@ -0,0 +1,65 @@
+import copy
+import pickle
+
+import pytest
+
+from backend.strategies.tick_buffer import TickRing
+
+
+def anel(n, capacidade=5):
+    ring = TickRing(capacidade)
+    for i in range(n):
+        ring.append(100.0 + i, 1000 + i, "R_100")
+    return ring
+
+
+def test_janela_contigua_depois_de_dar_a_volta():
+    ring = anel(13)
+    assert len(ring) == 5 and ring.maxlen == 5
+    assert list(ring.last()) == [108.0, 109.0, 110.0, 111.0, 112.0]
+    assert list(ring.last(2)) == [111.0, 112.0]
+    assert list(ring.last_epochs(3)) == [1010, 1011, 1012]
+    assert list(ring.last(50)) == list(ring.last())
+
+
+def test_quote_e_indices():
+    ring = anel(7)
+    assert ring.quote() == 106.0 and ring.quote(4) == 102.0
+    with pytest.raises(IndexError):
+        ring.quote(5)
+    assert ring[0]["quote"] == 102.0 and ring[-1] == {"quote": 106.0, "epoch": 1006, "symbol": "R_100"}
+    with pytest.raises(IndexError):
+        ring[5]
+    assert [t["quote"] for t in ring][-2:] == [105.0, 106.0]
+    assert ring[-2:] == ring.records()[-2:]
+
+
+def test_parcial_e_clear():
+    ring = anel(3)
+    assert list(ring.last()) == [100.0, 101.0, 102.0]
+    ring.clear()
+    assert not ring and list(ring.last()) == []
+
+
+def test_epoch_ausente_vira_none():
+    ring = TickRing(3)
+    ring.append(1.5)
+    assert ring[0]["epoch"] is None
+
+
+def test_as_array_sem_copia():
+    ring = anel(8)
+    arr = ring.as_array(3)
+    assert arr.tolist() == [105.0, 106.0, 107.0]
+    ring.append(200.0, 2000)
+    # A view antiga aponta para a memória do anel
+    assert ring.as_array(3).tolist() == [106.0, 107.0, 200.0]
+
+
+@pytest.mark.parametrize("copiar", [copy.deepcopy, lambda r: pickle.loads(pickle.dumps(r))])
+def test_copia_e_pickle(copiar):
+    ring = anel(9)
+    copia = copiar(ring)
+    assert copia.records() == ring.records() and copia.symbol == "R_100"
+    copia.append(999.0)
+    assert ring.quote() == 108.0 and copia.quote() == 999.0
@@ -0,0 +1,125 @@
+import pytest
+
+from backend import tick_hub as modulo
+from backend.tick_hub import TickHub
+
+
+class ApiFalsa:
+    """Conexão pública sem rede: o teste entrega os ticks por emitir()"""
+
+    criadas = []
+
+    def __init__(self, conecta=True):
+        self.conecta = conecta
+        self.callback = None
+        self.assinados = []
+        self.conectada = False
+        ApiFalsa.criadas.append(self)
+
+    def set_tick_callback(self, callback):
+        self.callback = callback
+
+    def connect(self):
+        self.conectada = self.conecta
+        return self.conecta
+
+    def subscribe_ticks(self, symbol):
+        self.assinados.append(symbol)
+
+    def disconnect(self):
+        self.conectada = False
+
+    def emitir(self, tick):
+        self.callback(tick)
+
+
+class CacheFalso:
+    def __init__(self, eventos):
+        self.eventos = eventos
+
+    def observe(self, tick):
+        self.eventos.append(("cache", tick["epoch"]))
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    ApiFalsa.criadas = []
+    eventos = []
+    monkeypatch.setattr(modulo, "criar_api", lambda public=True: ApiFalsa())
+    monkeypatch.setattr(modulo, "indicator_cache", CacheFalso(eventos))
+    monkeypatch.setattr(modulo, "_log", lambda *a, **k: None)
+    return TickHub(), eventos
+
+
+def tick(epoch):
+    return {"symbol": "R_100", "epoch": epoch, "quote": 1000.0 + epoch}
+
+
+def test_uma_conexao_por_simbolo_e_fan_out(hub):
+    hub, eventos = hub
+    a, b = [], []
+    assert hub.subscribe("R_100", a.append)
+    assert hub.subscribe("R_100", b.append)
+    assert hub.subscribe("R_100", a.append)     # repetido: não duplica
+    [api] = ApiFalsa.criadas
+    assert api.assinados == ["R_100"]
+
+    api.emitir(tick(1))
+    assert a == b == [tick(1)]
+    assert hub._feeds["R_100"].ticks_recebidos == 1
+
+
+def test_indicator_cache_ve_o_tick_antes_dos_bots(hub):
+    hub, eventos = hub
+    hub.subscribe("R_100", lambda t: eventos.append(("bot", t["epoch"])))
+    ApiFalsa.criadas[0].emitir(tick(7))
+    assert eventos == [("cache", 7), ("bot", 7)]
+
+
+def test_callback_com_erro_nao_interrompe_o_fan_out(hub):
+    hub, _ = hub
+    recebidos = []
+    hub.subscribe("R_100", lambda t: 1 / 0)
+    hub.subscribe("R_100", recebidos.append)
+    ApiFalsa.criadas[0].emitir(tick(1))
+    assert recebidos == [tick(1)]
+
+
+def test_unsubscribe_fecha_o_feed_no_ultimo_inscrito(hub):
+    hub, _ = hub
+    a, b = [], []
+    hub.subscribe("R_100", a.append)
+    hub.subscribe("R_100", b.append)
+    api = ApiFalsa.criadas[0]
+
+    hub.unsubscribe("R_100", a.append)
+    api.emitir(tick(1))
+    assert a == [] and b == [tick(1)]
+    assert api.conectada
+
+    hub.unsubscribe("R_100", b.append)
+    assert "R_100" not in hub._feeds and not api.conectada
+    hub.unsubscribe("R_100", b.append)           # sem feed: nada acontece
+
+    # Nova inscrição abre outra conexão
+    hub.subscribe("R_100", a.append)
+    assert len(ApiFalsa.criadas) == 2
+
+
+def test_falha_ao_conectar_nao_deixa_feed(hub, monkeypatch):
+    hub, _ = hub
+    monkeypatch.setattr(modulo, "criar_api", lambda public=True: ApiFalsa(conecta=False))
+    assert not hub.subscribe("R_50", print)
+    assert "R_50" not in hub._feeds
+
+
+def test_simbolos_independentes(hub):
+    hub, _ = hub
+    r100, r50 = [], []
+    hub.subscribe("R_100", r100.append)
+    hub.subscribe("R_50", r50.append)
+    api100, api50 = ApiFalsa.criadas
+    api50.emitir(tick(3))
+    assert r100 == [] and r50 == [tick(3)]
+    hub.unsubscribe("R_50", r50.append)
+    assert api100.conectada and not api50.conectada
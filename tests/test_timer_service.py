@@ -0,0 +1,71 @@
+import threading
+import time
+
+from backend.timer_service import TimerService
+
+
+def esperar(condicao, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while not condicao():
+        if time.monotonic() > limite:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_disparo_em_ordem_de_deadline():
+    servico, ordem = TimerService(), []
+    for atraso, nome in ((0.15, "c"), (0.05, "a"), (0.10, "b")):
+        servico.call_later(atraso, ordem.append, nome)
+    assert esperar(lambda: len(ordem) == 3)
+    assert ordem == ["a", "b", "c"]
+    assert servico.pending() == 0 and servico.disparos == 3
+
+
+def test_mesmo_deadline_respeita_a_ordem_de_agendamento(monkeypatch):
+    servico, ordem = TimerService(), []
+    agora = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: agora)   # todos com o mesmo deadline
+    for nome in "abcde":
+        servico.call_later(0, ordem.append, nome)
+    monkeypatch.undo()
+    assert esperar(lambda: len(ordem) == 5)
+    assert ordem == list("abcde")
+
+
+def test_cancel_impede_o_disparo():
+    servico, disparos = TimerService(), []
+    cancelado = servico.call_later(0.05, disparos.append, "cancelado")
+    servico.call_later(0.1, disparos.append, "ok")
+    cancelado.cancel()
+    assert servico.pending() == 1
+    assert esperar(lambda: disparos)
+    time.sleep(0.05)
+    assert disparos == ["ok"]
+
+
+def test_timer_mais_cedo_acorda_a_thread():
+    servico, disparos = TimerService(), []
+    servico.call_later(30, disparos.append, "tarde")
+    inicio = time.monotonic()
+    servico.call_later(0.05, disparos.append, "cedo")
+    assert esperar(lambda: disparos)
+    assert disparos == ["cedo"] and time.monotonic() - inicio < 1
+
+
+def test_call_every_repete_ate_cancel():
+    servico, disparos = TimerService(), []
+    handle = servico.call_every(0.02, lambda: disparos.append(time.monotonic()))
+    assert esperar(lambda: len(disparos) >= 4)
+    handle.cancel()
+    feitos = len(disparos)
+    time.sleep(0.1)
+    assert len(disparos) <= feitos + 1 and servico.pending() == 0
+
+
+def test_erro_no_callback_nao_derruba_o_servico(capsys):
+    servico, ok = TimerService(), threading.Event()
+    servico.call_later(0.01, lambda: 1 / 0)
+    servico.call_later(0.03, ok.set)
+    assert ok.wait(2)
+    assert "Erro no timer" in capsys.readouterr().out